@@ -1,17 +1,406 @@
 """Linux/X11 table detector implementation
 
 Uses xcffib for X11 window detection on Linux systems.
+
+The HUD asks for every table's geometry and title on each tick, and asking the
+X server costs a synchronous round trip per property per window. The detector
+therefore keeps an event-driven cache of the top-level client windows
+(``X11WindowTracker``): X reports creations, closes, moves, resizes and title
+changes as events, the cache is updated from them, and queries are answered
+from memory. What still has to be fetched is requested for all windows at once
+and the replies collected afterwards, so a batch costs one round trip rather
+than one per window.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
 
 from .protocol import Platform, TableGeometry, TableInfo
 
 logger = logging.getLogger(__name__)
 
+# X11 protocol constants (xproto.CW.EventMask and xproto.EventMask members).
+_CW_EVENT_MASK = 0x0800
+_STRUCTURE_NOTIFY = 0x020000
+_SUBSTRUCTURE_NOTIFY = 0x080000
+_PROPERTY_CHANGE = 0x400000
+_WHOLE_PROPERTY = (2**32) - 1
+
+# What a WindowChange reports.
+MOVED = "moved"
+RESIZED = "resized"
+CLOSED = "closed"
+RETITLED = "retitled"
+SHOWN = "shown"
+HIDDEN = "hidden"
+
+
+@dataclass(frozen=True)
+class WindowChange:
+    """One change to a tracked window, as reported to tracker listeners
+
+    Attributes:
+        window: X11 window ID (XID) of the client window
+        kind: One of MOVED, RESIZED, CLOSED, RETITLED, SHOWN, HIDDEN
+    """
+
+    window: int
+    kind: str
+
+
+@dataclass
+class _WindowState:
+    title: str = ""
+    geometry: TableGeometry | None = None
+    mapped: bool = False
+    frame: int | None = None  # the window manager's frame, if it reparented the client
+
+
+class X11WindowTracker:
+    """Event-driven cache of the top-level client windows
+
+    Subscribes to SubstructureNotify and PropertyChange on the root window
+    (client list changes, top-level creation) and to StructureNotify and
+    PropertyChange on every client (ConfigureNotify, DestroyNotify, map state,
+    reparenting, title changes). ``process_events`` drains whatever X has
+    queued without blocking, updates the cache and tells the listeners what
+    changed. Positions are re-read with TranslateCoordinates after a move,
+    because a reparented client's ConfigureNotify is relative to its frame;
+    those requests are pipelined like every other fetch.
+
+    X errors for single requests are logged and skipped. Any other failure
+    to read events means the connection is gone: the tracker then closes and
+    its owner falls back to asking X directly.
+
+    Note:
+        The connection is not thread-safe: use the tracker from the thread
+        that owns the detector (the Qt main thread in the HUD).
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        root: int,
+        *,
+        client_list_atom: int,
+        window_atom: int,
+        name_atom: int,
+        utf8_atom: int,
+        xproto: ModuleType,
+        protocol_error: type[Exception],
+    ) -> None:
+        self._xconn = connection
+        self._root = root
+        self._nclatom = client_list_atom
+        self._winatom = window_atom
+        self._wnameatom = name_atom
+        self._utf8atom = utf8_atom
+        self._windows: dict[int, _WindowState] = {}
+        self._frames: dict[int, int] = {}  # frame -> client
+        self._listeners: list[Callable[[list[WindowChange]], None]] = []
+        self._unsent: list[WindowChange] = []
+        self._notifying = False
+        self._protocol_error = protocol_error
+        self._closed = False
+        self._handlers = {
+            xproto.ConfigureNotifyEvent: self._on_configure,
+            xproto.PropertyNotifyEvent: self._on_property,
+            xproto.CreateNotifyEvent: self._on_create,
+            xproto.DestroyNotifyEvent: self._on_destroy,
+            xproto.MapNotifyEvent: self._on_map,
+            xproto.UnmapNotifyEvent: self._on_unmap,
+            xproto.ReparentNotifyEvent: self._on_reparent,
+        }
+        # Work collected while draining, done in one batch at the end.
+        self._moved: set[int] = set()
+        self._retitled: set[int] = set()
+        self._client_list_stale = False
+
+    def start(self) -> None:
+        """Subscribe to root window events and load every current client"""
+        # Subscribe first: a change between reading the client list and
+        # subscribing would otherwise never be reported.
+        self._xconn.core.ChangeWindowAttributes(
+            window=self._root,
+            value_mask=_CW_EVENT_MASK,
+            value_list=[_SUBSTRUCTURE_NOTIFY | _PROPERTY_CHANGE],
+        )
+        self._adopt(self._client_list())
+        logger.info(f"Tracking {len(self._windows)} X11 client windows from events")
+
+    def fileno(self) -> int:
+        """File descriptor of the X connection, readable when events arrive"""
+        return self._xconn.get_file_descriptor()
+
+    @property
+    def closed(self) -> bool:
+        """Whether reading events failed for good; the cache is stale from then on"""
+        return self._closed
+
+    def add_listener(self, listener: Callable[[list[WindowChange]], None]) -> None:
+        """Call ``listener`` with the changes found by each ``process_events``"""
+        self._listeners.append(listener)
+
+    def windows(self) -> list[int]:
+        """Tracked client windows, in client list order"""
+        return list(self._windows)
+
+    def is_tracked(self, window_id: int) -> bool:
+        """Whether ``window_id`` is a client the cache answers for"""
+        return window_id in self._windows
+
+    def title(self, window_id: int) -> str:
+        """Cached title of a tracked window"""
+        return self._windows[window_id].title
+
+    def geometry(self, window_id: int) -> TableGeometry | None:
+        """Cached root-relative geometry of a tracked window"""
+        return self._windows[window_id].geometry
+
+    def is_mapped(self, window_id: int) -> bool:
+        """Cached map state of a tracked window"""
+        return self._windows[window_id].mapped
+
+    def process_events(self) -> list[WindowChange]:
+        """Apply every queued X event to the cache and notify the listeners
+
+        Never blocks. A listener may query the detector, which drains again;
+        changes found then are delivered by the outer call.
+
+        Returns:
+            The changes found by this call
+        """
+        changes: list[WindowChange] = []
+        while not self._closed:
+            try:
+                event = self._xconn.poll_for_event()
+            except self._protocol_error as e:
+                # X errors for unchecked requests surface here, typically
+                # BadWindow for a client that closed while being loaded.
+                logger.debug(f"X error while draining events: {e}")
+                continue
+            except Exception as e:
+                # The connection is broken and every further poll would fail
+                # the same way.
+                logger.warning(f"X11 event tracking stopped, polling window properties instead: {e}")
+                self._closed = True
+                break
+            if event is None:
+                break
+            handler = self._handlers.get(type(event))
+            if handler is not None:
+                handler(event, changes)
+        self._finish_batch(changes)
+
+        self._unsent.extend(changes)
+        if not self._notifying:
+            self._notifying = True
+            try:
+                while self._unsent:
+                    batch, self._unsent = self._unsent, []
+                    for listener in list(self._listeners):
+                        try:
+                            listener(batch)
+                        except Exception:
+                            logger.exception("X11 window change listener failed")
+            finally:
+                self._notifying = False
+        return changes
+
+    # -- event handlers -------------------------------------------------
+
+    def _on_configure(self, event: Any, changes: list[WindowChange]) -> None:
+        state = self._windows.get(event.window)
+        if state is None:
+            client = self._frames.get(event.window)
+            if client is not None:
+                self._moved.add(client)
+            return
+        old = state.geometry
+        if old is not None and (old.width, old.height) != (event.width, event.height):
+            state.geometry = TableGeometry(x=old.x, y=old.y, width=event.width, height=event.height)
+            changes.append(WindowChange(event.window, RESIZED))
+        self._moved.add(event.window)
+
+    def _on_property(self, event: Any, changes: list[WindowChange]) -> None:
+        if event.window == self._root:
+            if event.atom == self._nclatom:
+                self._client_list_stale = True
+        elif event.atom == self._wnameatom and event.window in self._windows:
+            self._retitled.add(event.window)
+
+    def _on_create(self, event: Any, changes: list[WindowChange]) -> None:
+        # Menus and tooltips never become clients; anything else may be about
+        # to join the client list.
+        if event.parent == self._root and not event.override_redirect:
+            self._client_list_stale = True
+
+    def _on_destroy(self, event: Any, changes: list[WindowChange]) -> None:
+        if event.window in self._windows:
+            self._forget(event.window)
+            changes.append(WindowChange(event.window, CLOSED))
+
+    def _on_map(self, event: Any, changes: list[WindowChange]) -> None:
+        state = self._windows.get(event.window)
+        if state is not None and not state.mapped:
+            state.mapped = True
+            changes.append(WindowChange(event.window, SHOWN))
+
+    def _on_unmap(self, event: Any, changes: list[WindowChange]) -> None:
+        state = self._windows.get(event.window)
+        if state is not None and state.mapped:
+            state.mapped = False
+            changes.append(WindowChange(event.window, HIDDEN))
+
+    def _on_reparent(self, event: Any, changes: list[WindowChange]) -> None:
+        state = self._windows.get(event.window)
+        if state is None:
+            return
+        if state.frame is not None:
+            self._frames.pop(state.frame, None)
+        state.frame = event.parent if event.parent != self._root else None
+        if state.frame is not None:
+            self._frames[state.frame] = event.window
+        self._moved.add(event.window)
+
+    # -- batched fetches ------------------------------------------------
+
+    def _finish_batch(self, changes: list[WindowChange]) -> None:
+        if self._client_list_stale:
+            self._client_list_stale = False
+            try:
+                current = self._client_list()
+            except Exception as e:
+                logger.debug(f"Error reading the client list: {e}")
+            else:
+                listed = set(current)
+                for win in [win for win in self._windows if win not in listed]:
+                    self._forget(win)
+                    changes.append(WindowChange(win, CLOSED))
+                self._adopt([win for win in current if win not in self._windows])
+        moved = [win for win in self._moved if win in self._windows]
+        retitled = [win for win in self._retitled if win in self._windows]
+        self._moved.clear()
+        self._retitled.clear()
+        if moved:
+            self._refresh_positions(moved, changes)
+        if retitled:
+            self._refresh_titles(retitled, changes)
+
+    def _client_list(self) -> list[int]:
+        return (
+            self._xconn.core.GetProperty(
+                delete=False,
+                window=self._root,
+                property=self._nclatom,
+                type=self._winatom,
+                long_offset=0,
+                long_length=_WHOLE_PROPERTY,
+            )
+            .reply()
+            .value.to_atoms()
+        )
+
+    def _title_request(self, win: int) -> Any:
+        return self._xconn.core.GetProperty(
+            delete=False,
+            window=win,
+            property=self._wnameatom,
+            type=self._utf8atom,
+            long_offset=0,
+            long_length=_WHOLE_PROPERTY,
+        )
+
+    def _position_request(self, win: int) -> Any:
+        return self._xconn.core.TranslateCoordinates(src_window=win, dst_window=self._root, src_x=0, src_y=0)
+
+    def _adopt(self, windows: Iterable[int]) -> None:
+        """Subscribe to and load new clients, all requests sent before any reply is read"""
+        core = self._xconn.core
+        pending = []
+        for win in windows:
+            try:
+                core.ChangeWindowAttributes(
+                    window=win, value_mask=_CW_EVENT_MASK, value_list=[_STRUCTURE_NOTIFY | _PROPERTY_CHANGE]
+                )
+                pending.append(
+                    (
+                        win,
+                        self._title_request(win),
+                        core.GetGeometry(drawable=win),
+                        self._position_request(win),
+                        core.GetWindowAttributes(window=win),
+                        core.QueryTree(window=win),
+                    )
+                )
+            except Exception as e:
+                logger.debug(f"Error subscribing to window {win}: {e}")
+        for win, title, geom, coords, attrs, tree in pending:
+            try:
+                geometry = geom.reply()
+                position = coords.reply()
+                parent = tree.reply().parent
+                state = _WindowState(
+                    title=title.reply().value.to_utf8(),
+                    geometry=TableGeometry(
+                        x=position.dst_x, y=position.dst_y, width=geometry.width, height=geometry.height
+                    ),
+                    mapped=attrs.reply().map_state != 0,
+                    frame=parent if parent != self._root else None,
+                )
+            except Exception as e:
+                # Closed before its replies came back: its DestroyNotify or the
+                # next client list says so too.
+                logger.debug(f"Error loading window {win}: {e}")
+                continue
+            self._windows[win] = state
+            if state.frame is not None:
+                self._frames[state.frame] = win
+
+    def _refresh_positions(self, windows: list[int], changes: list[WindowChange]) -> None:
+        pending = [(win, self._position_request(win), self._xconn.core.GetGeometry(drawable=win)) for win in windows]
+        for win, coords, geom in pending:
+            try:
+                position = coords.reply()
+                size = geom.reply()
+            except Exception as e:
+                logger.debug(f"Error getting geometry for window {win}: {e}")
+                continue
+            state = self._windows.get(win)
+            if state is None:
+                continue
+            new = TableGeometry(x=position.dst_x, y=position.dst_y, width=size.width, height=size.height)
+            old = state.geometry
+            state.geometry = new
+            if old is None or (old.width, old.height) != (new.width, new.height):
+                changes.append(WindowChange(win, RESIZED))
+            if old is None or (old.x, old.y) != (new.x, new.y):
+                changes.append(WindowChange(win, MOVED))
+
+    def _refresh_titles(self, windows: list[int], changes: list[WindowChange]) -> None:
+        pending = [(win, self._title_request(win)) for win in windows]
+        for win, cookie in pending:
+            try:
+                title = cookie.reply().value.to_utf8()
+            except Exception as e:
+                logger.debug(f"Error getting title for window {win}: {e}")
+                continue
+            state = self._windows.get(win)
+            if state is not None and state.title != title:
+                state.title = title
+                changes.append(WindowChange(win, RETITLED))
+
+    def _forget(self, win: int) -> None:
+        state = self._windows.pop(win)
+        if state.frame is not None:
+            self._frames.pop(state.frame, None)
+
 
 class LinuxTableDetector:
     """Linux-specific table detector using X11/xcffib
@@ -24,6 +413,9 @@ class LinuxTableDetector:
         Does not support Wayland (see notes in XTables.py)
     """
 
+    # None when event tracking could not start: every query then asks X directly.
+    _tracker: X11WindowTracker | None = None
+
     def __init__(self):
         """Initialize Linux table detector"""
         self._platform = Platform.LINUX
@@ -41,6 +433,7 @@ class LinuxTableDetector:
             self._winatom = self._get_atom("WINDOW")
             self._wnameatom = self._get_atom("_NET_WM_NAME")
             self._utf8atom = self._get_atom("UTF8_STRING")
+            self._tracker = self._start_tracker(xcffib.xproto, xcffib.ProtocolException)
 
             logger.info("Linux X11 table detector initialized")
 
@@ -59,11 +452,52 @@ class LinuxTableDetector:
         """
         return self._xconn.core.InternAtom(only_if_exists=False, name_len=len(name), name=name).reply().atom
 
+    def _start_tracker(self, xproto: ModuleType, protocol_error: type[Exception]) -> X11WindowTracker | None:
+        try:
+            tracker = X11WindowTracker(
+                self._xconn,
+                self._root,
+                client_list_atom=self._nclatom,
+                window_atom=self._winatom,
+                name_atom=self._wnameatom,
+                utf8_atom=self._utf8atom,
+                xproto=xproto,
+                protocol_error=protocol_error,
+            )
+            tracker.start()
+            return tracker
+        except Exception as e:
+            logger.warning(f"X11 event tracking unavailable, polling window properties instead: {e}")
+            return None
+
     @property
     def platform(self) -> Platform:
         """Get the current platform"""
         return self._platform
 
+    @property
+    def tracker(self) -> X11WindowTracker | None:
+        """The event-driven window cache, or None when queries go to X directly"""
+        return self._tracker
+
+    def _drained(self) -> X11WindowTracker | None:
+        """Bring the cache up to date; None, from then on, once it has closed"""
+        tracker = self._tracker
+        if tracker is None:
+            return None
+        tracker.process_events()
+        if tracker.closed:
+            self._tracker = None
+            return None
+        return tracker
+
+    def _tracked(self, window_id: int) -> X11WindowTracker | None:
+        """The up to date cache if it knows ``window_id``, else None"""
+        tracker = self._drained()
+        if tracker is None or not tracker.is_tracked(window_id):
+            return None
+        return tracker
+
     def find_tables(self, search_string: str = "") -> list[TableInfo]:
         """Find all windows matching the search string
 
@@ -76,59 +510,66 @@ class LinuxTableDetector:
         tables = []
 
         try:
-            # Get list of all windows
-            wins = (
-                self._xconn.core.GetProperty(
-                    delete=False,
-                    window=self._root,
-                    property=self._nclatom,
-                    type=self._winatom,
-                    long_offset=0,
-                    long_length=(2**32) - 1,
-                )
-                .reply()
-                .value.to_atoms()
-            )
+            tracker = self._drained()
+            if tracker is not None:
+                candidates = [(win, tracker.title(win)) for win in tracker.windows()]
+            else:
+                candidates = self._read_titles()
+            logger.debug(f"Found {len(candidates)} windows to scan")
+
+            for win, w_title in candidates:
+                # Check if window matches search string
+                if not search_string or re.search(search_string, w_title, re.IGNORECASE):
+                    geometry = self.get_window_geometry(win)
+                    if geometry:
+                        tables.append(TableInfo(window_id=win, title=w_title, geometry=geometry))
+                        logger.debug(f"Found matching table: {w_title}")
+
+        except Exception as e:
+            logger.error(f"Error finding tables: {e}", exc_info=True)
 
-            logger.debug(f"Found {len(wins)} windows to scan")
+        logger.debug(f"Found {len(tables)} matching tables")
+        return tables
 
-            # Check each window
-            for win in wins:
-                try:
-                    w_title = (
+    def _read_titles(self) -> list[tuple[int, str]]:
+        """Every client window with its title, asked of X in one pipelined batch"""
+        wins = (
+            self._xconn.core.GetProperty(
+                delete=False,
+                window=self._root,
+                property=self._nclatom,
+                type=self._winatom,
+                long_offset=0,
+                long_length=_WHOLE_PROPERTY,
+            )
+            .reply()
+            .value.to_atoms()
+        )
+        requests = []
+        for win in wins:
+            try:
+                requests.append(
+                    (
+                        win,
                         self._xconn.core.GetProperty(
                             delete=False,
                             window=win,
                             property=self._wnameatom,
                             type=self._utf8atom,
                             long_offset=0,
-                            long_length=(2**32) - 1,
-                        )
-                        .reply()
-                        .value.to_utf8()
+                            long_length=_WHOLE_PROPERTY,
+                        ),
                     )
-
-                    # Check if window matches search string
-                    if not search_string or re.search(search_string, w_title, re.IGNORECASE):
-                        geometry = self.get_window_geometry(win)
-                        if geometry:
-                            table_info = TableInfo(
-                                window_id=win,
-                                title=w_title,
-                                geometry=geometry,
-                            )
-                            tables.append(table_info)
-                            logger.debug(f"Found matching table: {w_title}")
-
-                except Exception as e:
-                    logger.debug(f"Error getting window info for {win}: {e}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Error finding tables: {e}", exc_info=True)
-
-        logger.debug(f"Found {len(tables)} matching tables")
-        return tables
+                )
+            except Exception as e:
+                logger.debug(f"Error getting window info for {win}: {e}")
+        titles = []
+        for win, cookie in requests:
+            try:
+                titles.append((win, cookie.reply().value.to_utf8()))
+            except Exception as e:
+                logger.debug(f"Error getting window info for {win}: {e}")
+        return titles
 
     def get_window_geometry(self, window_id: int | str) -> TableGeometry | None:
         """Get geometry for a specific window
@@ -141,6 +582,9 @@ class LinuxTableDetector:
         """
         try:
             window_id = int(window_id)
+            tracker = self._tracked(window_id)
+            if tracker is not None:
+                return tracker.geometry(window_id)
             geom = self._xconn.core.GetGeometry(drawable=window_id).reply()
 
             # Translate coordinates to root window to get absolute screen position
@@ -165,6 +609,9 @@ class LinuxTableDetector:
         """
         try:
             window_id = int(window_id)
+            tracker = self._tracked(window_id)
+            if tracker is not None:
+                return tracker.is_mapped(window_id)
             attrs = self._xconn.core.GetWindowAttributes(window=window_id).reply()
             return attrs.map_state != 0
 
@@ -196,6 +643,9 @@ class LinuxTableDetector:
         """
         try:
             window_id = int(window_id)
+            tracker = self._tracked(window_id)
+            if tracker is not None:
+                return tracker.title(window_id)
             title = (
                 self._xconn.core.GetProperty(
                     delete=False,
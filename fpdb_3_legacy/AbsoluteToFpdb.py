@@ -28,7 +28,13 @@ import datetime
 import re
 from decimal import Decimal
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter, log
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+    log,
+)
 
 # Class for converting Absolute HH format.
 
@@ -139,6 +145,18 @@ class Absolute(HandHistoryConverter):
 
     re_Pocket = re.compile(r"\*\*\* POCKET CARDS \*\*\*")
 
+    @cached_player_regexes(
+        "re_PostSB",
+        "re_PostBB",
+        "re_PostIncoming",
+        "re_Antes",
+        "re_BringIn",
+        "re_PostBoth",
+        "re_HeroCards",
+        "re_Action",
+        "re_ShowdownAction",
+        "re_CollectPot",
+    )
     def compilePlayerRegexs(self, hand):
         players = set([player[1] for player in hand.players])
         if not players <= self.compiledPlayers:  # x <= y means 'x is subset of y'
@@ -1,10 +1,22 @@
-"""Legacy automatic player note generation."""
+"""Legacy automatic player note generation.
+
+Which rules run is set in the ``<autonotes>`` section of the config. Reading
+it walked the whole XML document with ``getElementsByTagName`` for every rule,
+for every player, for every hand imported, so with the Hwang PLO and AoF rule
+sets on, the switches cost a visible share of each hand's import. They are now
+read into an :class:`AutoNoteRulePlan` once per config revision: the setters
+below and the config reload observer start a new revision, and a reloaded
+config is a new document with plans of its own.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass, replace
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, replace
 from decimal import Decimal, InvalidOperation
+from time import perf_counter
 from typing import Any
 
 from fpdb_3_legacy.AutoNotePlo import (
@@ -80,6 +92,96 @@ class AutoNoteRuleSet:
     enabled_by_default: bool = True
 
 
+@dataclass(frozen=True)
+class AutoNoteRulePlan:
+    """What generate_for_hand needs from the config, read once per config revision."""
+
+    enabled: bool
+    # Enabled rule sets, each holding only its enabled rules.
+    rule_sets: tuple[AutoNoteRuleSet, ...]
+    # (rule set id, rule id) -> configured note template, where it differs from the rule's own.
+    templates: Mapping[tuple[str, str], str]
+    max_per_hand: int | None
+    max_per_player: int | None
+
+    def rule_sets_for_hand(self, hand) -> tuple[AutoNoteRuleSet, ...]:
+        return tuple(rule_set for rule_set in self.rule_sets if rule_set.supports_hand(hand))
+
+
+@dataclass
+class RuleTiming:
+    calls: int = 0
+    seconds: float = 0.0
+    slowest: float = 0.0
+
+
+class RuleTimings:
+    """Time spent in each rule's evaluation, collected while start_rule_timing is in effect."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.rules: dict[tuple[str, str], RuleTiming] = {}
+
+    def add(self, rule_set_id: str, rule_id: str, seconds: float) -> None:
+        with self._lock:
+            timing = self.rules.setdefault((rule_set_id, rule_id), RuleTiming())
+            timing.calls += 1
+            timing.seconds += seconds
+            timing.slowest = max(timing.slowest, seconds)
+
+    def report(self) -> list[dict[str, Any]]:
+        """One row per rule, the most expensive first."""
+        with self._lock:
+            items = sorted(self.rules.items(), key=lambda item: item[1].seconds, reverse=True)
+        return [
+            {
+                "ruleSet": rule_set_id,
+                "rule": rule_id,
+                "calls": timing.calls,
+                "seconds": timing.seconds,
+                "meanMicros": timing.seconds / timing.calls * 1e6 if timing.calls else 0.0,
+                "slowestMicros": timing.slowest * 1e6,
+            }
+            for (rule_set_id, rule_id), timing in items
+        ]
+
+
+_rule_timings: RuleTimings | None = None
+
+
+def start_rule_timing() -> RuleTimings:
+    """Time every rule evaluation from now on, into the returned collector."""
+    global _rule_timings  # noqa: PLW0603 - one switch for the whole process.
+    _rule_timings = RuleTimings()
+    return _rule_timings
+
+
+def stop_rule_timing() -> RuleTimings | None:
+    """Stop timing rules; return what was collected."""
+    global _rule_timings  # noqa: PLW0603 - one switch for the whole process.
+    timings, _rule_timings = _rule_timings, None
+    return timings
+
+
+def format_rule_timings(timings: RuleTimings, limit: int = 20) -> str:
+    """Format the slowest rules for command-line display."""
+    return "\n".join(
+        f"{row['rule']:<32} {row['calls']:>9} calls {row['seconds'] * 1000:>10.1f} ms "
+        f"{row['meanMicros']:>8.1f} us/call  max {row['slowestMicros']:.1f} us  [{row['ruleSet']}]"
+        for row in timings.report()[:limit]
+    )
+
+
+def _evaluate(rule_set_id: str, rule: AutoNoteRule, hand, player_name: str, context):
+    timings = _rule_timings
+    if timings is None:
+        return rule.evaluate(hand, player_name, context)
+    started = perf_counter()
+    note = rule.evaluate(hand, player_name, context)
+    timings.add(rule_set_id, rule.rule_id, perf_counter() - started)
+    return note
+
+
 def generate_for_hand(
     hand,
     rules: tuple[AutoNoteRule, ...] | None = None,
@@ -87,17 +189,12 @@ def generate_for_hand(
     rule_set_ids: set[str] | None = None,
     rule_ids: set[str] | None = None,
 ) -> list[GeneratedAutoNote]:
-    if not autonotes_enabled(config):
+    plan = rule_plan(config, rules, rule_set_ids=rule_set_ids, rule_ids=rule_ids)
+    if not plan.enabled:
         return []
 
     context = PreflopContext.from_hand(hand)
-    selected_rule_sets = _rule_sets_for_hand(
-        hand,
-        rules,
-        config,
-        rule_set_ids=rule_set_ids,
-        rule_ids=rule_ids,
-    )
+    selected_rule_sets = plan.rule_sets_for_hand(hand)
     notes: dict[tuple[int, int, str, int], GeneratedAutoNote] = {}
     for player in getattr(hand, "players", []) or []:
         if len(player) < 2:
@@ -105,18 +202,18 @@ def generate_for_hand(
         player_name = player[1]
         for rule_set in selected_rule_sets:
             for rule in rule_set.rules:
-                note = rule.evaluate(hand, player_name, context)
+                note = _evaluate(rule_set.rule_set_id, rule, hand, player_name, context)
                 if note:
-                    note = _apply_note_template_override(note, rule, rule_set.rule_set_id, config, player_name)
+                    template = plan.templates.get((rule_set.rule_set_id, rule.rule_id))
+                    if template is not None:
+                        note = _apply_note_template_override(note, template, player_name)
                     notes[note.idempotency_key] = note
     generated = list(notes.values())
-    max_notes_per_player = max_auto_notes_per_player_per_hand(config)
-    if max_notes_per_player is not None:
-        generated = _limit_notes_per_player(generated, max_notes_per_player)
-    max_notes = max_auto_notes_per_hand(config)
-    if max_notes is None:
+    if plan.max_per_player is not None:
+        generated = _limit_notes_per_player(generated, plan.max_per_player)
+    if plan.max_per_hand is None:
         return generated
-    return generated[:max_notes]
+    return generated[: plan.max_per_hand]
 
 
 def available_rule_sets() -> tuple[AutoNoteRuleSet, ...]:
@@ -218,44 +315,219 @@ def rule_manifest() -> dict[str, Any]:
     }
 
 
-def _rule_sets_for_hand(
-    hand,
-    rules: tuple[AutoNoteRule, ...] | None,
-    config,
+@dataclass(frozen=True)
+class _AutoNoteSwitches:
+    """The ``<autonotes>`` section of a config, read in one walk of the document.
+
+    Answers exactly as autonotes_enabled, rule_set_enabled, rule_enabled and
+    rule_note_template do when they walk the document themselves.
+    """
+
+    present: bool = False
+    enabled: bool = True
+    max_per_hand: int | None = None
+    max_per_player: int | None = None
+    # The first <ruleset> of each name decides whether that set is on.
+    rule_sets: Mapping[str, bool] = field(default_factory=dict)
+    # (rule set name, rule id) -> (enabled, noteTemplate) of the first matching <rule>.
+    rules: Mapping[tuple[str, str], tuple[bool, str]] = field(default_factory=dict)
+    # <rule> elements directly under <autonotes>, consulted when no rule set names the rule.
+    loose_rules: Mapping[str, bool] = field(default_factory=dict)
+
+    def rule_set_enabled(self, rule_set_name: str, default: bool = True) -> bool:
+        if not self.present:
+            return default
+        return self.rule_sets.get(rule_set_name, default)
+
+    def rule_enabled(self, rule_id: str, rule_set_name: str = RULE_SET_HWANG_PLO_PREFLOP) -> bool:
+        rule = self.rules.get((rule_set_name, rule_id))
+        if rule is not None:
+            return rule[0]
+        return self.loose_rules.get(rule_id, True)
+
+    def note_template(self, rule_id: str, rule_set_name: str, default: str) -> str:
+        rule = self.rules.get((rule_set_name, rule_id))
+        return (rule[1] or default) if rule is not None else default
+
+
+def _read_switches(config) -> _AutoNoteSwitches:
+    node = _autonotes_node(config)
+    if node is None:
+        return _AutoNoteSwitches()
+    rule_sets: dict[str, bool] = {}
+    rules: dict[tuple[str, str], tuple[bool, str]] = {}
+    for rule_set_node in node.getElementsByTagName("ruleset"):
+        name = rule_set_node.getAttribute("name")
+        rule_sets.setdefault(name, _string_to_bool(rule_set_node.getAttribute("enabled"), default=True))
+        for rule_node in rule_set_node.getElementsByTagName("rule"):
+            rules.setdefault(
+                (name, rule_node.getAttribute("id")),
+                (
+                    _string_to_bool(rule_node.getAttribute("enabled"), default=True),
+                    rule_node.getAttribute("noteTemplate"),
+                ),
+            )
+    loose_rules: dict[str, bool] = {}
+    for child in node.childNodes:
+        if getattr(child, "tagName", None) == "rule":
+            loose_rules.setdefault(
+                child.getAttribute("id"), _string_to_bool(child.getAttribute("enabled"), default=True)
+            )
+    return _AutoNoteSwitches(
+        present=True,
+        enabled=_string_to_bool(node.getAttribute("enabled"), default=True),
+        max_per_hand=_autonote_int_attribute(config, "maxPerHand"),
+        max_per_player=_autonote_int_attribute(config, "maxPerPlayerPerHand"),
+        rule_sets=rule_sets,
+        rules=rules,
+        loose_rules=loose_rules,
+    )
+
+
+def compile_rule_plan(
+    config=None,
+    rules: tuple[AutoNoteRule, ...] | None = None,
     rule_set_ids: set[str] | None = None,
     rule_ids: set[str] | None = None,
-) -> tuple[AutoNoteRuleSet, ...]:
+    rule_sets: tuple[AutoNoteRuleSet, ...] | None = None,
+) -> AutoNoteRulePlan:
+    """Read the config's rule switches, templates and limits into a plan.
+
+    With ``rules``, those rules are checked against the Hwang PLO switches and
+    run as one "custom" set; otherwise every available rule set is considered
+    (``rule_sets`` stands in for available_rule_sets()).
+    """
+    switches = _read_switches(config)
+    selected: tuple[AutoNoteRuleSet, ...]
     if rules is not None:
-        enabled_rules = tuple(
-            rule
-            for rule in rules
-            if (rule_ids is None or rule.rule_id in rule_ids) and rule_enabled(config, rule.rule_id)
+        selected = (
+            AutoNoteRuleSet(
+                "custom",
+                tuple(
+                    rule
+                    for rule in rules
+                    if (rule_ids is None or rule.rule_id in rule_ids) and switches.rule_enabled(rule.rule_id)
+                ),
+                lambda _h: True,
+            ),
+        )
+    else:
+        selected = _enabled_rule_sets(
+            switches,
+            available_rule_sets() if rule_sets is None else rule_sets,
+            rule_set_ids,
+            rule_ids,
         )
-        return (AutoNoteRuleSet("custom", enabled_rules, lambda _h: True),)
+    templates = {}
+    for rule_set in selected:
+        for rule in rule_set.rules:
+            template = switches.note_template(rule.rule_id, rule_set.rule_set_id, rule.note_template)
+            if template != rule.note_template:
+                templates[(rule_set.rule_set_id, rule.rule_id)] = template
+    return AutoNoteRulePlan(
+        enabled=switches.enabled,
+        rule_sets=selected,
+        templates=templates,
+        max_per_hand=switches.max_per_hand,
+        max_per_player=switches.max_per_player,
+    )
 
+
+def _enabled_rule_sets(
+    switches: _AutoNoteSwitches,
+    rule_sets: tuple[AutoNoteRuleSet, ...],
+    rule_set_ids: set[str] | None,
+    rule_ids: set[str] | None,
+) -> tuple[AutoNoteRuleSet, ...]:
     selected = []
-    for rule_set in available_rule_sets():
+    for rule_set in rule_sets:
         if rule_set_ids is not None and rule_set.rule_set_id not in rule_set_ids:
             continue
-        if not rule_set.supports_hand(hand) or not rule_set_enabled(
-            config,
-            rule_set.rule_set_id,
-            default=rule_set.enabled_by_default,
-        ):
+        if not switches.rule_set_enabled(rule_set.rule_set_id, default=rule_set.enabled_by_default):
             continue
         enabled_rules = tuple(
             rule
             for rule in rule_set.rules
             if (rule_ids is None or rule.rule_id in rule_ids)
-            and rule_enabled(config, rule.rule_id, rule_set.rule_set_id)
+            and switches.rule_enabled(rule.rule_id, rule_set.rule_set_id)
         )
         if enabled_rules:
-            selected.append(
-                AutoNoteRuleSet(rule_set.rule_set_id, enabled_rules, rule_set.supports_hand),
-            )
+            selected.append(AutoNoteRuleSet(rule_set.rule_set_id, enabled_rules, rule_set.supports_hand))
     return tuple(selected)
 
 
+# Plans kept, for a handful of configs and rule filters in use at once.
+RULE_PLAN_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class _CachedPlan:
+    # Held so the key's ids cannot be reused by other objects while cached.
+    doc: Any
+    source: Any
+    plan: AutoNoteRulePlan
+
+
+_plan_lock = threading.Lock()
+_plan_revision = 0
+_plans: OrderedDict[tuple, _CachedPlan] = OrderedDict()
+
+
+def invalidate_rule_plans() -> None:
+    """Rebuild every rule plan on next use, after the autonotes config changed."""
+    global _plan_revision  # noqa: PLW0603 - shared by every config in the process.
+    with _plan_lock:
+        _plan_revision += 1
+        _plans.clear()
+
+
+def rule_plan(
+    config=None,
+    rules: tuple[AutoNoteRule, ...] | None = None,
+    rule_set_ids: set[str] | None = None,
+    rule_ids: set[str] | None = None,
+) -> AutoNoteRulePlan:
+    """The config's plan, compiled on first use and reused until the config changes.
+
+    Custom rule sets are still asked for on every call: load_custom_rule_sets
+    hands back the same tuple until their file changes, and a new tuple makes
+    a new plan.
+    """
+    doc = getattr(config, "doc", None)
+    if rules is None:
+        from fpdb_3_legacy.user_autonotes_parser import load_custom_rule_sets
+
+        source: Any = load_custom_rule_sets()
+    else:
+        source = rules
+    key = (
+        id(doc),
+        id(source),
+        None if rule_set_ids is None else frozenset(rule_set_ids),
+        None if rule_ids is None else frozenset(rule_ids),
+    )
+    with _plan_lock:
+        cached = _plans.get(key)
+        revision = _plan_revision
+        if cached is not None and cached.doc is doc and cached.source is source:
+            _plans.move_to_end(key)
+            return cached.plan
+    if rules is None:
+        plan = compile_rule_plan(
+            config, rule_set_ids=rule_set_ids, rule_ids=rule_ids, rule_sets=RULE_SET_REGISTRY + source
+        )
+    else:
+        plan = compile_rule_plan(config, rules, rule_set_ids=rule_set_ids, rule_ids=rule_ids)
+    with _plan_lock:
+        # A change made while compiling has already cleared the cache; keep
+        # this plan out of it rather than serve it after the change.
+        if revision == _plan_revision:
+            _plans[key] = _CachedPlan(doc, source, plan)
+            while len(_plans) > RULE_PLAN_CACHE_SIZE:
+                _plans.popitem(last=False)
+    return plan
+
+
 def autonotes_enabled(config=None) -> bool:
     node = _autonotes_node(config)
     if node is None:
@@ -275,12 +547,14 @@ def set_autonotes_enabled(config, enabled: bool) -> None:
     """Set the global automatic-note switch in the XML config."""
     node = ensure_autonotes_node(config)
     node.setAttribute("enabled", _bool_to_string(enabled))
+    invalidate_rule_plans()
 
 
 def set_rule_set_enabled(config, rule_set_name: str, enabled: bool) -> None:
     """Set one automatic-note rule-set switch in the XML config."""
     rule_set_node = ensure_rule_set_node(config, rule_set_name)
     rule_set_node.setAttribute("enabled", _bool_to_string(enabled))
+    invalidate_rule_plans()
 
 
 def set_rule_enabled(
@@ -292,6 +566,7 @@ def set_rule_enabled(
     """Set one automatic-note rule switch in the XML config."""
     rule_node = ensure_rule_node(config, rule_set_name, rule_id)
     rule_node.setAttribute("enabled", _bool_to_string(enabled))
+    invalidate_rule_plans()
 
 
 def set_rule_note_template(
@@ -303,6 +578,7 @@ def set_rule_note_template(
     """Set one automatic-note rule text template in the XML config."""
     rule_node = ensure_rule_node(config, rule_set_name, rule_id)
     rule_node.setAttribute("noteTemplate", note_template)
+    invalidate_rule_plans()
 
 
 def rule_note_template(
@@ -396,16 +672,7 @@ def _limit_notes_per_player(notes: list[GeneratedAutoNote], max_notes_per_player
     return selected
 
 
-def _apply_note_template_override(
-    note: GeneratedAutoNote,
-    rule: AutoNoteRule,
-    rule_set_id: str,
-    config,
-    player_name: str,
-) -> GeneratedAutoNote:
-    template = rule_note_template(config, rule.rule_id, rule_set_id, rule.note_template)
-    if template == rule.note_template:
-        return note
+def _apply_note_template_override(note: GeneratedAutoNote, template: str, player_name: str) -> GeneratedAutoNote:
     try:
         return replace(note, note_text=template.format(player=player_name))
     except (IndexError, KeyError, ValueError):
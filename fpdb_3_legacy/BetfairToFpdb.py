@@ -21,7 +21,7 @@ import datetime
 import re
 from typing import Any
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import FpdbParseError, HandHistoryConverter, cached_player_regexes
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 log = get_logger("parser")
@@ -61,6 +61,19 @@ class Betfair(HandHistoryConverter):
     )
     re_board = re.compile(r"\[ (?P<CARDS>.+) \]")
 
+    @cached_player_regexes(
+        "re_post_sb",
+        "re_post_bb",
+        "re_antes",
+        "re_bring_in",
+        "re_post_both",
+        "re_hero_cards",
+        "re_action",
+        "re_showdown_action",
+        "re_collect_pot",
+        "re_sits_out",
+        "re_shown_cards",
+    )
     def compilePlayerRegexs(self, hand: Any) -> None:
         """Compile player-specific regex patterns."""
         players = {player[1] for player in hand.players}
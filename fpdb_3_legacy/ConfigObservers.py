@@ -6,6 +6,7 @@ Configuration observer implementations for different fpdb components.
 import threading
 from typing import Any
 
+from fpdb_3_legacy.AutoNotes import invalidate_rule_plans
 from fpdb_3_legacy.ConfigurationManager import ChangeType, ConfigChange, ConfigObserver
 from fpdb_3_legacy.loggingFpdb import get_logger
 
@@ -370,3 +371,31 @@ class BulkImportConfigObserver(ConfigObserver):
             A list of configuration path strings.
         """
         return ["supported_sites", "import.hhBulkPath", "import.ResultsDirectory"]
+
+
+class AutoNotesConfigObserver(ConfigObserver):
+    """Observer for the automatic note rules - drops the compiled rule plans."""
+
+    def on_config_change(self, change: ConfigChange) -> bool:
+        """Rebuild the automatic note rule plans on next use.
+
+        The plans are keyed by config document, so a reloaded config gets its
+        own anyway; this also drops the plans made from the old document.
+
+        Args:
+            change: The configuration change event to process.
+
+        Returns:
+            True, as the plans are rebuilt lazily.
+        """
+        log.info("Autonote rules changed: %s", change.path)
+        invalidate_rule_plans()
+        return True
+
+    def get_observed_paths(self) -> list[str]:
+        """Return the list of configuration paths observed by this autonotes observer.
+
+        Returns:
+            A list of configuration path strings.
+        """
+        return ["autonotes"]
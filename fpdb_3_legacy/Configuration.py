@@ -1035,6 +1035,8 @@ class Import:
         self.publicDB = string_to_bool(node.getAttribute("publicDB"), default=False)
         self.callFpdbHud = string_to_bool(node.getAttribute("callFpdbHud"), default=False)
         self.fastStoreHudCache = string_to_bool(node.getAttribute("fastStoreHudCache"), default=False)
+        # PostgreSQL only: load the per-hand tables with COPY FROM STDIN.
+        self.copyStream = string_to_bool(node.getAttribute("copyStream"), default=True)
         self.saveStarsHH = string_to_bool(node.getAttribute("saveStarsHH"), default=False)
         if node.getAttribute("importFilters"):
             self.importFilters = node.getAttribute("importFilters").split(",")
@@ -3460,6 +3462,12 @@ class Config:
             log.exception(f"Error getting 'fastStoreHudCache': {e}")
             imp["fastStoreHudCache"] = False
 
+        try:
+            imp["copyStream"] = self.imp.copyStream
+        except AttributeError as e:
+            log.exception(f"Error getting 'copyStream': {e}")
+            imp["copyStream"] = True
+
         try:
             imp["importFilters"] = self.imp.importFilters
         except AttributeError as e:
@@ -32,6 +32,16 @@ class ChangeType(Enum):
     THEME_SETTINGS = "theme_settings"
     SEAT_PREFERENCES = "seat_preferences"
     STAT_SETTINGS = "stat_settings"
+    AUTONOTE_SETTINGS = "autonote_settings"
+
+
+def _autonotes_xml(config: Configuration.Config) -> str | None:
+    """Return the ``<autonotes>`` section of a config as XML, or None without one."""
+    doc = getattr(config, "doc", None)
+    if doc is None:
+        return None
+    nodes = doc.getElementsByTagName("autonotes")
+    return nodes[0].toxml() if nodes else None
 
 
 class ConfigChange:
@@ -100,6 +110,7 @@ class ConfigurationManager:
         "hud_ui.*",  # HUD UI settings
         "general.qt_material_theme",  # Qt material theme
         "general.popup_theme",  # Popup theme
+        "autonotes",  # Automatic note rules
     ]
 
     def __new__(cls):
@@ -488,6 +499,19 @@ class ConfigurationManager:
             except CONFIG_ACCESS_ERRORS as e:
                 log.debug(f"Error comparing HUD UI parameters: {e}")
 
+            # Compare the automatic note rules, switched as a whole section
+            old_autonotes = _autonotes_xml(old_config)
+            new_autonotes = _autonotes_xml(new_config)
+            if old_autonotes != new_autonotes:
+                changes.append(
+                    ConfigChange(
+                        ChangeType.AUTONOTE_SETTINGS,
+                        "autonotes",
+                        old_autonotes,
+                        new_autonotes,
+                    ),
+                )
+
         except CONFIG_ACCESS_ERRORS as e:
             log.exception(f"Error identifying changes: {e}")
             import traceback
@@ -29,6 +29,7 @@ import re
 import sys
 import threading
 import traceback
+from collections import Counter
 from datetime import datetime, timedelta
 from decimal import Decimal
 from importlib import import_module
@@ -52,7 +53,7 @@ from fpdb_3_legacy.database_caches import DatabaseCachesMixin
 from fpdb_3_legacy.database_hud_stats import DatabaseHudStatsMixin
 from fpdb_3_legacy.database_lambda_dict import LambdaDict
 from fpdb_3_legacy.database_players import DatabasePlayersMixin
-from fpdb_3_legacy.database_schema import DB_VERSION, DatabaseSchemaMixin
+from fpdb_3_legacy.database_schema import DB_VERSION, HAND_ID_BLOCK, DatabaseSchemaMixin
 
 # HANDS_PLAYERS_KEYS moved to database_schema with the DDL that checks those
 # columns; re-exported because four test modules import it from Database.
@@ -72,6 +73,7 @@ from fpdb_3_legacy.Exceptions import (
     FpdbPostgresqlAccessDenied,
     FpdbPostgresqlNoDatabase,
 )
+from fpdb_3_legacy.hud_session import SessionAccumulator
 from fpdb_3_legacy.loggingFpdb import get_logger
 from fpdb_3_legacy.table_info import TableInfo
 
@@ -93,6 +95,29 @@ re_char = re.compile("[^a-zA-Z]")
 # from a stale entry; the size bounds a long multi-tabling session.
 GAMEINFO_CACHE_SIZE = 2000
 GAMEINFO_CACHE_TTL = 3600
+# The gameinfo dictionary Hand.hand_factory wants, in get_gameinfo_from_hid's column order.
+GAMEINFO_KEYS = (
+    "sitename",
+    "category",
+    "base",
+    "type",
+    "limitType",
+    "hilo",
+    "sb",
+    "bb",
+    "sbet",
+    "bbet",
+    "currency",
+    "gametypeId",
+    "split",
+)
+
+# Duplicate detection looks a whole file's hands up at once (prefetchDuplicates).
+# The batch bounds the parameters bound per statement -- SQLite builds before
+# 3.32 accept 999 -- and the memo bounds what one file keeps in memory; hands
+# past it are checked one query each, as they always were.
+DUPLICATE_BATCH_SIZE = 500
+DUPLICATE_MEMO_SIZE = 200_000
 
 #    FreePokerTools modules
 
@@ -304,6 +329,10 @@ class Database(
         # Created before resetCache, which is what empties them.
         self._gameinfo_cache: TTLCache = TTLCache(maxsize=GAMEINFO_CACHE_SIZE, ttl=GAMEINFO_CACHE_TTL)
         self._hand_1day_ago_read_at = 0.0
+        # Running session ("S" range) sums per table; see hud_session.
+        self._session_stats = SessionAccumulator()
+        # Where isDuplicate found its answer, over this connection's lifetime.
+        self.duplicate_lookups: Counter[str] = Counter(memory=0, database=0)
         self.resetCache()
         self.resetBulkCache()
         self._in_transaction = 0
@@ -1146,6 +1175,18 @@ class Database(
         row = c.fetchone()
         return row[0]
 
+    def get_import_state(self) -> tuple[int | None, int | None]:
+        """The highest hand id and the hands the importer has logged to Files.
+
+        max(id) alone misses hands stored from a hand-id block below it, which
+        concurrent PostgreSQL importers do; the logged total moves with every
+        import. Both read an index or the small Files table, never all of Hands.
+        """
+        c = self.connection.cursor()
+        c.execute(self.sql.query["get_import_state"])
+        last_hand, logged = c.fetchone()
+        return last_hand, logged
+
     def get_xml(self, hand_id):
         c = self.connection.cursor()
         c.execute(self.sql.query["get_xml"], (hand_id))
@@ -1184,24 +1225,37 @@ class Database(
             log.warning(f"No game info found for hand ID {hand_id}")
             return None
 
-        gameinfo = {
-            "sitename": row[0],
-            "category": row[1],
-            "base": row[2],
-            "type": row[3],
-            "limitType": row[4],
-            "hilo": row[5],
-            "sb": row[6],
-            "bb": row[7],
-            "sbet": row[8],
-            "bbet": row[9],
-            "currency": row[10],
-            "gametypeId": row[11],
-            "split": row[12],
-        }
+        gameinfo = dict(zip(GAMEINFO_KEYS, row, strict=False))
         self._gameinfo_cache[hand_id] = gameinfo
         return gameinfo
 
+    def get_gameinfo_from_hids(self, hand_ids) -> dict:
+        """Return ``{hand_id: gameinfo}`` for several hands, as get_gameinfo_from_hid does one.
+
+        Shares its cache; the hands not in it are asked for in one round trip.
+        Hands with no game info are left out.
+        """
+        found = {}
+        missing = []
+        for hand_id in dict.fromkeys(int(hand_id) for hand_id in hand_ids):
+            cached = self._gameinfo_cache.get(hand_id)
+            if cached is not None:
+                found[hand_id] = cached
+            else:
+                missing.append(hand_id)
+        if not missing:
+            return found
+
+        placeholder = self.sql.query["placeholder"]
+        q = self.sql.query["get_gameinfo_from_hids"].replace("<hand_ids>", ", ".join([placeholder] * len(missing)))
+        c = self.connection.cursor()
+        c.execute(q, tuple(missing))
+        for hand_id, *row in c.fetchall():
+            gameinfo = dict(zip(GAMEINFO_KEYS, row, strict=False))
+            self._gameinfo_cache[hand_id] = gameinfo
+            found[hand_id] = gameinfo
+        return found
+
     def get_last_gametype_id_for_table(self, site_name, table_name):
         """Return the gametypeId this table last dealt, or None.
 
@@ -1416,6 +1470,18 @@ class Database(
         if gameinfo_cache is not None:
             gameinfo_cache.clear()
         self._hand_1day_ago_read_at = 0.0
+        session_stats = getattr(self, "_session_stats", None)
+        if session_stats is not None:
+            session_stats.clear()
+        # Which keyed caches have the unique index their upsert needs; a schema
+        # rebuilt by recreate_tables() is probed again.
+        self._unique_cache_indexes: dict[str, bool] = {}
+        # The integer columns of each COPY statement (see database_bulk_import).
+        self._copy_integer_columns: dict[str, tuple[int, ...]] = {}
+        # The PostgreSQL hand-id block in hand (see nextHandId): the lowest id
+        # not handed out yet, and the end of the block.
+        self._hand_id_next = 0
+        self._hand_id_end = 0
 
     def get_last_insert_id(self, cursor=None):
         ret = None
@@ -2018,41 +2084,130 @@ class Database(
                 results[i][desc[n]] = data[i][n]
         return results
 
-    def nextHandId(self):
+    def nextHandId(self, after=None):
+        """The id to give the next hand stored.
+
+        ``after`` is the id just given to a hand (Hand.getHandId passes it);
+        without it, the first id of a new run. Until a hand takes the id
+        returned, the next call returns it again.
+
+        PostgreSQL hands out ids from a block reserved with one nextval of
+        HandIdBlocks, so auto-import, live captures and a bulk import insert
+        side by side without waiting on each other. SQLite allows one writer
+        at a time and MySQL has no sequences; both continue from max(id).
+
+        On PostgreSQL ids are unique but not in storing order across
+        connections: each connection's ids rise, while one still filling an
+        older block stores hands below another's max(id). So max(id) does not
+        say whether anything new was stored, and id order is storing order
+        only among the hands of one connection -- one table's, as one
+        importer feeds a table.
+        """
+        if self.backend != self.PGSQL:
+            if after is not None:
+                return after + self.hand_inc
+            c = self.get_cursor(True)
+            c.execute("SELECT max(id) FROM Hands")
+            id = c.fetchone()[0]
+            if not id:
+                id = 0
+            return id + self.hand_inc
+
+        if after is not None:
+            self._hand_id_next = max(self._hand_id_next, after + 1)
+        if self._hand_id_next >= self._hand_id_end:
+            self._hand_id_next = self._reserve_hand_id_block()
+            self._hand_id_end = self._hand_id_next + HAND_ID_BLOCK
+        return self._hand_id_next
+
+    def _reserve_hand_id_block(self) -> int:
+        """Reserve HAND_ID_BLOCK ids for this connection; return the first."""
         c = self.get_cursor(True)
-        if self.backend == self.PGSQL:
-            # Hand ids are assigned before the root and child rows are built.
-            # Serialize max(id)+1 across importer processes until their current
-            # transaction commits, otherwise two live feeds can reserve the
-            # same explicit Hands.id.
-            c.execute("SELECT pg_advisory_xact_lock(hashtext('fpdb_hands_id_allocator'))")
+        c.execute(self.sql.query["nextHandIdBlock"])
+        start = c.fetchone()[0]
+        # Once per block, an index lookup: hands copied in by a migration or
+        # stored by older code can be ahead of the sequence.
         c.execute("SELECT max(id) FROM Hands")
-        id = c.fetchone()[0]
-        if not id:
-            id = 0
-        id += self.hand_inc
-        return id
+        top = c.fetchone()[0] or 0
+        if start <= top:
+            c.execute(self.sql.query["skipHandIdBlocks"], ((top - start) // HAND_ID_BLOCK + 1,))
+            start = c.fetchone()[0]
+        return start
+
+    @staticmethod
+    def _duplicate_key(siteId, siteHandNo, heroSeat, publicDB) -> tuple[Any, ...]:
+        # siteHandNo is compared as text: parsers hand it over as a string, the
+        # database gives it back as an integer.
+        if publicDB:
+            return (str(siteHandNo), siteId, heroSeat)
+        return (str(siteHandNo), siteId)
+
+    def prefetchDuplicates(self, hands) -> None:
+        """Look up which hands of a parsed file are already stored, in batches.
+
+        One query per site and ``DUPLICATE_BATCH_SIZE`` hands replaces the query
+        ``isDuplicate`` would otherwise run for every hand. The answers last
+        until the next ``resetBulkCache``, i.e. for the file being imported.
+        """
+        batches: dict[Any, list[tuple[tuple[Any, ...], Any]]] = {}
+        for hand in hands:
+            if len(self.checkedHandNos) >= DUPLICATE_MEMO_SIZE:
+                break
+            siteHandNo = hand.hands["siteHandNo"]
+            key = self._duplicate_key(hand.siteId, siteHandNo, hand.hands["heroSeat"], hand.publicDB)
+            if key in self.checkedHandNos:
+                continue
+            self.checkedHandNos.add(key)
+            batches.setdefault(hand.siteId, []).append((key, siteHandNo))
+        if not batches:
+            return
+
+        c = self.get_cursor()
+        for siteId, pending in batches.items():
+            for start in range(0, len(pending), DUPLICATE_BATCH_SIZE):
+                batch = pending[start : start + DUPLICATE_BATCH_SIZE]
+                q = (
+                    self.sql.query["handsAlreadyInDB"]
+                    .replace("<siteHandNos>", ", ".join(["%s"] * len(batch)))
+                    .replace("%s", self.sql.query["placeholder"])
+                )
+                c.execute(q, [siteId, *(siteHandNo for _key, siteHandNo in batch)])
+                self.duplicate_lookups["database"] += 1
+                for siteHandNo, heroSeat in c.fetchall():
+                    self.knownHandNos.add((str(siteHandNo), siteId))
+                    self.knownHandNos.add((str(siteHandNo), siteId, heroSeat))
 
     def isDuplicate(self, siteId, siteHandNo, heroSeat, publicDB) -> bool:
+        key = self._duplicate_key(siteId, siteHandNo, heroSeat, publicDB)
+        if key in self.siteHandNos:
+            # An earlier hand of this file, queued for insert.
+            self.duplicate_lookups["memory"] += 1
+            return True
+        if key in self.checkedHandNos:
+            self.duplicate_lookups["memory"] += 1
+            if key in self.knownHandNos:
+                return True
+            self.siteHandNos.add(key)
+            return False
+
         q = self.sql.query["isAlreadyInDB"].replace("%s", self.sql.query["placeholder"])
-        key: tuple[Any, ...]
+        params: tuple[Any, ...]
         if publicDB:
-            key = (siteHandNo, siteId, heroSeat)
+            params = (siteHandNo, siteId, heroSeat)
             q = q.replace("<heroSeat>", " AND heroSeat=%s").replace(
                 "%s",
                 self.sql.query["placeholder"],
             )
         else:
-            key = (siteHandNo, siteId)
+            params = (siteHandNo, siteId)
             q = q.replace("<heroSeat>", "")
-        if key in self.siteHandNos:
-            return True
         c = self.get_cursor()
-        c.execute(q, key)
+        c.execute(q, params)
+        self.duplicate_lookups["database"] += 1
         result = c.fetchall()
         if len(result) > 0:
             return True
-        self.siteHandNos.append(key)
+        self.siteHandNos.add(key)
         return False
 
 
@@ -27,7 +27,13 @@ import datetime
 import re
 from decimal import Decimal
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter, log
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+    log,
+)
 
 # import TourneySummary
 
@@ -251,6 +257,23 @@ class Fulltilt(HandHistoryConverter):
         re.MULTILINE,
     )
 
+    @cached_player_regexes(
+        "re_PostSB",
+        "re_PostDead",
+        "re_PostBB",
+        "re_Antes",
+        "re_ReturnsAnte",
+        "re_BringIn",
+        "re_PostBoth",
+        "re_HeroCards",
+        "re_Action",
+        "re_ShowdownAction",
+        "re_CollectPot",
+        "re_CollectPot2",
+        "re_CollectSidePot",
+        "re_SitsOut",
+        "re_ShownCards",
+    )
     def compilePlayerRegexs(self, hand):
         players = set([player[1] for player in hand.players])
         if not players <= self.compiledPlayers:  # x <= y means 'x is subset of y'
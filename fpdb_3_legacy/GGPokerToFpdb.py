@@ -29,7 +29,12 @@ from decimal import Decimal
 from typing import Any, ClassVar, TypeAlias
 
 from fpdb_3_legacy.autonotes_aof import is_aof_category
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 Hand: TypeAlias = Any
@@ -344,6 +349,11 @@ class GGPoker(HandHistoryConverter):
         re.MULTILINE | re.VERBOSE,
     )
 
+    @cached_player_regexes(
+        "re_HeroCards",
+        "re_dealt_cards",
+        "re_ShownCards",
+    )
     def compilePlayerRegexs(self, hand: Hand) -> None:
         """Compile player-specific regex patterns for the hand."""
         players = {player[1] for player in hand.players}
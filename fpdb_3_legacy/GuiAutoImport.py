@@ -110,6 +110,30 @@ class AutoImportThread(QThread):
             self.error.emit(str(e))
 
 
+class FileWatchThread(QThread):
+    """Wakes the auto-import as soon as the importer's file watcher sees a change.
+
+    The interval timer keeps running as a safety net; this thread only makes
+    a cycle start within milliseconds of the poker client writing a hand.
+    """
+
+    changed = Signal()
+
+    def __init__(self, importer, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.importer = importer
+        self._stop_requested = False
+
+    def stop(self) -> None:
+        self._stop_requested = True
+
+    def run(self) -> None:
+        while not self._stop_requested:
+            # Bounded so stop() is honoured promptly.
+            if self.importer.waitForChanges(0.5):
+                self.changed.emit()
+
+
 class SwCNativeTailingThread(QThread):
     """Background thread tailing raw SwC native capture and importing live hands."""
 
@@ -194,6 +218,9 @@ class GuiAutoImport(QWidget):
             self.log_message.connect(self._addText_slot)
         self.importtimer: QTimer | None = None
         self.import_thread: AutoImportThread | None = None
+        self.watch_thread: FileWatchThread | None = None
+        # A change reported while a cycle was running; it gets a cycle of its own.
+        self._changes_pending = False
         self.swc_tailing_thread: SwCNativeTailingThread | None = None
         # Outage bookkeeping, so the database going away is reported once rather
         # than once per interval, and its return is reported too.
@@ -471,9 +498,34 @@ class GuiAutoImport(QWidget):
             return True
         return False
 
+    def _on_files_changed(self) -> None:
+        """The file watcher saw a change: import it now rather than at the next tick."""
+        if self.import_thread is not None and self.import_thread.isRunning():
+            self._changes_pending = True
+            return
+        self.do_import()
+
+    def _start_watch_thread(self) -> None:
+        if getattr(self.importer, "watcher", None) is None:
+            return
+        self.watch_thread = FileWatchThread(self.importer, parent=self)
+        self.watch_thread.changed.connect(self._on_files_changed)
+        self.watch_thread.start()
+        self.addText("\n * Watching the import directories for changes.", "folder")
+
+    def _stop_watch_thread(self) -> None:
+        if self.watch_thread is not None:
+            self.watch_thread.stop()
+            self.watch_thread.wait(1000)
+            self.watch_thread = None
+        self._changes_pending = False
+
     def import_finished(self) -> None:
         """Called when auto import cycle finishes in the background."""
         self.progressBar.setVisible(False)
+        if self._changes_pending and self.doAutoImportBool:
+            self._changes_pending = False
+            QTimer.singleShot(0, self.do_import)
         if self._db_offline:
             self._db_offline = False
             self.addText(_("\nDatabase is back. Auto Import resumed."), "info")
@@ -593,8 +645,9 @@ class GuiAutoImport(QWidget):
         Watches the hand-history and tournament-summary directories configured for
         the enabled sites and imports new/updated files on a fixed interval — the
         same engine the GUI auto-import tab drives, but stepped by a plain
-        ``time.sleep`` loop instead of a Qt timer. Runs until interrupted
-        (Ctrl+C / SIGTERM).
+        ``time.sleep`` loop instead of a Qt timer. Where the importer has a file
+        watcher, the loop wakes as soon as a monitored file changes instead (and
+        at the interval at the latest). Runs until interrupted (Ctrl+C / SIGTERM).
 
         Like the GUI "Start Auto Import" button, this launches the HUD subprocess
         (``launch_hud=True``) and feeds it the imported hands over ZMQ. Note the
@@ -647,7 +700,11 @@ class GuiAutoImport(QWidget):
                 except Exception:
                     # One bad cycle must not kill the daemon; log and keep watching.
                     log.exception("Auto-import cycle failed; continuing.")
-                time.sleep(interval)
+                if self.importer.watcher is None:
+                    time.sleep(interval)
+                else:
+                    # Wakes as soon as a monitored file changes.
+                    self.importer.waitForChanges(interval)
         except KeyboardInterrupt:
             log.info("Stopping headless auto-import (interrupt received).")
         finally:
@@ -887,6 +944,7 @@ class GuiAutoImport(QWidget):
                         self.updatePaths()
 
                         self.do_import()
+                        self._start_watch_thread()
                         self.start_swc_native_capture()
                         interval = self.intervalEntry.value()
                         self.importtimer = QTimer()
@@ -901,6 +959,7 @@ class GuiAutoImport(QWidget):
             if self.importtimer:
                 self.importtimer.stop()
                 self.importtimer = None
+            self._stop_watch_thread()
             if self._stop_cleanup_pending:
                 return
             if not self._stop_import_worker():
@@ -436,6 +436,13 @@ def main(argv=None) -> int:
         help="drop and recreate all DB tables before importing (THP clean slate)",
     )
     parser.add_argument("-q", "--quiet", action="store_true", help="only print the final summary line")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="processes parsing files in parallel; 0 = one per spare core (default: 1, no pool)",
+    )
     parser.add_argument(
         "--compare-regression",
         action="store_true",
@@ -473,6 +480,7 @@ def main(argv=None) -> int:
 
     importer = Importer.Importer(caller=None, settings=settings, config=config)
     importer.setThreads(-1)
+    importer.setParseWorkers(args.workers)
     importer.setCallHud(False)
     if args.compare_regression:
         # The comparison reads the parsed hands back off the converter, which the
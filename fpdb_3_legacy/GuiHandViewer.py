@@ -180,6 +180,8 @@ class GuiHandViewer(QSplitter):
         self.all_handids: list[Any] = []
         self.page = 0
         self.page_size = 100
+        # Hands rebuilt per database batch, one batch per progress update.
+        self.load_batch = 25
 
         self.pagerBox = QHBoxLayout()
         self.prevPageButton = QPushButton(_("◀ Prev"))
@@ -380,6 +382,8 @@ class GuiHandViewer(QSplitter):
             for idx, handid in enumerate(page_ids):
                 if progress.wasCanceled():
                     break
+                if idx % self.load_batch == 0:
+                    self._preload(page_ids[idx : idx + self.load_batch])
                 try:
                     if handid not in self.hands:
                         self.hands[handid] = self.importhand(handid)
@@ -752,14 +756,35 @@ class GuiHandViewer(QSplitter):
             log.exception("Unable to open hand replayer")
             QMessageBox.critical(self, "FPDB Replayer", f"Unable to open hand replayer:\n{exc}")
 
+    def _preload(self, handids) -> None:
+        """Rebuild the hands not loaded yet in one batch; any it cannot are left to importhand."""
+        missing = [handid for handid in handids if handid not in self.hands]
+        if not missing:
+            return
+        try:
+            loaded = self.importhands(missing)
+        except Exception:  # noqa: BLE001 - fall back to loading the hands one by one.
+            log.exception("Could not load hands %s in one batch", missing)
+            return
+        self.hands.update((handid, hand) for handid, hand in loaded.items() if hand is not None)
+
+    def importhands(self, handids) -> dict[Any, Any]:
+        hands = Hand.hands_factory(handids, self.config, self.db)
+        for h in hands.values():
+            if h is not None:
+                self._set_hero(h)
+        return hands
+
     def importhand(self, handid=1):
         h = Hand.hand_factory(handid, self.config, self.db)
+        self._set_hero(h)
+        return h
 
+    def _set_hero(self, h) -> None:
         # Safely get the hero for this hand's sitename
         h.hero = self.filters.get_hero_for_site(h.sitename, h)
         if h.hero is None:
             log.warning(f"No hero found for site {h.sitename}")
-        return h
 
     def render_cards(self, cardstring):
         card_width = 30
@@ -19,7 +19,6 @@ import copy
 import itertools
 import os
 import time
-from collections import Counter
 from dataclasses import dataclass, field
 from decimal import Decimal
 from math import cos, hypot, pi, sin
@@ -40,9 +39,11 @@ from PySide6.QtWidgets import (
 )
 
 from fpdb_3_legacy import SQL, Card, Configuration, Database, Deck, Hand
-from fpdb_3_legacy.equity import EquityUnavailableError, calculate_equity
+from fpdb_3_legacy.equity import EquityUnavailableError, calculate_equity, load_equity_backend
+from fpdb_3_legacy.hand_evaluator import default_tables_path, evaluate_cards, hand_category, set_tables_path
 from fpdb_3_legacy.http_capture_ofc import OFCHand, build_ofc_hand, load_ofc_hand
 from fpdb_3_legacy.i18n import gettext as _
+from fpdb_3_legacy.icm import icm_equities
 from fpdb_3_legacy.localized_formats import format_currency, format_number
 from fpdb_3_legacy.loggingFpdb import get_logger
 
@@ -104,51 +105,16 @@ def replay_hero_equity(frame, hero_name: str, game: str, *, backend=None, iterat
         if street in visible_streets:
             board.extend(card for card in (frame.board.get(street) or []) if _is_real_card(card))
     try:
-        result = calculate_equity(game, pockets, board, iterations=iterations, backend=backend)
+        result = calculate_equity(game, pockets, board, iterations=iterations, backend=backend or load_equity_backend())
     except (EquityUnavailableError, RuntimeError, ValueError):
         return None
     return result.players[hero_index].equity
 
 
-def _rank_five(cards: list[str]) -> tuple:
-    """Return a comparable strength tuple for exactly five cards (high hand)."""
-    values = sorted((_RANK_VALUE[c[0]] for c in cards), reverse=True)
-    suits = [c[1] for c in cards]
-    counts = Counter(values)
-    # (count, value) sorted so pairs/trips lead, then kickers by value.
-    by_count = sorted(values, key=lambda v: (counts[v], v), reverse=True)
-    is_flush = len(set(suits)) == 1
-    distinct = sorted(set(values), reverse=True)
-    straight_high = 0
-    if {14, 5, 4, 3, 2}.issubset(set(values)):
-        straight_high = 5  # wheel
-    for i in range(len(distinct) - 4 + 1):
-        window = distinct[i : i + 5]
-        if len(window) == 5 and window[0] - window[4] == 4:
-            straight_high = max(straight_high, window[0])
-            break
-    count_sig = sorted(counts.values(), reverse=True)
-    if is_flush and straight_high:
-        category = 8
-    elif count_sig == [4, 1]:
-        category = 7
-    elif count_sig == [3, 2]:
-        category = 6
-    elif is_flush:
-        category = 5
-    elif straight_high:
-        category = 4
-    elif count_sig == [3, 1, 1]:
-        category = 3
-    elif count_sig == [2, 2, 1]:
-        category = 2
-    elif count_sig == [2, 1, 1, 1]:
-        category = 1
-    else:
-        category = 0
-    if category in (4, 8):
-        return (category, [straight_high])
-    return (category, by_count)
+def _rank_five(cards: list[str]) -> tuple[int, int]:
+    """Return a comparable strength for exactly five cards (high hand): its category, then its value."""
+    value = evaluate_cards(cards)
+    return (hand_category(value), value)
 
 
 def best_hand(holecards: list[str], board: list[str], base: str, category: str):
@@ -652,9 +618,14 @@ class GuiReplayer(QWidget):
         self.sql = querylist
         self.newpot = Decimal()
         self.db = resolve_replayer_db(self.conf, self.sql, mainwin, db)
+        set_tables_path(default_tables_path(self.conf))
         self.states: list[Any] = []  # List with all table states.
         self.handlist = handlist
         self.handidx = 0
+        # Hands read ahead of the one shown, so stepping through the list is
+        # not one database read per hand. Each is handed out once.
+        self.prefetch_size = 25
+        self._prefetched: dict[Any, Any] = {}
         self.Heroes = ""
         self.setWindowTitle(_("FPDB Hand Replayer"))
 
@@ -2388,6 +2359,24 @@ class GuiReplayer(QWidget):
                 self._draw_player(painter, player, seat, layout, frame.street, is_final_frame)
         self._draw_timeline(painter, layout)
 
+    def _load_hand(self, handidx, entry):
+        """The hand at ``handidx``, read along with the next few on the list if it was not already."""
+        hand = self._prefetched.pop(entry, None)
+        if hand is None:
+            ahead = [
+                item
+                for item in self.handlist[handidx : handidx + self.prefetch_size]
+                if not self._is_ofc_replay_entry(item)
+            ]
+            try:
+                self._prefetched = Hand.hands_factory(ahead, self.conf, self.db)
+            except Exception:  # noqa: BLE001 - fall back to reading the hand alone.
+                log.exception("Could not read ahead from hand ID %s", entry)
+                self._prefetched = {}
+            hand = self._prefetched.pop(entry, None)
+        # A hand the batch could not rebuild is read alone, which raises its own error.
+        return hand if hand is not None else Hand.hand_factory(entry, self.conf, self.db)
+
     def play_hand(self, handidx) -> None:  # noqa: F811
         if handidx < 0 or handidx >= len(self.handlist):
             return
@@ -2403,7 +2392,7 @@ class GuiReplayer(QWidget):
             self.Heroes = ""
             self.replay_model = self._build_ofc_replay_model(ofc_hand)
         else:
-            hand = Hand.hand_factory(entry, self.conf, self.db)
+            hand = self._load_hand(handidx, entry)
             if hand is None:
                 log.error("Could not load hand ID %s for replayer", entry)
                 return
@@ -2569,11 +2558,9 @@ class GuiReplayer(QWidget):
                 break
 
 
-# ICM code originally grabbed from http://svn.gna.org/svn/pokersource/trunk/icm-calculator/icm-webservice.py
-# Copyright (c) 2008 Thomas Johnson <tomfmason@gmail.com>
-
-
 class ICM:
+    """ICM equities of ``stacks`` for ``payouts``, rounded for display."""
+
     def __init__(self, stacks, payouts) -> None:
         self.stacks = stacks
         self.payouts = payouts
@@ -2581,22 +2568,7 @@ class ICM:
         self.prepare()
 
     def prepare(self) -> None:
-        total = sum(self.stacks)
-        for k in self.stacks:
-            self.equities.append(round(Decimal(str(self.getEquities(total, k, 0))), 4))
-
-    def getEquities(self, total, player, depth):
-        D = Decimal
-        eq = D(self.stacks[player]) / total * D(str(self.payouts[depth]))
-        if depth + 1 < len(self.payouts):
-            i = 0
-            for stack in self.stacks:
-                if i != player and stack > 0.0:
-                    self.stacks[i] = 0.0
-                    eq += self.getEquities((total - stack), player, (depth + 1)) * ((stack) // (D(total)))
-                    self.stacks[i] = stack
-                i += 1
-        return eq
+        self.equities = [round(Decimal(str(equity)), 4) for equity in icm_equities(self.stacks, self.payouts)]
 
 
 class TableState:
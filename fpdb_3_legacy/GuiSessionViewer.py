@@ -16,7 +16,6 @@ from __future__ import annotations
 # In the "official" distribution you can find the license in agpl-3.0.txt.
 import contextlib
 import sys
-from datetime import datetime
 from time import gmtime, strftime, time
 from typing import Any
 
@@ -35,9 +34,11 @@ from PySide6.QtWidgets import (
 
 from fpdb_3_legacy import Database, Filters, GuiHandViewer, gui_empty_state
 from fpdb_3_legacy.i18n import gettext as _
-from fpdb_3_legacy.localized_formats import currency_symbol, format_currency, format_datetime, format_number
+from fpdb_3_legacy.localized_formats import currency_symbol, format_currency
 from fpdb_3_legacy.loggingFpdb import get_logger
 from fpdb_3_legacy.ring_stats.base import DbWorker
+from fpdb_3_legacy.ring_stats.report_engine import cached_report, report_cache_key, store_report
+from fpdb_3_legacy.sessionizer import Sessions, session_rows, sessionize
 
 log = get_logger("gui_session_viewer")
 DEBUG = False
@@ -221,29 +222,18 @@ class GuiSessionViewer(QSplitter):
     ) -> None:
         starttime = time()
         q = self.build_session_query(playerids, sitenos, games, currencies, limits, seats)
+        # The query carries every filter; report_cache_key tells an import.
+        cache_key = report_cache_key(self.db, "sessionStats", q)
 
         # Disconnect any previously running worker for this tab
         if self._db_worker is not None:
             with contextlib.suppress(Exception):
                 self._db_worker.finished.disconnect()
 
-        self._db_worker = DbWorker(self.db, "sessionStats", q)
-
-        def _on_query_finished(name, results_rows, colnames):
-            hands = list(results_rows) if results_rows else []
-            log.warning(f"GuiSessionViewer DbWorker finished: returned {len(hands)} hands.")
-            if not hands:
-                self.clearGraphData()
-                if self.canvas:
-                    self.canvas.setParent(None)
-                    self.canvas = None
-                gui_empty_state.show_no_data(self, context="Session viewer", db=self.db)
-                with contextlib.suppress(Exception):
-                    self.db.rollback()
-                return
-
-            (results, quotes) = self.process_session_hands(hands)
-            if not results or not quotes:
+        def _on_query_finished(name, result, colnames):
+            sessions: Sessions = result[0]
+            log.warning(f"GuiSessionViewer DbWorker finished: returned {int(sessions.hands.sum())} hands.")
+            if not len(sessions):
                 self.clearGraphData()
                 if self.canvas:
                     self.canvas.setParent(None)
@@ -253,6 +243,7 @@ class GuiSessionViewer(QSplitter):
                     self.db.rollback()
                 return
 
+            (results, quotes, self.times) = session_rows(sessions)
             if DEBUG:
                 for x in quotes:
                     log.debug(f"start {x[1]}\tend {x[2]}\thigh {x[3]}\tlow {x[4]}")
@@ -267,6 +258,19 @@ class GuiSessionViewer(QSplitter):
             log.error(f"GuiSessionViewer DbWorker error: {err_msg}")
             gui_empty_state.show_no_data(self, context="Session viewer", db=self.db)
 
+        cached = cached_report(cache_key)
+        if cached is not None:
+            _on_query_finished("sessionStats", cached, [])
+            return
+
+        def _sessionize(rows, colnames) -> list:
+            result = [sessionize(rows)]
+            store_report(cache_key, result)
+            return result
+
+        self._db_worker = DbWorker(self.db, "sessionStats", q)
+        # Cut the sessions in the worker thread too; only the rows are formatted here.
+        self._db_worker.transform = _sessionize
         self._db_worker.finished.connect(_on_query_finished)
         self._db_worker.error.connect(_on_query_error)
         self._db_worker.start()
@@ -325,107 +329,7 @@ class GuiSessionViewer(QSplitter):
         return self.process_session_hands(hands)
 
     def process_session_hands(self, hands: list):
-        THRESHOLD = 1800  # Min # of secs between consecutive hands before being considered a new session
-        PADDING = 5  # Additional time in minutes to add to a session, session startup, shutdown etc
-
-        hands = list(hands)
-        if not hands:
-            return ([], [])
-
-        hands.insert(0, (hands[0][0], 0))
-
-        times = np.array([int(x[0]) for x in hands])
-        profits = np.array([float(x[1]) for x in hands])
-        # NumPy 2.x: use array methods instead of numpy functions
-        diffs = np.diff(times)
-        diffs2: np.ndarray = np.append(diffs, THRESHOLD + 1)
-        nonzero_tuple = np.nonzero(diffs2 > THRESHOLD)
-        index_arr: np.ndarray = nonzero_tuple[0] if len(nonzero_tuple[0]) > 0 else np.array([0])
-
-        first_idx = 1
-        quotes = []
-        results = []
-        # NumPy 2.x: use array method instead of numpy.cumsum()
-        cum_sum = (profits.cumsum()) // (100)
-        sid = 1
-
-        total_hands = 0
-        total_time = 0
-        global_open: Any = None
-        global_lwm: Any = None
-        global_hwm: Any = None
-
-        self.times = []
-        for i in range(len(index_arr)):
-            last_idx = int(index_arr[i])
-            hds: int = last_idx - first_idx + 1
-            if hds > 0:
-                stime = format_datetime(datetime.fromtimestamp(times[first_idx]))
-                etime = format_datetime(datetime.fromtimestamp(times[last_idx]))
-                self.times.append(
-                    (times[first_idx] - PADDING * 60, times[last_idx] + PADDING * 60),
-                )
-                minutesplayed = (times[last_idx] - times[first_idx]) // (60)
-                minutesplayed = minutesplayed + PADDING
-                if minutesplayed == 0:
-                    minutesplayed = 1
-                hph = hds * 60 / minutesplayed
-                end_idx: int = last_idx + 1
-                won = (sum(profits[first_idx:end_idx])) // (100.0)
-                hwm = cum_sum[first_idx - 1 : end_idx].max()  # NumPy 2.x: use array method
-                lwm = cum_sum[first_idx - 1 : end_idx].min()  # NumPy 2.x: use array method
-                open_val = int((sum(profits[:first_idx])) // (100))
-                close_val = int((sum(profits[:end_idx])) // (100))
-
-                total_hands = total_hands + hds
-                total_time = total_time + minutesplayed
-                if global_lwm is None or global_lwm > lwm:
-                    global_lwm = lwm
-                if global_hwm is None or global_hwm < hwm:
-                    global_hwm = hwm
-                if global_open is None:
-                    global_open = open_val
-                    global_stime = stime
-
-                results.append(
-                    [
-                        format_number(sid, 0),
-                        format_number(hds, 0),
-                        stime,
-                        etime,
-                        format_number(hph, 0),
-                        format_number(open_val),
-                        format_number(close_val),
-                        format_number(lwm),
-                        format_number(hwm),
-                        format_number(hwm - lwm),
-                        format_number(won),
-                    ],
-                )
-                quotes.append((sid, open_val, close_val, hwm, lwm))
-                first_idx = end_idx
-                sid = sid + 1
-            else:
-                log.debug("hds <= 0")
-        global_close = close_val
-        global_etime = etime
-        results.append([""] * 11)
-        results.append(
-            [
-                ("all"),
-                format_number(total_hands, 0),
-                global_stime,
-                global_etime,
-                format_number(total_hands * 60 // total_time, 0),
-                format_number(global_open),
-                format_number(global_close),
-                format_number(global_lwm),
-                format_number(global_hwm),
-                format_number(global_hwm - global_lwm),
-                format_number(global_close - global_open),
-            ],
-        )
-
+        (results, quotes, self.times) = session_rows(sessionize(list(hands)))
         return (results, quotes)
 
     def clearGraphData(self) -> None:
@@ -52,6 +52,8 @@ class TourHandViewer(QSplitter):
         self.main_window = mainwin
         self.sql = querylist
         self.replayer: Any = None
+        # Hands rebuilt per database batch while a tournament's hands load.
+        self.load_batch = 25
 
         self.db = Database.Database(self.config, sql=self.sql)
 
@@ -256,10 +258,14 @@ class TourHandViewer(QSplitter):
         progress.setValue(0)
         progress.show()
         try:
+            loaded: dict[Any, Any] = {}
             for idx, handid in enumerate(handids):
                 if progress.wasCanceled():
                     break
-                self.hands[handid] = self.importhand(handid)
+                if idx % self.load_batch == 0:
+                    loaded = self._import_batch(handids[idx : idx + self.load_batch])
+                # A hand the batch could not rebuild is loaded alone, which raises its own error.
+                self.hands[handid] = loaded.get(handid) or self.importhand(handid)
                 self.addHandRow(handid, self.hands[handid])
 
                 progress.setValue(idx + 1)
@@ -503,14 +509,30 @@ class TourHandViewer(QSplitter):
             log.exception("Unable to open hand replayer")
             QMessageBox.critical(self, "FPDB Replayer", f"Unable to open hand replayer:\n{exc}")
 
+    def _import_batch(self, handids) -> dict[Any, Any]:
+        try:
+            return self.importhands(handids)
+        except Exception:  # noqa: BLE001 - fall back to loading the hands one by one.
+            log.exception("Could not load hands %s in one batch", list(handids))
+            return {}
+
+    def importhands(self, handids) -> dict[Any, Any]:
+        hands = Hand.hands_factory(handids, self.config, self.db)
+        for h in hands.values():
+            if h is not None:
+                self._set_hero(h)
+        return hands
+
     def importhand(self, handid=1):
         h = Hand.hand_factory(handid, self.config, self.db)
+        self._set_hero(h)
+        return h
 
+    def _set_hero(self, h) -> None:
         # Safely get the hero for this hand's sitename
         h.hero = self.filters.get_hero_for_site(h.sitename, h)
         if h.hero is None:
             log.warning(f"No hero found for site {h.sitename}")
-        return h
 
     def render_cards(self, cardstring):
         card_width = 30
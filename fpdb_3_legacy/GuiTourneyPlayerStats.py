@@ -507,12 +507,12 @@ class GuiTourneyPlayerStats(QSplitter):
 
             tt_idx = column_indices["tourneytypeid"]
             pid_idx = column_indices["playerid"]
-            augmented = []
-            for row_data in result:
-                key = (row_data[tt_idx], row_data[pid_idx])
-                ev_row = lookup.get(key, {})
-                extra = [descriptor.format(adapter.compute(descriptor, ev_row)) for descriptor in descriptors]
-                augmented.append(list(row_data) + extra)
+            ev_rows = [lookup.get((row_data[tt_idx], row_data[pid_idx]), {}) for row_data in result]
+            extra = [
+                [descriptor.format(value) for value in adapter.compute_rows(descriptor, ev_rows)]
+                for descriptor in descriptors
+            ]
+            augmented = [list(row_data) + list(values) for row_data, *values in zip(result, *extra, strict=True)]
             new_colnames = colnames + [descriptor.name for descriptor in descriptors]
             log.info(f"GuiTourneyPlayerStats: merged {len(descriptors)} ChipEV column(s) for {len(lookup)} group(s)")
             return augmented, new_colnames
@@ -52,6 +52,7 @@ from fpdb_3_legacy.fast_fold_engine import (
     build_seat_map,
     is_fast_fold_table,
 )
+from fpdb_3_legacy.hud_aggregates import HudAggregateStore, decode_hud_message
 from fpdb_3_legacy.hud_diagnostics import ROLE_HUD, format_identity, log_process_identity, session_id
 from fpdb_3_legacy.hud_profiles import HudContext, HudPositionScope
 from fpdb_3_legacy.hud_read_service import (
@@ -222,10 +223,12 @@ class HudReadWorker(QThread):
         config: Configuration.Config,
         parent: QObject | None = None,
         db_factory: Callable[..., Any] = Database.Database,
+        aggregates: HudAggregateStore | None = None,
     ) -> None:
         super().__init__(parent)
         self.config = config
         self.db_factory = db_factory
+        self.aggregates = aggregates
         self._requests: Queue[HudBatchReadRequest | None] = Queue()
         self._stopping = threading.Event()
 
@@ -314,6 +317,7 @@ class HudReadWorker(QThread):
             if database is None:
                 try:
                     database = self.db_factory(self.config)
+                    database.hud_aggregates = self.aggregates
                     self._configure_session(database)
                     service = HudReadService(self.config, database)
                 except Exception as exc:
@@ -380,9 +384,19 @@ class ZMQReceiver(QObject):
 
     message_received = Signal(str)
 
-    def __init__(self, port: str = "5555", parent: QObject | None = None) -> None:
-        """Initialize the ZMQ receiver."""
+    def __init__(
+        self,
+        port: str = "5555",
+        parent: QObject | None = None,
+        aggregates: HudAggregateStore | None = None,
+    ) -> None:
+        """Initialize the ZMQ receiver.
+
+        ``aggregates`` is given every message's HudCache rows before the hand
+        id is emitted, so the read that follows already sees them.
+        """
         super().__init__(parent)
+        self.aggregates = aggregates
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.PULL)
         self.socket.bind(f"tcp://127.0.0.1:{port}")
@@ -403,9 +417,13 @@ class ZMQReceiver(QObject):
             if self.socket.closed:
                 return
             if self.socket in socks and socks[self.socket] == zmq.POLLIN:
-                hand_id = self.socket.recv_string(zmq.NOBLOCK)
-                log.info("ZMQ received hand ID: %s", hand_id)
-                self.message_received.emit(hand_id)
+                message = decode_hud_message(self.socket.recv_string(zmq.NOBLOCK))
+                if self.aggregates is not None:
+                    self.aggregates.record(message)
+                if message is None:
+                    return
+                log.info("ZMQ received hand ID: %s", message.hand_id)
+                self.message_received.emit(message.hand_id)
             else:
                 # Heartbeat
                 log.debug("Heartbeat: No message received")
@@ -942,7 +960,13 @@ class HudMain(QObject):
             self._cleanup_timer.timeout.connect(self._sweep_stale_fast_fold_tables)
             self._cleanup_timer.start()
 
-            self._db_worker: HudReadWorker | None = HudReadWorker(self.config, parent=self)
+            # Player aggregates kept in memory between hands, fed by the ZMQ receiver.
+            self.hud_aggregates = HudAggregateStore()
+            self._db_worker: HudReadWorker | None = HudReadWorker(
+                self.config,
+                parent=self,
+                aggregates=self.hud_aggregates,
+            )
             self._db_worker.ready.connect(self._on_db_worker_ready)
             self._db_worker.snapshot_ready.connect(self._on_db_snapshot)
             self._db_worker.unavailable.connect(self._on_db_worker_unavailable)
@@ -958,7 +982,7 @@ class HudMain(QObject):
 
             # Initialization ZMQ avec QThread
             log.info("Initializing ZMQ communication...")
-            self.zmq_receiver: ZMQReceiver | None = ZMQReceiver(parent=self)
+            self.zmq_receiver: ZMQReceiver | None = ZMQReceiver(parent=self, aggregates=self.hud_aggregates)
             log.info("ZMQ receiver created successfully")
             self.zmq_receiver.message_received.connect(self.handle_message)
             self.zmq_worker: ZMQWorker | None = ZMQWorker(self.zmq_receiver)
@@ -966,6 +990,12 @@ class HudMain(QObject):
             log.info("Starting ZMQ worker...")
             self.zmq_worker.start()
 
+            # Where the platform reports window changes as they happen (X11), the
+            # tables concerned are re-checked at once; the check_tables timer
+            # remains for everything else.
+            watch = getattr(self.Tables, "watch_table_windows", None)
+            self._table_window_watch = watch(self, self._on_table_windows_changed) if watch else None
+
             # Main window
             self.init_main_window()
 
@@ -2340,6 +2370,14 @@ class HudMain(QObject):
                         if w.isVisible():
                             hud.table.topify(w)
 
+    def _on_table_windows_changed(self, window_ids: set[int]) -> None:
+        """Re-check the tables whose windows the platform reported changed."""
+        if Aux_Base.is_drag_active():
+            return
+        for hud in list(self.hud_dict.values()):
+            if getattr(getattr(hud, "table", None), "number", None) in window_ids:
+                self._handle_table_status(hud)
+
     def check_tables(self) -> None:
         """Periodically check the status of poker tables."""
         # Skip while a HUD window is being dragged: the geometry poll (an
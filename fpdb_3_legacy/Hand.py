@@ -23,6 +23,7 @@ from typing import Any, TextIO
 from fpdb_3_legacy import Card, Configuration, DerivedStats
 from fpdb_3_legacy.autonotes_aof import is_aof_category
 from fpdb_3_legacy.Exceptions import FpdbHandDuplicate, FpdbHandPartial, FpdbParseError
+from fpdb_3_legacy.hand_rows import HAND_ROWS_BATCH, HandRows, read_hand_rows
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 # import L10n
@@ -465,7 +466,7 @@ class Hand:
             )
         self.dbid_hands = id
         self.hands["id"] = self.dbid_hands
-        return id + db.hand_inc
+        return db.nextHandId(id)
 
     def insertHands(self, db, fileId, doinsert=False, printtest=False) -> None:
         """Function to insert Hand into database
@@ -595,10 +596,10 @@ class Hand:
         """Function to update Tourney Bounties if any."""
         db.updateTourneyPlayerBounties(self)
 
-    def updateHudCache(self, db, doinsert=False) -> None:
-        """Function to update the HudCache."""
+    def updateHudCache(self, db, doinsert=False) -> list:
+        """Function to update the HudCache. Returns the rows the hand added to it."""
         if self.callHud:
-            db.storeHudCache(
+            return db.storeHudCache(
                 self.dbid_gt,
                 self.gametype,
                 self.playerIds,
@@ -606,6 +607,7 @@ class Hand:
                 self.handsplayers,
                 doinsert,
             )
+        return []
 
     def updateSessionsCache(self, db, tz, doinsert=False) -> None:
         """Function to update the Sessions."""
@@ -676,21 +678,16 @@ class Hand:
 
     def select(self, db, handId) -> None:
         """Function to create Hand object from database."""
-        c = db.get_cursor()
-        q = db.sql.query["playerHand"]
-        q = q.replace("%s", db.sql.query["placeholder"])
+        rows = read_hand_rows(db, [handId]).get(int(handId))
+        if rows is None:
+            raise FpdbParseError(f"Hand {handId} is not in the database", hid=str(handId))
+        self.select_rows(rows)
 
-        c.execute(f"select heroseat from Hands where id = {handId}")
-        heroSeat = c.fetchone()[0]
-
-        # PlayerStacks
-        c.execute(q, (handId,))
-        # See NOTE: below on what this does.
-
-        # Descriptor must be lowercase: postgres returns lowercase, SQLite preserves case
-        rows = c.fetchall()
-        col_names = [col[0].lower() for col in c.description]
-        player_rows = [dict(zip(col_names, row, strict=False)) for row in rows]
+    def select_rows(self, rows: HandRows) -> None:
+        """Fill the hand from its stored rows, read alone by select or with others by hands_factory."""
+        hand_info = rows.info
+        heroSeat = hand_info["heroseat"]
+        player_rows = rows.players
 
         # Resolve hero name first
         hero_name = None
@@ -781,23 +778,6 @@ class Hand:
                     self.buttonpos = row["seatno"]
 
         # HandInfo
-        q = db.sql.query["singleHand"]
-        q = q.replace("%s", db.sql.query["placeholder"])
-        c.execute(q, (handId,))
-
-        # NOTE: This relies on row_factory = sqlite3.Row (set in connect() params)
-        #       Need to find MySQL and Postgres equivalents
-        #       MySQL maybe: cursorclass=MySQLdb.cursors.DictCursor
-        # res = c.fetchone()
-
-        # Using row_factory is global, and affects the rest of fpdb. The following 2 line achieves
-        # a similar result
-
-        # Descriptor must be lowercase: postgres returns lowercase, SQLite preserves case
-        rows = c.fetchall()
-        col_names = [col[0].lower() for col in c.description]
-        hand_info = dict(zip(col_names, rows[0], strict=False))
-
         self.tablename = hand_info["tablename"]
         self.handid = hand_info["sitehandno"]
         # Bomb/splash pot markers (cents) for the replayer overlay; older DBs
@@ -856,14 +836,9 @@ class Hand:
             self.setCommunityCards("RIVER", [cards[4]])
 
         if hand_info["runittwice"] or self.gametype["split"]:
-            # Fetch the boards first so we know how many runs there were
+            # The boards tell how many runs there were
             # (run-it-twice and run-it-three both come through here).
-            q = db.sql.query["singleHandBoards"]
-            q = q.replace("%s", db.sql.query["placeholder"])
-            c.execute(q, (handId,))
-            rows = c.fetchall()
-            col_names = [col[0].lower() for col in c.description]
-            boards = [dict(zip(col_names, row, strict=False)) for row in rows]
+            boards = rows.boards
 
             # Extend the streets for the actual number of runs.
             self.runItTimes = max(2, len(boards)) if boards else 2
@@ -930,15 +905,7 @@ class Hand:
         # street3Pot | street4Pot | showdownPot | comment | commentTs | texture
 
         # Actions
-        q = db.sql.query["handActions"]
-        q = q.replace("%s", db.sql.query["placeholder"])
-        c.execute(q, (handId,))
-
-        # Descriptor must be lowercase: postgres returns lowercase, SQLite preserves case
-        rows = c.fetchall()
-        col_names = [col[0].lower() for col in c.description]
-        action_rows = [dict(zip(col_names, row, strict=False)) for row in rows]
-        for row in action_rows:
+        for row in rows.actions:
             name = row["name"]
             street = row["street"]
             act = row["actionid"]
@@ -993,21 +960,14 @@ class Hand:
 
         # Restore showdown combinations / winning cards parsed at import time
         # (stored in HandsShowdown) so the replayer can label and highlight them.
-        try:
-            showdown = db.get_hands_showdown(handId)
-        except Exception:  # noqa: BLE001 - legacy DB without the table.
-            showdown = {}
-        for name, (combo, cards) in showdown.items():
+        for name, (combo, cards) in rows.showdown.items():
             if combo:
                 self.showdownStrings[name] = combo
             if cards:
                 self.winningHand[name] = cards.split(" ")
 
         # Restore EV cashout amounts/fees (stored in HandsCashout).
-        try:
-            cashouts = db.get_hands_cashout(handId)
-        except Exception:  # noqa: BLE001 - legacy DB without the table.
-            cashouts = {}
+        cashouts = rows.cashouts
         for name, (amount, fee) in cashouts.items():
             try:
                 if amount is not None:
@@ -1020,11 +980,7 @@ class Hand:
             self.cashedOut = True
 
         # Restore who collected the splash (stored in cents on HandsPlayers).
-        try:
-            splash = db.get_hands_splash(handId)
-        except Exception:  # noqa: BLE001 - legacy DB without the column.
-            splash = {}
-        for name, amount in splash.items():
+        for name, amount in rows.splash.items():
             try:
                 self.splashWinnings[name] = Decimal(str(amount)) / 100
             except (ValueError, ArithmeticError):
@@ -3203,57 +3159,80 @@ class Pot:
         )
 
 
-def hand_factory(hand_id, config, db_connection):
-    # a factory function to discover the base type of the hand
-    # and to return a populated class instance of the correct hand
-
-    log.debug(f"get info from db for hand {hand_id}")
-    gameinfo = db_connection.get_gameinfo_from_hid(hand_id)
-
+def _db_hand(hand_id, config, gameinfo):
+    """An empty hand of the class ``gameinfo`` calls for, ready to be filled from the database."""
     if gameinfo is None:
         log.error(f"No game info found for hand ID {hand_id}")
         return None  # Return None or handle the error appropriately
 
     log.debug(f"gameinfo {gameinfo} for hand {hand_id}")
 
-    hand_instance: Hand
+    hand_class: type[Hand]
     if gameinfo["base"] == "hold":
-        hand_instance = HoldemOmahaHand(
-            config=config,
-            hhc=None,
-            sitename=gameinfo["sitename"],
-            gametype=gameinfo,
-            handText=None,
-            builtFrom="DB",
-            handid=hand_id,
-        )
+        hand_class = HoldemOmahaHand
     elif gameinfo["base"] == "stud":
-        hand_instance = StudHand(
-            config=config,
-            hhc=None,
-            sitename=gameinfo["sitename"],
-            gametype=gameinfo,
-            handText=None,
-            builtFrom="DB",
-            handid=hand_id,
-        )
+        hand_class = StudHand
     elif gameinfo["base"] == "draw":
-        hand_instance = DrawHand(
-            config=config,
-            hhc=None,
-            sitename=gameinfo["sitename"],
-            gametype=gameinfo,
-            handText=None,
-            builtFrom="DB",
-            handid=hand_id,
-        )
+        hand_class = DrawHand
     else:
         log.error(f"Unknown game base type: {gameinfo['base']} for hand {hand_id}")
         return None  # Handle unexpected game types
 
+    return hand_class(
+        config=config,
+        hhc=None,
+        sitename=gameinfo["sitename"],
+        gametype=gameinfo,
+        handText=None,
+        builtFrom="DB",
+        handid=hand_id,
+    )
+
+
+def hand_factory(hand_id, config, db_connection):
+    # a factory function to discover the base type of the hand
+    # and to return a populated class instance of the correct hand
+
+    log.debug(f"get info from db for hand {hand_id}")
+    hand_instance = _db_hand(hand_id, config, db_connection.get_gameinfo_from_hid(hand_id))
+    if hand_instance is None:
+        return None
+
     log.debug(f"selecting info from db for hand {hand_id}")
     hand_instance.select(db_connection, hand_id)
     hand_instance.handid_selected = hand_id  # hand_instance does not supply this, create it here
     log.debug(f"exiting hand_factory for hand {hand_id}")
 
     return hand_instance
+
+
+def hands_factory(hand_ids, config, db_connection) -> dict[Any, Hand | None]:
+    """Rebuild several stored hands, as hand_factory does one, from a few queries per batch.
+
+    Returns ``{hand_id: hand}`` in the order given. A hand that is missing, of
+    an unknown game or that fails to rebuild maps to None and is logged, so
+    one bad hand does not cost the others; asking hand_factory for it again
+    raises the error itself.
+    """
+    hands: dict[Any, Hand | None] = {}
+    ids = list(dict.fromkeys(hand_ids))
+    for start in range(0, len(ids), HAND_ROWS_BATCH):
+        batch = ids[start : start + HAND_ROWS_BATCH]
+        gameinfos = db_connection.get_gameinfo_from_hids(batch)
+        stored = read_hand_rows(db_connection, batch)
+        for hand_id in batch:
+            hand_instance = _db_hand(hand_id, config, gameinfos.get(int(hand_id)))
+            rows = stored.get(int(hand_id))
+            if hand_instance is not None and rows is None:
+                log.error(f"Hand {hand_id} is not in the database")
+                hand_instance = None
+            if hand_instance is not None:
+                try:
+                    hand_instance.select_rows(rows)
+                except Exception:  # noqa: BLE001 - one bad hand must not cost the batch.
+                    log.exception(f"Could not rebuild hand {hand_id} from the database")
+                    hand_instance = None
+                else:
+                    hand_instance.handid_selected = hand_id
+            hands[hand_id] = hand_instance
+    return hands
@@ -18,16 +18,21 @@ from __future__ import annotations
 import codecs
 import contextlib
 import datetime
+import functools
 import os
 import os.path
 import re
 import sqlite3
 import sys
+import threading
 import time
 import xml.parsers.expat
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
 from decimal import Decimal
 from pathlib import Path
+from typing import Any
 
 import defusedxml.minidom
 import pytz
@@ -61,6 +66,64 @@ HHC_XML_PARSE_ERRORS = (OSError, TypeError, xml.parsers.expat.ExpatError, Defuse
 # (player, blindtype, amount, stack_is_now_empty).
 BLIND_ALL_IN_INDEX = 3
 
+# Player sets whose compiled regexes are kept, process-wide.
+PLAYER_REGEX_CACHE_SIZE = 256
+
+_player_regex_cache: OrderedDict[tuple[Any, ...], tuple[tuple[str, object], ...]] = OrderedDict()
+# Converters run in the importer's threads as well as the GUI's.
+_player_regex_lock = threading.Lock()
+
+
+def cached_player_regexes(
+    *attributes: str,
+    variant: Callable[[Any, Any], Hashable] | None = None,
+) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Share what a ``compilePlayerRegexs`` compiles, per player set, across hands and converters.
+
+    The regexes that spell out the seated players' names are recompiled
+    whenever a hand seats someone the last compile did not cover, which on a
+    fast-fold table (Zoom, Rush, Fast Forward) is nearly every hand, and every
+    file starts over with a new converter. The decorated method still compiles
+    a player set the first time; afterwards ``attributes`` are set from a
+    bounded LRU keyed by converter class, player set and ``variant(self,
+    hand)`` -- whatever else the patterns are built from, such as the
+    currency. The method must set nothing but ``attributes`` and
+    ``compiledPlayers``.
+    """
+
+    def decorate(compile_player_regexs: Callable[..., None]) -> Callable[..., None]:
+        @functools.wraps(compile_player_regexs)
+        def compile_or_reuse(self, hand) -> None:
+            players = {player[1] for player in hand.players}
+            if players <= getattr(self, "compiledPlayers", set()):
+                return
+            key = (type(self), variant(self, hand) if variant else None, frozenset(players))
+            with _player_regex_lock:
+                bundle = _player_regex_cache.get(key)
+                if bundle is not None:
+                    _player_regex_cache.move_to_end(key)
+            if bundle is None:
+                compile_player_regexs(self, hand)
+                bundle = tuple((name, getattr(self, name)) for name in attributes)
+                with _player_regex_lock:
+                    _player_regex_cache[key] = bundle
+                    while len(_player_regex_cache) > PLAYER_REGEX_CACHE_SIZE:
+                        _player_regex_cache.popitem(last=False)
+                return
+            for name, pattern in bundle:
+                setattr(self, name, pattern)
+            self.compiledPlayers = players
+
+        return compile_or_reuse
+
+    return decorate
+
+
+def clear_player_regex_cache() -> None:
+    with _player_regex_lock:
+        _player_regex_cache.clear()
+
+
 SQLITE_MAGIC = b"SQLite format 3\x00"
 # The Microgaming text export separates its hands with this line, so rebuilding
 # it lets the existing parser read the database form unchanged.
@@ -167,6 +230,8 @@ in_path   (default '-' = sys.stdin)
         self.parsing_issues: list[str] = []
         self.isCarraige = False
         self.autoPop = False
+        # Set by auto-import so polls read only what was appended (see tail_reader).
+        self.tail_reader = None
 
         # Initialize improved error handler
         self.error_handler = get_improved_error_handler()
@@ -291,6 +356,9 @@ HandHistoryConverter: '{sitename}'
     def setAutoPop(self, value) -> None:
         self.autoPop = value
 
+    def setTailReader(self, reader) -> None:
+        self.tail_reader = reader
+
     def allHandsAsList(self) -> list[str]:
         """Return the hand-text snapshot from ``in_path``.
 
@@ -352,6 +420,18 @@ HandHistoryConverter: '{sitename}'
         """Parse a shared game header for converters that enable ``copyGameHeader``."""
         raise NotImplementedError
 
+    def header_file(self) -> str:
+        """``whole_file`` with the line endings and no-break spaces ``allHandsAsList`` normalises.
+
+        ``processHand`` hands it to ``parseHeader`` for every hand of the file,
+        so it is built once per text ``readFile`` (or ``setObs``) loads rather
+        than once per hand, which made a long session quadratic to parse.
+        """
+        if getattr(self, "_header_source", None) is not self.whole_file:
+            self._header_file = self.whole_file.replace("\r\n", "\n").replace("\xa0", " ")
+            self._header_source = self.whole_file
+        return self._header_file
+
     def raise_summary_partial(self, hand: Hand.Hand, marker: str) -> None:
         """Reject a hand whose summary sections do not number exactly one.
 
@@ -382,10 +462,7 @@ HandHistoryConverter: '{sitename}'
             raise FpdbHandPartial(msg)
 
         if self.copyGameHeader:
-            gametype = self.parseHeader(
-                handText,
-                self.whole_file.replace("\r\n", "\n").replace("\xa0", " "),
-            )
+            gametype = self.parseHeader(handText, self.header_file())
         else:
             gametype = self.determineGameType(handText)
 
@@ -813,6 +890,14 @@ or None if we fail to get the info """
     def readFile(self) -> bool | None:
         """Opens in_path according to self.codepage. Exceptions are handled elsewhere."""
         if self.filetype == "text":
+            if self.tail_reader is not None:
+                obs = self.tail_reader.read_from(self.index)
+                if obs is not None:
+                    self.obs = obs
+                    self.whole_file = self.tail_reader.whole_file(self.index, obs)
+                    self.index = self.tail_reader.end
+                    self.kodec = self.tail_reader.kodec
+                    return True
             try:
                 with open(self.in_path, "rb") as binary_file:
                     raw_data = binary_file.read()
@@ -858,6 +943,9 @@ or None if we fail to get the info """
                     self.index = len(self.whole_file)
                     self.kodec = kodec
                     log.debug(f"File successfully decoded using codec: {kodec}")
+                    if self.tail_reader is not None:
+                        split_hands_re = getattr(self, "re_split_hands", getattr(self, "re_SplitHands", None))
+                        self.tail_reader.prime(len(raw_data), self.whole_file, kodec, split_hands_re)
                     return True
                 except (OSError, UnicodeDecodeError) as e:
                     log.warning(f"Failed to read file with codec {kodec}: {e}")
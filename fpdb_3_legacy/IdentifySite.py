@@ -19,19 +19,22 @@ import copy
 import os
 import re
 import sys
+from functools import lru_cache
 from time import time
 from typing import Any
 
 from fpdb_3_legacy import Configuration
-from fpdb_3_legacy.HandHistoryConverter import HandHistoryConverter, unpack_sqlite_hand_history
-from fpdb_3_legacy.import_failure_cache import FailureCache, is_sidecar_file
+from fpdb_3_legacy.HandHistoryConverter import SQLITE_MAGIC, HandHistoryConverter, unpack_sqlite_hand_history
+from fpdb_3_legacy.import_failure_cache import FailureCache, file_signature, is_sidecar_file
 from fpdb_3_legacy.loggingFpdb import get_logger
+from fpdb_3_legacy.parser_identify_table import ParserIdentity
 from fpdb_3_legacy.parser_registry import (
     LEGACY_MODULE_REGISTRY as LEGACY_MODULE_REGISTRY,
 )
 from fpdb_3_legacy.parser_registry import (
     get_parser_class,
-    get_summary_class,
+    get_parser_identity,
+    get_summary_identify,
 )
 from fpdb_3_legacy.parser_registry import (
     import_fpdb_module as import_fpdb_module,
@@ -57,6 +60,47 @@ re_Divider["Fulltilt"] = re.compile(r"\*{20}\s#\s\d+\s\*{15,25}\s?", re.MULTILIN
 re_Head["Fulltilt"] = re.compile(r"^((BEGIN)?\n)?FullTiltPoker.+\n\nSeat", re.MULTILINE)
 re_XLS["PokerStars"] = re.compile(r"Tournaments\splayed\sby\s\'.+?\'")
 re_XLS["Fulltilt"] = re.compile(r"Player\sTournament\sReport\sfor\s.+?\s\(.*\)")
+# The dividers are ASCII, so an 8-bit file's archive check can run on its bytes
+# without decoding it; "\s*$" takes the "\r" of a CRLF line end. Both lead with
+# a literal so the engine skips ahead to candidates: a MULTILINE "^" or a
+# counted repeat in front makes it try every byte of a multi-megabyte archive.
+# The PokerStars divider must also start a line, which the caller checks.
+re_DividerBytes = {
+    "PokerStars": re.compile(rb"Hand #(\d+)\s*$", re.MULTILINE),
+    "Fulltilt": re.compile(rb"\*" * 20 + rb"\s#\s\d+\s\*{15,25}\s?"),
+}
+
+# Identification never looks past the first 10000 characters of a file (the
+# summary regexes); only the archive-divider check and PokerTracker's iPoker
+# skin detection read further.
+IDENTIFY_PREFIX_CHARS = 10000
+IDENTIFY_READ_CHUNK = 16 * 1024
+_SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+_SCOPED_MASK = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+
+@lru_cache(maxsize=8)
+def _combined_identify(specs: tuple[tuple[str, int] | None, ...]) -> re.Pattern[str] | None:
+    """One alternation of every site's identify regex, each in group ``s<index>``.
+
+    At the leftmost position where any site matches, the alternation takes the
+    first such site in list order. None when a pattern cannot be combined.
+    """
+    branches = []
+    for index, spec in enumerate(specs):
+        if spec is None:
+            continue
+        pattern, flags = spec
+        flags &= ~re.UNICODE
+        letters = "".join(letter for flag, letter in _SCOPED_FLAGS.items() if flags & flag)
+        if flags & ~_SCOPED_MASK:
+            return None
+        scoped = f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+        branches.append(f"(?P<s{index}>{scoped})")
+    try:
+        return re.compile("|".join(branches)) if branches else None
+    except re.error:
+        return None
 
 
 class FPDBFile:
@@ -80,7 +124,7 @@ class Site:
         hhc_fname: str,
         hhc_type: str,
         summary: str | None,
-        obj: type[HandHistoryConverter],
+        obj: type[HandHistoryConverter] | ParserIdentity,
     ) -> None:
         self.name = name
         self.hhc_fname = hhc_fname
@@ -97,10 +141,7 @@ class Site:
         self.summary: str | None = summary
         # self.obj            = obj
         if summary:
-            sum_class = get_summary_class(summary)
-            self.re_SumIdentify = (
-                getattr(sum_class, "re_identify", getattr(sum_class, "re_Identify", None)) if sum_class else None
-            )
+            self.re_SumIdentify = get_summary_identify(summary)
         self.line_delimiter = self.getDelimiter(hhc_type)
         self.line_addendum = self.getAddendum(hhc_type)
         self.spaces = hhc_type == "Entraction"
@@ -140,7 +181,7 @@ class Site:
 
         return line_addendum
 
-    def getHeroRegex(self, obj: type[HandHistoryConverter], filter_name: str) -> None:
+    def getHeroRegex(self, obj: type[HandHistoryConverter] | ParserIdentity, filter_name: str) -> None:
         if hasattr(obj, "re_hero_cards") and filter_name not in ("Bovada", "Enet"):
             self.re_HeroCards = obj.re_hero_cards
         elif hasattr(obj, "re_HeroCards") and filter_name not in ("Bovada", "Enet"):
@@ -157,6 +198,10 @@ class IdentifySite:
         self.sitelist: dict[int | None, Site] = {}
         self.filelist: dict[str | bytes, FPDBFile] = {}
         self.failed_files = FailureCache()
+        # path -> (size and mtime, FPDBFile) of files identified so far. Kept
+        # across clear_filelist, so rescanning a directory reads only new or
+        # changed files.
+        self.identified: dict[str | bytes, tuple[tuple[int, int] | None, FPDBFile]] = {}
         self.re_Identify_PT: re.Pattern[str] | None = None
         self.re_SumIdentify_PT: re.Pattern[str] | None = None
         self.generateSiteList(hhcs)
@@ -370,7 +415,11 @@ class IdentifySite:
         self.failed_files = FailureCache()
 
     def generateSiteList(self, hhcs) -> None:
-        """Generates a ordered dictionary of site, filter and filter name for each site in hhcs."""
+        """Generates a ordered dictionary of site, filter and filter name for each site in hhcs.
+
+        Reads the precomputed identification table, so no converter is
+        imported until a file turns out to need it.
+        """
         if not hhcs:
             hhcs = self.config.hhcs
         for site, hhc in list(hhcs.items()):
@@ -378,7 +427,7 @@ class IdentifySite:
             filter_name = filter.replace("ToFpdb", "")
             summary = hhc.summaryImporter
             try:
-                obj = get_parser_class(filter_name)
+                obj = get_parser_identity(filter_name)
                 site_id = getattr(obj, "site_id", getattr(obj, "siteId", None))
                 self.sitelist[site_id] = Site(
                     site,
@@ -391,14 +440,8 @@ class IdentifySite:
                 log.warning(f"Could not find module {filter}, skipping.")
             except IDENTIFY_SITE_IMPORT_ERRORS as e:
                 log.exception(f"Failed to load HH importer: {filter_name}. {e}")
-        pt_class = get_parser_class("PokerTracker")
-        self.re_Identify_PT = (
-            getattr(pt_class, "re_identify", getattr(pt_class, "re_Identify", None)) if pt_class else None
-        )
-        pt_sum_class = get_summary_class("PokerTrackerSummary")
-        self.re_SumIdentify_PT = (
-            getattr(pt_sum_class, "re_identify", getattr(pt_sum_class, "re_Identify", None)) if pt_sum_class else None
-        )
+        self.re_Identify_PT = get_parser_identity("PokerTracker").re_identify
+        self.re_SumIdentify_PT = get_summary_identify("PokerTrackerSummary")
 
     def walkDirectory(self, dir, sitelist) -> None:
         """Walks a directory, and executes a callback on each file."""
@@ -420,11 +463,15 @@ class IdentifySite:
         if path in self.filelist or self.identification_failed(path):
             return
 
-        log.debug(f"filelist {self.filelist}")
-        whole_file, kodec = self.read_file(path)
-        # log.debug('whole_file',whole_file)
+        signature = file_signature(path)
+        known = self.identified.get(path)
+        if known is not None and signature is not None and known[0] == signature:
+            self.filelist[path] = copy.copy(known[1])
+            return
+
+        head, kodec, complete = self.read_prefix(path)
         log.debug(f"kodec {kodec}")
-        if not whole_file:
+        if not head:
             # Empty or unreadable: the poker client creates the history file when
             # a table opens and only writes the first hand later, so this is a
             # file that has not been written yet, not one that never will be.
@@ -433,14 +480,110 @@ class IdentifySite:
             self.remember_failure(path)
             return
 
-        fobj = self.idSite(path, whole_file, kodec)
+        fobj = self.idSite(path, head, kodec, complete=complete)
         log.debug(f"siteid obj {fobj}")
-        # print(fobj.path)
         if fobj is False:  # Site id failed
             log.debug(f"siteId Failed for: {path}")
             self.remember_failure(path)
         else:
             self.filelist[path] = fobj
+            self.identified[path] = (signature, copy.copy(fobj))
+
+    def read_prefix(self, in_path):
+        """Read and decode only as much of a file as identification looks at.
+
+        Returns ``(text, codec, complete)``: at least the first
+        ``IDENTIFY_PREFIX_CHARS`` characters, decoded with the first codec that
+        reads them, and whether that is the whole file. Spreadsheets and
+        SQLite hand-history databases are read whole, as by :meth:`read_file`.
+        """
+        if is_sidecar_file(in_path) or in_path.endswith((".xls", ".xlsx")):
+            text, kodec = self.read_file(in_path)
+            return text, kodec, True
+        raw = b""
+        try:
+            with open(in_path, "rb") as infile:
+                while True:
+                    chunk = infile.read(IDENTIFY_READ_CHUNK)
+                    raw += chunk
+                    complete = len(chunk) < IDENTIFY_READ_CHUNK
+                    if raw.startswith(SQLITE_MAGIC):
+                        text, kodec = self.read_file(in_path)
+                        return text, kodec, True
+                    text, kodec = self._decode_prefix(in_path, raw, complete)
+                    if text is None or complete or len(text) >= IDENTIFY_PREFIX_CHARS:
+                        return text, kodec, complete
+        except OSError as e:
+            log.exception(f"Error reading file {in_path}: {e}")
+            return None, None, True
+
+    def _decode_prefix(self, in_path, raw, complete):
+        """Decode the start of a file as read_file decodes the whole of it."""
+        if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+            if complete and len(raw) % 2:
+                log.debug("Dropping stray trailing byte of UTF-16 file %s", in_path)
+                raw = raw[:-1]
+            try:
+                return codecs.getincrementaldecoder("utf-16")().decode(raw, final=complete), "utf-16"
+            except UnicodeDecodeError as e:
+                log.warning(f"Strict UTF-16 decoding failed for {in_path} (trying with errors='replace'): {e}")
+                return codecs.getincrementaldecoder("utf-16")("replace").decode(raw, final=complete), "utf-16"
+        for kodec in self.codepage:
+            try:
+                # Incremental, so a character cut in two at the end of the
+                # prefix is held back rather than taken for bad input.
+                return codecs.getincrementaldecoder(kodec)().decode(raw, final=complete), kodec
+            except UnicodeDecodeError as e:
+                log.warning(f"Failed to read file {in_path} with codec {kodec}: {e}")
+        log.error(f"Unable to read file {in_path} with any known codecs.")
+        return None, None
+
+    def _has_archive_divider(self, path, filter_name, text, kodec, complete) -> bool:
+        """Whether a PokerStars or Full Tilt file is an archive, read past the prefix if need be."""
+        if complete:
+            return re_Divider[filter_name].search(text.replace("\r\n", "\n")) is not None
+        if kodec != "utf-16":
+            try:
+                with open(path, "rb") as infile:
+                    raw = infile.read()
+            except OSError:
+                return False
+            return any(
+                filter_name != "PokerStars" or m.start() == 0 or raw[m.start() - 1] == ord("\n")
+                for m in re_DividerBytes[filter_name].finditer(raw)
+            )
+        whole_file, _kodec = self.read_file(path)
+        return bool(whole_file) and re_Divider[filter_name].search(whole_file.replace("\r\n", "\n")) is not None
+
+    def _first_identified_site(self, first_chunk):
+        """The first site, in list order, whose identify regex matches ``first_chunk``.
+
+        One pass of the combined regex finds the site matching leftmost; only
+        the sites listed before it still need a search of their own.
+        """
+        sites = list(self.sitelist.values())
+        combined = _combined_identify(
+            tuple(
+                None if site.re_Identify is None else (site.re_Identify.pattern, site.re_Identify.flags)
+                for site in sites
+            ),
+        )
+        if combined is None:
+            candidates = sites
+        else:
+            m = combined.search(first_chunk)
+            if m is None:
+                return None, sites
+            if m.lastgroup is None:
+                # Matched outside the per-site groups: ask every site instead.
+                candidates = sites
+            else:
+                first = int(m.lastgroup[1:])
+                candidates = [*sites[:first], sites[first]]
+        for index, site in enumerate(candidates):
+            if site.re_Identify is not None and site.re_Identify.search(first_chunk):
+                return site, sites[:index]
+        return None, sites
 
     def read_file(self, in_path):
         # System leftovers and the regression corpus' reference data are not
@@ -507,8 +650,12 @@ class IdentifySite:
         log.error(f"Unable to read file {in_path} with any known codecs.")
         return None, None
 
-    def idSite(self, path, whole_file, kodec):
-        """Identifies the site the hh file originated from."""
+    def idSite(self, path, whole_file, kodec, complete=True):
+        """Identifies the site the hh file originated from.
+
+        ``whole_file`` may be just the start of the file, as read by
+        :meth:`read_prefix`, with ``complete`` False.
+        """
         f = FPDBFile(path)
         f.kodec = kodec
         # DEBUG:print('idsite path',path )
@@ -529,42 +676,42 @@ class IdentifySite:
                         f.hero = "Hero"
                     return f
 
-        # DEBUG:print('idsite self.sitelist.items',self.sitelist.items())
-        for _id, site in list(self.sitelist.items()):
+        site, passed = self._first_identified_site(first_chunk)
+        head = first_chunk.replace("\r\n", "\n")
+        for other in passed:
+            if re_Head.get(other.filter_name) and re_Head[other.filter_name].match(head):
+                f.archive = True
+                f.archiveHead = True
+        if site is not None:
             filter_name = site.filter_name
-            m = site.re_Identify.search(first_chunk) if site.re_Identify is not None else None
-            if m and filter_name in ("Fulltilt", "PokerStars"):
-                m1 = re_Divider[filter_name].search(whole_file.replace("\r\n", "\n"))
-                if m1:
+            if filter_name in ("Fulltilt", "PokerStars"):
+                if self._has_archive_divider(path, filter_name, whole_file, kodec, complete):
                     f.archive = True
                     f.archiveDivider = True
-            elif re_Head.get(filter_name) and re_Head[filter_name].match(
-                whole_file[:5000].replace("\r\n", "\n"),
-            ):
+            elif re_Head.get(filter_name) and re_Head[filter_name].match(head):
                 f.archive = True
                 f.archiveHead = True
-            if m:
-                # For PokerStars, WPN, iPoker and Party, we need to determine the specific skin
-                if filter_name == "PokerStars":
-                    selected_site = self._select_pokerstars_skin_site(path, whole_file, site)
-                elif filter_name == "Winning":
-                    selected_site = self._select_winning_skin_site(path, site)
-                elif filter_name == "iPoker":
-                    selected_site = self._select_ipoker_skin_site(path, site)
-                elif filter_name == "PartyPoker":
-                    selected_site = self._select_partypoker_skin_site(path, site)
-                else:
-                    selected_site = site
-                f.site = selected_site
-
-                f.ftype = "hh"
-                if selected_site.re_HeroCards:
-                    h = selected_site.re_HeroCards.search(whole_file[:5000])
-                    if h and "PNAME" in h.groupdict():
-                        f.hero = h.group("PNAME")
-                else:
-                    f.hero = "Hero"
-                return f
+            # For PokerStars, WPN, iPoker and Party, we need to determine the specific skin
+            if filter_name == "PokerStars":
+                selected_site = self._select_pokerstars_skin_site(path, whole_file, site)
+            elif filter_name == "Winning":
+                selected_site = self._select_winning_skin_site(path, site)
+            elif filter_name == "iPoker":
+                selected_site = self._select_ipoker_skin_site(path, site)
+            elif filter_name == "PartyPoker":
+                selected_site = self._select_partypoker_skin_site(path, site)
+            else:
+                selected_site = site
+            f.site = selected_site
+
+            f.ftype = "hh"
+            if selected_site.re_HeroCards:
+                h = selected_site.re_HeroCards.search(whole_file[:5000])
+                if h and "PNAME" in h.groupdict():
+                    f.hero = h.group("PNAME")
+            else:
+                f.hero = "Hero"
+            return f
 
         for _id, site in list(self.sitelist.items()):
             if site.summary:
@@ -597,14 +744,16 @@ class IdentifySite:
         if m1 or m2:
             filter = "PokerTrackerToFpdb"
             filter_name = "PokerTracker"
-            obj = get_parser_class(filter_name)
+            obj = get_parser_identity(filter_name)
             summary = "PokerTrackerSummary"
 
             # Detect specific iPoker skin for PokerTracker format
             detected_site_name = "PokerTracker"  # default
             if m1 and "GAME #" in m1.group():
                 # This is an iPoker hand, detect the specific skin
-                detected_site_name = self.detectiPokerSkin(whole_file)
+                # Skin markers can sit anywhere in the file, not only in its start
+                full_text = whole_file if complete else (self.read_file(path)[0] or whole_file)
+                detected_site_name = self.detectiPokerSkin(full_text)
                 log.debug(f"Detected iPoker skin from PokerTracker format: {detected_site_name}")
 
             pt_site = Site(detected_site_name, filter, filter_name, summary, obj)
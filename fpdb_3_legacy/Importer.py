@@ -29,17 +29,19 @@ import zmq as _zmq
 from PySide6.QtCore import QCoreApplication
 from PySide6.QtWidgets import QDialog, QLabel, QProgressBar, QVBoxLayout
 
-from fpdb_3_legacy import Configuration, Database, IdentifySite, db_profile
+from fpdb_3_legacy import Configuration, Database, IdentifySite, db_profile, file_watcher, import_pipeline
 from fpdb_3_legacy.Exceptions import (
     FpdbHandDuplicate,
     FpdbHandPartial,
     FpdbParseError,
     FpdbSummaryNotFound,
 )
+from fpdb_3_legacy.hud_aggregates import encode_hud_message
 from fpdb_3_legacy.import_failure_cache import SIDECAR_EXTENSIONS, FailureCache
 from fpdb_3_legacy.iPoker.dispatcher import get_parser_class_for_path as get_ipoker_parser_class_for_path
 from fpdb_3_legacy.loggingFpdb import get_logger
 from fpdb_3_legacy.parser_registry import get_parser_class, get_summary_class
+from fpdb_3_legacy.tail_reader import TailReader
 
 zmq: Any = _zmq
 
@@ -70,6 +72,10 @@ if __name__ == "__main__":
 log = get_logger("importer")
 
 IMPORTER_FILE_READ_ERRORS = (OSError, UnicodeDecodeError)
+# With a file watcher, auto-import still walks the monitored directories this
+# often, in case the watcher missed something it could not report (a network
+# share, say, whose writes never reach the local kernel).
+FULL_RESCAN_SECONDS = 300
 ZMQ_CLOSE_ERRORS = (RuntimeError, zmq.ZMQError)
 
 # Round-trip profiling (off unless FPDB_DB_PROFILE=1). Module-level rather than
@@ -95,15 +101,23 @@ class ZMQSender:
         self.socket.setsockopt(zmq.SNDTIMEO, 100)  # 100ms timeout
         self.socket.connect(f"tcp://127.0.0.1:{port}")
         log.info(f"ZMQ sender connected to port {port}")
+        # Numbered per sender, so the HUD can tell a dropped message from none.
+        self._sender = f"{os.getpid()}-{id(self):x}"
+        self._seq = 0
 
-    def send_hand_id(self, hand_id) -> None:
+    def send_hand_id(self, hand_id, hudcache=None) -> None:
         """Send a hand ID to the connected ZMQ server.
 
         Args:
             hand_id: The hand ID to send.
+            hudcache: The (key, line) rows the hand added to HudCache, which let
+                the HUD update its aggregates without reading them again. None
+                when unknown; the HUD then reads them from the database.
         """
+        self._seq += 1
+        message = encode_hud_message(hand_id, sender=self._sender, seq=self._seq, hudcache=hudcache)
         try:
-            self.socket.send_string(str(hand_id), zmq.NOBLOCK)
+            self.socket.send_string(message, zmq.NOBLOCK)
             log.debug(f"Sent hand ID {hand_id} via ZMQ")
         except zmq.Again:
             log.warning(f"ZMQ queue full, dropping hand ID {hand_id}")
@@ -167,6 +181,11 @@ class Importer:
         self.faobs = None  # File as one big string
         self.mode = None
         self.pos_in_file: dict[str, int] = {}  # dict to remember how far we have read in the file
+        # Byte offsets and decoder state behind pos_in_file, for auto-import.
+        self.tail_readers: dict[str, TailReader] = {}
+        # Reports changed files in the monitored directories (auto-import only).
+        self.watcher: file_watcher.InotifyWatcher | None = None
+        self._last_full_scan = 0.0
 
         # Configuration of default parameters
         self.callHud = self.config.get_import_parameters().get("callFpdbHud")
@@ -179,6 +198,10 @@ class Importer:
         self.settings.setdefault("ftpArchive", False)
         self.settings.setdefault("testData", False)
         self.settings.setdefault("cacheHHC", False)
+        # Bulk import parses on this many processes (1 = in this process).
+        self.settings.setdefault("parseWorkers", 1)
+        # Auto-import learns about changed files from the OS where it can.
+        self.settings.setdefault("watchFiles", True)
         # Populated only when cacheHHC is on (see runImport).
         self.handhistoryconverter: Any = None
         self.cached_hhcs: dict[str, Any] = {}
@@ -290,6 +313,30 @@ class Importer:
             for _i in range(self.settings["threads"] - len(self.writerdbs)):
                 self.writerdbs.append(Database.Database(self.config, sql=self.sql))
 
+    def setParseWorkers(self, value) -> None:
+        """Set the number of processes that parse files during a bulk import.
+
+        Parsing fans out over that many worker processes while this importer
+        stays the only writer. 1 keeps the whole import in this process; 0 or a
+        negative value picks one worker per spare core.
+
+        Args:
+            value: The number of parse worker processes.
+        """
+        value = int(value)
+        self.settings["parseWorkers"] = value if value > 0 else import_pipeline.default_workers()
+
+    def setWatchFiles(self, value) -> None:
+        """Set whether auto-import watches its directories instead of polling them.
+
+        Only takes effect where the platform can report file changes (inotify);
+        elsewhere auto-import polls regardless.
+
+        Args:
+            value: True to watch monitored directories for changes.
+        """
+        self.settings["watchFiles"] = value
+
     def setDropIndexes(self, value) -> None:
         """Set the dropIndexes setting for the importer.
 
@@ -386,6 +433,7 @@ class Importer:
         self.updatedsize = {}
         self.updatedtime = {}
         self.pos_in_file = {}
+        self.tail_readers = {}
         self.filelist = {}
         # Reassigned rather than cleared in place: callers that build an
         # Importer without running __init__ rely on this creating the cache.
@@ -667,6 +715,7 @@ class Importer:
             if monitor is True:
                 self.monitor = True
                 self.dirlist[site] = [dir, filter]
+                self._watch_directory(dir)
 
             # print "addImportDirectory: checking files in", dir
             for subdir in os.walk(dir):
@@ -687,6 +736,37 @@ class Importer:
                 f"Attempted to add non-directory '{dir!s}' as an import directory",
             )
 
+    def _watch_directory(self, dir) -> None:
+        """Have the file watcher report changes below ``dir``, when there is one."""
+        if not self.settings.get("watchFiles"):
+            return
+        if self.watcher is None:
+            self.watcher = file_watcher.create_watcher()
+            if self.watcher is None:
+                self.settings["watchFiles"] = False
+                return
+        if not self.watcher.watch(dir):
+            log.warning(f"Cannot watch {dir}; auto-import goes back to polling")
+            self.stopWatching()
+            self.settings["watchFiles"] = False
+
+    def stopWatching(self) -> None:
+        """Close the file watcher; later cycles walk the monitored directories."""
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+    def waitForChanges(self, timeout) -> bool:
+        """Block until a monitored file changes or ``timeout`` seconds pass.
+
+        Returns:
+            bool: True when the watcher has changes for the next cycle. Without
+            a watcher this returns False at once; the caller keeps its interval.
+        """
+        if self.watcher is None:
+            return False
+        return self.watcher.poll(timeout)
+
     def removeImportDirectory(self, dir=None, site=None) -> None:
         """Remove monitored import directories and stale files below them.
 
@@ -705,7 +785,10 @@ class Importer:
         if dir is not None and not removed_dirs:
             removed_dirs.append(dir)
 
+        watcher = getattr(self, "watcher", None)
         for watched_dir in removed_dirs:
+            if watcher is not None:
+                watcher.unwatch(watched_dir)
             watched_prefix = os.path.abspath(watched_dir)
             for filename in list(self.filelist.keys()):
                 try:
@@ -718,6 +801,7 @@ class Importer:
                     self.updatedsize.pop(filename, None)
                     self.updatedtime.pop(filename, None)
                     self.pos_in_file.pop(filename, None)
+                    self.tail_readers.pop(filename, None)
             for failed_path in list(self.failed_files):
                 try:
                     # The cache accepts bytes paths, which commonpath cannot mix
@@ -836,42 +920,46 @@ class Importer:
             assert self.progress_start_cb is not None
             self.progress_start_cb(len(self.filelist))
 
-        for f in self.filelist:
-            if not has_callbacks:
-                ProgressDialog.progress_update(f, str(self.database.getHandCount()))
-            else:
-                assert self.progress_update_cb is not None
-                self.progress_update_cb(f, str(self.database.getHandCount()))
+        with self._parse_ahead() as parse_ahead:
+            for f in self.filelist:
+                if not has_callbacks:
+                    ProgressDialog.progress_update(f, str(self.database.getHandCount()))
+                else:
+                    assert self.progress_update_cb is not None
+                    self.progress_update_cb(f, str(self.database.getHandCount()))
 
-            try:
-                (stored, duplicates, partial, skipped, errors, ttime, _) = self._import_despatch(self.filelist[f])
-                totstored += stored
-                totdups += duplicates
-                totpartial += partial
-                totskipped += skipped
-                toterrors += errors
-
-                self.logImport(
-                    "bulk",
-                    f,
-                    stored,
-                    duplicates,
-                    partial,
-                    skipped,
-                    errors,
-                    ttime,
-                    self.filelist[f].fileId,
-                )
-            except Exception as e:  # intentional broad catch: file import must isolate per-file failures.
-                self.database.rollback()
-                log.exception(f"A fatal error occurred while processing file: {f}. Error: {e}")
-                toterrors += 1
-                self._relocate_processed_file(f, failed=True)
-                continue
+                try:
+                    parsed = parse_ahead.result(f) if parse_ahead is not None else None
+                    (stored, duplicates, partial, skipped, errors, ttime, _) = self._import_despatch(
+                        self.filelist[f], parsed
+                    )
+                    totstored += stored
+                    totdups += duplicates
+                    totpartial += partial
+                    totskipped += skipped
+                    toterrors += errors
+
+                    self.logImport(
+                        "bulk",
+                        f,
+                        stored,
+                        duplicates,
+                        partial,
+                        skipped,
+                        errors,
+                        ttime,
+                        self.filelist[f].fileId,
+                    )
+                except Exception as e:  # intentional broad catch: file import must isolate per-file failures.
+                    self.database.rollback()
+                    log.exception(f"A fatal error occurred while processing file: {f}. Error: {e}")
+                    toterrors += 1
+                    self._relocate_processed_file(f, failed=True)
+                    continue
 
-            # Optionally archive the file once processed: successful imports go to
-            # the "imported" directory, files that produced errors to the "failed" one.
-            self._relocate_processed_file(f, failed=errors > 0)
+                # Optionally archive the file once processed: successful imports go to
+                # the "imported" directory, files that produced errors to the "failed" one.
+                self._relocate_processed_file(f, failed=errors > 0)
 
         if not has_callbacks:
             ProgressDialog.accept()
@@ -884,6 +972,39 @@ class Importer:
 
     # end def importFiles
 
+    def _parse_ahead(self):
+        """Start parsing the queued hand histories on worker processes.
+
+        Only bulk imports of more than one file fan out, and only when
+        ``parseWorkers`` is above 1 and ``cacheHHC`` is off. Summaries and parsers that need the
+        database while parsing (``import_pipeline.WRITER_ONLY_FILTERS``) are left
+        to this process.
+
+        Returns:
+            A context manager yielding an ``import_pipeline.ParseAhead``, or
+            yielding ``None`` when every file is parsed here.
+        """
+        workers = self.settings.get("parseWorkers", 1)
+        # cacheHHC keeps each file's converter, which only exists where it parsed.
+        if workers <= 1 or self.mode == "auto" or self.settings.get("cacheHHC", False):
+            return contextlib.nullcontext()
+        jobs = [
+            import_pipeline.ParseJob(
+                path=path,
+                filter_name=fpdbfile.site.filter_name,
+                sitename=fpdbfile.site.name,
+                archive=fpdbfile.archive,
+                index=self.pos_in_file.get(path, 0),
+            )
+            for path, fpdbfile in self.filelist.items()
+            if fpdbfile.ftype in ("hh", "both")
+            and fpdbfile.site is not None
+            and fpdbfile.site.filter_name not in import_pipeline.WRITER_ONLY_FILTERS
+        ]
+        if len(jobs) < 2:
+            return contextlib.nullcontext()
+        return import_pipeline.ParseAhead(self.config.file, jobs, min(workers, len(jobs)))
+
     def _relocate_processed_file(self, filepath: str, *, failed: bool) -> None:
         """Move a just-processed file to the configured imported/failed directory.
 
@@ -928,13 +1049,14 @@ class Importer:
         if target_dir is not None:
             self.settings["moveFailedFilesDir"] = target_dir
 
-    def _import_despatch(self, fpdbfile):
+    def _import_despatch(self, fpdbfile, parsed=None):
         """Dispatch the import process for a given file based on its type.
 
         Determines the file type and calls the appropriate import method, returning import statistics and detected site name.
 
         Args:
             fpdbfile: The file object to import.
+            parsed: The file as already parsed by a worker process, if it was.
 
         Returns:
             tuple: A tuple containing the number of stored, duplicate, partial, skipped, and error hands, the import time, and the detected site name.
@@ -942,7 +1064,9 @@ class Importer:
         stored, duplicates, partial, skipped, errors, ttime = 0, 0, 0, 0, 0, 0
         detected_sitename = None
         if fpdbfile.ftype in ("hh", "both"):
-            (stored, duplicates, partial, skipped, errors, ttime, detected_sitename) = self._import_hh_file(fpdbfile)
+            (stored, duplicates, partial, skipped, errors, ttime, detected_sitename) = self._import_hh_file(
+                fpdbfile, parsed
+            )
         if fpdbfile.ftype == "summary":
             (stored, duplicates, partial, skipped, errors, ttime) = self._import_summary_file(fpdbfile)
         if fpdbfile.ftype == "both" and fpdbfile.path not in self.updatedsize:
@@ -1014,17 +1138,48 @@ class Importer:
             self._run_updated_cycle()
         _profile_reporter.maybe_log()
 
+    def _changed_paths(self) -> set[str] | None:
+        """Paths the watcher saw change, or None when the cycle must walk everything."""
+        watcher = getattr(self, "watcher", None)
+        if watcher is None:
+            return None
+        changed = watcher.take()
+        if changed is None or time() - self._last_full_scan >= FULL_RESCAN_SECONDS:
+            self._last_full_scan = time()
+            return None
+        return changed
+
     def _run_updated_cycle(self) -> None:
-        """One pass over the tracked directories and files."""
-        for site, type in self.dirlist:
-            self.addImportDirectory(
-                self.dirlist[(site, type)][0],
-                False,
-                (site, type),
-                self.dirlist[(site, type)][1],
-            )
+        """One pass over the tracked directories and files.
 
-        for f in list(self.filelist):
+        With a file watcher only the files it reported are looked at; otherwise
+        (and every ``FULL_RESCAN_SECONDS``) the monitored directories are walked
+        and every tracked file is stat-ed.
+        """
+        changed = self._changed_paths()
+        if changed is None:
+            for site, type in self.dirlist:
+                self.addImportDirectory(
+                    self.dirlist[(site, type)][0],
+                    False,
+                    (site, type),
+                    self.dirlist[(site, type)][1],
+                )
+            candidates = list(self.filelist)
+        else:
+            for path in sorted(changed):
+                if path in self.filelist or os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                if self.addImportFile(path, "auto"):
+                    # Reported by the watcher, so written just now: import it in
+                    # this cycle rather than only noting its size, as a walk does
+                    # for a file it has not seen before.
+                    self.updatedsize[path] = 0
+                    self.updatedtime[path] = 0
+            # Files first seen by a walk wait one cycle for their first import.
+            candidates = [f for f in self.filelist if f in changed or self.updatedsize.get(f) == 0]
+
+        for f in candidates:
             tracked_file = self.filelist.get(f)
             if tracked_file is None:
                 continue
@@ -1114,12 +1269,13 @@ class Importer:
         for file in self.removeFromFileList:
             if file in self.filelist:
                 del self.filelist[file]
+            self.tail_readers.pop(file, None)
 
         self.removeFromFileList = {}
         self.database.rollback()
         self.runPostImport()
 
-    def _import_hh_file(self, fpdbfile):  # noqa: C901, PLR0912, PLR0915
+    def _import_hh_file(self, fpdbfile, parsed=None):  # noqa: C901, PLR0912, PLR0915
         """Import a hand history file and process its contents.
 
         Loads the appropriate hand history converter, processes the file, updates the database, and handles HUD and summary processing as needed.
@@ -1133,6 +1289,8 @@ class Importer:
 
         Args:
             fpdbfile: The file object representing the hand history file to import.
+            parsed: An ``import_pipeline.ParsedFile`` when a worker process has
+                already parsed the file; it then stands in for the converter.
 
         Returns:
             tuple: A tuple containing the number of stored, duplicate, partial, skipped, and error hands, the import time, and the detected site name.
@@ -1161,22 +1319,30 @@ class Importer:
             else:
                 self.pos_in_file[fpdbfile.path], idx = 0, 0
 
-            hhc = obj(
-                self.config,
-                in_path=fpdbfile.path,
-                index=idx,
-                autostart=False,
-                starsArchive=fpdbfile.archive,
-                ftpArchive=fpdbfile.archive,
-                sitename=fpdb_site.name,
-            )
-            if filter_name == "PartyPoker":
-                # Party tournament results are embedded in hand histories.
-                # Reuse the Importer's connection without making standalone
-                # hand parsing open a database by itself.
-                setattr(hhc, "db", self.database)
-            hhc.setAutoPop(self.mode == "auto")
-            hhc.start()
+            if parsed is not None:
+                hhc = parsed
+                hhc.attach_config(self.config)
+                # Count the worker's parse in this file's import time.
+                ttime -= hhc.parse_seconds
+            else:
+                hhc = obj(
+                    self.config,
+                    in_path=fpdbfile.path,
+                    index=idx,
+                    autostart=False,
+                    starsArchive=fpdbfile.archive,
+                    ftpArchive=fpdbfile.archive,
+                    sitename=fpdb_site.name,
+                )
+                if filter_name == "PartyPoker":
+                    # Party tournament results are embedded in hand histories.
+                    # Reuse the Importer's connection without making standalone
+                    # hand parsing open a database by itself.
+                    setattr(hhc, "db", self.database)
+                hhc.setAutoPop(self.mode == "auto")
+                if self.mode == "auto":
+                    hhc.setTailReader(self.tail_readers.setdefault(fpdbfile.path, TailReader(fpdbfile.path)))
+                hhc.start()
 
             # Add parsing issues to the main importer's list
             for issue in hhc.parsing_issues:
@@ -1220,6 +1386,9 @@ class Importer:
             detected_sitename = getattr(hhc, "sitename", None)
 
             self.pos_in_file[fpdbfile.path] = hhc.getLastCharacterRead()
+            tail_reader = getattr(hhc, "tail_reader", None)
+            if tail_reader is not None:
+                tail_reader.release(self.pos_in_file[fpdbfile.path])
 
             # Tally the results
             partial = hhc.numPartial
@@ -1232,6 +1401,7 @@ class Importer:
 
             # Initialize variables that are used later in the function
             (phands, ahands, ihands, to_hud) = ([], [], [], [])
+            hud_rows = {}
 
             if stored > 0:
                 with self.database.transaction():
@@ -1251,6 +1421,11 @@ class Importer:
                         log.debug(f"final import of hand: {hand}")
                         phands.append(hand)
 
+                    # One batched lookup for the whole file, answered from
+                    # memory by getHandId below.
+                    lookups = self.database.duplicate_lookups.copy()
+                    self.database.prefetchDuplicates(phands)
+
                     # Everything below runs inside the surrounding
                     # database.transaction() context manager above.
                     backtrack = False
@@ -1269,7 +1444,7 @@ class Importer:
                             )
                             hand.updateCardsCache(self.database, None, doinsert)
                             hand.updatePositionsCache(self.database, None, doinsert)
-                            hand.updateHudCache(self.database, doinsert)
+                            hud_rows[hand.dbid_hands] = hand.updateHudCache(self.database, doinsert)
                             hand.updateTourneyResults(self.database)
                             ihands.append(hand)
                             to_hud.append(hand.dbid_hands)
@@ -1366,6 +1541,12 @@ class Importer:
                             hand.updateHudCache(self.database, doinsert)
                             hand.handsplayers, hand.hero = hp, hero
 
+                    lookups = self.database.duplicate_lookups - lookups
+                    log.info(
+                        f"Duplicate check for {len(phands)} hands: {lookups['memory']} answered from memory, "
+                        f"{lookups['database']} database queries",
+                    )
+
                     for i in range(len(ihands)):
                         doinsert = len(ihands) == i + 1
                         hand = ihands[i]
@@ -1384,8 +1565,8 @@ class Importer:
                         hand.insertHandsShowdown(self.database, doinsert)
                         hand.insertHandsCashout(self.database, doinsert)
 
-                    # Cache HHC if enabled
-                    if self.settings.get("cacheHHC", False):
+                    # Cache HHC if enabled (a worker's ParsedFile is not a converter)
+                    if self.settings.get("cacheHHC", False) and parsed is None:
                         self.handhistoryconverter = hhc
                         # Keyed too, so a caller comparing a whole directory gets
                         # each file's own converter instead of the last one.
@@ -1405,7 +1586,7 @@ class Importer:
                     for hid in to_hud:
                         try:
                             log.info(f"Sending hand ID {hid} to HUD via ZMQ socket")
-                            zmq_sender.send_hand_id(hid)
+                            zmq_sender.send_hand_id(hid, hudcache=hud_rows.get(hid))
                         except OSError as e:
                             log.exception(f"Failed to send hand ID to HUD via socket: {e}")
         elif self.mode == "auto":
@@ -1666,6 +1847,9 @@ class Importer:
             except Exception as e:  # intentional broad catch: cleanup should never mask caller outcome.
                 log.warning(f"Error closing ZMQ sender during cleanup: {e}")
 
+        if getattr(self, "watcher", None) is not None:
+            self.stopWatching()
+
         # Close database connections
         if hasattr(self, "database") and self.database is not None:
             try:
@@ -25,7 +25,12 @@ import re
 from decimal import Decimal
 from typing import Any
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 # KingsClub HH Format
@@ -300,6 +305,9 @@ class KingsClub(HandHistoryConverter):
         re.MULTILINE | re.VERBOSE,
     )
 
+    @cached_player_regexes(
+        "re_HeroCards",
+    )
     def compilePlayerRegexs(self, hand) -> None:
         players = {player[1] for player in hand.players}
         if not players <= self.compiledPlayers:  # x <= y means 'x is subset of y'
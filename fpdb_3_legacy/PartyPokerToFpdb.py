@@ -25,7 +25,12 @@ import re
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 # Getting configured logger
@@ -411,6 +416,19 @@ class PartyPoker(HandHistoryConverter):
 
         return filtered_hands
 
+    @cached_player_regexes(
+        "re_PostSB",
+        "re_PostBB",
+        "re_PostDead",
+        "re_PostBUB",
+        "re_Antes",
+        "re_Action",
+        "re_HeroCards",
+        "re_ShownCards",
+        "re_CollectPot",
+        "re_CashOutAmount",
+        variant=lambda self, hand: (hand.gametype["currency"], self.sym.get(hand.gametype["currency"], "")),
+    )
     def compilePlayerRegexs(self, hand) -> None:
         log.debug(f"Starting regex compilation for players hand_id: {hand.handid}")
 
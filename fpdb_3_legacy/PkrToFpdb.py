@@ -27,7 +27,13 @@ import datetime
 import re
 from decimal import Decimal
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter, log
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+    log,
+)
 
 
 class Pkr(HandHistoryConverter):
@@ -136,6 +142,20 @@ class Pkr(HandHistoryConverter):
         """(?P<D>[0-9]{2}) (?P<M>\\w+) (?P<Y>[0-9]{4}) (?P<H>[0-9]+):(?P<MIN>[0-9]+):(?P<S>[0-9]+)""", re.MULTILINE
     )
 
+    @cached_player_regexes(
+        "re_PostSB",
+        "re_PostBB",
+        "re_Antes",
+        "re_BringIn",
+        "re_Post",
+        "re_HeroCards",
+        "re_Action",
+        "re_ShowdownAction",
+        "re_CollectPot",
+        "re_sitsOut",
+        "re_ShownCards",
+        variant=lambda self, hand: self.sym[hand.gametype["currency"]],
+    )
     def compilePlayerRegexs(self, hand):
         players = set([player[1] for player in hand.players])
         if not players <= self.compiledPlayers:  # x <= y means 'x is subset of y'
@@ -34,7 +34,12 @@ from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 if TYPE_CHECKING:
@@ -163,6 +168,7 @@ class PokerStars(HandHistoryConverter):
 
     sitename = "PokerStars"
     compiledPlayers: set[str] = set()
+    _any_player_regexs_by_site: ClassVar[dict[int, tuple[re.Pattern[str], re.Pattern[str]]]] = {}
     filetype = "text"
     codepage = ("utf8", "cp1252", "ISO-8859-1")
     site_id = 32  # Default to PokerStars.COM, will be overridden by detectPokerStarsSkin
@@ -770,7 +776,11 @@ class PokerStars(HandHistoryConverter):
     def compilePlayerRegexs(self, hand: Hand) -> None:  # type: ignore[override]
         """Compiles player-specific regular expressions for parsing hand text.
 
-        Generates and stores regex patterns for hero cards and shown cards based on the current set of players in the hand.
+        Fast-fold tables seat a new set of players almost every hand, and the
+        regexes naming them cost far more to compile than the hand costs to
+        parse. So the hand is first read with regexes matching any name, which
+        are kept as long as every name they find is seated; otherwise the
+        regexes spelling out the seated players are compiled.
 
         Args:
             hand ("Hand"): The hand object containing player information.
@@ -779,44 +789,79 @@ class PokerStars(HandHistoryConverter):
             None
         """
         players = {player[1] for player in hand.players}
+        hand_text = getattr(hand, "handText", None)
+        hero_cards, shown_cards = self._any_player_regexs()
+        if isinstance(hand_text, str) and all(
+            found.group("PNAME") in players for regex in (hero_cards, shown_cards) for found in regex.finditer(hand_text)
+        ):
+            self.re_hero_cards, self.re_shown_cards = hero_cards, shown_cards
+            # The next hand is checked again, whoever is seated.
+            self.compiledPlayers = set()
+            return
+        self._compile_seated_player_regexs(hand)
+
+    def _any_player_regexs(self) -> tuple[re.Pattern[str], re.Pattern[str]]:
+        """Return the hero-cards and shown-cards regexes with a name-agnostic player group."""
+        site_id = self.siteId
+        regexs = self._any_player_regexs_by_site.get(site_id) if site_id is not None else None
+        if regexs is None:
+            regexs = self._player_regexs(r"(?P<PNAME>.+?)")
+            # A converter that has not identified its skin yet is not cached.
+            if site_id is not None:
+                self._any_player_regexs_by_site[site_id] = regexs
+        return regexs
+
+    @cached_player_regexes(
+        "re_hero_cards",
+        "re_shown_cards",
+        variant=lambda self, hand: self.siteId,
+    )
+    def _compile_seated_player_regexs(self, hand: Hand) -> None:
+        """Compile the hero-cards and shown-cards regexes for the players seated at ``hand``."""
+        players = {player[1] for player in hand.players}
         if not players <= self.compiledPlayers:  # x <= y means 'x is subset of y'
             self.compiledPlayers = players
             player_re = "(?P<PNAME>" + "|".join(map(re.escape, players)) + ")"
-            subst = {
-                "PLYR": player_re,
-                "BRKTS": (
-                    r"(\(button\) |\(small blind\) |\(big blind\) |"
-                    r"\(button\) \(small blind\) |\(button\) \(big blind\) )?"
+            self.re_hero_cards, self.re_shown_cards = self._player_regexs(player_re)
+
+    def _player_regexs(self, player_re: str) -> tuple[re.Pattern[str], re.Pattern[str]]:
+        """Build the hero-cards and shown-cards regexes around the ``player_re`` name group."""
+        subst = {
+            "PLYR": player_re,
+            "BRKTS": (
+                r"(\(button\) |\(small blind\) |\(big blind\) |"
+                r"\(button\) \(small blind\) |\(button\) \(big blind\) )?"
+            ),
+            "CUR": "(\\$|\xe2\x82\xac|\u20ac||\\£|)",
+        }
+        if self.siteId == SITE_MERGE:
+            hero_cards = re.compile(
+                r"Dealt\sto\s(?P<PNAME>(?![A-Z][a-z]+\s[A-Z]).+?)"
+                r"(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])".format(),
+                re.MULTILINE,
+            )
+            shown_cards = re.compile(
+                r"Seat (?P<SEAT>[0-9]+): {PLYR} {BRKTS}(?P<SHOWED>showed|mucked) \[(?P<CARDS>.*)\]"
+                r"( and (lost|(won|collected) {CUR}(?P<POT>[,\.\d]+) with (?P<STRING>.+?))"
+                r"(,\sand\s(lost|won\s{CUR}[\.\d]+\swith\s(?P<STRING2>.*)))?)?$".format(
+                    **subst,
                 ),
-                "CUR": "(\\$|\xe2\x82\xac|\u20ac||\\£|)",
-            }
-            if self.siteId == SITE_MERGE:
-                self.re_hero_cards = re.compile(
-                    r"Dealt\sto\s(?P<PNAME>(?![A-Z][a-z]+\s[A-Z]).+?)"
-                    r"(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])".format(),
-                    re.MULTILINE,
-                )
-                self.re_shown_cards = re.compile(
-                    r"Seat (?P<SEAT>[0-9]+): {PLYR} {BRKTS}(?P<SHOWED>showed|mucked) \[(?P<CARDS>.*)\]"
-                    r"( and (lost|(won|collected) {CUR}(?P<POT>[,\.\d]+) with (?P<STRING>.+?))"
-                    r"(,\sand\s(lost|won\s{CUR}[\.\d]+\swith\s(?P<STRING2>.*)))?)?$".format(
-                        **subst,
-                    ),
-                    re.MULTILINE,
-                )
-            else:
-                self.re_hero_cards = re.compile(
-                    r"Dealt to {PLYR}(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])".format(**subst),
-                    re.MULTILINE,
-                )
-                self.re_shown_cards = re.compile(
-                    r"Seat (?P<SEAT>[0-9]+): {PLYR} {BRKTS}(?P<SHOWED>showed|mucked) \[(?P<CARDS>.*)\]"
-                    r"( and (lost|(won|collected) \({CUR}(?P<POT>[,\.\d]+)\)) with (?P<STRING>.+?)"
-                    r"(,\sand\s(won\s\({CUR}[\.\d]+\)|lost)\swith\s(?P<STRING2>.*))?)?$".format(
-                        **subst,
-                    ),
-                    re.MULTILINE,
-                )
+                re.MULTILINE,
+            )
+        else:
+            hero_cards = re.compile(
+                r"Dealt to {PLYR}(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])".format(**subst),
+                re.MULTILINE,
+            )
+            shown_cards = re.compile(
+                r"Seat (?P<SEAT>[0-9]+): {PLYR} {BRKTS}(?P<SHOWED>showed|mucked) \[(?P<CARDS>.*)\]"
+                r"( and (lost|(won|collected) \({CUR}(?P<POT>[,\.\d]+)\)) with (?P<STRING>.+?)"
+                r"(,\sand\s(won\s\({CUR}[\.\d]+\)|lost)\swith\s(?P<STRING2>.*))?)?$".format(
+                    **subst,
+                ),
+                re.MULTILINE,
+            )
+        return hero_cards, shown_cards
 
     def readSupportedGames(self) -> list[list[str]]:
         """Returns a list of supported game types for PokerStars.
@@ -10,6 +10,7 @@ from fpdb_3_legacy.sql_metadata import metadata_queries
 from fpdb_3_legacy.sql_queries_aof import aof_queries
 from fpdb_3_legacy.sql_queries_cache_maintenance import cache_maintenance_queries
 from fpdb_3_legacy.sql_queries_cache_rebuild import cache_rebuild_queries
+from fpdb_3_legacy.sql_queries_cache_upsert import cache_upsert_queries
 from fpdb_3_legacy.sql_queries_cards_cache_write import cards_cache_write_queries
 from fpdb_3_legacy.sql_queries_cash_profit import cash_profit_queries
 from fpdb_3_legacy.sql_queries_core import core_lookup_queries
@@ -17,6 +18,7 @@ from fpdb_3_legacy.sql_queries_database_admin import database_admin_queries
 from fpdb_3_legacy.sql_queries_filters import filter_queries
 from fpdb_3_legacy.sql_queries_game_types import game_type_queries
 from fpdb_3_legacy.sql_queries_hand_artifacts import hand_artifact_queries
+from fpdb_3_legacy.sql_queries_hand_batch import hand_batch_queries
 from fpdb_3_legacy.sql_queries_hand_detail import hand_detail_queries
 from fpdb_3_legacy.sql_queries_hand_player_persistence import hand_player_persistence_queries
 from fpdb_3_legacy.sql_queries_hand_root_persistence import hand_root_persistence_queries
@@ -33,6 +35,7 @@ from fpdb_3_legacy.sql_queries_player_position import player_position_stats_quer
 from fpdb_3_legacy.sql_queries_player_stats import player_stats_queries
 from fpdb_3_legacy.sql_queries_positions_cache_write import positions_cache_write_queries
 from fpdb_3_legacy.sql_queries_replayer import replayer_queries
+from fpdb_3_legacy.sql_queries_ring_stats_scan import ring_stats_scan_queries
 from fpdb_3_legacy.sql_queries_session_cache_write import session_cache_write_queries
 from fpdb_3_legacy.sql_queries_session_stats import session_stats_queries
 from fpdb_3_legacy.sql_queries_tournament_graph import tournament_graph_queries
@@ -46,7 +49,7 @@ from fpdb_3_legacy.sql_schema_core import core_schema_queries
 from fpdb_3_legacy.sql_schema_game import game_schema_queries
 from fpdb_3_legacy.sql_schema_hand import hand_schema_queries
 from fpdb_3_legacy.sql_schema_hand_player import hand_player_schema_queries
-from fpdb_3_legacy.sql_schema_hand_root import root_hand_schema_queries
+from fpdb_3_legacy.sql_schema_hand_root import hand_id_block_queries, root_hand_schema_queries
 from fpdb_3_legacy.sql_schema_hud_cache import hud_cache_schema_queries
 from fpdb_3_legacy.sql_schema_import import import_schema_queries
 from fpdb_3_legacy.sql_schema_lookup import lookup_schema_queries
@@ -100,6 +103,7 @@ class Sql:
         self.query.update(hand_schema_queries(db_server))
         self.query.update(hand_player_schema_queries(db_server))
         self.query.update(root_hand_schema_queries(db_server))
+        self.query.update(hand_id_block_queries(db_server))
         self.query.update(hud_cache_schema_queries(db_server))
         self.query.update(import_schema_queries(db_server))
         self.query.update(lookup_schema_queries(db_server))
@@ -117,10 +121,12 @@ class Sql:
         self.query.update(cash_profit_queries())
         self.query.update(cache_maintenance_queries())
         self.query.update(cache_rebuild_queries(db_server))
+        self.query.update(cache_upsert_queries(db_server))
         self.query.update(cards_cache_write_queries())
         self.query.update(filter_queries(db_server))
         self.query.update(game_type_queries(db_server))
         self.query.update(hand_artifact_queries())
+        self.query.update(hand_batch_queries())
         self.query.update(hand_detail_queries())
         self.query.update(hand_player_persistence_queries())
         self.query.update(hand_root_persistence_queries())
@@ -137,6 +143,7 @@ class Sql:
         self.query.update(player_stats_queries(db_server))
         self.query.update(positions_cache_write_queries())
         self.query.update(replayer_queries())
+        self.query.update(ring_stats_scan_queries(db_server))
         self.query.update(session_cache_write_queries())
         self.query.update(session_stats_queries(db_server))
         self.query.update(tournament_player_detailed_queries(db_server))
@@ -25,7 +25,12 @@ import re
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 if TYPE_CHECKING:
@@ -199,6 +204,10 @@ class SealsWithClubs(HandHistoryConverter):
         """True for the legacy 2013 'Seals With Clubs' text format."""
         return self.re_NewFormat.search(text) is None
 
+    @cached_player_regexes(
+        "re_HeroCards",
+        "re_ShownCards",
+    )
     def compilePlayerRegexs(self, hand) -> None:
         """Compiles regular expressions to match player names and cards shown in a poker hand.
 
@@ -24,7 +24,12 @@ from decimal import Decimal
 from re import Match
 from typing import TYPE_CHECKING, Any, ClassVar
 
-from fpdb_3_legacy.HandHistoryConverter import FpdbHandPartial, FpdbParseError, HandHistoryConverter
+from fpdb_3_legacy.HandHistoryConverter import (
+    FpdbHandPartial,
+    FpdbParseError,
+    HandHistoryConverter,
+    cached_player_regexes,
+)
 from fpdb_3_legacy.loggingFpdb import get_logger
 
 if TYPE_CHECKING:
@@ -184,6 +189,22 @@ class Winamax(HandHistoryConverter):
         r"Seat\s(?P<SEAT>[0-9]+):\s(?P<PNAME>.+?)\s".format(),
     )
 
+    @cached_player_regexes(
+        "re_post_sb",
+        "re_post_bb",
+        "re_deny_sb",
+        "re_antes",
+        "re_bring_in",
+        "re_post_both",
+        "re_post_dead",
+        "re_post_second_sb",
+        "re_dealt_cards",
+        "re_action",
+        "re_showdown_action",
+        "re_collect_pot",
+        "re_shown_cards",
+        variant=lambda self, hand: self.sym[hand.gametype["currency"]],
+    )
     def compilePlayerRegexs(self, hand: Hand) -> None:  # type: ignore[override]
         """Compile player-specific regex patterns based on players in the hand.
 
@@ -20,10 +20,11 @@ from __future__ import annotations
 # for table detection. The legacy X11 code has been replaced with the unified
 # TableDetector interface for better maintainability and testing.
 #    Standard Library modules
+from collections.abc import Callable
 from typing import Any
 
 #    Other Library modules
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QObject, QSocketNotifier, Qt
 from PySide6.QtGui import QWindow
 
 from fpdb.infrastructure.platform import get_table_detector
@@ -37,6 +38,31 @@ c = Configuration.Config()
 log = get_logger("x_tables")
 
 
+def watch_table_windows(parent: QObject, on_change: Callable[[set[int]], None]) -> QSocketNotifier | None:
+    """Call ``on_change`` with the ids of windows X reports moved, resized, retitled or closed.
+
+    The X connection's socket is watched from the Qt event loop, so changes
+    are handled as they arrive rather than on the HUD's next tick. Returns
+    None, and the HUD keeps polling, when the detector has no event tracker;
+    the notifier turns itself off if the tracker closes later.
+    """
+    tracker = getattr(get_table_detector(), "tracker", None)
+    if tracker is None:
+        return None
+    tracker.add_listener(lambda changes: on_change({change.window for change in changes}))
+    notifier = QSocketNotifier(tracker.fileno(), QSocketNotifier.Type.Read, parent)
+
+    def on_readable(*_: object) -> None:
+        tracker.process_events()
+        if tracker.closed:
+            # A dead connection's socket stays readable.
+            notifier.setEnabled(False)
+
+    notifier.activated.connect(on_readable)
+    log.info("Tracking table windows from X11 events")
+    return notifier
+
+
 class Table(Table_Window):
     """X11/Linux specific table window implementation.
 
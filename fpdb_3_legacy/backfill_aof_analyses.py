@@ -22,6 +22,7 @@ from fpdb_3_legacy.aof_equity import KNOWN_BACKEND, KNOWN_BACKEND_VERSION, Known
 from fpdb_3_legacy.autonotes_aof import extract_decisions
 from fpdb_3_legacy.equity import EquityEngine
 from fpdb_3_legacy.equity_async import AsyncEquityService
+from fpdb_3_legacy.equity_store import default_store_path, open_store
 
 
 def _hand_ids_with_missing_analyses(db: Any, after_id: int, limit: int) -> list[int]:
@@ -73,11 +74,17 @@ def backfill_analyses(
     status_callback: Callable[[str], None] | None = None,
     db_factory: Callable[[], Any] | None = None,
     engine: EquityEngine | None = None,
+    equity_cache: bool = True,
+    equity_workers: int = 1,
 ) -> dict[str, int]:
     """Submit hands with missing analyses to the async analysis pipeline.
 
     When *commit* is *False* the method is a scan-only dry run that counts
-    eligible hands and decisions without writing anything.
+    eligible hands and decisions without writing anything. With
+    *equity_cache*, equities computed by earlier runs and other processes are
+    read from the on-disk equity cache instead of being computed again.
+    *equity_workers* spreads each population-range equity over that many
+    processes.
     """
     config = Configuration.Config(file=config_file)
     owns_db = db is None
@@ -88,10 +95,16 @@ def backfill_analyses(
         db.ensure_feature_tables()
 
     coordinator: KnownCardsAnalysisCoordinator | None = None
+    store = None
+    owns_engine = False
     if commit:
+        if engine is None:
+            store = open_store(default_store_path(config)) if equity_cache else None
+            engine = EquityEngine(store=store, max_workers=max(1, int(equity_workers)))
+            owns_engine = True
         factory = db_factory or (lambda: Database.Database(config))
         coordinator = KnownCardsAnalysisCoordinator(
-            AsyncEquityService(engine or EquityEngine()),
+            AsyncEquityService(engine),
             db_factory=factory,
         )
 
@@ -106,6 +119,16 @@ def backfill_analyses(
 
     if coordinator is not None:
         coordinator.close()
+        lookups = engine.cache_lookups
+        if status_callback is not None:
+            status_callback(
+                f"Equities: {lookups['computed']} computed, {lookups['store']} from the equity cache, "
+                f"{lookups['memory']} from memory",
+            )
+    if owns_engine:
+        engine.close()
+    if store is not None:
+        store.close()
     if owns_db:
         db.close_connection()
     return stats
@@ -163,6 +186,17 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--batch-size", type=int, default=50)
     parser.add_argument("--limit", type=int)
     parser.add_argument("--start-after", type=int, default=0, help="Resume after this hand id")
+    parser.add_argument(
+        "--no-equity-cache",
+        action="store_true",
+        help="Compute every equity instead of reusing the on-disk equity cache",
+    )
+    parser.add_argument(
+        "--equity-workers",
+        type=int,
+        default=1,
+        help="Processes sharing each population-range equity calculation (default 1)",
+    )
     args = parser.parse_args(argv)
     stats = backfill_analyses(
         config_file=args.config,
@@ -171,6 +205,8 @@ def main(argv: list[str] | None = None) -> int:
         limit=args.limit,
         start_after=args.start_after,
         status_callback=print,
+        equity_cache=not args.no_equity_cache,
+        equity_workers=args.equity_workers,
     )
     print(
         f"Scanned {stats['hands']} hands, submitted {stats['hands_submitted']} "
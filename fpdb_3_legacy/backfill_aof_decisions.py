@@ -13,7 +13,7 @@ from typing import Any
 
 from fpdb_3_legacy import Configuration, Database
 from fpdb_3_legacy.autonotes_aof import AOF_CATEGORIES, AofDecision, extract_decisions
-from fpdb_3_legacy.backfill_autonotes import load_hand_from_database
+from fpdb_3_legacy.backfill_autonotes import load_hands_from_database
 
 
 def _hand_ids_after(db: Any, after_id: int, limit: int) -> list[int]:
@@ -90,9 +90,10 @@ def backfill_database(
 
 def _read_batch(db: Any, hand_ids: list[int], stats: dict[str, int]) -> list[AofDecision]:
     pending: list[AofDecision] = []
+    hands = load_hands_from_database(db, hand_ids)
     for hand_id in hand_ids:
         stats["hands"] += 1
-        hand = load_hand_from_database(db, hand_id)
+        hand = hands.get(hand_id)
         decisions = extract_decisions(hand) if hand is not None else []
         if decisions:
             stats["matched_hands"] += 1
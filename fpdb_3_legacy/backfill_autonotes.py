@@ -26,9 +26,12 @@ from fpdb_3_legacy.AutoNotes import (
     configured_rule_summary,
     format_note_evidence,
     format_rule_summary,
+    format_rule_timings,
     generate_for_hand,
     rule_manifest,
     rule_set_enabled,
+    start_rule_timing,
+    stop_rule_timing,
 )
 from fpdb_3_legacy.autonotes_aof import is_aof_category
 from fpdb_3_legacy.iPoker.dispatcher import get_parser_class_for_path as get_ipoker_parser_class_for_path
@@ -37,6 +40,9 @@ from fpdb_3_legacy.parser_registry import get_parser_class
 
 log = get_logger("backfill_autonotes")
 
+# Stored hands read per round of queries when backfilling from the database.
+DATABASE_HAND_BATCH = 200
+
 _HH_EXTENSIONS = (".txt", ".xml", ".hh", ".log")
 STREET_BY_ID = {
     -1: "BLINDSANTES",
@@ -378,8 +384,11 @@ def _database_hand_ids(db, limit=1000, date_from=None, date_to=None, site_id=Non
     return [row[0] for row in c.fetchall()]
 
 
-def _database_hand_row(db, hand_id) -> dict | None:
-    placeholder = db.sql.query["placeholder"]
+def _hand_ids_in(db, hand_ids) -> str:
+    return ", ".join([db.sql.query["placeholder"]] * len(hand_ids))
+
+
+def _database_hand_rows(db, hand_ids) -> dict:
     c = db.get_cursor()
     c.execute(
         'SELECT H.id, H.siteHandNo AS "siteHandNo", H.tourneyId AS "tourneyId", H.startTime AS "startTime", H.seats, H.heroSeat AS "heroSeat", '
@@ -387,51 +396,74 @@ def _database_hand_row(db, hand_id) -> dict | None:
         'H.street0Pot AS "street0Pot", H.street1Pot AS "street1Pot", H.street2Pot AS "street2Pot", H.street3Pot AS "street3Pot", H.street4Pot AS "street4Pot", H.finalPot AS "finalPot", '
         'G.siteId AS "siteId", G.type, G.base, G.category, G.limitType AS "limitType", G.smallBlind AS "smallBlind", G.bigBlind AS "bigBlind" '
         'FROM Hands H JOIN Gametypes G ON H.gametypeId=G.id '
-        f'WHERE H.id={placeholder}',
-        (hand_id,),
+        f'WHERE H.id IN ({_hand_ids_in(db, hand_ids)})',
+        tuple(hand_ids),
     )
-    row = c.fetchone()
-    return _row_dict(c, row) if row else None
+    rows = [_row_dict(c, row) for row in c.fetchall()]
+    return {row["id"]: row for row in rows}
 
 
-def _database_player_rows(db, hand_id) -> list[dict]:
-    placeholder = db.sql.query["placeholder"]
+def _database_player_rows(db, hand_ids) -> dict:
     c = db.get_cursor()
     card_columns = ", ".join(f'HP.card{index} AS "card{index}"' for index in range(1, 21))
     c.execute(
-        'SELECT HP.playerId AS "playerId", P.name AS "name", HP.seatNo AS "seatNo", HP.position, HP.startCash AS "startCash", HP.effStack AS "effStack", '
+        'SELECT HP.handId AS "handId", HP.playerId AS "playerId", P.name AS "name", HP.seatNo AS "seatNo", HP.position, HP.startCash AS "startCash", HP.effStack AS "effStack", '
         f'{card_columns}, HP.totalProfit AS "totalProfit", HP.winnings, HP.comment, HP.wonAtSD AS "wonAtSD", HP.sawShowdown AS "sawShowdown", '
         'HP.cnt_f_spr, HP.val_f_spr, HP.cnt_t_spr, HP.val_t_spr, HP.cnt_r_spr, HP.val_r_spr '
         'FROM HandsPlayers HP JOIN Players P ON HP.playerId=P.id '
-        f'WHERE HP.handId={placeholder} ORDER BY HP.seatNo',
-        (hand_id,),
+        f'WHERE HP.handId IN ({_hand_ids_in(db, hand_ids)}) ORDER BY HP.handId, HP.seatNo',
+        tuple(hand_ids),
     )
-    return [_row_dict(c, row) for row in c.fetchall()]
+    rows: dict = {}
+    for row in c.fetchall():
+        player = _row_dict(c, row)
+        rows.setdefault(player["handId"], []).append(player)
+    return rows
 
 
-def _database_action_rows(db, hand_id) -> list[dict]:
-    placeholder = db.sql.query["placeholder"]
+def _database_action_rows(db, hand_ids) -> dict:
     c = db.get_cursor()
     c.execute(
-        'SELECT HA.street, HA.actionNo AS "actionNo", HA.streetActionNo AS "streetActionNo", HA.amount, HA.raiseTo AS "raiseTo", HA.amountCalled AS "amountCalled", '
+        'SELECT HA.handId AS "handId", HA.street, HA.actionNo AS "actionNo", HA.streetActionNo AS "streetActionNo", HA.amount, HA.raiseTo AS "raiseTo", HA.amountCalled AS "amountCalled", '
         'HA.numDiscarded AS "numDiscarded", HA.cardsDiscarded AS "cardsDiscarded", HA.allIn AS "allIn", P.name AS "playerName", A.name AS "actionName" '
         'FROM HandsActions HA '
         'JOIN Players P ON HA.playerId=P.id '
         'LEFT JOIN Actions A ON HA.actionId=A.id '
-        f'WHERE HA.handId={placeholder} ORDER BY HA.actionNo, HA.street, HA.streetActionNo',
-        (hand_id,),
+        f'WHERE HA.handId IN ({_hand_ids_in(db, hand_ids)}) ORDER BY HA.handId, HA.actionNo, HA.street, HA.streetActionNo',
+        tuple(hand_ids),
     )
-    return [_row_dict(c, row) for row in c.fetchall()]
+    rows: dict = {}
+    for row in c.fetchall():
+        action = _row_dict(c, row)
+        rows.setdefault(action["handId"], []).append(action)
+    return rows
+
+
+def load_hands_from_database(db, hand_ids) -> dict:
+    """Return ``{hand_id: hand}`` as load_hand_from_database would, from three queries per batch.
+
+    Hands that are missing or have no players map to None.
+    """
+    hands: dict = {}
+    ids = list(dict.fromkeys(hand_ids))
+    for start in range(0, len(ids), DATABASE_HAND_BATCH):
+        batch = ids[start : start + DATABASE_HAND_BATCH]
+        hand_rows = _database_hand_rows(db, batch)
+        player_rows = _database_player_rows(db, batch) if hand_rows else {}
+        action_rows = _database_action_rows(db, batch) if player_rows else {}
+        for hand_id in batch:
+            hand_row = hand_rows.get(int(hand_id))
+            players = player_rows.get(int(hand_id))
+            hands[hand_id] = (
+                DatabaseAutoNoteHand(hand_row, players, action_rows.get(int(hand_id), []))
+                if hand_row and players
+                else None
+            )
+    return hands
 
 
 def load_hand_from_database(db, hand_id) -> DatabaseAutoNoteHand | None:
-    hand_row = _database_hand_row(db, hand_id)
-    if not hand_row:
-        return None
-    player_rows = _database_player_rows(db, hand_id)
-    if not player_rows:
-        return None
-    return DatabaseAutoNoteHand(hand_row, player_rows, _database_action_rows(db, hand_id))
+    return load_hands_from_database(db, [hand_id])[hand_id]
 
 
 def _prepare_hand_for_autonotes(hand, db_hand_id, player_ids, config=None, rule_set_ids=None, rule_ids=None):
@@ -585,6 +617,8 @@ def format_stats_json(stats, commit=False, rule_set_ids=None, rule_ids=None) ->
         "rule_sets_filter": sorted(rule_set_ids) if rule_set_ids else [],
         "rules_filter": sorted(rule_ids) if rule_ids else [],
     }
+    if "rule_timings" in stats:
+        payload["rule_timings"] = stats["rule_timings"]
     return json.dumps(payload, sort_keys=True)
 
 
@@ -817,18 +851,22 @@ def backfill_database_preview(
         "source": "database",
     }
 
-    for hand_id in _database_hand_ids(
+    hand_ids = _database_hand_ids(
         db,
         limit=limit,
         date_from=date_from,
         date_to=date_to,
         site_id=site_id,
         limit_type=limit_type,
-    ):
+    )
+    loaded: dict = {}
+    for index, hand_id in enumerate(hand_ids):
+        if index % DATABASE_HAND_BATCH == 0:
+            loaded = load_hands_from_database(db, hand_ids[index : index + DATABASE_HAND_BATCH])
         stats["hands"] += 1
         if status_callback and stats["hands"] % 100 == 1:
             status_callback(f"Scanning database hand {stats['hands']} / {limit}")
-        hand = load_hand_from_database(db, hand_id)
+        hand = loaded.get(hand_id)
         if hand is None:
             stats["unmatched_hands"] = stats.get("unmatched_hands", 0) + 1
             continue
@@ -981,6 +1019,40 @@ def backfill_with_optional_import(
     )
 
 
+def _run_backfill(args, rule_set_ids, rule_ids):
+    if args.from_db:
+        stats = backfill_database_preview(
+            commit=args.commit,
+            config_file=args.config,
+            rule_set_ids=rule_set_ids,
+            rule_ids=rule_ids,
+            limit=args.limit,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            site_id=args.site_id,
+            limit_type=args.limit_type,
+        )
+        stats.pop("preview", None)
+        return stats
+    if args.raw_preview:
+        stats = backfill_raw_preview(
+            args.paths,
+            config_file=args.config,
+            rule_set_ids=rule_set_ids,
+            rule_ids=rule_ids,
+        )
+        stats.pop("preview", None)
+        return stats
+    return backfill_with_optional_import(
+        args.paths,
+        commit=args.commit,
+        config_file=args.config,
+        rule_set_ids=rule_set_ids,
+        rule_ids=rule_ids,
+        import_missing=args.import_missing,
+    )
+
+
 def main(argv=None) -> int:
     parser = argparse.ArgumentParser(description="Backfill PlayerAutoNotes from hand-history files.")
     parser.add_argument("paths", nargs="*", help="Hand-history file(s) or directory(ies).")
@@ -1014,6 +1086,11 @@ def main(argv=None) -> int:
         action="append",
         help="Limit generation to one rule id. May be repeated or comma-separated.",
     )
+    parser.add_argument(
+        "--rule-timings",
+        action="store_true",
+        help="Time each rule's evaluation and report the slowest rules.",
+    )
     parser.add_argument("--json", action="store_true", dest="json_output", help="Print machine-readable JSON stats.")
     args = parser.parse_args(argv)
 
@@ -1049,36 +1126,14 @@ def main(argv=None) -> int:
     if not args.from_db and not args.paths:
         parser.error("paths are required unless --list-rules is used")
 
-    if args.from_db:
-        stats = backfill_database_preview(
-            commit=args.commit,
-            config_file=args.config,
-            rule_set_ids=rule_set_ids,
-            rule_ids=rule_ids,
-            limit=args.limit,
-            date_from=args.date_from,
-            date_to=args.date_to,
-            site_id=args.site_id,
-            limit_type=args.limit_type,
-        )
-        stats.pop("preview", None)
-    elif args.raw_preview:
-        stats = backfill_raw_preview(
-            args.paths,
-            config_file=args.config,
-            rule_set_ids=rule_set_ids,
-            rule_ids=rule_ids,
-        )
-        stats.pop("preview", None)
-    else:
-        stats = backfill_with_optional_import(
-            args.paths,
-            commit=args.commit,
-            config_file=args.config,
-            rule_set_ids=rule_set_ids,
-            rule_ids=rule_ids,
-            import_missing=args.import_missing,
-        )
+    if args.rule_timings:
+        start_rule_timing()
+    try:
+        stats = _run_backfill(args, rule_set_ids, rule_ids)
+    finally:
+        timings = stop_rule_timing() if args.rule_timings else None
+    if timings is not None:
+        stats["rule_timings"] = timings.report()
     if args.json_output:
         print(format_stats_json(stats, commit=args.commit, rule_set_ids=rule_set_ids, rule_ids=rule_ids))
         return 0
@@ -1122,6 +1177,8 @@ def main(argv=None) -> int:
     rule_set_counts = format_rule_counts(stats.get("rule_sets", {}))
     if rule_set_counts:
         print(f"rule_sets={rule_set_counts}")
+    if timings is not None:
+        print(format_rule_timings(timings))
     return 0
 
 
@@ -21,7 +21,7 @@ List capture devices::
 
     python -m fpdb_3_legacy.coinpoker_live_capture --list-ifaces
 
-Replay a saved pcap/pcapng file (no privileges; for testing)::
+Replay a saved pcap/pcapng file (no privileges, and read without libpcap)::
 
     python -m fpdb_3_legacy.coinpoker_live_capture --replay capture.pcap --dry-run
 
@@ -56,7 +56,9 @@ from fpdb_3_legacy.coinpoker_hand_builder import (
     tournament_result_announcements,
 )
 from fpdb_3_legacy.coinpoker_protocol import decode_frame
+from fpdb_3_legacy.equity import EquityEngine
 from fpdb_3_legacy.equity_async import AsyncEquityService
+from fpdb_3_legacy.equity_store import default_store_path, open_store
 from fpdb_3_legacy.Exceptions import FpdbHandDuplicate
 from fpdb_3_legacy.http_capture_hand_builder import (
     CaptureNotImportableError,
@@ -174,6 +176,7 @@ _HDR_RE = re.compile(
 _HEX_RE = re.compile(r"\s+0x[0-9a-f]+:\s+((?:[0-9a-f]{2,4}\s?)+)")
 
 _FRAME_FLAGS = frozenset({0x80, 0xA0})  # uncompressed / zlib frame start markers
+_FRAME_MARKERS = tuple(bytes([flag]) for flag in sorted(_FRAME_FLAGS))
 _SEQ_MOD = 1 << 32
 _MAX_PENDING = 512  # out-of-order segments before we force a resync
 _MAX_TAIL = 1 << 20  # cap the undecoded tail buffer (guards against runaway)
@@ -215,7 +218,7 @@ class _Conn:
         self.pending: dict[int, bytes] = {}
         self.buf = bytearray()  # contiguous, not-yet-decoded application bytes
 
-    def add(self, seq: int, payload: bytes) -> None:
+    def add(self, seq: int, payload: bytes | memoryview) -> None:
         if not payload:
             return
         if self.next_seq is None:
@@ -229,12 +232,13 @@ class _Conn:
                 self._append(payload[overlap:])
             # else: a pure duplicate — drop it.
         else:
-            # Ahead of next_seq: buffer until the gap fills.
-            self.pending[seq] = payload
+            # Ahead of next_seq: buffer until the gap fills. A copy, as the
+            # payload may be a view into a capture file's read buffer.
+            self.pending[seq] = bytes(payload)
             if len(self.pending) > _MAX_PENDING:
                 self._resync()
 
-    def _append(self, payload: bytes) -> None:
+    def _append(self, payload: bytes | memoryview) -> None:
         if self.next_seq is None:
             raise RuntimeError("cannot append TCP payload before sequence initialization")
         self.buf.extend(payload)
@@ -261,28 +265,46 @@ class _Conn:
     def _realign(self) -> None:
         # After a gap we cannot know frame boundaries; scan to the next frame
         # start marker and drop the garbage before it.
-        for i in range(len(self.buf)):
-            if self.buf[i] in _FRAME_FLAGS:
-                del self.buf[:i]
-                return
-        self.buf.clear()
-
-    def pop_frames(self) -> list[tuple[int, bytes]]:
-        """Extract all complete frames now available; self-heals misalignment."""
-        frames: list[tuple[int, bytes]] = []
-        while len(self.buf) >= 3:
-            if self.buf[0] not in _FRAME_FLAGS:
+        starts = [found for found in map(self.buf.find, _FRAME_MARKERS) if found >= 0]
+        if starts:
+            del self.buf[: min(starts)]
+        else:
+            self.buf.clear()
+
+    def pop_frames(self) -> list[tuple[int, memoryview]]:
+        """Extract all complete frames now available; self-heals misalignment.
+
+        The frames are views into one copy of the bytes they span, and the
+        buffer is trimmed once per call rather than once per frame.
+        """
+        frames: list[tuple[int, memoryview]] = []
+        spans: list[tuple[int, int, int]] = []
+        start = 0
+        buf = self.buf
+        while len(buf) - start >= 3:
+            if buf[start] not in _FRAME_FLAGS:
+                frames += self._take_frames(spans, start)
+                spans, start = [], 0
                 self._realign()
-                if len(self.buf) < 3 or self.buf[0] not in _FRAME_FLAGS:
+                if len(buf) < 3 or buf[0] not in _FRAME_FLAGS:
                     break
-            flags = self.buf[0]
-            length = (self.buf[1] << 8) | self.buf[2]
-            if 3 + length > len(self.buf):
+            end = start + 3 + ((buf[start + 1] << 8) | buf[start + 2])
+            if end > len(buf):
                 break
-            frames.append((flags, bytes(self.buf[3 : 3 + length])))
-            del self.buf[: 3 + length]
+            spans.append((buf[start], start + 3, end))
+            start = end
+        frames += self._take_frames(spans, start)
         return frames
 
+    def _take_frames(self, spans: list[tuple[int, int, int]], consumed: int) -> list[tuple[int, memoryview]]:
+        """Cut the first ``consumed`` bytes off the buffer and return the frames at ``spans`` in them."""
+        if not consumed:
+            return []
+        with memoryview(self.buf) as view:
+            taken = memoryview(view[:consumed].tobytes())
+        del self.buf[:consumed]
+        return [(flags, taken[body:end]) for flags, body, end in spans]
+
 
 class StreamReassembler:
     """Reassemble server->client TCP streams from ``tcpdump -x`` text lines.
@@ -379,6 +401,8 @@ def _events_from_lines(lines: Iterable[str]) -> Iterator[tuple]:
     reassembler = StreamReassembler()
     for line in lines:
         yield from reassembler.feed_line(line.rstrip("\n"))
+    # A packet is flushed by the next header line; the last one has none.
+    yield from reassembler._flush()
 
 
 def _events_from_archive(path: str) -> Iterator[tuple]:
@@ -907,7 +931,7 @@ def _open_db(config_file: str | None = None):
     config = Configuration.Config(file=config_file or _resolve_config_file())
     db = Database.Database(config)
     ensure_coinpoker_site(db)
-    # nextHandId() computes max(id)+1, but store_hand lets the serial assign the
+    # nextHandId() hands out explicit ids, but store_hand lets the serial assign the
     # id. If the sequence is out of sync with max(id) the two disagree and the
     # HandsPlayers FK fails, so realign every id sequence with its table first.
     try:
@@ -923,13 +947,16 @@ def _open_db(config_file: str | None = None):
     return db, config
 
 
-def _make_equity_coordinator(config, notify) -> KnownCardsAnalysisCoordinator:
+def _make_equity_coordinator(config, notify, *, equity_cache: bool = True) -> KnownCardsAnalysisCoordinator:
     """Build the live worker with a fresh database connection per result."""
     from fpdb_3_legacy import Database
 
     notify_hand = notify.send_hand_id if notify is not None else None
+    # Shared with backfill_aof_analyses and other captures: a matchup any of
+    # them has computed is a lookup here.
+    engine = EquityEngine(store=open_store(default_store_path(config)) if equity_cache else None)
     return KnownCardsAnalysisCoordinator(
-        AsyncEquityService(),
+        AsyncEquityService(engine),
         lambda: Database.Database(config),
         notify_hand=notify_hand,
         population_model=PopulationObservedRange(),
@@ -945,13 +972,15 @@ def run(
     config_file: str | None = None,
     archive: bool = True,
     notify_hud: bool = True,
+    equity_cache: bool = True,
 ) -> None:
     """Build and import hands from a stream of decoded events.
 
     ``archive`` is off for a replay: the events being read already came from
     the archive, and appending them would grow it by a copy of itself on every
     run. ``notify_hud`` is off for the same reason -- a bulk catch-up would
-    walk the HUD through hours of finished tables.
+    walk the HUD through hours of finished tables. ``equity_cache`` off
+    computes every equity instead of sharing the on-disk equity cache.
     """
     file_id = 0
     notify = None
@@ -967,7 +996,7 @@ def run(
         known_aof_tables = _known_aof_tables(db)
         notify = _make_hud_notifier() if notify_hud else None
 
-    equity_coordinator = None if dry_run else _make_equity_coordinator(config, notify)
+    equity_coordinator = None if dry_run else _make_equity_coordinator(config, notify, equity_cache=equity_cache)
     pump = HandPump(
         db,
         config,
@@ -1081,6 +1110,7 @@ def _replay_archives(args: Any) -> None:
                 config_file=args.config_file,
                 archive=False,
                 notify_hud=False,
+                equity_cache=not args.no_equity_cache,
             )
     except KeyboardInterrupt:
         print("\n[INFO] Stopped.")
@@ -1109,6 +1139,11 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--log-file", help="Tee all output to this file (used by the GUI tab).")
     parser.add_argument("--stop-file", help="Exit cleanly once this file exists (GUI stop signal).")
     parser.add_argument("--config-file", help="Explicit HUD_config.xml path (needed when launched elevated).")
+    parser.add_argument(
+        "--no-equity-cache",
+        action="store_true",
+        help="Compute every equity instead of reusing the on-disk equity cache",
+    )
     return parser
 
 
@@ -1132,7 +1167,7 @@ def main() -> None:  # noqa: C901
 
     import os
 
-    from fpdb_3_legacy.coinpoker_pcap import capture_live, open_offline
+    from fpdb_3_legacy.coinpoker_pcap import capture_live, read_capture_file
 
     stop = (lambda: bool(args.stop_file) and os.path.exists(args.stop_file)) if args.stop_file else None
 
@@ -1153,12 +1188,18 @@ def main() -> None:  # noqa: C901
     if args.live:
         events = _events_from_segments(capture_live(args.iface, BPF_FILTER, stop=stop))
     elif args.replay:
-        events = _events_from_segments(open_offline(args.replay, BPF_FILTER))
+        events = _events_from_segments(read_capture_file(args.replay))
     else:
         events = _events_from_lines(sys.stdin)
 
     try:
-        run(events, dry_run=args.dry_run, table_category=args.game, config_file=args.config_file)
+        run(
+            events,
+            dry_run=args.dry_run,
+            table_category=args.game,
+            config_file=args.config_file,
+            equity_cache=not args.no_equity_cache,
+        )
     except KeyboardInterrupt:
         print("\n[INFO] Stopped.")
         sys.exit(0)
@@ -16,9 +16,11 @@ from __future__ import annotations
 
 import ctypes
 import ctypes.util
+import struct
 import subprocess
 import sys
 from collections.abc import Callable, Iterator
+from typing import BinaryIO
 
 # --- library loading ----------------------------------------------------------
 
@@ -123,8 +125,12 @@ def _l3_offset(pkt: bytes, dlt: int) -> int:
     return 14  # best-effort default (assume Ethernet)
 
 
-def parse_segment(pkt: bytes, dlt: int) -> tuple[int, int, int, bytes] | None:
-    """Return (src_port, dst_port, seq, payload) for a TCP packet, else None."""
+def parse_segment(pkt: bytes | memoryview, dlt: int) -> tuple[int, int, int, bytes | memoryview] | None:
+    """Return (src_port, dst_port, seq, payload) for a TCP packet, else None.
+
+    The payload ends where the IP header says the packet does, so the padding
+    Ethernet adds to short frames (a bare ACK) is not taken for stream bytes.
+    """
     off = _l3_offset(pkt, dlt)
     if off < 0 or off + 20 > len(pkt):
         return None
@@ -133,11 +139,13 @@ def parse_segment(pkt: bytes, dlt: int) -> tuple[int, int, int, bytes] | None:
         if pkt[off + 6] != 6:  # next header must be TCP (no extension headers)
             return None
         l4 = off + 40
+        end = l4 + int.from_bytes(pkt[off + 4 : off + 6], "big")
     elif version == 4:
         ihl = (pkt[off] & 0x0F) * 4
         if pkt[off + 9] != 6:
             return None
         l4 = off + ihl
+        end = off + int.from_bytes(pkt[off + 2 : off + 4], "big")
     else:
         return None
     if l4 + 20 > len(pkt):
@@ -146,10 +154,122 @@ def parse_segment(pkt: bytes, dlt: int) -> tuple[int, int, int, bytes] | None:
     dst_port = int.from_bytes(pkt[l4 + 2 : l4 + 4], "big")
     seq = int.from_bytes(pkt[l4 + 4 : l4 + 8], "big")
     data_off = (pkt[l4 + 12] >> 4) * 4
-    payload = pkt[l4 + data_off :]
+    # A zero length field (TSO-offloaded captures) leaves the captured bytes as they are.
+    payload = pkt[l4 + data_off : end] if end > l4 else pkt[l4 + data_off :]
     return src_port, dst_port, seq, payload
 
 
+# --- capture files without libpcap --------------------------------------------
+
+# pcap magic -> byte order; the nanosecond variants differ only in timestamps.
+_PCAP_BYTE_ORDER = {
+    b"\xd4\xc3\xb2\xa1": "<",
+    b"\xa1\xb2\xc3\xd4": ">",
+    b"\x4d\x3c\xb2\xa1": "<",
+    b"\xa1\xb2\x3c\x4d": ">",
+}
+_PCAPNG_SECTION = b"\x0a\x0d\x0d\x0a"
+_PCAPNG_LITTLE_ENDIAN = b"\x4d\x3c\x2b\x1a"
+_PCAPNG_INTERFACE = 1
+_PCAPNG_SIMPLE_PACKET = 3
+_PCAPNG_ENHANCED_PACKET = 6
+_READ_SIZE = 1 << 20
+
+
+class _SpanReader:
+    """Consecutive spans of a file, as views into reads of a megabyte or more.
+
+    A span stays valid after the next read: each read is a new bytes object,
+    kept alive by the views into it.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._data = b""
+        self._view = memoryview(self._data)
+        self._pos = 0
+
+    def take(self, count: int) -> memoryview | None:
+        """The next ``count`` bytes, or None at the end of the file (or of a truncated record)."""
+        end = self._pos + count
+        if end > len(self._data):
+            self._data = self._data[self._pos :] + self._stream.read(max(count, _READ_SIZE))
+            self._view = memoryview(self._data)
+            self._pos, end = 0, count
+            if end > len(self._data):
+                return None
+        span = self._view[self._pos : end]
+        self._pos = end
+        return span
+
+
+def _pcap_packets(reader: _SpanReader, byte_order: str) -> Iterator[tuple[int, memoryview]]:
+    header = reader.take(24)
+    if header is None:
+        return
+    # The upper bits of the link type carry FCS details, not the DLT.
+    dlt = struct.unpack_from(byte_order + "I", header, 20)[0] & 0xFFFF
+    record = struct.Struct(byte_order + "IIII").unpack
+    while (head := reader.take(16)) is not None:
+        caplen = record(head)[2]
+        packet = reader.take(caplen)
+        if packet is None:
+            return
+        yield dlt, packet
+
+
+def _pcapng_packets(reader: _SpanReader) -> Iterator[tuple[int, memoryview]]:
+    byte_order = "<"
+    dlts: list[int] = []
+    while (head := reader.take(8)) is not None:
+        if head[:4] == _PCAPNG_SECTION:
+            # A new section restates the byte order and numbers its interfaces afresh.
+            magic = reader.take(4)
+            if magic is None:
+                return
+            byte_order = "<" if magic == _PCAPNG_LITTLE_ENDIAN else ">"
+            dlts = []
+            if reader.take(struct.unpack_from(byte_order + "I", head, 4)[0] - 12) is None:
+                return
+            continue
+        block_type, length = struct.unpack(byte_order + "II", head)
+        body = reader.take(length - 8)
+        if body is None:
+            return
+        if block_type == _PCAPNG_INTERFACE:
+            dlts.append(struct.unpack_from(byte_order + "H", body)[0])
+        elif block_type == _PCAPNG_ENHANCED_PACKET:
+            interface, _, _, caplen = struct.unpack_from(byte_order + "IIII", body)
+            yield dlts[interface], body[20 : 20 + caplen]
+        elif block_type == _PCAPNG_SIMPLE_PACKET:
+            # Captured up to the block's end: the block length less its 16 framing bytes.
+            original = struct.unpack_from(byte_order + "I", body)[0]
+            yield dlts[0], body[4 : 4 + min(original, length - 16)]
+
+
+def read_capture_file(path: str) -> Iterator[tuple[int, int, int, bytes | memoryview]]:
+    """Yield (src_port, dst_port, seq, payload) from a pcap or pcapng file, without libpcap.
+
+    Unlike :func:`open_offline` this needs no capture library and applies no
+    BPF filter; the caller keeps the ports it wants. Payloads are views into
+    the file's reads rather than copies.
+    """
+    with open(path, "rb") as stream:
+        reader = _SpanReader(stream)
+        magic = stream.read(4)
+        stream.seek(0)
+        if magic == _PCAPNG_SECTION:
+            packets = _pcapng_packets(reader)
+        elif magic in _PCAP_BYTE_ORDER:
+            packets = _pcap_packets(reader, _PCAP_BYTE_ORDER[magic])
+        else:
+            raise ValueError(f"{path} is neither a pcap nor a pcapng capture")
+        for dlt, packet in packets:
+            segment = parse_segment(packet, dlt)
+            if segment is not None:
+                yield segment
+
+
 # --- device discovery ---------------------------------------------------------
 
 
@@ -349,8 +469,7 @@ def _iter_handle(lib: ctypes.CDLL, handle: int, stop: Callable[[], bool] | None)
         while stop is None or not stop():
             rc = lib.pcap_next_ex(handle, ctypes.byref(hdr), ctypes.byref(data))
             if rc == 1:
-                caplen = hdr.contents.caplen
-                pkt = bytes(bytearray(data[:caplen]))
+                pkt = ctypes.string_at(data, hdr.contents.caplen)
                 seg = parse_segment(pkt, dlt)
                 if seg is not None:
                     yield seg
@@ -40,15 +40,16 @@ from typing import Any
 COMPRESSED_FLAG = 0x20
 
 
-def split_frames(buf: bytes) -> list[tuple[int, bytes]]:
-    """Split a reassembled TCP byte stream into (flags, payload) frames."""
-    frames: list[tuple[int, bytes]] = []
+def split_frames(buf: bytes | memoryview) -> list[tuple[int, memoryview]]:
+    """Split a reassembled TCP byte stream into (flags, payload) frames; payloads are views into ``buf``."""
+    view = memoryview(buf)
+    frames: list[tuple[int, memoryview]] = []
     i = 0
-    while i + 3 <= len(buf):
-        flags = buf[i]
-        length = struct.unpack_from(">H", buf, i + 1)[0]
+    while i + 3 <= len(view):
+        flags = view[i]
+        length = _U16(view, i + 1)[0]
         i += 3
-        payload = buf[i : i + length]
+        payload = view[i : i + length]
         i += length
         if len(payload) < length:
             break  # truncated tail (partial capture)
@@ -56,68 +57,119 @@ def split_frames(buf: bytes) -> list[tuple[int, bytes]]:
     return frames
 
 
-# Fixed-width scalar TLV types -> struct format (0x02 is a bare byte).
-_SCALAR_FMT = {0x03: ">H", 0x04: ">I", 0x05: ">Q"}
-# Length-prefixed string TLV types -> format of the length prefix.
-_STRLEN_FMT = {0x08: ">H", 0x0A: ">I"}
+_U16 = struct.Struct(">H").unpack_from
+# Fixed-width scalar TLV types -> (reader, width) (0x02 is a bare byte).
+_SCALARS = {0x03: (_U16, 2), 0x04: (struct.Struct(">I").unpack_from, 4), 0x05: (struct.Struct(">Q").unpack_from, 8)}
+# Length-prefixed string TLV types -> (prefix reader, prefix width).
+_STRINGS = {0x08: (_U16, 2), 0x0A: (struct.Struct(">I").unpack_from, 4)}
+_MAP = 0x12
+_ARRAY = 0x13
+
+# Frames are cut from the stream as memoryviews, so splitting a capture copies
+# nothing; each frame is then walked as bytes (one copy, or the output of
+# zlib), because slicing bytes and decoding the slice is cheaper than doing the
+# same through a view, and every key and string has to become a str anyway.
+# Maps come back as plain dicts. Decoding them lazily was measured and lost:
+# envelope fields are a few bytes each, the one large field (the event JSON)
+# is always read, and a Python-level lookup per access costs more than the copy
+# it would save.
 
 
 def _read_map(b: bytes, off: int) -> tuple[dict[str, Any], int]:
-    count = struct.unpack_from(">H", b, off)[0]
+    count = _U16(b, off)[0]
     off += 2
     out: dict[str, Any] = {}
     for _ in range(count):
-        klen = struct.unpack_from(">H", b, off)[0]
+        klen = _U16(b, off)[0]
         off += 2
         key = b[off : off + klen].decode("latin1")
         off += klen
         vtyp = b[off]
         off += 1
-        out[key], off = _read_value(b, off, vtyp)
+        # Short strings and nested maps are nearly every entry; skip the generic dispatch for them.
+        if vtyp == 0x08:
+            ln = _U16(b, off)[0]
+            off += 2
+            out[key] = b[off : off + ln].decode("latin1")
+            off += ln
+        elif vtyp == _MAP:
+            out[key], off = _read_map(b, off)
+        else:
+            out[key], off = _read_value(b, off, vtyp)
+    if off > len(b):
+        raise ValueError("TLV map runs past the end of the frame")
     return out, off
 
 
-def _read_array(b: bytes, off: int) -> tuple[list[Any], int]:
-    count = struct.unpack_from(">H", b, off)[0]
-    off += 2
-    etyp = b[off]
-    off += 1
-    arr = []
-    for _ in range(count):
-        val, off = _read_value(b, off, etyp)
-        arr.append(val)
-    return arr, off
-
-
 def _read_value(b: bytes, off: int, typ: int) -> tuple[Any, int]:
-    if typ == 0x12:  # map
+    if typ == _MAP:
         return _read_map(b, off)
-    if typ == 0x13:  # array
-        return _read_array(b, off)
+    if typ == _ARRAY:
+        count = _U16(b, off)[0]
+        etyp = b[off + 2]
+        off += 3
+        arr = []
+        for _ in range(count):
+            val, off = _read_value(b, off, etyp)
+            arr.append(val)
+        return arr, off
     if typ == 0x02:  # single byte
         return b[off], off + 1
-    if typ in _SCALAR_FMT:
-        fmt = _SCALAR_FMT[typ]
-        return struct.unpack_from(fmt, b, off)[0], off + struct.calcsize(fmt)
-    if typ in _STRLEN_FMT:
-        fmt = _STRLEN_FMT[typ]
-        prefix = struct.calcsize(fmt)
-        ln = struct.unpack_from(fmt, b, off)[0]
-        off += prefix
+    if typ in _SCALARS:
+        read, width = _SCALARS[typ]
+        return read(b, off)[0], off + width
+    if typ in _STRINGS:
+        read, width = _STRINGS[typ]
+        ln = read(b, off)[0]
+        off += width
         return b[off : off + ln].decode("latin1"), off + ln
     raise ValueError(f"unknown TLV type 0x{typ:02x} at offset {off}")
 
 
-def decode_frame(flags: int, payload: bytes) -> Any:
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, dict):
+        parts = [struct.pack(">H", len(value))]
+        for key, item in value.items():
+            raw_key = key.encode("latin1")
+            parts += [struct.pack(">H", len(raw_key)), raw_key, _encode_value(item)]
+        return bytes([_MAP]) + b"".join(parts)
+    if isinstance(value, str):
+        raw = value.encode("latin1")
+        return (
+            b"\x08" + struct.pack(">H", len(raw)) if len(raw) <= 0xFFFF else b"\x0a" + struct.pack(">I", len(raw))
+        ) + raw
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < 1 << 64:
+        for typ, fmt in ((0x02, ">B"), (0x03, ">H"), (0x04, ">I"), (0x05, ">Q")):
+            if value < 1 << (8 * struct.calcsize(fmt)):
+                return bytes([typ]) + struct.pack(fmt, value)
+    raise TypeError(f"no TLV encoding for {value!r}")
+
+
+def encode_frame(obj: Any, *, compress: bool = False) -> bytes:
+    """The frame :func:`decode_frame` reads back as ``obj``; builds synthetic streams for tests and benchmarks.
+
+    Maps, latin-1 strings and unsigned integers are encoded; arrays are not.
+    """
+    payload = _encode_value(obj)
+    flags = 0x80
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= COMPRESSED_FLAG
+    if len(payload) > 0xFFFF:
+        raise ValueError(f"a frame holds at most 65535 bytes, not {len(payload)}")
+    return bytes([flags]) + struct.pack(">H", len(payload)) + payload
+
+
+def decode_frame(flags: int, payload: bytes | memoryview) -> Any:
     """Decode one frame's payload (decompressing first if flagged) into an object."""
-    data = zlib.decompress(payload) if flags & COMPRESSED_FLAG else payload
+    data = zlib.decompress(payload) if flags & COMPRESSED_FLAG else bytes(payload)
     if not data:
         return None
     value, _ = _read_value(data, 1, data[0])
     return value
 
 
-def iter_messages(stream: bytes) -> Iterator[Any]:
+def iter_messages(stream: bytes | memoryview) -> Iterator[Any]:
     """Yield each decodable message object from a reassembled server->client stream."""
     for flags, payload in split_frames(stream):
         try:
@@ -155,7 +207,7 @@ def game_event_from_object(obj: Any) -> tuple[str, str | None, Any] | None:
     return event
 
 
-def iter_game_events(stream: bytes) -> Iterator[tuple[str, str | None, Any]]:
+def iter_game_events(stream: bytes | memoryview) -> Iterator[tuple[str, str | None, Any]]:
     """Yield (event_name, game_hand_id, parsed_data) for each ``game.*`` event.
 
     ``parsed_data`` is the JSON-decoded ``data`` field when present, else the raw
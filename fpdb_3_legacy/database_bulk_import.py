@@ -19,6 +19,7 @@ import re
 import string
 import sys
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
 from time import time
 from typing import TYPE_CHECKING, Any
 
@@ -33,6 +34,54 @@ re_insert = re.compile(
     re.DOTALL,
 )
 
+# The per-hand child tables PostgreSQL loads with COPY ... FROM STDIN (unless
+# the import option copyStream is turned off). Every row of these is new -- no
+# ON CONFLICT, no RETURNING -- which is all COPY can do. Hands itself keeps the
+# executemany it has always used.
+COPY_STREAM_TABLES = frozenset({"HandsPlayers", "HandsActions", "HandsStove", "HandsPots", "Boards"})
+# Rows per c.executemany where COPY is not used.
+EXECUTEMANY_BATCH_SIZE = 20000
+# PostgreSQL type oids of smallint, integer and bigint.
+_PG_INTEGER_TYPES = frozenset({21, 23, 20})
+
+
+def copy_statement(q: str) -> str | None:
+    """The COPY FROM STDIN equivalent of a bulk insert into a COPY_STREAM_TABLES table."""
+    m = re_insert.match(q)
+    if m is None or m.group("TABLENAME") not in COPY_STREAM_TABLES:
+        return None
+    columns = ", ".join(c.strip() for c in m.group("COLUMNS").strip("()").split(","))
+    return f"COPY {m.group('TABLENAME')} ({columns}) FROM STDIN"
+
+
+def _to_integer(value: Any) -> Any:
+    # What an INSERT's assignment cast does with the value: COPY's text format
+    # takes neither "True" nor "1.0" for an integer column.
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float):
+        return round(value)  # float8 -> integer rounds half to even, as round() does
+    if isinstance(value, Decimal):
+        return int(value.to_integral_value(ROUND_HALF_UP))  # numeric rounds half away from zero
+    return value
+
+
+def copy_rows(c, statement: str, values, integer_columns: tuple[int, ...] = ()) -> None:
+    """Stream rows through a psycopg COPY.
+
+    Each row goes from the bulk buffer straight to psycopg's text encoder:
+    no batch slices, no CSV file, and the server reads from the connection, so
+    an ordinary role on a remote host can use it. The values at
+    ``integer_columns`` are coerced the way an INSERT would coerce them.
+    """
+    with c.copy(statement) as copy:
+        for row in values:
+            if integer_columns:
+                row = list(row)
+                for n in integer_columns:
+                    row[n] = _to_integer(row[n])
+            copy.write_row(row)
+
 
 class DatabaseBulkImportMixin:
     """Accumulates one import's rows and writes them in bulk.
@@ -54,7 +103,9 @@ class DatabaseBulkImportMixin:
 
     # Created by resetBulkCache, below, and read by the cache and tournament
     # mixins as well as by the host.
-    siteHandNos: list[Any]
+    siteHandNos: set[Any]
+    checkedHandNos: set[Any]
+    knownHandNos: set[Any]
     hbulk: list[Any]
     bbulk: list[Any]
     hpbulk: list[Any]
@@ -72,6 +123,8 @@ class DatabaseBulkImportMixin:
     sc: dict[Any, Any]
     tc: dict[Any, Any]
     hids: list[Any]
+    # Created by resetCache in the host: COPY statement -> its integer columns.
+    _copy_integer_columns: dict[str, tuple[int, ...]]
 
     if TYPE_CHECKING:
 
@@ -348,7 +401,9 @@ class DatabaseBulkImportMixin:
     # end def afterBulkImport
 
     def resetBulkCache(self, reconnect=False) -> None:
-        self.siteHandNos: list[Any] = []  # cache of siteHandNo
+        self.siteHandNos: set[Any] = set()  # siteHandNos queued for insert
+        self.checkedHandNos: set[Any] = set()  # siteHandNos looked up by prefetchDuplicates
+        self.knownHandNos: set[Any] = set()  # ... and those of them already stored
         self.hbulk: list[Any] = []  # Hands bulk inserts
         self.bbulk: list[Any] = []  # Boards bulk inserts
         self.hpbulk: list[Any] = []  # HandsPlayers bulk inserts
@@ -371,7 +426,12 @@ class DatabaseBulkImportMixin:
             self.do_connect(self.config)
 
     def executemany(self, c, q, values) -> None:
-        if self.backend == self.PGSQL and self.import_options["hhBulkPath"] != "":
+        statement = None
+        if self.backend == self.PGSQL and self.import_options.get("copyStream", True):
+            statement = copy_statement(q)
+        if statement is not None and hasattr(c, "copy"):
+            copy_rows(c, statement, values, self._integer_columns(c, statement))
+        elif self.backend == self.PGSQL and self.import_options["hhBulkPath"] != "":
             # COPY much faster under postgres. Requires superuser privileges
             m = re_insert.match(q)
             if m is None:
@@ -395,13 +455,19 @@ class DatabaseBulkImportMixin:
             c.execute(q_insert)
             os.remove(bulk_file)
         else:
-            batch_size = 20000  # experiment to find optimal batch_size for your data
-            while values:  # repeat until all records in values have been inserted ''
-                batch, values = (
-                    values[:batch_size],
-                    values[batch_size:],
-                )  # split values into the current batch and the remaining records
-                c.executemany(q, batch)  # insert current batch ''
+            for start in range(0, len(values), EXECUTEMANY_BATCH_SIZE):
+                c.executemany(q, values[start : start + EXECUTEMANY_BATCH_SIZE])
+
+    def _integer_columns(self, c, statement: str) -> tuple[int, ...]:
+        """Positions of the integer columns a COPY statement lists, read once per connection."""
+        known = self._copy_integer_columns.get(statement)
+        if known is None:
+            columns = statement[statement.index("(") + 1 : statement.index(")")]
+            table = statement.split()[1]
+            c.execute(f"SELECT {columns} FROM {table} LIMIT 0")
+            known = tuple(n for n, column in enumerate(c.description) if column.type_code in _PG_INTEGER_TYPES)
+            self._copy_integer_columns[statement] = known
+        return known
 
     def storeHand(self, hdata, doinsert=False, printdata=False) -> None:
         if printdata:
@@ -7,6 +7,7 @@ aggregate hands rather than record them.
 
 from __future__ import annotations
 
+import sqlite3
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
@@ -427,6 +428,43 @@ SESSION_CACHE_KEYS = [
     "street3Discards",
 ]
 
+# The caches whose rows are keyed by a unique index: query-catalogue name ->
+# (table, unique index, key columns in the order the writers pack them,
+# statistics in line order). See sql_queries_cache_upsert.py.
+KEYED_CACHES: dict[str, tuple[str, str, tuple[str, ...], list[str]]] = {
+    "hudcache": (
+        "HudCache",
+        "HudCache_Compound_idx",
+        ("gametypeId", "playerId", "seats", "position", "tourneyTypeId", "styleKey"),
+        [*CACHE_KEYS, *HUDCACHE_EXTRA_KEYS],
+    ),
+    "cardscache": (
+        "CardsCache",
+        "CardsCache_Compound_idx",
+        ("weekId", "monthId", "gametypeId", "tourneyTypeId", "playerId", "startCards"),
+        SESSION_CACHE_KEYS,
+    ),
+    "positionscache": (
+        "PositionsCache",
+        "PositionsCache_Compound_idx",
+        ("weekId", "monthId", "gametypeId", "tourneyTypeId", "playerId", "seats", "maxPosition", "position"),
+        SESSION_CACHE_KEYS,
+    ),
+}
+
+# Rows per executemany and keys per IN list when a keyed cache is flushed.
+CACHE_WRITE_BATCH = 500
+
+# Narrowing the batched key lookup: besides playerId, the key columns whose few
+# distinct values per flush keep other days' and weeks' rows out of the result.
+_KEY_LOOKUP_COLUMNS = ("playerId", "gametypeId", "styleKey", "weekId", "monthId")
+
+
+def _lookup_key(key) -> tuple[Any, ...]:
+    # Compared as text: positions and dates come back from some drivers typed
+    # differently from what the writers pack.
+    return tuple(None if v is None else str(v) for v in key)
+
 
 class DatabaseCachesMixin:
     """Writes the aggregate caches the HUD and the reports read from.
@@ -454,6 +492,11 @@ class DatabaseCachesMixin:
     ttnew: set[Any]
     wmold: set[Any]
     wmnew: set[Any]
+    backend: int
+    MYSQL_INNODB: int
+    PGSQL: int
+    SQLITE: int
+    _unique_cache_indexes: dict[str, bool]
 
     if TYPE_CHECKING:
 
@@ -469,8 +512,88 @@ class DatabaseCachesMixin:
 
         def insertOrUpdate(self, type: Any, cursor: Any, key: Any, select: Any, insert: Any) -> Any: ...
 
-    def storeHudCache(self, gid, gametype, pids, starttime, pdata, doinsert=False) -> None:
-        """Update cached statistics. If update fails because no record exists, do an insert."""
+    def _can_upsert(self, c, name) -> bool:
+        """Whether the unique index ``upsert_<name>`` relies on exists (looked up once)."""
+        known = self._unique_cache_indexes.get(name)
+        if known is None:
+            if self.backend == self.SQLITE and sqlite3.sqlite_version_info < (3, 24):
+                known = False  # no ON CONFLICT ... DO UPDATE before SQLite 3.24
+            else:
+                index = KEYED_CACHES[name][1].lower()
+                c.execute(
+                    self.sql.query["cacheUniqueIndexExists"].replace("%s", self.sql.query["placeholder"]), (index,)
+                )
+                known = c.fetchone() is not None
+            if not known:
+                log.info(f"No unique index for {KEYED_CACHES[name][0]}; its rows are looked up before they are written")
+            self._unique_cache_indexes[name] = known
+        return known
+
+    def _stored_cache_ids(self, c, name, keys) -> dict[tuple[Any, ...], Any]:
+        """Ids of the stored rows of a keyed cache, for a whole flush of keys at once."""
+        _table, _index, key_columns, _statistics = KEYED_CACHES[name]
+        placeholder = self.sql.query["placeholder"]
+        wanted = {_lookup_key(k) for k in keys}
+        narrowing = {
+            column: sorted({k[key_columns.index(column)] for k in keys})
+            for column in _KEY_LOOKUP_COLUMNS[1:]
+            if column in key_columns
+        }
+        players = sorted({k[key_columns.index("playerId")] for k in keys})
+        ids: dict[tuple[Any, ...], Any] = {}
+        for start in range(0, len(players), CACHE_WRITE_BATCH):
+            filters = {"playerId": players[start : start + CACHE_WRITE_BATCH], **narrowing}
+            where = " AND ".join(
+                f"{column} IN ({', '.join([placeholder] * len(values))})" for column, values in filters.items()
+            )
+            c.execute(
+                self.sql.query[f"select_{name}_keys"].replace("<where>", where),
+                [v for values in filters.values() for v in values],
+            )
+            for row in c.fetchall():
+                key = _lookup_key(row[1:])
+                if key in wanted:
+                    ids.setdefault(key, row[0])
+        return ids
+
+    def _flush_keyed_cache(self, c, name, rows) -> None:
+        """Add aggregated lines to a keyed cache, a batch of rows per statement.
+
+        Rows whose key the unique index can arbitrate go through one
+        ``upsert_<name>``. The rest -- ring-game keys carry a NULL tourneyTypeId,
+        and databases without the index -- are matched against the stored rows
+        with one lookup per batch, then updated or inserted as before.
+        """
+        if rows and self._can_upsert(c, name):
+            upserts = [[*k, *line] for k, line in rows if None not in k]
+            rows = [(k, line) for k, line in rows if None in k]
+            upsert = self.sql.query[f"upsert_{name}"].replace("%s", self.sql.query["placeholder"])
+            for start in range(0, len(upserts), CACHE_WRITE_BATCH):
+                c.executemany(upsert, upserts[start : start + CACHE_WRITE_BATCH])
+        if not rows:
+            return
+
+        ids = self._stored_cache_ids(c, name, [k for k, _line in rows])
+        updates, inserts = [], []
+        for k, line in rows:
+            id = ids.get(_lookup_key(k))
+            if id is None:
+                inserts.append([*k, *line])
+            else:
+                updates.append([*line, id])
+        update = self.sql.query[f"update_{name}"].replace("%s", self.sql.query["placeholder"])
+        for start in range(0, len(updates), CACHE_WRITE_BATCH):
+            c.executemany(update, updates[start : start + CACHE_WRITE_BATCH])
+        if inserts:
+            self.executemany(c, self.sql.query[f"insert_{name}"].replace("%s", self.sql.query["placeholder"]), inserts)
+
+    def storeHudCache(self, gid, gametype, pids, starttime, pdata, doinsert=False) -> list:
+        """Update cached statistics. If update fails because no record exists, do an insert.
+
+        Returns the (key, line) rows this hand added, which the importer
+        forwards to the HUD so it can move its in-memory aggregates forward.
+        """
+        rows = []
         if pdata:
             # starttime is UTC; shifting it by the machine's offset and by
             # day_start buckets it into the player's own day. timedelta.seconds
@@ -522,6 +645,7 @@ class DatabaseCachesMixin:
                 # HudCache-only columns (see HUDCACHE_EXTRA_KEYS): appended after
                 # the shared CACHE_KEYS values, matching insert/update_hudcache.
                 line += [int(player_stats.get(k, 0)) for k in HUDCACHE_EXTRA_KEYS]
+                rows.append((k, line))
 
                 hud = self.hcbulk.get(k)
                 # Add line to the old line in the hudcache.
@@ -529,53 +653,15 @@ class DatabaseCachesMixin:
                     for idx, val in enumerate(line):
                         hud[idx] += val
                 else:
-                    self.hcbulk[k] = line
+                    # A copy: later hands add into the bulk line in place.
+                    self.hcbulk[k] = list(line)
 
         if doinsert:
-            update_hudcache = self.sql.query["update_hudcache"]
-            update_hudcache = update_hudcache.replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            insert_hudcache = self.sql.query["insert_hudcache"]
-            insert_hudcache = insert_hudcache.replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-
-            select_hudcache_ring = self.sql.query["select_hudcache_ring"]
-            select_hudcache_ring = select_hudcache_ring.replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            select_hudcache_tour = self.sql.query["select_hudcache_tour"]
-            select_hudcache_tour = select_hudcache_tour.replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            inserts = []
             c = self.get_cursor()
-            for k, item in list(self.hcbulk.items()):
-                if not k[4]:
-                    q = select_hudcache_ring
-                    row = [*list(k[:4]), k[-1]]
-                else:
-                    q = select_hudcache_tour
-                    row = list(k)
-
-                c.execute(q, row)
-                result = c.fetchone()
-                if result:
-                    id = result[0]
-                    update = [*item, id]
-                    c.execute(update_hudcache, update)
-
-                else:
-                    inserts.append(list(k) + item)
-
-            if inserts:
-                self.executemany(c, insert_hudcache, inserts)
+            self._flush_keyed_cache(c, "hudcache", list(self.hcbulk.items()))
             self.commit()
+        return rows
+
     def storeSessions(self, hid, pids, startTime, tid, heroes, tz_name, doinsert=False) -> None:
         """Update cached sessions. If no record exists, do an insert."""
         THRESHOLD = timedelta(seconds=int(self.sessionTimeout * 60))
@@ -1080,31 +1166,7 @@ class DatabaseCachesMixin:
             self.dcbulk[k] = line
 
         if doinsert:
-            update_cardscache = self.sql.query["update_cardscache"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            insert_cardscache = self.sql.query["insert_cardscache"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            select_cardscache_ring = self.sql.query["select_cardscache_ring"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            select_cardscache_tour = self.sql.query["select_cardscache_tour"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-
-            # Removed unused variables
-            # select_W = self.sql.query["select_W"].replace("%s", self.sql.query["placeholder"])
-            # select_M = self.sql.query["select_M"].replace("%s", self.sql.query["placeholder"])
-            # insert_W = self.sql.query["insert_W"].replace("%s", self.sql.query["placeholder"])
-            # insert_M = self.sql.query["insert_M"].replace("%s", self.sql.query["placeholder"])
-
             dccache: dict[tuple[Any, ...], list[Any]] = {}
-            inserts: list[Any] = []
             for cache_key, line in list(self.dcbulk.items()):
                 sc = self.s.get(cache_key[0])
                 if sc is not None:
@@ -1123,26 +1185,9 @@ class DatabaseCachesMixin:
                         else:
                             dccache[group_key] = line
 
-            c = self.get_cursor()
-            for cache_key, item in list(dccache.items()):
-                if cache_key[3]:
-                    q = select_cardscache_tour
-                    row = list(cache_key)
-                else:
-                    q = select_cardscache_ring
-                    row = list(cache_key[:3]) + list(cache_key[-2:])
-                c.execute(q, row)
-                result = c.fetchone()
-                if result:
-                    id = result[0]
-                    update = [*item, id]
-                    c.execute(update_cardscache, update)
-                else:
-                    insert = list(cache_key) + item
-                    inserts.append(insert)
-
-            if inserts:
-                self.executemany(c, insert_cardscache, inserts)
+            if dccache:
+                c = self.get_cursor()
+                self._flush_keyed_cache(c, "cardscache", list(dccache.items()))
                 self.commit()
     def storePositionsCache(
         self,
@@ -1174,29 +1219,7 @@ class DatabaseCachesMixin:
             self.pcbulk[k] = line
 
         if doinsert:
-            update_positionscache = self.sql.query["update_positionscache"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            insert_positionscache = self.sql.query["insert_positionscache"].replace(
-                "%s",
-                self.sql.query["placeholder"],
-            )
-            select_positionscache_ring = self.sql.query["select_positionscache_ring"].replace(
-                "%s", self.sql.query["placeholder"]
-            )
-            select_positionscache_tour = self.sql.query["select_positionscache_tour"].replace(
-                "%s", self.sql.query["placeholder"]
-            )
-
-            # Removed unused variables:
-            # select_W = self.sql.query["select_W"].replace("%s", self.sql.query["placeholder"])
-            # select_M = self.sql.query["select_M"].replace("%s", self.sql.query["placeholder"])
-            # insert_W = self.sql.query["insert_W"].replace("%s", self.sql.query["placeholder"])
-            # insert_M = self.sql.query["insert_M"].replace("%s", self.sql.query["placeholder"])
-
             position_cache: dict[tuple[Any, ...], list[Any]] = {}
-            inserts: list[Any] = []
             for cache_key, line in list(self.pcbulk.items()):
                 sc = self.s.get(cache_key[0])
                 if sc is not None:
@@ -1218,27 +1241,9 @@ class DatabaseCachesMixin:
                         else:
                             position_cache[group_key] = line
 
-            c = self.get_cursor()
-            for cache_key, item in list(position_cache.items()):
-                if cache_key[3]:  # Check if it's a tournament
-                    q = select_positionscache_tour
-                    row = list(cache_key)
-                else:  # It's a ring game
-                    q = select_positionscache_ring
-                    row = list(cache_key[:3]) + list(cache_key[-4:])
-
-                c.execute(q, row)
-                result = c.fetchone()
-                if result:
-                    id = result[0]
-                    update = [*item, id]
-                    c.execute(update_positionscache, update)
-                else:
-                    insert = list(cache_key) + item
-                    inserts.append(insert)
-
-            if inserts:
-                self.executemany(c, insert_positionscache, inserts)
+            if position_cache:
+                c = self.get_cursor()
+                self._flush_keyed_cache(c, "positionscache", list(position_cache.items()))
                 self.commit()
     def appendHandsSessionIds(self) -> None:
         for i in range(len(self.hbulk)):
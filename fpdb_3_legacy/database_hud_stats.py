@@ -11,16 +11,24 @@ are declared below.
 
 from __future__ import annotations
 
+import re
 import sys
 import traceback
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from time import time
 from typing import TYPE_CHECKING, Any
 
 from fpdb_3_legacy.autonotes_aof import AOF_CATEGORIES
 from fpdb_3_legacy.db_reconnect import reconnect_on_connection_loss
+from fpdb_3_legacy.hand_rows import HAND_ROWS_BATCH, hand_ids_sql
+from fpdb_3_legacy.hud_session import IDENTITY_COLUMNS
 from fpdb_3_legacy.loggingFpdb import get_logger
 
+if TYPE_CHECKING:
+    from fpdb_3_legacy.hud_aggregates import DimensionedColumn, HudAggregateStore, ReadKey
+    from fpdb_3_legacy.hud_session import SessionAccumulator
+
 log = get_logger("db")
 
 # How long the 24-hour boundary hand id is reused before being re-read. It is a
@@ -29,6 +37,9 @@ log = get_logger("db")
 # one query per five minutes.
 HAND_1DAY_AGO_TTL = 300.0
 
+# Above any hand id either backend hands out: "no upper bound" for a session read.
+_NO_HAND_ID_BOUND = 2**62
+
 # What a caller gets when it asks for statistics without saying how. Kept here
 # so the per-hand and batched paths cannot disagree about it.
 _DEFAULT_HUD_PARAMS = {
@@ -68,9 +79,14 @@ class DatabaseHudStatsMixin:
 
     # Set by _inject_hud_chipev_columns, below.
     _hud_chipev_clause: str
+    _hud_chipev_columns: Sequence[DimensionedColumn] = ()
 
     # Provided by Database; reset by its resetCache.
     _hand_1day_ago_read_at: float
+    _session_stats: SessionAccumulator
+
+    # Set by the HUD process: aggregates kept in memory between hands.
+    hud_aggregates: HudAggregateStore | None = None
 
     if TYPE_CHECKING:
 
@@ -169,18 +185,26 @@ class DatabaseHudStatsMixin:
         """
         if "<chipev_columns>" not in sql_text:
             return sql_text
-        if not hasattr(self, "_hud_chipev_clause"):
-            try:
-                from fpdb_3_legacy.stat_adapters import HudAdapter
-                from fpdb_3_legacy.stat_registry import get_registry
-
-                descriptors = [d for d in get_registry().series_for_scope("tour") if d.dimension]
-                self._hud_chipev_clause = HudAdapter().select_clause(descriptors)
-            except Exception:
-                log.exception("failed to build HUD ChipEV columns; disabling")
-                self._hud_chipev_clause = ""
+        self._build_hud_chipev_columns()
         return sql_text.replace("<chipev_columns>", self._hud_chipev_clause)
 
+    def _build_hud_chipev_columns(self) -> None:
+        """Compile the ChipEV clause and its column declarations, once."""
+        if hasattr(self, "_hud_chipev_clause"):
+            return
+        try:
+            from fpdb_3_legacy.stat_adapters import HudAdapter
+            from fpdb_3_legacy.stat_registry import get_registry
+
+            descriptors = [d for d in get_registry().series_for_scope("tour") if d.dimension]
+            adapter = HudAdapter()
+            self._hud_chipev_clause = adapter.select_clause(descriptors)
+            self._hud_chipev_columns = adapter.aggregated_columns(descriptors)
+        except Exception:
+            log.exception("failed to build HUD ChipEV columns; disabling")
+            self._hud_chipev_clause = ""
+            self._hud_chipev_columns = ()
+
     def _refresh_hand_1day_ago(self) -> None:
         """Re-read the 24-hour boundary hand id, at most once per TTL.
 
@@ -326,7 +350,22 @@ class DatabaseHudStatsMixin:
 
         gametypeId = handinfo["gametypeId"]
 
-        query = "get_stats_from_hand_aggregated"
+        # Inject declarative ChipEV-by-position columns (stat_registry.py) into
+        # the HUD aggregation. These are bucket-encoded SUM(CASE...) columns that
+        # become stat_dict keys, so descriptor stats render live in the HUD.
+        sql_text = self._inject_hud_chipev_columns(self.sql.query["get_stats_from_hand_aggregated"])
+
+        keys = self._aggregate_read_keys(gametypeId, hud_params, stylekey, h_stylekey, num_seats)
+        seats: dict[int, int] = {}
+        store = self.hud_aggregates if self._aggregates_usable(hud_params) else None
+        if store is not None:
+            seats = self._hand_seats([hand]).get(hand, {})
+            cached = store.cached_stats(seats, hero_id, keys, self._hud_gametype)
+            if cached is not None:
+                self._merge_aof_profile_stats(cached, poker_game or handinfo["category"])
+                return cached
+        started_at = store.now() if store is not None and seats else 0.0
+
         subs = (
             hand,
             hero_id,
@@ -347,13 +386,6 @@ class DatabaseHudStatsMixin:
 
         stime = time()
         c = self.connection.cursor()
-
-        # Inject declarative ChipEV-by-position columns (stat_registry.py) into
-        # the HUD aggregation. These are bucket-encoded SUM(CASE...) columns that
-        # become stat_dict keys, so descriptor stats render live in the HUD.
-        sql_text = self._inject_hud_chipev_columns(self.sql.query[query])
-
-        # Now get the stats
         c.execute(sql_text, subs)
         ptime = time() - stime
         log.info(
@@ -378,9 +410,69 @@ class DatabaseHudStatsMixin:
                     t_dict[name.lower()] = val
                 stat_dict[t_dict["player_id"]] = t_dict
 
+        if store is not None and seats:
+            store.seed(seats, hero_id, keys, stat_dict, started_at, self._newest_hand_id())
         self._merge_aof_profile_stats(stat_dict, poker_game or handinfo["category"])
         return stat_dict
 
+    def _aggregates_usable(self, hud_params) -> bool:
+        """Whether the in-memory aggregates can answer for these parameters."""
+        store = self.hud_aggregates
+        if store is None or hud_params["stat_range"] == "S" or hud_params["h_stat_range"] == "S":
+            return False
+        self._build_hud_chipev_columns()
+        return store.plan(self._hud_chipev_columns) is not None
+
+    def _newest_hand_id(self) -> int | None:
+        """The in-memory aggregates' watermark: the newest hand id, read after a seed."""
+        c = self.get_cursor()
+        c.execute(self.sql.query["get_last_hand"])
+        row = c.fetchone()
+        return int(row[0]) if row and row[0] is not None else None
+
+    def _aggregate_read_keys(self, gametype_id, hud_params, stylekey, h_stylekey, num_seats):
+        """The villain and hero parameters an aggregate is kept under."""
+        seats_min, seats_max = self._seat_bounds(
+            hud_params["seats_style"],
+            hud_params["seats_cust_nums_low"],
+            hud_params["seats_cust_nums_high"],
+            num_seats,
+        )
+        h_seats_min, h_seats_max = self._seat_bounds(
+            hud_params["h_seats_style"],
+            hud_params["h_seats_cust_nums_low"],
+            hud_params["h_seats_cust_nums_high"],
+            num_seats,
+        )
+        keys: tuple[ReadKey, ReadKey] = (
+            (gametype_id, stylekey, hud_params["agg_bb_mult"], seats_min, seats_max),
+            (gametype_id, h_stylekey, hud_params["h_agg_bb_mult"], h_seats_min, h_seats_max),
+        )
+        return keys
+
+    def _hand_seats(self, hands) -> dict[Any, dict[int, int]]:
+        """``{hand: {player id: seat}}``, read ``HAND_ROWS_BATCH`` hands per query."""
+        hand_by_id = {str(hand): hand for hand in hands}
+        seats: dict[Any, dict[int, int]] = {hand: {} for hand in hands}
+        c = self.get_cursor()
+        for start in range(0, len(hands), HAND_ROWS_BATCH):
+            batch = hands[start : start + HAND_ROWS_BATCH]
+            c.execute(hand_ids_sql(self, "handBatchSeats", len(batch)), tuple(batch))
+            for hand_id, player_id, seat in c.fetchall():
+                seats[hand_by_id.get(str(hand_id), hand_id)][int(player_id)] = int(seat)
+        return seats
+
+    def _hud_gametype(self, gametype_id):
+        """(siteId, type, category, limitType, bigBlind) of a gametype, or None."""
+        ph = self.sql.query.get("placeholder", "%s")
+        c = self.get_cursor()
+        c.execute(
+            f"SELECT siteId, type, category, limitType, bigBlind FROM Gametypes WHERE id = {ph}",
+            (gametype_id,),
+        )
+        row = c.fetchone()
+        return tuple(row) if row else None
+
     def _live_player_rewrites(self, placeholder: str, player_count: int):
         """The edits that key the HUD aggregate on players instead of a hand.
 
@@ -578,14 +670,37 @@ class DatabaseHudStatsMixin:
             by_gametype.setdefault(handinfo["gametypeId"], []).append(hand)
             categories[hand] = handinfo["category"]
 
+        usable = bool(categories) and self._aggregates_usable(params)
+        store = self.hud_aggregates if usable else None
+        seats_by_hand = self._hand_seats(list(categories)) if store is not None else {}
+        stylekey = self._style_key(params["stat_range"], hero=False)
+        h_stylekey = self._style_key(params["h_stat_range"], hero=True)
+
         results: dict[Any, dict[Any, Any]] = {}
-        for gametype_id, group in by_gametype.items():
+        for gametype_id, hands_of_gametype in by_gametype.items():
+            group = hands_of_gametype
+            keys = self._aggregate_read_keys(gametype_id, params, stylekey, h_stylekey, num_seats)
+            if store is not None:
+                group = []
+                for hand in hands_of_gametype:
+                    cached = store.cached_stats(seats_by_hand.get(hand, {}), hero_id, keys, self._hud_gametype)
+                    if cached is None:
+                        group.append(hand)
+                        continue
+                    self._merge_aof_profile_stats(cached, poker_game or categories.get(hand))
+                    results[hand] = cached
+                if not group:
+                    continue
+            started_at = store.now() if store is not None else 0.0
             batched = self._run_batched_aggregate(group, gametype_id, params, hero_id, num_seats)
             if batched is None:
                 results.update(self._stats_per_hand(group, game_type, params, hero_id, num_seats, poker_game))
                 continue
+            watermark = self._newest_hand_id() if store is not None else None
             for hand in group:
                 stat_dict = batched.get(hand, {})
+                if store is not None:
+                    store.seed(seats_by_hand.get(hand, {}), hero_id, keys, stat_dict, started_at, watermark)
                 self._merge_aof_profile_stats(stat_dict, poker_game or categories.get(hand))
                 results[hand] = stat_dict
         return results
@@ -722,57 +837,72 @@ class DatabaseHudStatsMixin:
         - only fetch heroes stats if h_stat_range == 'S',
         and only fetch others stats if stat_range == 'S'
         seats_min/max params give seats limits, only include stats if between these values.
+
+        The sums come from the table's running totals (hud_session), which
+        read only the hands not seen before instead of the whole window.
+        """
+        c = self.get_cursor()
+        c.execute(self._session_players_sql(), (hand,))
+        players = c.fetchall()
+        if not players:
+            return
+        state = self._session_stats.table(players[0][5], self.hand_1day_ago, self._read_session_rows)
+        for hand_id, playerid, seat, screen_name, seats, _table_name in players:
+            is_hero = False
+            if hero_id is not None:
+                try:
+                    is_hero = int(playerid) == int(hero_id)
+                except (ValueError, TypeError):
+                    is_hero = str(playerid) == str(hero_id)
+            if is_hero and h_stat_range == "S":
+                sums = state.player_sums(playerid, h_seats_min, h_seats_max)
+            elif not is_hero and stat_range == "S":
+                sums = state.player_sums(playerid, seats_min, seats_max)
+            else:
+                continue
+            if sums is None:
+                continue
+            row = {"player_id": playerid, "hand_id": hand_id, "seat": seat, "screen_name": screen_name, "seats": seats}
+            row.update(sums)
+            player_stats = stat_dict.setdefault(playerid, {})
+            for name, val in row.items():
+                if name not in player_stats:
+                    player_stats[name] = val
+                elif name not in IDENTITY_COLUMNS:
+                    player_stats[name] += val
+
+    def _session_players_sql(self) -> str:
+        ph = self.sql.query.get("placeholder", "%s")
+        return (
+            "SELECT h.id, hp.playerId, hp.seatNo, p.name, h.seats, h.tableName FROM Hands h "
+            "INNER JOIN HandsPlayers hp ON (hp.handId = h.id) "
+            f"INNER JOIN Players p ON (p.id = hp.playerId) WHERE h.id = {ph}"
+        )
+
+    def _session_rows_sql(self) -> str:
+        """The session query's columns, one row per player per hand at a table.
+
+        Rewritten from ``get_stats_from_hand_session`` itself so the two cannot
+        list different columns. ``hp``/``h`` are joined to the same rows as
+        ``hp2``/``h2``, so hand_id and seats describe each hand read.
         """
         query = self.sql.query["get_stats_from_hand_session"]
         query = query.replace("<signed>", "signed ") if self.db_server == "mysql" else query.replace("<signed>", "")
-
-        subs = (
-            self.hand_1day_ago,
-            hand,
-            hero_id,
-            seats_min,
-            seats_max,
-            hero_id,
-            h_seats_min,
-            h_seats_max,
-        )
+        select = re.split(r"\bFROM\s+Hands\s+h\b", query, maxsplit=1)[0]
+        ph = self.sql.query.get("placeholder", "%s")
+        return f"""{select}
+                     FROM Hands h
+                     INNER JOIN HandsPlayers hp  ON (hp.handId = h.id)
+                     INNER JOIN HandsPlayers hp2 ON (hp2.id = hp.id)
+                     INNER JOIN Players p        ON (p.id = hp.playerId)
+                     INNER JOIN Gametypes gt     ON (gt.id = h.gametypeId)
+                WHERE h.tableName = {ph} AND h.id >= {ph} AND h.id < {ph}"""
+
+    def _read_session_rows(self, table_name: str, lowest_id: int, id_bound: int | None):
+        """Rows for the table's hands with ``lowest_id <= id < id_bound`` (no bound if None)."""
         c = self.get_cursor()
-
-        # now get the stats
-        # print "sess_stats: subs =", subs, "subs[0] =", subs[0]
-        c.execute(query, subs)
-        colnames = [desc[0] for desc in c.description]
-        row = c.fetchone()
-        if colnames[0].lower() == "player_id":
-            # Loop through stats adding them to appropriate stat_dict:
-            while row:
-                # Native int keys, matching do_stat()/stat functions. See the
-                # aggregated loop above for why str coercion breaks stat lookups.
-                playerid = row[0]
-                is_hero = False
-                if hero_id is not None:
-                    try:
-                        is_hero = int(playerid) == int(hero_id)
-                    except (ValueError, TypeError):
-                        is_hero = str(playerid) == str(hero_id)
-                if (is_hero and h_stat_range == "S") or (not is_hero and stat_range == "S"):
-                    for name, val in zip(colnames, row, strict=False):
-                        if playerid not in stat_dict:
-                            stat_dict[playerid] = {}
-                            stat_dict[playerid][name.lower()] = val
-                        elif name.lower() not in stat_dict[playerid]:
-                            stat_dict[playerid][name.lower()] = val
-                        elif name.lower() not in (
-                            "hand_id",
-                            "player_id",
-                            "seat",
-                            "screen_name",
-                            "seats",
-                        ):
-                            stat_dict[playerid][name.lower()] += val
-                row = c.fetchone()
-        else:
-            log.error(f"query {query} result does not have player_id as first column")
+        c.execute(self._session_rows_sql(), (table_name, lowest_id, _NO_HAND_ID_BOUND if id_bound is None else id_bound))
+        return [desc[0] for desc in c.description], c.fetchall()
 
     def get_hero_hudcache_start(self):
         """Fetches earliest stylekey from hudcache for one of hero's player ids."""
@@ -23,6 +23,11 @@ log = get_logger("db")
 # Schema version written into Settings by create_tables and checked on connect.
 DB_VERSION = 224
 
+# Hand ids a PostgreSQL connection reserves per nextval of HandIdBlocks. Ids a
+# connection closes without using are skipped, so this bounds the gap a short
+# live-capture session leaves.
+HAND_ID_BLOCK = 1000
+
 # Keys used to index into player data in storeHandsPlayers.
 HANDS_PLAYERS_KEYS = [
     "startCash",
@@ -948,6 +953,7 @@ class DatabaseSchemaMixin:
         self.create_tables()
         self.createAllIndexes()
         self.commit()
+        self.ensure_hand_id_blocks()
         self.get_sites()
         log.info("Finished recreating tables")
 
@@ -989,11 +995,43 @@ class DatabaseSchemaMixin:
                 self.rollback()
 
         self._ensure_gametype_category_width()
+        self.ensure_hand_id_blocks()
 
         self.ensure_hudcache_columns()
         self.ensure_handsplayers_columns()
         self.ensure_hands_columns()
 
+    def ensure_hand_id_blocks(self) -> None:
+        """Create the PostgreSQL sequence nextHandId reserves blocks of ids from.
+
+        Started past the ids already stored, so a database created by older
+        code carries on from where it was. Other backends keep max(id).
+        """
+        if self.backend != self.PGSQL:
+            return
+        import psycopg
+
+        try:
+            c = self.get_cursor()
+            c.execute(self.sql.query["handIdBlocksExists"])
+            if c.fetchone()[0] is not None:
+                return
+            c.execute("SELECT max(id) FROM Hands")
+            start = (c.fetchone()[0] or 0) + 1
+            c.execute(
+                self.sql.query["createHandIdBlocks"]
+                .replace("<block>", str(HAND_ID_BLOCK))
+                .replace("<start>", str(start)),
+            )
+            self.commit()
+            log.info("Created the HandIdBlocks sequence, starting at %s", start)
+        except psycopg.errors.UndefinedTable:
+            # First-time setup: no Hands yet. recreate_tables calls this again.
+            self.rollback()
+        except psycopg.Error as e:
+            self.rollback()
+            log.error(f"Could not create the HandIdBlocks sequence, hand ids cannot be reserved: {e}")
+
     def _get_table_columns(self, table: str) -> set[str]:
         c = self.get_cursor()
         if self.backend == self.SQLITE:
@@ -1182,6 +1220,10 @@ class DatabaseSchemaMixin:
         from fpdb_3_legacy import dialects
 
         dialects.dialect_for_backend(self.backend).drop_all_tables(self)
+        if self.backend == self.PGSQL:
+            # Owned by no table, so dropping the tables leaves it behind.
+            self.get_cursor().execute(self.sql.query["dropHandIdBlocks"])
+            self.commit()
 
     # end def drop_tables
 
@@ -303,6 +303,17 @@ class CountingCursor:
         finally:
             self._profile.record(str(sql), time.perf_counter() - started)
 
+    @contextmanager
+    def copy(self, statement, *args, **kwargs):
+        # One COPY is one statement however many rows stream through it; it is
+        # timed until the server has acknowledged the end of the data.
+        started = time.perf_counter()
+        try:
+            with self._cursor.copy(statement, *args, **kwargs) as copy:
+                yield copy
+        finally:
+            self._profile.record(str(statement), time.perf_counter() - started)
+
     def __iter__(self):
         return iter(self._cursor)
 
@@ -8,8 +8,10 @@ and gives callers values on a documented 0..1 scale.
 from __future__ import annotations
 
 import ctypes
+import multiprocessing
 from collections import Counter, OrderedDict
 from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from decimal import Decimal
 from importlib import import_module
@@ -17,10 +19,14 @@ from itertools import product
 from math import prod
 from random import Random
 from threading import Lock
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
 from fpdb_3_legacy.loggingFpdb import get_logger
 
+if TYPE_CHECKING:
+    from fpdb_3_legacy.equity_store import EquityResultStore
+    from fpdb_3_legacy.hand_evaluator import TablePokerEval
+
 log = get_logger("equity")
 
 COMMUNITY_CARD_GAMES = frozenset({"holdem", "holdem8", "omaha", "omaha8", "omaha5", "omaha5_8", "omaha6", "shortdeck"})
@@ -38,6 +44,9 @@ DEFAULT_EQUITY_ITERATIONS = 20_000
 DEFAULT_EQUITY_CACHE_SIZE = 256
 DEFAULT_RANGE_ENUMERATION_LIMIT = 10_000
 EQUITY_ENGINE_VERSION = 1
+# A weighted range is only spread over worker processes when it holds at least
+# this many iterations; below it, starting the jobs costs more than they save.
+PARALLEL_MIN_ITERATIONS = 2_000
 
 
 def _seed_native_rng(seed: int) -> None:
@@ -111,6 +120,22 @@ def load_poker_eval() -> PokerEvalBackend | None:
         return None
 
 
+def load_equity_backend() -> PokerEvalBackend | TablePokerEval:
+    """Return pypoker-eval, or the table evaluator when it cannot be loaded.
+
+    The table evaluator ranks high-only hold'em and Omaha; other games raise
+    ``ValueError`` from it. Results that are stored or compared across runs
+    keep to :func:`load_poker_eval`, so a missing extension never mixes the two.
+    """
+    backend = load_poker_eval()
+    if backend is not None:
+        return backend
+    # NumPy is only loaded when the extension is missing.
+    from fpdb_3_legacy.hand_evaluator import TablePokerEval
+
+    return TablePokerEval()
+
+
 def _validate_cards(pockets: list[list[str]], board: list[str], dead: list[str]) -> None:
     cards = [card for pocket in pockets for card in pocket] + board + dead
     known_cards = [card for card in cards if card != "__"]
@@ -195,6 +220,16 @@ class EquityEngine:
     are reduced to legal concrete pocket combinations, then sent to
     ``poker_eval`` in batches rather than evaluated one board at a time in
     Python.
+
+    Results are remembered in an in-process LRU and, when a ``store`` is given,
+    in an :class:`~fpdb_3_legacy.equity_store.EquityResultStore` shared with
+    other processes. ``cache_lookups`` counts where each answer came from.
+
+    The native backend holds the GIL, so threads cannot share its work. With
+    ``max_workers`` above one, the concrete matchups of a weighted range are
+    split over that many worker processes instead. Each matchup keeps the seed
+    it has in a sequential run and the results are merged in matchup order, so
+    the answer is the same either way. Call :meth:`close` to stop the workers.
     """
 
     def __init__(
@@ -203,6 +238,8 @@ class EquityEngine:
         *,
         cache_size: int = DEFAULT_EQUITY_CACHE_SIZE,
         range_enumeration_limit: int = DEFAULT_RANGE_ENUMERATION_LIMIT,
+        store: EquityResultStore | None = None,
+        max_workers: int = 1,
     ) -> None:
         if cache_size < 0:
             msg = "cache_size cannot be negative"
@@ -210,6 +247,9 @@ class EquityEngine:
         if range_enumeration_limit <= 0:
             msg = "range_enumeration_limit must be positive"
             raise ValueError(msg)
+        if max_workers <= 0:
+            msg = "max_workers must be positive"
+            raise ValueError(msg)
         self._backend = backend
         self._backend_loaded = backend is not None
         self._unavailable_reported = False
@@ -217,6 +257,12 @@ class EquityEngine:
         self._range_enumeration_limit = range_enumeration_limit
         self._cache: OrderedDict[tuple[Any, ...], EquityResult] = OrderedDict()
         self._cache_lock = Lock()
+        self._store = store
+        self.cache_lookups: Counter[str] = Counter(memory=0, store=0, computed=0)
+        self._injected_backend = backend
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = Lock()
 
     @property
     def available(self) -> bool:
@@ -400,19 +446,65 @@ class EquityEngine:
         else:
             counts = _sample_legal_combinations(ranges, known_cards, iterations, seed)
         backend = self._require_backend()
-        results = []
-        for i, (pockets, count) in enumerate(counts.items()):
-            result = calculate_equity(
-                game,
-                [list(hero), *[list(pocket) for pocket in pockets]],
-                list(board),
-                dead=list(dead),
-                iterations=count,
-                backend=backend,
-                seed=seed + i if seed is not None else None,
-            )
-            results.append((result, count))
-        return _merge_weighted_results(results, iterations)
+        # A matchup's seed depends only on its position, so splitting the list
+        # over processes cannot change any single result.
+        matchups: list[tuple[int | None, tuple[tuple[str, ...], ...], int]] = [
+            (seed + i if seed is not None else None, pockets, count)
+            for i, (pockets, count) in enumerate(counts.items())
+        ]
+        counted = self._evaluate_in_workers(game, hero, board, dead, matchups)
+        if counted is None:
+            counted = _evaluate_matchups(game, hero, board, dead, matchups, backend)
+        return _merge_weighted_results(counted, iterations)
+
+    def _evaluate_in_workers(
+        self,
+        game: str,
+        hero: tuple[str, ...],
+        board: tuple[str, ...],
+        dead: tuple[str, ...],
+        matchups: list[tuple[int | None, tuple[tuple[str, ...], ...], int]],
+    ) -> list[tuple[EquityResult, int]] | None:
+        """Evaluate the matchups in worker processes; None when they should run here."""
+        iterations = sum(count for _seed, _pockets, count in matchups)
+        if self._max_workers == 1 or len(matchups) < 2 or iterations < PARALLEL_MIN_ITERATIONS:
+            return None
+        chunks = _split_matchups(matchups, self._max_workers)
+        try:
+            pool = self._worker_pool()
+            # A backend that was handed in is sent along; otherwise each worker
+            # loads pypoker-eval for itself.
+            futures = [
+                pool.submit(_evaluate_matchups, game, hero, board, dead, chunk, self._injected_backend)
+                for chunk in chunks
+            ]
+            return [counted for future in futures for counted in future.result()]
+        except (EquityUnavailableError, ValueError):
+            raise
+        except Exception as exc:
+            log.warning("Equity worker processes failed (%s); evaluating in this process", exc)
+            self.close()
+            self._max_workers = 1
+            return None
+
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: the live capture and the backfills call
+                # this from a process with other threads and open database
+                # connections, whose held locks a fork would copy.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Stop the worker processes, if any were started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
 
     def _require_backend(self) -> PokerEvalBackend:
         if not self._backend_loaded:
@@ -434,8 +526,17 @@ class EquityEngine:
                 cached = self._cache.get(key)
                 if cached is not None:
                     self._cache.move_to_end(key)
+                    self.cache_lookups["memory"] += 1
                     return cached
-        result = calculate()
+        result = self._store.get(key) if self._store is not None else None
+        source = "store"
+        if result is None:
+            result = calculate()
+            source = "computed"
+            if self._store is not None:
+                self._store.put(key, result)
+        with self._cache_lock:
+            self.cache_lookups[source] += 1
         if self._cache_size:
             with self._cache_lock:
                 self._cache[key] = result
@@ -587,6 +688,63 @@ def _sample_legal_combinations(
     return dict(counts)
 
 
+def _evaluate_matchups(
+    game: str,
+    hero: tuple[str, ...],
+    board: tuple[str, ...],
+    dead: tuple[str, ...],
+    matchups: Sequence[tuple[int | None, tuple[tuple[str, ...], ...], int]],
+    backend: PokerEvalBackend | None,
+) -> list[tuple[EquityResult, int]]:
+    """Evaluate concrete matchups one native call each; also the worker-process entry point."""
+    backend = backend or _worker_backend()
+    return [
+        (
+            calculate_equity(
+                game,
+                [list(hero), *[list(pocket) for pocket in pockets]],
+                list(board),
+                dead=list(dead),
+                iterations=count,
+                backend=backend,
+                seed=seed,
+            ),
+            count,
+        )
+        for seed, pockets, count in matchups
+    ]
+
+
+_worker_backends: list[PokerEvalBackend] = []
+
+
+def _worker_backend() -> PokerEvalBackend:
+    # Loaded once per worker process and kept for the jobs that follow.
+    if not _worker_backends:
+        backend = load_poker_eval()
+        if backend is None:
+            msg = "pypoker-eval is not installed or its native extension cannot be loaded"
+            raise EquityUnavailableError(msg)
+        _worker_backends.append(backend)
+    return _worker_backends[0]
+
+
+def _split_matchups(
+    matchups: list[tuple[int | None, tuple[tuple[str, ...], ...], int]],
+    workers: int,
+) -> list[list[tuple[int | None, tuple[tuple[str, ...], ...], int]]]:
+    """Cut the matchups into at most ``workers`` consecutive runs of similar iteration totals."""
+    total = sum(count for _seed, _pockets, count in matchups)
+    chunks: list[list[tuple[int | None, tuple[tuple[str, ...], ...], int]]] = [[]]
+    done = 0
+    for matchup in matchups:
+        if chunks[-1] and done * workers >= total * len(chunks):
+            chunks.append([])
+        chunks[-1].append(matchup)
+        done += matchup[2]
+    return chunks
+
+
 def _merge_weighted_results(
     results: Sequence[tuple[EquityResult, int]],
     iterations: int,
@@ -0,0 +1,152 @@
+"""Keep equity results on disk, shared by every process that computes them.
+
+``EquityEngine`` remembers results in a small in-process LRU, which is lost on
+every restart. An AoF backfill over a few hundred thousand decisions, the next
+backfill, and each live-capture session then ask pypoker-eval for the same
+matchups again -- and a native Monte-Carlo run costs milliseconds where a
+lookup costs microseconds.
+
+``EquityResultStore`` is the second level behind that LRU: one SQLite file,
+keyed on the engine's own cache keys. Those start with
+``EQUITY_ENGINE_VERSION``, so a change to how equity is computed simply stops
+matching the old rows, which then age out. The file is opened in WAL mode so a
+backfill and a live capture can read and write it at the same time, and it is
+bounded: past ``max_entries`` the least recently used rows are deleted.
+
+The store is a cache, never a dependency. A file that cannot be opened gives no
+store, and an error while reading or writing one is logged and treated as a
+miss -- equity is then computed as it always was.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+from decimal import Decimal
+from threading import Lock
+from typing import Any
+
+from fpdb_3_legacy.equity import EquityResult, PlayerEquity
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("equity")
+
+EQUITY_STORE_FILE = "equity_cache.sqlite3"
+DEFAULT_EQUITY_STORE_ENTRIES = 1_000_000
+# A hit refreshes its row's age at most this often, so that reading a hot row
+# is not a write every time.
+_TOUCH_SECONDS = 3600
+# Writes between two checks of the row count.
+_EVICT_EVERY = 1000
+
+
+def _encode_key(key: tuple[Any, ...]) -> str:
+    # The engine's keys hold only strings, ints, None and tuples of them, whose
+    # repr is stable across processes and Python versions.
+    return repr(key)
+
+
+def _encode_result(result: EquityResult) -> str:
+    players = [[str(p.equity), p.wins, p.ties, p.losses] for p in result.players]
+    return json.dumps([result.samples, result.exhaustive, players], separators=(",", ":"))
+
+
+def _decode_result(text: str) -> EquityResult:
+    samples, exhaustive, players = json.loads(text)
+    return EquityResult(
+        players=tuple(PlayerEquity(Decimal(equity), wins, ties, losses) for equity, wins, ties, losses in players),
+        samples=samples,
+        exhaustive=exhaustive,
+    )
+
+
+class EquityResultStore:
+    """A size-bounded SQLite table of equity results, safe across threads and processes."""
+
+    def __init__(self, path: str, *, max_entries: int = DEFAULT_EQUITY_STORE_ENTRIES) -> None:
+        if max_entries <= 0:
+            msg = "max_entries must be positive"
+            raise ValueError(msg)
+        self.path = path
+        self._max_entries = max_entries
+        self._lock = Lock()
+        self._writes = 0
+        self.lookups: Counter[str] = Counter(hits=0, misses=0)
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS EquityResults (key TEXT PRIMARY KEY, result TEXT NOT NULL, used REAL NOT NULL)",
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS EquityResults_used_idx ON EquityResults (used)")
+        self._evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM EquityResults").fetchone()[0]
+
+    def get(self, key: tuple[Any, ...]) -> EquityResult | None:
+        """The stored result for an engine cache key, or None."""
+        encoded = _encode_key(key)
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT result, used FROM EquityResults WHERE key = ?",
+                    (encoded,),
+                ).fetchone()
+                if row is None:
+                    self.lookups["misses"] += 1
+                    return None
+                now = time.time()
+                if now - row[1] > _TOUCH_SECONDS:
+                    self._connection.execute("UPDATE EquityResults SET used = ? WHERE key = ?", (now, encoded))
+                self.lookups["hits"] += 1
+            return _decode_result(row[0])
+        except (sqlite3.Error, ValueError) as exc:
+            log.warning("Equity cache %s unreadable (%s); computing instead", self.path, exc)
+            return None
+
+    def put(self, key: tuple[Any, ...], result: EquityResult) -> None:
+        """Store a result; another process storing the same key first is fine."""
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO EquityResults (key, result, used) VALUES (?, ?, ?)",
+                    (_encode_key(key), _encode_result(result), time.time()),
+                )
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict()
+        except sqlite3.Error as exc:
+            log.warning("Cannot write the equity cache %s: %s", self.path, exc)
+
+    def _evict(self) -> None:
+        """Delete the least recently used rows past max_entries. Caller holds the lock (or is __init__)."""
+        count = self._connection.execute("SELECT count(*) FROM EquityResults").fetchone()[0]
+        if count > self._max_entries:
+            self._connection.execute(
+                "DELETE FROM EquityResults WHERE key IN (SELECT key FROM EquityResults ORDER BY used LIMIT ?)",
+                (count - self._max_entries,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def default_store_path(config: Any) -> str:
+    """Where the equity cache lives: next to the SQLite databases of the configuration."""
+    return os.path.join(config.dir_database, EQUITY_STORE_FILE)
+
+
+def open_store(path: str, *, max_entries: int = DEFAULT_EQUITY_STORE_ENTRIES) -> EquityResultStore | None:
+    """Open (creating if needed) the equity cache at ``path``; None when that is not possible."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return EquityResultStore(path, max_entries=max_entries)
+    except (OSError, sqlite3.Error) as exc:
+        log.warning("Equity cache %s unavailable (%s); results are kept in memory only", path, exc)
+        return None
@@ -0,0 +1,243 @@
+"""Tell auto-import which hand-history files changed, instead of asking every file.
+
+Auto-import used to find new hands by walking every monitored directory and
+stat-ing every tracked file on each tick. A hand-history folder holding years of
+archived sessions turned that into hundreds of milliseconds of CPU per tick, and
+a new hand still waited up to a whole interval before the importer noticed it.
+
+On Linux the kernel already knows: an inotify watch on each monitored directory
+(and each directory below it) reports every write, close, creation, rename and
+deletion. ``InotifyWatcher`` collects those paths; ``Importer.runUpdated`` takes
+them and looks only at the files named, and the auto-import loop wakes up as
+soon as one arrives instead of at the next tick.
+
+The watcher is an optimisation, never the source of truth. Whenever it cannot
+vouch for having seen everything -- a directory was just added, the kernel event
+queue overflowed, a watch could not be placed -- ``take()`` answers ``None`` and
+the importer falls back to the full walk it always did. Platforms without
+inotify get no watcher at all (``create_watcher()`` returns ``None``) and keep
+polling.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("file_watcher")
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# IN_ATTRIB is in the mask because the polling loop also reacts to a newer
+# mtime alone (``touch``, or a client that rewrites a file in place).
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT = struct.Struct("iIII")
+# Room for many events per read; a name is at most NAME_MAX + 1 bytes.
+_READ_SIZE = 64 * (_EVENT.size + 256)
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not all(hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")):
+        return None
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+    return libc
+
+
+class InotifyWatcher:
+    """Recursive inotify watches over the monitored directories.
+
+    ``poll()`` may run on its own thread (the GUI's watch thread) while the
+    import thread calls ``take()`` and the GUI thread calls ``watch()`` and
+    ``unwatch()``; the shared state is guarded by one lock.
+    """
+
+    def __init__(self, libc) -> None:
+        self._libc = libc
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._fd = fd
+        self._lock = threading.Lock()
+        self._wd_paths: dict[int, str] = {}
+        self._roots: set[str] = set()
+        self._changed: set[str] = set()
+        # The first take() after a directory is added must be a full walk: the
+        # watch only reports what happens from now on.
+        self._rescan = True
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def _add_watch(self, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                log.warning(
+                    "inotify watch limit reached at %s (raise fs.inotify.max_user_watches); using polling",
+                    directory,
+                )
+            elif err not in (errno.ENOENT, errno.ENOTDIR):
+                log.warning("Cannot watch %s: %s", directory, os.strerror(err))
+            return err in (errno.ENOENT, errno.ENOTDIR)  # gone since listed: nothing to miss
+        self._wd_paths[wd] = directory
+        return True
+
+    def _add_tree(self, directory: str) -> bool:
+        """Watch ``directory`` and every directory below it. Caller holds the lock."""
+        ok = True
+        for dirpath, dirnames, _filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not os.path.islink(os.path.join(dirpath, d))]
+            ok = self._add_watch(dirpath) and ok
+        return ok
+
+    def watch(self, directory: str) -> bool:
+        """Start watching a monitored directory. False when it could not be fully watched."""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            if directory in self._roots:
+                return True
+            self._roots.add(directory)
+            self._rescan = True
+            return self._add_tree(directory)
+
+    def unwatch(self, directory: str) -> None:
+        """Stop watching a monitored directory and everything below it."""
+        prefix = os.path.join(os.path.abspath(directory), "")
+        with self._lock:
+            self._roots.discard(os.path.abspath(directory))
+            for wd, path in list(self._wd_paths.items()):
+                if os.path.join(path, "").startswith(prefix):
+                    del self._wd_paths[wd]
+                    self._libc.inotify_rm_watch(self._fd, wd)
+            self._changed = {path for path in self._changed if not path.startswith(prefix)}
+
+    def poll(self, timeout: float = 0.0) -> bool:
+        """Wait up to ``timeout`` seconds for events and collect them.
+
+        Returns True when anything new is waiting for ``take()``.
+        """
+        try:
+            readable, _w, _x = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):  # closed under us by close()
+            return False
+        if not readable:
+            return False
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except OSError:  # BlockingIOError: another poll() read the events first
+            return False
+        with self._lock:
+            self._parse(data)
+            return bool(self._changed) or self._rescan
+
+    def _parse(self, data: bytes) -> None:
+        """Turn a buffer of inotify events into changed paths. Caller holds the lock."""
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                log.info("inotify queue overflowed; next cycle rescans the monitored directories")
+                self._rescan = True
+                continue
+            directory = self._wd_paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._wd_paths[wd]
+                if directory in self._roots:
+                    self._rescan = True
+                continue
+            if not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if not mask & IN_ISDIR:
+                self._changed.add(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO) and not os.path.islink(path):
+                self._new_directory(path)
+
+    def _new_directory(self, path: str) -> None:
+        """Watch a directory that appeared under a watched one. Caller holds the lock."""
+        if not self._add_tree(path):
+            self._rescan = True
+        # Files can land in it before its watch exists; report whatever is there.
+        for dirpath, _dirnames, filenames in os.walk(path):
+            self._changed.update(os.path.join(dirpath, f) for f in filenames)
+
+    def take(self) -> set[str] | None:
+        """Hand over the paths changed since the last call; None means walk everything."""
+        self.poll(0.0)
+        with self._lock:
+            if self._rescan:
+                self._rescan = False
+                self._changed = set()
+                return None
+            changed, self._changed = self._changed, set()
+            return changed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+            self._wd_paths.clear()
+            self._roots.clear()
+
+
+def create_watcher() -> InotifyWatcher | None:
+    """An inotify watcher, or None where inotify is unavailable (auto-import then polls)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    libc = _load_libc()
+    if libc is None:
+        log.info("inotify is not available; auto-import polls the monitored directories")
+        return None
+    try:
+        return InotifyWatcher(libc)
+    except OSError as e:
+        log.warning("Cannot start the file watcher (%s); auto-import polls the monitored directories", e)
+        return None
@@ -96,6 +96,7 @@ from fpdb_3_legacy import (
 )
 from fpdb_3_legacy import __version__ as PACKAGE_VERSION
 from fpdb_3_legacy.ConfigInitializer import ensure_config_initialized
+from fpdb_3_legacy.ConfigObservers import AutoNotesConfigObserver
 from fpdb_3_legacy.ConfigurationManager import ConfigurationManager
 from fpdb_3_legacy.disabled_sites import is_site_disabled
 from fpdb_3_legacy.Exceptions import FpdbError
@@ -2144,6 +2145,8 @@ class fpdb(QMainWindow):
             gui_observer = GuiConfigObserver(self)
             config_manager.register_observer(gui_observer)
             log.info("GUI observer registered with ConfigurationManager")
+            # Imports generate notes from compiled rule plans; drop them when the rules are edited
+            config_manager.register_observer(AutoNotesConfigObserver())
 
         except Exception as e:
             log.exception(f"Error while registering the GUI observer: {e}")
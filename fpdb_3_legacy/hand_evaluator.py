@@ -0,0 +1,406 @@
+"""Rank high poker hands from lookup tables, one at a time or by the million.
+
+pypoker-eval is the equity backend, but it is a native extension that a fresh
+Linux install or a CI runner usually lacks, and the replayer's own fallback
+ranked a hand by sorting Python lists for each of its five-card subsets. This
+module ranks five to seven cards with two table lookups:
+
+* a flush table indexed by the 13-bit set of ranks held in the flush suit,
+  giving the best flush or straight flush inside it;
+* a table of every multiset of five to seven ranks (at most four of each),
+  giving the best hand those ranks make without a flush, found by the
+  multiset's base-5 key.
+
+Both lookups give a hand the cards really make, so the larger of the two is
+the hand. The batched :func:`evaluate` does the
+same over NumPy arrays of card indices, which is what the Monte-Carlo equity
+of :class:`TablePokerEval` runs on.
+
+A hand value is ``category << 20`` followed by up to five 4-bit ranks, so
+values compare as hands do and ``value >> 20`` is the category, 0 (high card)
+to 8 (straight flush). The tables take about a second to build; they are built
+on first use and, given a path, kept on disk.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from math import comb
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("hand_evaluator")
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+DECK = tuple(rank + suit for rank in RANKS for suit in SUITS)
+CARD_INDEX = {card: index for index, card in enumerate(DECK)}
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORY_SHIFT = 20
+
+EVALUATOR_TABLES_FILE = "hand_evaluator_tables.npz"
+# Bumped whenever the tables' layout or values change, so an old file is rebuilt.
+TABLES_VERSION = 1
+
+_FIVE = 5
+_WHEEL = 0b1000000001111  # A-2-3-4-5
+# Per card index: its term of the rank multiset key, its suit's nibble and its rank bit.
+_CARD_KEY = 5 ** (np.arange(52, dtype=np.int64) >> 2)
+_CARD_SUIT_COUNT = 1 << 4 * (np.arange(52, dtype=np.int64) & 3)
+_CARD_BIT = 1 << (np.arange(52, dtype=np.int64) >> 2)
+_NIBBLES: np.ndarray = 4 * np.arange(4, dtype=np.int64)
+
+
+def _value(category: int, ranks: Sequence[int]) -> int:
+    value = category
+    for position in range(5):
+        value = (value << 4) | (ranks[position] if position < len(ranks) else 0)
+    return value
+
+
+def _straight_top(mask: int) -> int:
+    """The top rank of the best straight in a rank mask, or -1."""
+    for top in range(12, 3, -1):
+        run = 0b11111 << (top - 4)
+        if mask & run == run:
+            return top
+    return 3 if mask & _WHEEL == _WHEEL else -1
+
+
+def _flush_value(mask: int) -> int:
+    top = _straight_top(mask)
+    if top >= 0:
+        return _value(STRAIGHT_FLUSH, [top])
+    return _value(FLUSH, [rank for rank in range(12, -1, -1) if mask >> rank & 1][:_FIVE])
+
+
+def _unsuited_value(counts: Sequence[int]) -> int:
+    """The best hand a multiset of ranks makes without a flush."""
+    by_count = sorted(((count, rank) for rank, count in enumerate(counts) if count), reverse=True)
+    present = [rank for count, rank in by_count]
+    mask = sum(1 << rank for rank in present)
+    top_count = by_count[0][0]
+
+    def kickers(*used: int) -> list[int]:
+        return sorted((rank for rank in present if rank not in used), reverse=True)
+
+    if top_count == 4:
+        quads = by_count[0][1]
+        return _value(QUADS, [quads, kickers(quads)[0]])
+    pairs_or_better = [rank for count, rank in by_count if count >= 2]
+    if top_count == 3 and len(pairs_or_better) >= 2:
+        trips = by_count[0][1]
+        return _value(FULL_HOUSE, [trips, max(rank for rank in pairs_or_better if rank != trips)])
+    top = _straight_top(mask)
+    if top >= 0:
+        return _value(STRAIGHT, [top])
+    if top_count == 3:
+        trips = by_count[0][1]
+        return _value(TRIPS, [trips, *kickers(trips)[:2]])
+    if len(pairs_or_better) >= 2:
+        high, low = sorted(pairs_or_better, reverse=True)[:2]
+        return _value(TWO_PAIR, [high, low, kickers(high, low)[0]])
+    if top_count == 2:
+        pair = by_count[0][1]
+        return _value(PAIR, [pair, *kickers(pair)[:3]])
+    return _value(HIGH_CARD, kickers()[:_FIVE])
+
+
+def _rank_multisets(low: int, high: int):
+    """Every count vector over the 13 ranks, at most 4 each, summing to ``low``..``high``."""
+    counts = [0] * 13
+
+    def fill(rank: int, left: int):
+        if rank == 13:
+            if left <= high - low:
+                yield counts
+            return
+        for count in range(min(4, left) + 1):
+            counts[rank] = count
+            yield from fill(rank + 1, left - count)
+        counts[rank] = 0
+
+    yield from fill(0, high)
+
+
+@dataclass(frozen=True)
+class EvaluatorTables:
+    """The two lookup tables; see the module docstring."""
+
+    flush: np.ndarray  # int32[8192], 0 where the mask holds fewer than five ranks
+    unsuited_keys: np.ndarray  # int64, sorted base-5 keys of the rank multisets
+    unsuited_values: np.ndarray  # int32, in key order
+
+    def unsuited(self) -> dict[int, int]:
+        """The multiset table as a dict, for ranking one hand at a time."""
+        return dict(zip(self.unsuited_keys.tolist(), self.unsuited_values.tolist(), strict=True))
+
+
+def build_tables() -> EvaluatorTables:
+    flush: np.ndarray = np.zeros(1 << 13, dtype=np.int32)
+    for mask in range(1 << 13):
+        if mask.bit_count() >= _FIVE:
+            flush[mask] = _flush_value(mask)
+    keys = []
+    values = []
+    for counts in _rank_multisets(_FIVE, 7):
+        keys.append(sum(count * 5**rank for rank, count in enumerate(counts)))
+        values.append(_unsuited_value(counts))
+    order = np.argsort(np.array(keys, dtype=np.int64))
+    return EvaluatorTables(
+        flush=flush,
+        unsuited_keys=np.array(keys, dtype=np.int64)[order],
+        unsuited_values=np.array(values, dtype=np.int32)[order],
+    )
+
+
+def default_tables_path(config: Any) -> str:
+    """Where the tables are kept: next to the SQLite databases of the configuration."""
+    return os.path.join(config.dir_database, EVALUATOR_TABLES_FILE)
+
+
+def _read_tables(path: str) -> EvaluatorTables | None:
+    try:
+        with np.load(path) as stored:
+            if int(stored["version"]) != TABLES_VERSION:
+                return None
+            return EvaluatorTables(stored["flush"], stored["unsuited_keys"], stored["unsuited_values"])
+    except (OSError, KeyError, ValueError) as exc:
+        log.debug("Hand evaluator tables %s unreadable (%s); rebuilding them", path, exc)
+        return None
+
+
+def _write_tables(path: str, tables: EvaluatorTables) -> None:
+    partial = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(partial, "wb") as stream:
+            np.savez(
+                stream,
+                version=TABLES_VERSION,
+                flush=tables.flush,
+                unsuited_keys=tables.unsuited_keys,
+                unsuited_values=tables.unsuited_values,
+            )
+        os.replace(partial, path)
+    except OSError as exc:
+        log.warning("Hand evaluator tables cannot be saved to %s (%s); they are rebuilt next time", path, exc)
+        with contextlib.suppress(OSError):
+            os.remove(partial)
+
+
+_tables: EvaluatorTables | None = None
+_tables_path: str | None = None
+_unsuited: dict[int, int] = {}
+_tables_lock = Lock()
+
+
+def set_tables_path(path: str | None) -> None:
+    """Keep the tables at ``path`` once they are first needed, instead of rebuilding them in each process."""
+    global _tables_path  # noqa: PLW0603 - one table file per process
+    _tables_path = path
+
+
+def load_tables(path: str | None = None) -> EvaluatorTables:
+    """The process's tables, read from ``path`` or built (and then saved there) on first use."""
+    global _tables, _unsuited  # noqa: PLW0603 - built once per process
+    with _tables_lock:
+        if _tables is None:
+            path = path or _tables_path
+            tables = _read_tables(path) if path and os.path.exists(path) else None
+            if tables is None:
+                tables = build_tables()
+                if path:
+                    _write_tables(path, tables)
+            _unsuited = tables.unsuited()
+            _tables = tables
+        return _tables
+
+
+def card_index(card: str) -> int:
+    """0..51 for a card such as ``"As"``; ranks are case-insensitive upper, suits lower."""
+    try:
+        return CARD_INDEX[card[0].upper() + card[1:].lower()]
+    except (KeyError, IndexError):
+        msg = f"Invalid card: {card!r}"
+        raise ValueError(msg) from None
+
+
+def evaluate_cards(cards: Sequence[str]) -> int:
+    """The value of the best five-card high hand among five to seven cards."""
+    tables = _tables or load_tables()
+    key = 0
+    suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        index = card_index(card)
+        rank = index >> 2
+        key += 5**rank
+        suit_masks[index & 3] |= 1 << rank
+    value = _unsuited[key]
+    for mask in suit_masks:
+        if mask.bit_count() >= _FIVE:
+            value = max(value, int(tables.flush[mask]))
+    return value
+
+
+def hand_category(value: int) -> int:
+    """HIGH_CARD .. STRAIGHT_FLUSH for a hand value."""
+    return value >> CATEGORY_SHIFT
+
+
+def _values(keys: np.ndarray, suit_counts: np.ndarray, flush_hands: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Hand values from the rank multiset keys and suit counts of some hands.
+
+    ``flush_hands`` gives the card indices of the hands, by flat position, that
+    hold five cards of a suit; only those are looked up in the flush table.
+    """
+    tables = _tables or load_tables()
+    values = tables.unsuited_values[np.searchsorted(tables.unsuited_keys, keys)]
+    # Four suit counts, a nibble each; adding three sets a nibble's top bit from five cards up.
+    suit_counts = suit_counts.reshape(-1)
+    flushes = np.flatnonzero((suit_counts + 0x3333) & 0x8888)
+    if flushes.size:
+        hands = flush_hands(flushes)
+        suit = np.argmax((suit_counts[flushes, None] >> _NIBBLES) & 0xF >= _FIVE, axis=1)
+        masks = np.where(hands & 3 == suit[:, None], _CARD_BIT[hands], 0).sum(axis=-1)
+        flat = values.reshape(-1)
+        flat[flushes] = np.maximum(flat[flushes], tables.flush[masks])
+    return values
+
+
+def evaluate(cards: np.ndarray) -> np.ndarray:
+    """Hand values of an array of card indices whose last axis holds five to seven cards."""
+    cards = np.asarray(cards, dtype=np.intp)
+    return _values(
+        _CARD_KEY[cards].sum(axis=-1),
+        _CARD_SUIT_COUNT[cards].sum(axis=-1),
+        cards.reshape(-1, cards.shape[-1]).__getitem__,
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Equity backend.
+# --------------------------------------------------------------------------- #
+
+# Hole cards an Omaha hand must play; hold'em plays any of its two.
+_OMAHA_HOLE = 2
+_GAMES = frozenset({"holdem", "omaha", "omaha5", "omaha6"})
+# An exhaustive run deals at most this many boards; past it, ask for iterations.
+EXHAUSTIVE_BOARD_LIMIT = 2_000_000
+UNKNOWN = "__"
+
+
+class TablePokerEval:
+    """The ``poker_eval`` call of pypoker-eval, for high-only hold'em and Omaha, on these tables.
+
+    It answers in pypoker-eval's shape -- ``info`` with the sample count and one
+    ``eval`` entry per pocket with ``ev`` on a 0..1000 scale and win, tie and
+    loss counters -- so :func:`~fpdb_3_legacy.equity.calculate_equity` reads it
+    unchanged. Without ``iterations`` every missing board card is enumerated;
+    with it, the missing board and the unknown (``"__"``) pocket cards are dealt
+    at random. Hi/lo and short-deck games are not handled.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._rng = np.random.default_rng(seed)
+
+    def poker_eval(
+        self,
+        game: str,
+        pockets: Sequence[Sequence[str]],
+        board: Sequence[str] = (),
+        dead: Sequence[str] = (),
+        iterations: int | None = None,
+        **_: Any,
+    ) -> dict:
+        if game not in _GAMES:
+            msg = f"The table evaluator does not rank {game!r}"
+            raise ValueError(msg)
+        board = list(board) + [UNKNOWN] * (5 - len(board))
+        known = [card_index(card) for card in (*board, *dead) if card != UNKNOWN]
+        known += [card_index(card) for pocket in pockets for card in pocket if card != UNKNOWN]
+        stub = np.setdiff1d(np.arange(len(DECK)), known)
+        slots = [(-1, position) for position, card in enumerate(board) if card == UNKNOWN]
+        slots += [
+            (player, position)
+            for player, pocket in enumerate(pockets)
+            for position, card in enumerate(pocket)
+            if card == UNKNOWN
+        ]
+
+        if iterations is None:
+            if len(slots) > sum(card == UNKNOWN for card in board):
+                msg = "Exhaustive evaluation needs every pocket card; pass iterations"
+                raise ValueError(msg)
+            deal_count = comb(len(stub), len(slots))
+            if deal_count > EXHAUSTIVE_BOARD_LIMIT:
+                msg = "Too many boards to enumerate; pass iterations"
+                raise ValueError(msg)
+            deals = np.fromiter(
+                itertools.chain.from_iterable(itertools.combinations(stub.tolist(), len(slots))),
+                dtype=np.int64,
+                count=deal_count * len(slots),
+            ).reshape(deal_count, len(slots))
+        else:
+            draws = self._rng.random((iterations, len(stub))).argsort(axis=1)[:, : len(slots)]
+            deals = stub[draws]
+        samples = len(deals)
+
+        def dealt(cards: Sequence[str], player: int) -> np.ndarray:
+            columns = []
+            for position, card in enumerate(cards):
+                if card == UNKNOWN:
+                    columns.append(deals[:, slots.index((player, position))])
+                else:
+                    columns.append(np.full(samples, card_index(card)))
+            return np.stack(columns, axis=1)
+
+        boards = dealt(board, -1)
+        values = np.stack([self._best(game, dealt(pocket, n), boards) for n, pocket in enumerate(pockets)])
+        best = values.max(axis=0)
+        winners = values == best
+        sharing = winners.sum(axis=0)
+        shares = (winners / sharing).sum(axis=1)
+        outright = (winners & (sharing == 1)).sum(axis=1)
+        tied = (winners & (sharing > 1)).sum(axis=1)
+        return {
+            "info": (samples, 0, 0),
+            "eval": [
+                {
+                    "ev": round(1000 * float(shares[n]) / samples),
+                    "winhi": int(outright[n]),
+                    "tiehi": int(tied[n]),
+                    "losehi": samples - int(outright[n]) - int(tied[n]),
+                }
+                for n in range(len(pockets))
+            ],
+        }
+
+    @staticmethod
+    def _best(game: str, hole: np.ndarray, boards: np.ndarray) -> np.ndarray:
+        if game == "holdem":
+            return evaluate(np.concatenate((hole, boards), axis=1))
+        # Every hand is two hole cards and three board cards, and the keys and
+        # suit counts of the two parts add up, so each part is summed once.
+        pairs = hole[:, list(itertools.combinations(range(hole.shape[1]), _OMAHA_HOLE))]
+        threes = boards[:, list(itertools.combinations(range(5), 3))]
+        per_sample = pairs.shape[1] * threes.shape[1]
+
+        def flush_hands(rows: np.ndarray) -> np.ndarray:
+            sample, hand = np.divmod(rows, per_sample)
+            pair, three = np.divmod(hand, threes.shape[1])
+            return np.concatenate((pairs[sample, pair], threes[sample, three]), axis=1)
+
+        def added(table: np.ndarray) -> np.ndarray:
+            return table[pairs].sum(axis=-1)[:, :, None] + table[threes].sum(axis=-1)[:, None, :]
+
+        return _values(added(_CARD_KEY), added(_CARD_SUIT_COUNT), flush_hands).max(axis=(1, 2))
@@ -0,0 +1,104 @@
+"""The stored rows a hand is rebuilt from, read for many hands at once.
+
+``Hand.select`` used to run its own queries per hand: the hero's seat, the
+players, the hand row, the boards, the actions, then the showdown, cash-out and
+splash lookups. The hand viewer rebuilds a page of hands that way, so a page
+cost seven to nine round trips per hand -- over PostgreSQL on another machine,
+most of the time spent opening a page was latency.
+
+:func:`read_hand_rows` runs each of those queries once for a whole list of hand
+ids and deals the rows back out per hand. ``Hand.select`` reads through it too,
+with a one-id list, so a hand rebuilt alone and one rebuilt as part of a page
+come from the same rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("hand_rows")
+
+# Hand ids per read. Keeps each IN list well under SQLite's bound-variable
+# limit while still covering a viewer page in a few reads.
+HAND_ROWS_BATCH = 250
+
+
+@dataclass
+class HandRows:
+    """Everything ``Hand.select`` needs about one stored hand."""
+
+    info: dict[str, Any]  # the Hands row, lower-cased column names
+    players: list[dict[str, Any]] = field(default_factory=list)  # by seat
+    boards: list[dict[str, Any]] = field(default_factory=list)
+    actions: list[dict[str, Any]] = field(default_factory=list)  # in the order they were stored
+    showdown: dict[str, tuple[Any, Any]] = field(default_factory=dict)  # name -> (combo, cards)
+    cashouts: dict[str, tuple[Any, Any]] = field(default_factory=dict)  # name -> (amount, fee)
+    splash: dict[str, Any] = field(default_factory=dict)  # name -> cents
+
+
+def hand_ids_sql(db: Any, query_name: str, count: int) -> str:
+    """The named batch query with ``<hand_ids>`` expanded to ``count`` placeholders."""
+    placeholder = db.sql.query["placeholder"]
+    return db.sql.query[query_name].replace("<hand_ids>", ", ".join([placeholder] * count))
+
+
+def _dict_rows(db: Any, query_name: str, hand_ids: Sequence[int]) -> list[dict[str, Any]]:
+    c = db.get_cursor()
+    c.execute(hand_ids_sql(db, query_name, len(hand_ids)), tuple(hand_ids))
+    rows = c.fetchall()
+    # Descriptor must be lowercase: postgres returns lowercase, SQLite preserves case
+    col_names = [col[0].lower() for col in c.description]
+    return [dict(zip(col_names, row, strict=False)) for row in rows]
+
+
+def _artifact_rows(db: Any, query_name: str, hand_ids: Sequence[int]) -> list[tuple[Any, ...]]:
+    """Rows of a table or column an older database may not have; none if it lacks them."""
+    try:
+        c = db.get_cursor()
+        c.execute(hand_ids_sql(db, query_name, len(hand_ids)), tuple(hand_ids))
+        return list(c.fetchall())
+    except Exception:  # noqa: BLE001 - legacy DB without the table or column.
+        rollback = getattr(db, "_rollback_after_failed_read", None)
+        if rollback is not None:
+            rollback()
+        return []
+
+
+def _add_artifacts(db: Any, hands: dict[int, HandRows], ids: Sequence[int]) -> None:
+    for hand_id, name, *values in _artifact_rows(db, "handBatchShowdown", ids):
+        if int(hand_id) in hands:
+            hands[int(hand_id)].showdown[name] = tuple(values)
+    for hand_id, name, *values in _artifact_rows(db, "handBatchCashout", ids):
+        if int(hand_id) in hands:
+            hands[int(hand_id)].cashouts[name] = tuple(values)
+    for hand_id, name, amount in _artifact_rows(db, "handBatchSplash", ids):
+        if int(hand_id) in hands:
+            hands[int(hand_id)].splash[name] = amount
+
+
+def read_hand_rows(db: Any, hand_ids: Sequence[Any]) -> dict[int, HandRows]:
+    """Return ``{hand_id: HandRows}`` for the hands among ``hand_ids`` that are stored.
+
+    One query per table for the whole list; callers keep the list to about
+    ``HAND_ROWS_BATCH`` ids.
+    """
+    ids = list(dict.fromkeys(int(hand_id) for hand_id in hand_ids))
+    if not ids:
+        return {}
+    hands = {int(info["id"]): HandRows(info) for info in _dict_rows(db, "handBatch", ids)}
+    if not hands:
+        return {}
+    # Boards only matter for run-it-twice and split-board hands, but reading
+    # them for the whole list is one round trip rather than one per such hand.
+    for name, attr in (("handBatchPlayers", "players"), ("handBatchBoards", "boards"), ("handBatchActions", "actions")):
+        for row in _dict_rows(db, name, ids):
+            rows = hands.get(int(row["handid"]))
+            if rows is not None:
+                getattr(rows, attr).append(row)
+    _add_artifacts(db, hands, ids)
+    log.debug("read the rows of %d of %d hands", len(hands), len(ids))
+    return hands
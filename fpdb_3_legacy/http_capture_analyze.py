@@ -9,23 +9,14 @@ from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any
 
+from fpdb_3_legacy.http_capture_archive import iter_raw_capture_records
 from fpdb_3_legacy.http_capture_registry import get_http_capture_adapter
 
 
-def _read_jsonl(path: Path) -> list[dict[str, Any]]:
-    records = []
-    with path.expanduser().open("r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if line:
-                records.append(json.loads(line))
-    return records
-
-
 def analyze_raw_archive(raw_path: str | Path) -> dict[str, Any]:
     """Return high-level diagnostics for a raw capture JSONL archive."""
 
-    records = _read_jsonl(Path(raw_path))
+    records = 0
     sites: Counter[str] = Counter()
     message_types: Counter[str] = Counter()
     transports: Counter[str] = Counter()
@@ -35,7 +26,8 @@ def analyze_raw_archive(raw_path: str | Path) -> dict[str, Any]:
     games_by_site: dict[str, Counter[str]] = defaultdict(Counter)
     unrecognized = 0
 
-    for record in records:
+    for record in iter_raw_capture_records(raw_path):
+        records += 1
         site = str(record.get("site") or "unknown")
         sites[site] += 1
         message_types[str(record.get("message_type") or "unknown")] += 1
@@ -60,7 +52,7 @@ def analyze_raw_archive(raw_path: str | Path) -> dict[str, Any]:
             unrecognized += 1
 
     return {
-        "records": len(records),
+        "records": records,
         "sites": dict(sites),
         "message_types": dict(message_types),
         "transports": dict(transports),
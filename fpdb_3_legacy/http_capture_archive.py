@@ -1,30 +1,271 @@
-"""Filesystem archive helpers for HTTP/WebSocket poker capture."""
+"""Filesystem archive helpers for HTTP/WebSocket poker capture.
+
+The raw archive is written in blocks rather than one open/append/close per
+message, and each block gets a line in a sidecar index. Long sessions produce
+archives of several GB, so the reading side streams: replay and analysis walk
+the records one at a time, and the index lets a replay start at a timestamp or
+a hand without decompressing or parsing what comes before it.
+"""
 
 from __future__ import annotations
 
+import datetime
+import gzip
+import io
 import json
+import threading
+import time
+from collections.abc import Iterator
+from importlib import import_module
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, cast
 
 from fpdb_3_legacy.http_capture_models import RawCaptureMessage, json_default
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("http_capture_archive")
+
+# Block compression -> file suffix. Each block is a complete gzip member or zstd
+# frame, so ``zcat``/``zstdcat`` read the whole archive as one stream.
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+INDEX_SUFFIX = ".idx"
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_BYTES = 256 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstandard() -> Any:
+    try:
+        return import_module("zstandard")
+    except ImportError as exc:
+        msg = "zstd capture archives need the zstandard package (pip install 'fpdb-3[zstd]')"
+        raise ValueError(msg) from exc
+
+
+def _compressor(compression: str | None):
+    if compression is None:
+        return lambda block: block
+    if compression == "gzip":
+        return lambda block: gzip.compress(block, mtime=0)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor().compress
+    msg = f"unknown capture archive compression {compression!r}; expected one of {sorted(COMPRESSION_SUFFIXES)}"
+    raise ValueError(msg)
+
+
+def index_path(path: str | Path) -> Path:
+    """The sidecar offset index of an archive."""
+
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
 
 
 class JsonlRawCaptureArchive:
-    """Append-only JSONL archive for raw capture messages."""
+    """Append-only JSONL archive for raw capture messages.
 
-    def __init__(self, output_dir: str | Path, filename: str = "raw_messages.jsonl") -> None:
+    The file stays open for the life of the archive. Messages are buffered and
+    written as one block once ``flush_bytes`` of JSON have accumulated or the
+    oldest of them is ``flush_interval`` seconds old, and on :meth:`flush` or
+    :meth:`close`. With ``compression`` ("gzip" or "zstd") each block is
+    compressed on its own and the suffix is added to ``filename``. Every block
+    is recorded in the sidecar index (:func:`index_path`) with its byte offset,
+    first sequence and timestamp, and the hands it holds.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        filename: str = "raw_messages.jsonl",
+        *,
+        compression: str | None = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_bytes: int = DEFAULT_FLUSH_BYTES,
+    ) -> None:
+        self._compress = _compressor(compression)
+        suffix = COMPRESSION_SUFFIXES.get(compression or "", "")
+        if suffix and not filename.endswith(suffix):
+            filename += suffix
         self.output_dir = Path(output_dir).expanduser()
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.path = self.output_dir / filename
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
         self._sequence = 0
+        self._lock = threading.Lock()
+        self._handle: IO[bytes] | None = None
+        self._index: IO[str] | None = None
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._block_entry: dict[str, Any] = {}
+        self._block_hands: dict[str, None] = {}
+        self._block_started = 0.0
+        self._timer: threading.Timer | None = None
 
     def append(self, message: RawCaptureMessage) -> str:
-        self._sequence += 1
-        message.sequence = self._sequence
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(message.to_dict(), ensure_ascii=False, default=json_default))
-            handle.write("\n")
-        return f"{self.path.name}:{self._sequence}"
+        with self._lock:
+            self._sequence += 1
+            message.sequence = self._sequence
+            line = json.dumps(message.to_dict(), ensure_ascii=False, default=json_default).encode("utf-8") + b"\n"
+            if not self._pending:
+                self._block_entry = {"sequence": message.sequence, "captured_at": message.captured_at}
+                self._block_started = time.monotonic()
+                self._start_timer()
+            if message.hand_id is not None:
+                self._block_hands[str(message.hand_id)] = None
+            self._pending.append(line)
+            self._pending_size += len(line)
+            if self._pending_size >= self.flush_bytes or time.monotonic() - self._block_started >= self.flush_interval:
+                self._write_block()
+            return f"{self.path.name}:{self._sequence}"
+
+    def flush(self) -> None:
+        """Write whatever is buffered as one block."""
+
+        with self._lock:
+            self._write_block()
+
+    def close(self) -> None:
+        """Flush and release the archive and index handles; a later append reopens them."""
+
+        with self._lock:
+            self._write_block()
+            for handle in (self._handle, self._index):
+                if handle is not None:
+                    handle.close()
+            self._handle = self._index = None
+
+    def __enter__(self) -> JsonlRawCaptureArchive:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _start_timer(self) -> None:
+        # Bounds how long a message waits when capture goes quiet after it.
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _write_block(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        handle, index = self._handle, self._index
+        if handle is None or index is None:
+            handle = self._handle = self.path.open("ab")
+            index = self._index = index_path(self.path).open("a", encoding="utf-8")
+        entry = {"offset": handle.tell(), **self._block_entry, "hands": list(self._block_hands)}
+        handle.write(self._compress(b"".join(self._pending)))
+        handle.flush()
+        # The block is on disk before its index line: an index written up to a
+        # crash can be short, never ahead of the data.
+        index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        index.flush()
+        self._pending = []
+        self._pending_size = 0
+        self._block_hands = {}
+
+
+def _instant(value: Any) -> datetime.datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        instant = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return instant if instant.tzinfo else instant.replace(tzinfo=datetime.UTC)
+
+
+def _read_index(path: Path) -> list[dict[str, Any]]:
+    entries = []
+    try:
+        with index_path(path).open(encoding="utf-8") as handle:
+            for raw_line in handle:
+                try:
+                    entries.append(json.loads(raw_line))
+                except ValueError:
+                    break  # torn last line
+    except OSError:
+        return []
+    return entries
+
+
+def _start_offset(path: Path, since: datetime.datetime | None, hand_id: str | None) -> int:
+    """Offset of the last indexed block that cannot skip past the requested start."""
+
+    offset = 0
+    if since is None and hand_id is None:
+        return offset
+    for entry in _read_index(path):
+        if since is not None:
+            first = _instant(entry.get("captured_at"))
+            if first is None or first > since:
+                break
+        elif hand_id is not None and hand_id in entry.get("hands", ()):
+            return entry["offset"]
+        offset = entry["offset"]
+    return offset
+
+
+def _open_records(raw: IO[bytes], magic: bytes) -> IO[str]:
+    if magic.startswith(_GZIP_MAGIC):
+        stream = cast(IO[bytes], gzip.GzipFile(fileobj=raw, mode="rb"))
+    elif magic.startswith(_ZSTD_MAGIC):
+        stream = _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+    else:
+        stream = raw
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def iter_raw_capture_records(
+    raw_path: str | Path,
+    *,
+    since: str | datetime.datetime | None = None,
+    hand_id: str | int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield the records of a raw archive one at a time, plain or compressed.
+
+    ``since`` starts at the first record captured at or after that instant and
+    ``hand_id`` at the first record of that hand; from there on every record is
+    yielded. The sidecar index, when there is one, picks the block to start
+    reading from; without it the archive is read from the top. A compressed
+    archive cut short by a crash yields what was complete.
+    """
+
+    path = Path(raw_path).expanduser()
+    start = _instant(since) if isinstance(since, str) else since
+    if start is not None and start.tzinfo is None:
+        start = start.replace(tzinfo=datetime.UTC)
+    wanted_hand = str(hand_id) if hand_id is not None else None
+    started = start is None and wanted_hand is None
+    with path.open("rb") as raw:
+        magic = raw.read(4)
+        raw.seek(_start_offset(path, start, wanted_hand))
+        lines = _open_records(raw, magic)
+        try:
+            for raw_line in lines:
+                line = raw_line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if not started:
+                    if start is not None:
+                        instant = _instant(record.get("captured_at"))
+                        started = instant is not None and instant >= start
+                    else:
+                        started = str(record.get("hand_id")) == wanted_hand
+                    if not started:
+                        continue
+                yield record
+        except EOFError:
+            log.warning("%s ends in a truncated block; replayed what was complete", path.name)
 
 
 class JsonHandArchive:
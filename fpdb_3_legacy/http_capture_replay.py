@@ -4,32 +4,26 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
-from typing import Any
 
-from fpdb_3_legacy.http_capture_archive import JsonHandArchive
+from fpdb_3_legacy.http_capture_archive import JsonHandArchive, iter_raw_capture_records
 from fpdb_3_legacy.http_capture_registry import get_http_capture_adapter, registered_http_capture_sites
 
 
-def _read_jsonl(path: Path) -> list[dict[str, Any]]:
-    records = []
-    with path.expanduser().open("r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if line:
-                records.append(json.loads(line))
-    return records
-
-
 def replay_raw_archive(
     raw_path: str | Path,
     output_dir: str | Path,
     *,
     site: str | None = None,
     include_active: bool = False,
+    since: str | None = None,
+    from_hand: str | int | None = None,
 ) -> list[Path]:
-    """Replay a raw JSONL archive and write normalized hand files."""
+    """Replay a raw JSONL archive and write normalized hand files.
+
+    The archive is streamed, plain or compressed; ``since`` and ``from_hand``
+    start the replay at a timestamp or at a hand instead of the top.
+    """
 
     raw_path = Path(raw_path).expanduser()
     hand_archive = JsonHandArchive(output_dir)
@@ -37,7 +31,7 @@ def replay_raw_archive(
     written: list[Path] = []
     written_keys = set()
 
-    for record in _read_jsonl(raw_path):
+    for record in iter_raw_capture_records(raw_path, since=since, hand_id=from_hand):
         record_site = site or record.get("site")
         if not record_site:
             continue
@@ -86,16 +80,25 @@ def replay_swc_raw_archive(
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Replay raw HTTP/WebSocket capture JSONL into normalized hand JSON.")
-    parser.add_argument("raw_path", help="Path to raw_messages.jsonl")
+    parser.add_argument("raw_path", help="Path to raw_messages.jsonl (or .jsonl.gz / .jsonl.zst)")
     parser.add_argument("--output-dir", required=True, help="Directory for normalized hand JSON")
     parser.add_argument(
         "--site",
         help=f"Force adapter site instead of using each JSONL record. Registered: {', '.join(registered_http_capture_sites())}",
     )
     parser.add_argument("--include-active", action="store_true", help="Write active/incomplete hands too")
+    parser.add_argument("--since", help="Start at the first message captured at or after this ISO-8601 time")
+    parser.add_argument("--from-hand", help="Start at the first message of this hand id")
     args = parser.parse_args()
 
-    written = replay_raw_archive(args.raw_path, args.output_dir, site=args.site, include_active=args.include_active)
+    written = replay_raw_archive(
+        args.raw_path,
+        args.output_dir,
+        site=args.site,
+        include_active=args.include_active,
+        since=args.since,
+        from_hand=args.from_hand,
+    )
     for path in written:
         print(path)
     return 0
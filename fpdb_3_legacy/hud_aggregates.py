@@ -0,0 +1,386 @@
+"""Keep the HUD's player aggregates in memory and move them forward hand by hand.
+
+For every hand dealt, the HUD used to run ``get_stats_from_hand_aggregated``
+over HudCache for everybody seated -- and for every other open table's last
+hand as well -- and throw the answer away when the next hand arrived. At two
+dozen tables that is hundreds of heavy aggregates a minute over the same few
+hundred players, each of whom changes by one hand at a time.
+
+:class:`HudAggregateStore` keeps each player's aggregate, as that query returns
+it, under the parameters it was read with: the reference gametype, the
+styleKey floor, the blind-level multiplier and the seat range. It is seeded by
+running the query once. After that the importer sends, with each hand id it
+pushes to the HUD, the rows the hand added to HudCache (``storeHudCache``), and
+the store adds them to every aggregate they fall inside -- the same filter and
+the same sums the SQL applies. :func:`aggregate_plan` takes the sums from the
+columns declared next to the query, which its select list is written from, so
+the two cannot drift apart. A column it cannot follow turns the store off.
+
+Anything that might mean a missed hand drops the whole store and the next read
+goes back to the database. That covers a bare hand id, a hand sent without its
+rows, a gap in a sender's sequence numbers and an unreadable message. A seed
+also keeps the newest hand id read once its query is done. A hand whose rows
+arrive after the query started is added only if its id is above that
+watermark; any other hand may already be in the seed, so the entry is read
+again instead. Each entry is read again after ``HUD_AGGREGATE_TTL`` so that
+imports the HUD never hears about, such as a bulk import with the HUD off,
+show up within minutes. Session ranges ("S") come from another query and never
+use the store.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from fpdb_3_legacy.database_caches import KEYED_CACHES
+from fpdb_3_legacy.loggingFpdb import get_logger
+from fpdb_3_legacy.sql_queries_hud_aggregated_stats import (
+    HUD_BIG_BLINDS_ALIAS,
+    HUD_POSITION_COLUMNS,
+    HUD_SUMMED_COLUMNS,
+)
+
+log = get_logger("hud_aggregates")
+
+# An aggregate is read from the database again after this many seconds.
+HUD_AGGREGATE_TTL = 600.0
+
+# The HudCache columns of one hand's rows, in the order storeHudCache packs them.
+HUDCACHE_COLUMNS = tuple(KEYED_CACHES["hudcache"][3])
+
+# (reference gametypeId, styleKey floor, agg_bb_mult, seats_min, seats_max)
+ReadKey = tuple[Any, str, Any, int, int]
+
+# (alias, HudCache column, seats, position) of a summed column filtered on
+# hc.seats / hc.position, as HudAdapter.aggregated_columns declares them.
+DimensionedColumn = tuple[str, str, int | None, str | None]
+
+
+@dataclass(frozen=True)
+class AggregateColumn:
+    """How one output column of the aggregate moves when a HudCache row is added."""
+
+    index: int  # into HUDCACHE_COLUMNS
+    seats: int | None = None
+    position: str | None = None
+    big_blinds: bool = False
+
+
+@dataclass(frozen=True)
+class HudCacheDelta:
+    """One player's HudCache row for one hand, as the importer sends it."""
+
+    gametype_id: int
+    player_id: int
+    seats: int
+    position: str
+    style_key: str
+    values: tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class HudMessage:
+    """A hand id pushed to the HUD, with what the hand added to HudCache when known."""
+
+    hand_id: str
+    rows: tuple[HudCacheDelta, ...] | None = None
+    sender: str | None = None
+    seq: int | None = None
+
+
+def aggregate_plan(dimensioned: Iterable[DimensionedColumn] = ()) -> dict[str, AggregateColumn] | None:
+    """The per-column update rules for the HUD aggregate's declared columns.
+
+    ``dimensioned`` are the descriptor columns injected at ``<chipev_columns>``.
+    Returns None if any column sums something storeHudCache does not send --
+    the store cannot follow such a query.
+    """
+    columns = {name.lower(): index for index, name in enumerate(HUDCACHE_COLUMNS)}
+    declared: list[DimensionedColumn] = [
+        *((alias, column, None, None) for alias, column in HUD_SUMMED_COLUMNS),
+        *((alias, column, None, position) for alias, column, position in HUD_POSITION_COLUMNS),
+        *dimensioned,
+    ]
+    plan = {HUD_BIG_BLINDS_ALIAS: AggregateColumn(columns["n"], big_blinds=True)}
+    for alias, column, seats, position in declared:
+        if column.lower() not in columns:
+            log.warning(
+                "HUD aggregate column %s sums %s, which is not sent; in-memory HUD aggregates are off", alias, column
+            )
+            return None
+        plan[alias.lower()] = AggregateColumn(columns[column.lower()], seats, position)
+    return plan
+
+
+def encode_hud_message(
+    hand_id: Any,
+    *,
+    sender: str,
+    seq: int,
+    hudcache: Sequence[tuple[Sequence[Any], Sequence[Any]]] | None = None,
+) -> str:
+    """The text ZMQSender pushes: a hand id, its sequence number and its HudCache rows."""
+    payload: dict[str, Any] = {"hand": str(hand_id), "sender": sender, "seq": seq}
+    if hudcache is not None:
+        payload["hudcache"] = [[*key, list(line)] for key, line in hudcache]
+    # Decimal statistics travel as strings and come back as Decimal.
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def _number(value: Any) -> Any:
+    return Decimal(value) if isinstance(value, str) else value
+
+
+def decode_hud_message(text: str) -> HudMessage | None:
+    """Parse what HUD_main received: a bare hand id or an encoded message. None if unreadable."""
+    text = text.strip()
+    if not text.startswith("{"):
+        return HudMessage(hand_id=text) if text else None
+    try:
+        payload = json.loads(text)
+        rows = None
+        if "hudcache" in payload:
+            rows = tuple(
+                HudCacheDelta(int(gid), int(pid), int(seats), str(position), str(style_key), tuple(map(_number, line)))
+                for gid, pid, seats, position, _tourney_type_id, style_key, line in payload["hudcache"]
+            )
+        return HudMessage(str(payload["hand"]), rows, payload.get("sender"), payload.get("seq"))
+    except (ArithmeticError, KeyError, TypeError, ValueError) as exc:
+        log.warning("Unreadable HUD message %.80r: %s", text, exc)
+        return None
+
+
+def _add(total: Any, value: Any) -> Any:
+    """Add like the database does, without mixing Decimal and float."""
+    if value is None:
+        return total
+    if total is None:
+        return value
+    if isinstance(total, Decimal) and isinstance(value, float):
+        return total + Decimal(str(value))
+    if isinstance(total, float) and isinstance(value, Decimal):
+        return total + float(value)
+    return total + value
+
+
+def _divide(big_blind: Any, multiplier: Any) -> Any:
+    # Both backends divide two integers as integers, and the query is written
+    # against exactly that.
+    if isinstance(big_blind, int) and isinstance(multiplier, int):
+        return big_blind // multiplier
+    return big_blind / multiplier
+
+
+def _hand_number(hand_id: str) -> int | None:
+    try:
+        return int(hand_id)
+    except ValueError:
+        return None
+
+
+def _is_hero(player_id: Any, hero_id: Any) -> bool:
+    if hero_id is None:
+        return False
+    try:
+        return int(player_id) == int(hero_id)
+    except (TypeError, ValueError):
+        return str(player_id) == str(hero_id)
+
+
+@dataclass
+class _Entry:
+    stats: dict[str, Any] | None  # None: the player had no HudCache row in range
+    seeded_at: float
+    watermark: int | None  # the newest hand id once the seed's query was done
+    plays_reference: bool  # has rows in the reference gametype, which the seat column reports
+
+
+def _add_row(entry: _Entry, row: HudCacheDelta, plan: dict[str, AggregateColumn], big_blind: Any) -> None:
+    assert entry.stats is not None
+    for alias, column in plan.items():
+        if column.seats is not None and row.seats != column.seats:
+            continue
+        if column.position is not None and row.position != column.position:
+            continue
+        value = row.values[column.index]
+        if column.big_blinds and value is not None:
+            value = big_blind * value
+        entry.stats[alias] = _add(entry.stats.get(alias), value)
+
+
+class HudAggregateStore:
+    """Per-(player, read parameters) HUD aggregates, seeded once and moved forward by each hand.
+
+    ``record`` is called from the thread receiving ZMQ messages; everything
+    else from the one thread that reads the database for the HUD.
+    """
+
+    def __init__(self, *, ttl: float = HUD_AGGREGATE_TTL, clock: Callable[[], float] = monotonic) -> None:
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: dict[tuple[Any, ReadKey], _Entry] = {}
+        self._pending: list[tuple[float, int | None, tuple[HudCacheDelta, ...]]] = []
+        self._senders: dict[str, int] = {}
+        self._gametypes: dict[Any, tuple[Any, ...] | None] = {}
+        self._plan: dict[str, AggregateColumn] | None = None
+        self._plan_read = False
+        self.lookups: Counter[str] = Counter(hits=0, misses=0, gaps=0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, message: HudMessage | None) -> None:
+        """Queue a hand's HudCache rows, or drop everything if a hand may have been missed."""
+        with self._lock:
+            contiguous = False
+            if message is not None and message.sender is not None and message.seq is not None:
+                last = self._senders.get(message.sender)
+                contiguous = message.seq == (1 if last is None else last + 1)
+                self._senders[message.sender] = message.seq
+            if message is None or message.rows is None or not contiguous:
+                self._entries.clear()
+                self._pending.clear()
+                self.lookups["gaps"] += 1
+                return
+            self._pending.append((self._clock(), _hand_number(message.hand_id), message.rows))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    def plan(self, dimensioned: Iterable[DimensionedColumn] = ()) -> dict[str, AggregateColumn] | None:
+        """The update rules for the aggregate query, worked out once."""
+        if not self._plan_read:
+            self._plan = aggregate_plan(dimensioned)
+            self._plan_read = True
+        return self._plan
+
+    @staticmethod
+    def _key(player_id: Any, hero_id: Any, keys: tuple[ReadKey, ReadKey]) -> ReadKey:
+        return keys[1] if _is_hero(player_id, hero_id) else keys[0]
+
+    def cached_stats(
+        self,
+        seats: dict[Any, int],
+        hero_id: Any,
+        keys: tuple[ReadKey, ReadKey],
+        gametype: Callable[[Any], tuple[Any, ...] | None],
+    ) -> dict[Any, dict[str, Any]] | None:
+        """The stat_dict for a hand seating ``seats`` (player id -> seat), or None if it must be read.
+
+        ``keys`` are the villain and hero read parameters; ``gametype`` returns
+        (siteId, type, category, limitType, bigBlind) for a gametype id.
+        """
+        if self._plan is None:
+            return None
+        self._apply_pending(gametype)
+        now = self._clock()
+        stat_dict: dict[Any, dict[str, Any]] = {}
+        with self._lock:
+            for player_id, seat in seats.items():
+                entry = self._entries.get((player_id, self._key(player_id, hero_id, keys)))
+                if entry is None or now - entry.seeded_at > self._ttl:
+                    self.lookups["misses"] += 1
+                    return None
+                if entry.stats is not None:
+                    stat_dict[player_id] = dict(entry.stats, seat=seat if entry.plays_reference else -1)
+            self.lookups["hits"] += 1
+        return stat_dict
+
+    def seed(
+        self,
+        seats: dict[Any, int],
+        hero_id: Any,
+        keys: tuple[ReadKey, ReadKey],
+        stat_dict: dict[Any, dict[str, Any]],
+        started_at: float,
+        watermark: int | None,
+    ) -> None:
+        """Remember what the aggregate query, started at ``started_at``, returned for these players.
+
+        ``watermark`` is the newest hand id, read after the query finished.
+        """
+        if self._plan is None:
+            return
+        with self._lock:
+            for player_id in seats:
+                row = stat_dict.get(player_id)
+                self._entries[(player_id, self._key(player_id, hero_id, keys))] = _Entry(
+                    stats=dict(row) if row is not None else None,
+                    seeded_at=started_at,
+                    watermark=watermark,
+                    plays_reference=row is not None and row.get("seat", -1) != -1,
+                )
+
+    def now(self) -> float:
+        return self._clock()
+
+    def _gametype(self, gametype: Callable[[Any], tuple[Any, ...] | None], gametype_id: Any) -> Any:
+        if gametype_id not in self._gametypes:
+            self._gametypes[gametype_id] = gametype(gametype_id)
+        return self._gametypes[gametype_id]
+
+    def _apply_pending(self, gametype: Callable[[Any], tuple[Any, ...] | None]) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for received_at, hand_id, rows in pending:
+            for row in rows:
+                self._apply(received_at, hand_id, row, gametype)
+        if pending:
+            with self._lock:
+                now = self._clock()
+                for key in [key for key, entry in self._entries.items() if now - entry.seeded_at > self._ttl]:
+                    del self._entries[key]
+
+    def _applies(self, key: ReadKey, row: HudCacheDelta, gametype: Callable[[Any], Any]) -> bool | None:
+        """Whether the row falls inside the aggregate read with ``key``; None if that cannot be told."""
+        reference_id, style_floor, multiplier, seats_min, seats_max = key
+        if not (seats_min <= row.seats <= seats_max and row.style_key > style_floor):
+            return False
+        played, reference = self._gametype(gametype, row.gametype_id), self._gametype(gametype, reference_id)
+        if played is None or reference is None:
+            return None
+        return (
+            played[:4] == reference[:4]
+            and played[4] <= reference[4] * multiplier
+            and played[4] >= _divide(reference[4], multiplier)
+        )
+
+    def _apply(
+        self, received_at: float, hand_id: int | None, row: HudCacheDelta, gametype: Callable[[Any], Any]
+    ) -> None:
+        plan = self._plan
+        assert plan is not None
+        if len(row.values) != len(HUDCACHE_COLUMNS):
+            self.clear()
+            return
+        with self._lock:
+            entries = [(key, entry) for key, entry in self._entries.items() if key[0] == row.player_id]
+        for key, entry in entries:
+            # Sent after its commit, so the hand was in the database before the seed's read began.
+            if received_at <= entry.seeded_at:
+                continue
+            applies = self._applies(key[1], row, gametype)
+            with self._lock:
+                if self._entries.get(key) is not entry or not applies:
+                    if applies is None:
+                        self._entries.pop(key, None)
+                    continue
+                newer = hand_id is not None and entry.watermark is not None and hand_id > entry.watermark
+                if entry.stats is None or not newer:
+                    del self._entries[key]
+                    continue
+                played = self._gametypes[row.gametype_id]
+                assert played is not None  # _applies answers None without it
+                _add_row(entry, row, plan, played[4])
+                if row.gametype_id == key[1][0]:
+                    entry.plays_reference = True
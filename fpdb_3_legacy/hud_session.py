@@ -0,0 +1,126 @@
+"""Running session statistics for the HUD, per table and player.
+
+A "session" range on the HUD means every hand played at this table since
+``hand_1day_ago``. ``get_stats_from_hand_session`` answered that by reading the
+whole window again for each hand dealt and summing the rows in Python, so the
+work grew with the session: by the end of a 3,000-hand grind every hand cost
+3,000 hands' worth of rows per player.
+
+:class:`SessionAccumulator` keeps, for each table, the sum of those rows per
+player and per table size (``h.seats``, which the seat-range filter is over).
+Each read folds in only the hands with ids above the last one it saw. When
+``hand_1day_ago`` moves forward, the hands that fell out of the window are read
+back and subtracted. Sums of the same integer rows make the result the same as
+the full query's. That assumes a table's hands become visible in id order. A
+hand committed late behind a newer one would be missed, so each table is also
+read afresh every ``SESSION_REBUILD_SECONDS``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+# A table's sums are rebuilt from a full read at least this often.
+SESSION_REBUILD_SECONDS = 600.0
+# Tables kept; the least recently read is dropped past this.
+SESSION_TABLES = 64
+
+# Columns describing the hand being asked about rather than summed.
+IDENTITY_COLUMNS = ("player_id", "hand_id", "seat", "screen_name", "seats")
+
+# read_rows(table_name, lowest_id, id_bound) -> (column names, rows) for the
+# table's hands with lowest_id <= id < id_bound, or everything above lowest_id
+# when id_bound is None.
+RowReader = Callable[[str, int, int | None], tuple[Sequence[str], Sequence[Sequence[Any]]]]
+
+
+def _add(total: Any, value: Any) -> Any:
+    return total if value is None else total + value
+
+
+@dataclass
+class _TableSession:
+    floor: int  # hand_1day_ago the sums start from
+    last_id: int  # highest hand id folded in
+    built_at: float
+    columns: tuple[str, ...] | None = None  # summed columns, in row order
+    # player id -> table size -> summed columns
+    sums: dict[Any, dict[int, list[Any]]] = field(default_factory=dict)
+
+    def player_sums(self, player_id: Any, seats_min: int, seats_max: int) -> dict[str, Any] | None:
+        """The player's summed columns over table sizes in range; None if they played no such hand."""
+        total: list[Any] | None = None
+        for seats, bucket in self.sums.get(player_id, {}).items():
+            if not seats_min <= seats <= seats_max:
+                continue
+            total = list(bucket) if total is None else [_add(a, b) for a, b in zip(total, bucket, strict=True)]
+        if total is None or self.columns is None:
+            return None
+        stats = dict(zip(self.columns, total, strict=True))
+        return stats if stats.get("n") else None
+
+
+class SessionAccumulator:
+    """Per-table running sums of the session query's rows."""
+
+    def __init__(
+        self,
+        *,
+        rebuild_seconds: float = SESSION_REBUILD_SECONDS,
+        max_tables: int = SESSION_TABLES,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._rebuild_seconds = rebuild_seconds
+        self._max_tables = max_tables
+        self._clock = clock
+        self._tables: OrderedDict[str, _TableSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+    def table(self, table_name: str, floor: int, read_rows: RowReader) -> _TableSession:
+        """The table's sums brought up to date for a window starting at ``floor``."""
+        now = self._clock()
+        state = self._tables.pop(table_name, None)
+        if (
+            state is None
+            or floor < state.floor
+            or floor > state.last_id
+            or now - state.built_at > self._rebuild_seconds
+        ):
+            state = _TableSession(floor=floor, last_id=floor - 1, built_at=now)
+        elif floor > state.floor:
+            self._fold(state, *read_rows(table_name, state.floor, floor), sign=-1)
+            state.floor = floor
+        self._fold(state, *read_rows(table_name, state.last_id + 1, None), sign=1)
+        self._tables[table_name] = state
+        while len(self._tables) > self._max_tables:
+            self._tables.popitem(last=False)
+        return state
+
+    @staticmethod
+    def _fold(state: _TableSession, colnames: Sequence[str], rows: Sequence[Sequence[Any]], *, sign: int) -> None:
+        if not rows:
+            return
+        names = [name.lower() for name in colnames]
+        summed = [i for i, name in enumerate(names) if name not in IDENTITY_COLUMNS]
+        # Every read is the same rewritten query, so the columns never change.
+        state.columns = tuple(names[i] for i in summed)
+        player_at, hand_at, seats_at = names.index("player_id"), names.index("hand_id"), names.index("seats")
+        for row in rows:
+            if sign > 0:
+                state.last_id = max(state.last_id, int(row[hand_at]))
+            buckets = state.sums.setdefault(row[player_at], {})
+            bucket = buckets.get(row[seats_at])
+            if bucket is None:
+                bucket = buckets[row[seats_at]] = [0] * len(summed)
+            for slot, i in enumerate(summed):
+                value = row[i]
+                bucket[slot] = _add(bucket[slot], value if sign > 0 or value is None else -value)
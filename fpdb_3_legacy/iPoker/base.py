@@ -61,6 +61,7 @@ from fpdb_3_legacy import Database
 from fpdb_3_legacy.HandHistoryConverter import FpdbParseError, HandHistoryConverter
 from fpdb_3_legacy.iPoker.dispatcher import detect_skin, resolve_site_id
 from fpdb_3_legacy.iPoker.hand_info import IPokerHandInfoMixin
+from fpdb_3_legacy.iPoker.session_header import IPokerSessionHeaderMixin
 from fpdb_3_legacy.iPoker.streets_actions import IPokerStreetsActionsMixin
 from fpdb_3_legacy.iPoker.tournament_results import IPokerTournamentResultsMixin
 from fpdb_3_legacy.iPoker.xml_format import IPokerXMLFormatMixin
@@ -70,7 +71,7 @@ from fpdb_3_legacy.TourneySummary import TourneySummary
 log = get_logger("ipoker_parser")
 
 
-class iPoker(IPokerStreetsActionsMixin, IPokerHandInfoMixin, IPokerTournamentResultsMixin, IPokerXMLFormatMixin, HandHistoryConverter):  # noqa: N801
+class iPoker(IPokerStreetsActionsMixin, IPokerHandInfoMixin, IPokerTournamentResultsMixin, IPokerXMLFormatMixin, IPokerSessionHeaderMixin, HandHistoryConverter):  # noqa: N801
     """A class for converting iPoker hand history files to the PokerTH format."""
 
     tinfo: dict[str, Any]
@@ -540,7 +541,7 @@ class iPoker(IPokerStreetsActionsMixin, IPokerHandInfoMixin, IPokerTournamentRes
 
         m2 = self.re_max_seats.search(hand_text)
         if not m2 and hasattr(self, "whole_file") and self.whole_file:
-            m2 = self.re_max_seats.search(self.whole_file)
+            m2 = self._session_search(self.re_max_seats)
             if m2:
                 log.debug("re_max_seats regex matched in whole_file.")
 
@@ -1149,7 +1150,7 @@ class iPoker(IPokerStreetsActionsMixin, IPokerHandInfoMixin, IPokerTournamentRes
 
         # Detect tournament vs ring game (check for tournament markers in whole file)
         if hasattr(self, "whole_file") and self.whole_file:
-            if "<tournamentname>" in self.whole_file or "<place>" in self.whole_file:
+            if self._session_contains("<tournamentname>") or self._session_contains("<place>"):
                 log.debug("Tournament detected in XML - setting type to tour")
                 self.info["type"] = "tour"
                 self.info["currency"] = "T$"  # Tournament currency
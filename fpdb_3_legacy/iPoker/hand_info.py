@@ -47,6 +47,8 @@ class IPokerHandInfoMixin:
 
         def getFileCreationTime(self) -> datetime.datetime: ...
 
+        def _session_search(self, pattern: str | re.Pattern[str]) -> re.Match[str] | None: ...
+
         def guessMaxSeats(self, hand: Any) -> int: ...
 
         @staticmethod
@@ -54,8 +56,7 @@ class IPokerHandInfoMixin:
 
     def _session_code(self) -> str:
         """Return the session code used to scope unresolved anonymous names."""
-        whole = getattr(self, "whole_file", "") or ""
-        m = _SESSION_CODE_RE.search(whole)
+        m = self._session_search(_SESSION_CODE_RE)
         return m.group("CODE") if m else "0"
 
     def _session_seat_names(self) -> dict[int, str]:
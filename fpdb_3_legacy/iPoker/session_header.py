@@ -0,0 +1,48 @@
+"""Session-level tags of an iPoker file, searched for once per read.
+
+An iPoker file is one ``<session>``: its ``<general>`` block (game type, table,
+currency, hero, table size, tournament data) is written once, ahead of the
+games, and each game carries only its own hand. Parsing a game therefore looks
+things up in ``whole_file``, and did so with a fresh ``re.search`` per hand --
+so a tag missing from the session (``<tablesize>`` in older exports, every
+tournament tag in a cash file) was hunted for across the whole file again for
+every hand, making a long session quadratic to parse. The answers depend on the
+file text only, so they are kept until ``readFile`` replaces it.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+
+class IPokerSessionHeaderMixin:
+    """Cached searches of ``whole_file`` for iPoker hand histories."""
+
+    whole_file: str
+    _session_header_src: str
+    _session_matches: dict[Any, re.Match[str] | None]
+    _session_markers: dict[str, bool]
+
+    def _session_header(self) -> str:
+        """Return ``whole_file``, dropping the cached answers if it was re-read."""
+        whole = getattr(self, "whole_file", "") or ""
+        if getattr(self, "_session_header_src", None) is not whole:
+            self._session_header_src = whole
+            self._session_matches = {}
+            self._session_markers = {}
+        return whole
+
+    def _session_search(self, pattern: str | re.Pattern[str]) -> re.Match[str] | None:
+        """``re.search(pattern, whole_file)``, run once per pattern and file."""
+        whole = self._session_header()
+        if pattern not in self._session_matches:
+            self._session_matches[pattern] = re.search(pattern, whole)
+        return self._session_matches[pattern]
+
+    def _session_contains(self, marker: str) -> bool:
+        """``marker in whole_file``, checked once per marker and file."""
+        whole = self._session_header()
+        if marker not in self._session_markers:
+            self._session_markers[marker] = marker in whole
+        return self._session_markers[marker]
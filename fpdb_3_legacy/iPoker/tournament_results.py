@@ -14,12 +14,15 @@ class IPokerTournamentResultsMixin:
     """Tournament result parsing helpers for iPoker hand histories."""
 
     if TYPE_CHECKING:
+        whole_file: str
 
         def _clean_currency_amount(self, amount_str: str) -> str: ...
 
         @staticmethod
         def clearMoneyString(money: str) -> str: ...
 
+        def _session_search(self, pattern: str | re.Pattern[str]) -> re.Match[str] | None: ...
+
     def _initialize_tournament_data(self, hand: Any) -> None:
         """Initialize tournament data structures."""
         hand.winnings = {}
@@ -71,7 +74,7 @@ class IPokerTournamentResultsMixin:
 
         tourney_info = {}
         for key, pattern in tourney_patterns.items():
-            match = re.search(pattern, xml_source)
+            match = self._session_search(pattern) if xml_source is self.whole_file else re.search(pattern, xml_source)
             if match:
                 tourney_info[key] = match.group(1)
                 log.debug("Found tournament %s: %s", key, match.group(1))
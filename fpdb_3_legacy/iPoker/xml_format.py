@@ -23,6 +23,10 @@ class IPokerXMLFormatMixin:
 
         def _filename_game_info_source(self) -> str: ...
 
+        def _session_search(self, pattern: str | re.Pattern[str]) -> re.Match[str] | None: ...
+
+        def _session_contains(self, marker: str) -> bool: ...
+
     def _parse_xml_format(self, hand_text: str) -> dict | None:  # noqa: ARG002, PLR0912, PLR0915, C901
         """Parse XML format by combining session and game level information."""
         log.debug("Parsing XML format")
@@ -38,7 +42,7 @@ class IPokerXMLFormatMixin:
 
         session_info: dict[str, str] = {}
         for key, pattern in session_patterns.items():
-            match = re.search(pattern, self.whole_file)
+            match = self._session_search(pattern)
             if match:
                 session_info[key] = match.group(1)
                 log.debug("Found session %s: %s", key, match.group(1))
@@ -170,7 +174,7 @@ class IPokerXMLFormatMixin:
                 self.info["category"] = "holdem"
 
         # Detect tournament vs ring game
-        if "<tournamentname>" in self.whole_file or "<place>" in self.whole_file:
+        if self._session_contains("<tournamentname>") or self._session_contains("<place>"):
             log.debug("Tournament detected in XML - setting type to tour")
             self.info["type"] = "tour"
             self.info["currency"] = "T$"  # Tournament currency
@@ -298,7 +302,7 @@ class IPokerXMLFormatMixin:
 
         tourney_info: dict[str, str] = {}
         for key, pattern in tourney_patterns.items():
-            match = re.search(pattern, self.whole_file)
+            match = self._session_search(pattern)
             if match:
                 tourney_info[key] = match.group(1)
                 log.debug("Found tournament %s: %s", key, match.group(1))
@@ -313,7 +317,7 @@ class IPokerXMLFormatMixin:
             log.debug("Using tournamentcode as tourNo: %s", self.tinfo["tourNo"])
         else:
             # Fallback: extract from tablename
-            tablename = re.search(r"<tablename>([^<]*)</tablename>", self.whole_file)
+            tablename = self._session_search(r"<tablename>([^<]*)</tablename>")
             if tablename:
                 tourno_match = re.search(r"(\d{9,})", tablename.group(1))
                 if tourno_match:
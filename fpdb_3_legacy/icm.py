@@ -0,0 +1,126 @@
+"""Independent Chip Model (Malmuth-Harville) tournament equity.
+
+ICM turns chip stacks into shares of a prize pool: a player finishes first with
+probability stack / chips in play, and each later place is drawn the same way
+from the players still left. Summing over every finishing order is factorial in
+the number of players; the replayer's original recursion did exactly that, in
+``Decimal``, and stopped being usable around eight stacks.
+
+Only *which* players have taken the places above matters, not their order, so
+:func:`exact_icm` walks sets of finished players (bitmasks) one paid place at a
+time, carrying the probability of each set. That is ``n * 2**n`` float steps in
+the worst case -- a full 9-handed final table in about a millisecond -- and far
+fewer when only a few places pay. Beyond :data:`EXACT_ICM_STATE_LIMIT` sets,
+:func:`monte_carlo_icm` samples finishing orders with NumPy instead.
+
+:func:`icm_equities` picks between the two and is what callers -- the replayer,
+all-in EV analysis, tournament reports -- should use. Stacks of zero are players
+already out: they take no paid place.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import comb
+
+import numpy as np
+
+# More finished-player sets than this and icm_equities samples instead.
+EXACT_ICM_STATE_LIMIT = 250_000
+DEFAULT_ICM_SAMPLES = 200_000
+# Finishing orders drawn per NumPy batch, bounding memory to a few MB.
+_SAMPLE_BATCH = 20_000
+
+
+def _validate(stacks: Sequence[float], payouts: Sequence[float]) -> None:
+    if any(stack < 0 for stack in stacks):
+        msg = "Stacks cannot be negative"
+        raise ValueError(msg)
+    if any(payout < 0 for payout in payouts):
+        msg = "Payouts cannot be negative"
+        raise ValueError(msg)
+
+
+def exact_state_count(players: int, places: int) -> int:
+    """Finished-player sets the exact model visits for this many players and paid places."""
+    return sum(comb(players, size) for size in range(min(places, players)))
+
+
+def exact_icm(stacks: Sequence[float], payouts: Sequence[float]) -> list[float]:
+    """Exact ICM equity of each stack, in the units of ``payouts``."""
+    _validate(stacks, payouts)
+    chips = [float(stack) for stack in stacks]
+    equities = [0.0] * len(chips)
+    alive = [(1 << i, i, chip) for i, chip in enumerate(chips) if chip > 0]
+    places = min(len(payouts), len(alive))
+    total = sum(chips)
+    # Finished-player set -> (probability, chips those players held).
+    layer: dict[int, tuple[float, float]] = {0: (1.0, 0.0)}
+    for place in range(places):
+        prize = float(payouts[place])
+        last = place + 1 == places
+        following: dict[int, tuple[float, float]] = {}
+        for finished, (probability, finished_chips) in layer.items():
+            scale = probability / (total - finished_chips)
+            for bit, i, chip in alive:
+                if finished & bit:
+                    continue
+                share = scale * chip
+                equities[i] += share * prize
+                if not last:
+                    key = finished | bit
+                    previous = following.get(key)
+                    if previous is None:
+                        following[key] = (share, finished_chips + chip)
+                    else:
+                        following[key] = (previous[0] + share, previous[1])
+        layer = following
+    return equities
+
+
+def monte_carlo_icm(
+    stacks: Sequence[float],
+    payouts: Sequence[float],
+    *,
+    samples: int = DEFAULT_ICM_SAMPLES,
+    seed: int | None = 0,
+) -> list[float]:
+    """ICM equity estimated from ``samples`` finishing orders drawn with ``seed``.
+
+    Ordering players by ``Exp(1) / stack`` draws a finishing order with exactly
+    the Malmuth-Harville probabilities, so a batch of orders is one argsort.
+    """
+    _validate(stacks, payouts)
+    if samples <= 0:
+        msg = "samples must be positive"
+        raise ValueError(msg)
+    chips = np.asarray(stacks, dtype=float)
+    equities = np.zeros(len(chips))
+    alive = np.flatnonzero(chips > 0)
+    places = min(len(payouts), len(alive))
+    if places == 0:
+        return equities.tolist()
+    prizes = np.asarray(payouts[:places], dtype=float)
+    rng = np.random.default_rng(seed)
+    remaining = samples
+    while remaining:
+        batch = min(remaining, _SAMPLE_BATCH)
+        keys = rng.standard_exponential((batch, len(alive))) / chips[alive]
+        order = np.argsort(keys, axis=1)[:, :places]
+        equities += np.bincount(alive[order].ravel(), weights=np.tile(prizes, batch), minlength=len(chips))
+        remaining -= batch
+    return (equities / samples).tolist()
+
+
+def icm_equities(
+    stacks: Sequence[float],
+    payouts: Sequence[float],
+    *,
+    samples: int = DEFAULT_ICM_SAMPLES,
+    seed: int | None = 0,
+) -> list[float]:
+    """ICM equity of each stack: exact when affordable, sampled for large fields."""
+    players = sum(1 for stack in stacks if stack > 0)
+    if exact_state_count(players, len(payouts)) <= EXACT_ICM_STATE_LIMIT:
+        return exact_icm(stacks, payouts)
+    return monte_carlo_icm(stacks, payouts, samples=samples, seed=seed)
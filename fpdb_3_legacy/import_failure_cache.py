@@ -42,7 +42,7 @@ def is_sidecar_file(path: str | bytes) -> bool:
     return name.endswith(SYSTEM_FILES) or name.endswith(SIDECAR_EXTENSIONS)
 
 
-def _signature(path: str | bytes) -> tuple[int, int] | None:
+def file_signature(path: str | bytes) -> tuple[int, int] | None:
     try:
         stat = os.stat(path)
     except OSError:
@@ -62,13 +62,13 @@ class FailureCache:
 
     def remember(self, path: str | bytes) -> None:
         """Record that `path` failed as it currently stands."""
-        self._signatures[path] = _signature(path)
+        self._signatures[path] = file_signature(path)
 
     def failed(self, path: str | bytes) -> bool:
         """True only if `path` failed and has not changed since."""
         if path not in self._signatures:
             return False
-        if self._signatures[path] != _signature(path):
+        if self._signatures[path] != file_signature(path):
             # Written to since it failed, so it deserves another read.
             del self._signatures[path]
             return False
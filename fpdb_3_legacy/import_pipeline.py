@@ -0,0 +1,206 @@
+"""Parse hand-history files on a process pool while one writer stores them.
+
+A bulk import spends most of its time turning text into ``Hand`` objects: the
+converter's regexes, the street and action bookkeeping, the pot arithmetic. None
+of that touches the database, so it can run on every core. Storing cannot: the
+hand ids come from one counter, duplicate detection and the cache tables assume
+hands arrive in order, and player and game-type rows are created on first sight.
+Two writers racing to create the same player would fail on the unique key.
+
+So the work is split where the database first appears. Workers run
+``HandHistoryConverter.start`` and send back the parsed hands together with the
+counters the importer reads off a converter. The importer stays the only
+writer: it resolves ids (``Hand.prepInsert``), derives the statistics
+(``Hand.assembleHand``, which needs those ids) and inserts, file by file in the
+order the files were queued. Hand ids, tallies and stored rows are therefore the
+same as a serial import of the same list.
+
+Workers are started with the ``spawn`` method on every platform. The importer
+process holds Qt, ZMQ and database threads; forking it would copy their locks in
+whatever state they happened to be.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+log = get_logger("import_pipeline")
+
+# Parsers that need the importer's database while they parse. PartyPoker writes
+# the tournament results embedded in its hand histories as it reads them, so its
+# files stay on the writer.
+WRITER_ONLY_FILTERS = frozenset({"PartyPoker"})
+
+# Files parsed ahead of the writer, per worker. Enough to keep every worker busy
+# while the writer stores the file in front of it, without holding a whole
+# archive's worth of parsed hands in memory.
+PARSE_AHEAD_PER_WORKER = 2
+
+_worker_config: Any = None
+
+
+def default_workers() -> int:
+    """One parse worker per core, leaving one core to the writer."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+@dataclass(frozen=True, slots=True)
+class ParseJob:
+    """Everything a worker needs to parse one file without the importer."""
+
+    path: str
+    filter_name: str
+    sitename: str
+    archive: bool = False
+    index: int = 0
+    auto_pop: bool = False
+
+
+@dataclass
+class ParsedFile:
+    """A parsed file, standing in for the converter that produced it.
+
+    ``Importer._import_hh_file`` reads the converter through the attributes and
+    getters below; a ``ParsedFile`` offers the same ones so the store phase does
+    not care which process did the parsing.
+    """
+
+    path: str
+    sitename: str | None
+    processedHands: list[Any] = field(default_factory=list)
+    parsing_issues: list[str] = field(default_factory=list)
+    numHands: int = 0
+    numPartial: int = 0
+    numSkipped: int = 0
+    numErrors: int = 0
+    summaryInFile: bool = False
+    last_character_read: int = 0
+    parse_seconds: float = 0.0
+
+    def getProcessedHands(self) -> list[Any]:
+        return self.processedHands
+
+    def getLastCharacterRead(self) -> int:
+        return self.last_character_read
+
+    def attach_config(self, config: Any) -> None:
+        """Give the hands back the writer's configuration (workers strip theirs)."""
+        for hand in self.processedHands:
+            hand.config = config
+
+
+def _init_worker(config_file: str | None) -> None:
+    global _worker_config
+    from fpdb_3_legacy import Configuration
+
+    _worker_config = Configuration.Config(file=config_file)
+
+
+def parse_file(job: ParseJob) -> ParsedFile:
+    """Parse one file in a worker process. Runs ``start`` exactly as the importer would."""
+    from fpdb_3_legacy.iPoker.dispatcher import get_parser_class_for_path
+    from fpdb_3_legacy.parser_registry import get_parser_class
+
+    started = perf_counter()
+    parser_class = get_parser_class(job.filter_name)
+    if job.filter_name == "iPoker":
+        parser_class = get_parser_class_for_path(job.path)
+    hhc = parser_class(
+        _worker_config,
+        in_path=job.path,
+        index=job.index,
+        autostart=False,
+        starsArchive=job.archive,
+        ftpArchive=job.archive,
+        sitename=job.sitename,
+    )
+    hhc.setAutoPop(job.auto_pop)
+    hhc.start()
+
+    hands = hhc.getProcessedHands()
+    for hand in hands:
+        # The configuration is rebuilt in every worker and is by far the largest
+        # thing a hand refers to; sending it back once per hand would cost more
+        # than the parse saved.
+        hand.config = None
+    return ParsedFile(
+        path=job.path,
+        sitename=getattr(hhc, "sitename", None),
+        processedHands=hands,
+        parsing_issues=list(hhc.parsing_issues),
+        numHands=hhc.numHands,
+        numPartial=hhc.numPartial,
+        numSkipped=getattr(hhc, "numSkipped", 0),
+        numErrors=hhc.numErrors,
+        summaryInFile=getattr(hhc, "summaryInFile", False),
+        last_character_read=hhc.getLastCharacterRead(),
+        parse_seconds=perf_counter() - started,
+    )
+
+
+class ParseAhead:
+    """Parse queued files on a process pool, a bounded window ahead of the writer.
+
+    Jobs are submitted in queue order and at most ``workers *
+    PARSE_AHEAD_PER_WORKER`` are in flight. ``result(path)`` blocks until that
+    file is parsed and re-raises whatever the worker raised, so a file that
+    fails to parse fails in the importer exactly where it would have serially.
+    Paths with no job (summaries, writer-only parsers) return ``None``: the
+    importer parses those itself.
+    """
+
+    def __init__(self, config_file: str | None, jobs: Iterable[ParseJob], workers: int) -> None:
+        self._pending: deque[ParseJob] = deque(jobs)
+        self._jobs = {job.path for job in self._pending}
+        self._futures: dict[str, Future[ParsedFile]] = {}
+        self._window = max(1, workers) * PARSE_AHEAD_PER_WORKER
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config_file,),
+        )
+        log.info(f"Parsing {len(self._pending)} files on {workers} worker processes")
+        self._fill()
+
+    def _fill(self) -> None:
+        while self._pending and len(self._futures) < self._window:
+            job = self._pending.popleft()
+            self._futures[job.path] = self._executor.submit(parse_file, job)
+
+    def result(self, path: str) -> ParsedFile | None:
+        if path not in self._jobs:
+            return None
+        self._jobs.discard(path)
+        future = self._futures.pop(path, None)
+        if future is None:
+            # Asked out of queue order: submit it now rather than wait for the window.
+            job = next(job for job in self._pending if job.path == path)
+            self._pending.remove(job)
+            future = self._executor.submit(parse_file, job)
+        self._fill()
+        return future.result()
+
+    def close(self) -> None:
+        self._pending.clear()
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ParseAhead:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,406 @@
+"""What IdentifySite needs of each converter, precomputed.
+
+Picking a file's site only takes a handful of class attributes per converter:
+the identification, hand-splitting and hero-card regexes, the code pages and a
+few flags. Reading them off the classes meant importing every converter first.
+They are copied here instead, so that the converter for a file is imported only
+once the file is known to belong to it.
+
+The table is generated from the classes. After changing any of these
+attributes on a converter, regenerate it with::
+
+    python -m fpdb_3_legacy.parser_identify_table && ruff format fpdb_3_legacy/parser_identify_table.py
+
+``test/test_parser_identify_table.py`` fails until the table matches the classes.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+# (pattern, flags) of a compiled regex; re.UNICODE is implied.
+PatternSpec = tuple[str, int]
+
+
+@dataclass(frozen=True)
+class ParserIdentity:
+    """The identification attributes of one converter class.
+
+    Exposes them under the converter's own attribute names, so ``Site`` can be
+    built from either.
+    """
+
+    site_id: int | None
+    codepage: str | tuple[str, ...]
+    copyGameHeader: bool
+    summaryInFile: bool
+    identify: PatternSpec | None = None
+    split_hands: PatternSpec | None = None
+    hero_cards: PatternSpec | None = None
+    hero_cards1: PatternSpec | None = None
+    hero_cards2: PatternSpec | None = None
+
+    @cached_property
+    def re_identify(self) -> re.Pattern[str] | None:
+        return _compile(self.identify)
+
+    @cached_property
+    def re_split_hands(self) -> re.Pattern[str] | None:
+        return _compile(self.split_hands)
+
+    @cached_property
+    def re_hero_cards(self) -> re.Pattern[str] | None:
+        return _compile(self.hero_cards)
+
+    @cached_property
+    def re_HeroCards1(self) -> re.Pattern[str] | None:  # noqa: N802 - PokerTracker's attribute name.
+        return _compile(self.hero_cards1)
+
+    @cached_property
+    def re_HeroCards2(self) -> re.Pattern[str] | None:  # noqa: N802 - PokerTracker's attribute name.
+        return _compile(self.hero_cards2)
+
+
+def _compile(spec: PatternSpec | None) -> re.Pattern[str] | None:
+    return None if spec is None else re.compile(*spec)
+
+
+PARSER_IDENTITIES: dict[str, ParserIdentity] = {
+    "Absolute": ParserIdentity(
+        site_id=8,
+        codepage="cp1252",
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Stage\s+\#C?[0-9]+", re.NOFLAG),
+        split_hands=(r"\n\n+", re.NOFLAG),
+    ),
+    "BetOnline": ParserIdentity(
+        site_id=19,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(
+            r"(BetOnline\sPoker|PayNoRake|ActionPoker\.com|Gear\sPoker|SportsBetting\.ag\sPoker|Tiger\sGaming)\sGame\s\#\d+",
+            re.NOFLAG,
+        ),
+        split_hands=("\n\n\n+", re.NOFLAG),
+        hero_cards=(r"^Dealt [Tt]o (?P<PNAME>.+?)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "Betfair": ParserIdentity(
+        site_id=7,
+        codepage="cp1252",
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"\*{5}\sBetfair\sPoker\sHand\sHistory\sfor\sGame\s\d+\s", re.NOFLAG),
+        split_hands=(r"\n\n+", re.NOFLAG),
+    ),
+    "Boss": ParserIdentity(
+        site_id=4,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=('<HISTORY\\sID="\\d+"\\sSESSION=', re.NOFLAG),
+        split_hands=(r"</HISTORY>", re.NOFLAG),
+        hero_cards=(
+            'PLAYER="(?P<PNAME>[^"]+)">(?P<CARDS>(\\s+<CARD LINK="[0-9]+"></CARD>){2,5})</ACTION>',
+            re.MULTILINE,
+        ),
+    ),
+    "Bovada": ParserIdentity(
+        site_id=21,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"(Ignition|Bovada|Bodog(\.com|\.eu|\sUK|\sCanada|88)?)\sHand", re.NOFLAG),
+        split_hands=("\n\n+", re.NOFLAG),
+        hero_cards=(r"^(?P<PNAME>.+?)  ?\[ME\] : Card dealt to a spot \[(?P<NEWCARDS>.+?)\]", re.MULTILINE),
+    ),
+    "Cake": ParserIdentity(
+        site_id=17,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Hand\#[A-Z0-9]+\s\-\s", re.NOFLAG),
+        split_hands=("\n\n+", re.NOFLAG),
+        hero_cards=(r"^Dealt to (?P<PNAME>.+?)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "CoinPoker": ParserIdentity(
+        site_id=140,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"$^", re.NOFLAG),
+    ),
+    "Enet": ParserIdentity(
+        site_id=22,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"^Game\s\#\d+:\s[OH]", re.NOFLAG),
+        split_hands=("\n\n+", re.NOFLAG),
+        hero_cards=(r"^Dealt to (?P<PNAME>.+?)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "Entraction": ParserIdentity(
+        site_id=18,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Game\s\#\s\d+\s\-\s", re.NOFLAG),
+        split_hands=(r"\n\n(?=Game\s#)", re.NOFLAG),
+        hero_cards=(r"^(?P<PNAME>.+?) was dealt:\s+(?P<CARDS>.+)", re.MULTILINE),
+    ),
+    "Everest": ParserIdentity(
+        site_id=16,
+        codepage="utf8",
+        copyGameHeader=True,
+        summaryInFile=False,
+        identify=('<HAND\\stime="\\d+"\\sid=', re.NOFLAG),
+        split_hands=(r"</HAND>", re.NOFLAG),
+        hero_cards=('<HOLE position="(?P<PSEAT>[0-9])">(?P<CARD>[^-]+)</HOLE>', re.MULTILINE),
+    ),
+    "Everleaf": ParserIdentity(
+        site_id=3,
+        codepage=("utf-8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"\*{5}\sHand\shistory\sfor\sgame\s#\d+\s|Partouche\sPoker\s", re.NOFLAG),
+        split_hands=(r"\n\n\n+", re.NOFLAG),
+    ),
+    "Fulltilt": ParserIdentity(
+        site_id=1,
+        codepage=("utf-8", "cp1252", "utf-16"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"FullTiltPoker|Full\sTilt\sPoker\sGame\s#\d+:", re.NOFLAG),
+        split_hands=(r"\n\n+(?=(?:Full\sTilt\sPoker\sGame\s\#|FullTiltPoker\sGame\s\#))", re.NOFLAG),
+    ),
+    "GGPoker": ParserIdentity(
+        site_id=27,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Poker\sHand\s\#[A-Z]{0,2}?\d+:", re.NOFLAG),
+        split_hands=("(?:\\s?\n){2,}", re.NOFLAG),
+    ),
+    "KingsClub": ParserIdentity(
+        site_id=28,
+        codepage=("utf8", "cp1252", "ISO-8859-1"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"^\#\d+:", re.NOFLAG),
+        split_hands=("(?:\\s?\n){2,}", re.NOFLAG),
+    ),
+    "Merge": ParserIdentity(
+        site_id=12,
+        codepage=("cp1252", "utf8"),
+        copyGameHeader=True,
+        summaryInFile=False,
+        identify=('<game\\sid="[0-9]+\\-[0-9]+"\\sstarttime', re.NOFLAG),
+        split_hands=(r"</game>\n+(?=<)", re.NOFLAG),
+        hero_cards=(
+            '<cards type="(HOLE|DRAW_DRAWN_CARDS)" cards="(?P<CARDS>.+)" player="(?P<PSEAT>[0-9])"',
+            re.MULTILINE,
+        ),
+    ),
+    "Microgaming": ParserIdentity(
+        site_id=20,
+        codepage=("utf-8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=('<Game\\s(hhversion="\\d"\\s)?id="\\d+"\\sdate="[\\d\\-\\s:]+"\\sunicodetablename', re.NOFLAG),
+        split_hands=("\n*----.+.DAT----\n*", re.NOFLAG),
+        hero_cards=(
+            '<Action seq="\\d+" type="DealCards" seat="(?P<SEAT>\\d+)">\\s+?(?P<CARDS>(<Card value="[0-9TJQKA]+" suit="[csdh]" id="(?P<CARD>\\d+)"\\s?/>\\s+)+)',
+            re.MULTILINE,
+        ),
+    ),
+    "OnGame": ParserIdentity(
+        site_id=5,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"\*{5}\sHistory\sfor\shand\s[A-Z0-9\-]+\s", re.NOFLAG),
+        split_hands=("\\*\\*\\*\\*\\*\\sEnd\\sof\\shand\\s[-A-Z\\d]+.*\n+(?=\\*)", re.NOFLAG),
+    ),
+    "PacificPoker": ParserIdentity(
+        site_id=10,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(
+            r"(\*{4,5}\s(Cassava|888poker|888)(\.[a-z]{2})?(\-[a-z]{2})?\s(Snap\sPoker\s|BLAST\s)?Hand\sHistory\sfor\sGame\s\d+\s)",
+            re.NOFLAG,
+        ),
+        split_hands=("\n\n+", re.NOFLAG),
+        hero_cards=(r"^Dealt to (?P<PNAME>.+?)( \[\s(?P<NEWCARDS>.+?)\s\])", re.MULTILINE),
+    ),
+    "PartyPoker": ParserIdentity(
+        site_id=9,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"\*{5}\sHand\sHistory\s[fF]or\sGame\s\w+", re.NOFLAG),
+        split_hands=(
+            r"Game\s*\#\d+\s*starts.\n\n+\#Game\s*No\s*\:\s*\d+\s*|\n\n+(?=\*\*\*\*\*\sHand\sHistory\s[fF]or\sGame)",
+            re.NOFLAG,
+        ),
+    ),
+    "Pkr": ParserIdentity(
+        site_id=13,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Starting\sHand\s\#\d+", re.NOFLAG),
+        split_hands=("\n\n+", re.NOFLAG),
+    ),
+    "PokerStars": ParserIdentity(
+        site_id=32,
+        codepage=("utf8", "cp1252", "ISO-8859-1"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(
+            r"(PokerStars|POKERSTARS|Hive\sPoker|Full\sTilt|PokerMaster|Run\sIt\sOnce\sPoker|BetOnline|PokerBros|MPLPoker|SupremaPoker)(\sGame|\sHand|\sHome\sGame|\sHome\sGame\sHand|Game|\s(Zoom|Rush)\sHand|\sGAME)\s\#\d+:",
+            re.NOFLAG,
+        ),
+        split_hands=("(?:\\s?\n){2,}", re.NOFLAG),
+    ),
+    "PokerTracker": ParserIdentity(
+        site_id=14,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(
+            r"(EverestPoker\sGame\s\#|GAME\s\#|MERGE_GAME\s\#|Merge\sGame\s\#|\*{2}\s(Game\sID|Hand\s\#)\s)\d+",
+            re.NOFLAG,
+        ),
+        split_hands=("\n\n\n+?", re.NOFLAG),
+        hero_cards1=(r"^Dealt to (?P<PNAME>.+?)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+        hero_cards2=(r"rd(s)? to (?P<PNAME>.+?): (?P<OLDCARDS>NONE)?(?P<NEWCARDS>.+)\n", re.MULTILINE),
+    ),
+    "SealsWithClubs": ParserIdentity(
+        site_id=23,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"SwCPoker\sHand\s|^Site:\sSeals\sWith\sClubs", re.MULTILINE),
+        split_hands=("(?:\\s?\n){2,}", re.NOFLAG),
+        hero_cards=(r"^Dealt to (?P<PNAME>\w+)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "Unibet": ParserIdentity(
+        site_id=30,
+        codepage=("utf8", "cp1252", "ISO-8859-1"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(
+            r"Game\s\#\d+:\sTable\s(€|$|£)[0-9]+\s(PL|NL|FL)|Unibet\sHand\s\#\d+(\s-\s|,\sTournament\s\#)",
+            re.NOFLAG,
+        ),
+        split_hands=("(?:\\s?\n){2,}", re.NOFLAG),
+        hero_cards=(r"Dealt\sto\s\s?(?P<PNAME>.+?)\s(?:\[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "Winamax": ParserIdentity(
+        site_id=15,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=('Winamax\\sPoker\\s\\-\\s(CashGame|Go\\sFast|HOLD\\-UP|ESCAPE|Tournament\\s")', re.NOFLAG),
+        split_hands=(r"\n\n", re.NOFLAG),
+    ),
+    "Winning": ParserIdentity(
+        site_id=24,
+        codepage=("utf8", "cp1252", "utf-16"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=(r"Game\sID:\s\d+|^(?:Game\s)?Hand\s\#\d+\s\-\s", re.MULTILINE),
+        split_hands=("\n\n", re.NOFLAG),
+        hero_cards1=(r"^Player (?P<PNAME>.+?) received card: \[(?P<CARD>.+)\]", re.MULTILINE),
+        hero_cards2=(r"^Dealt to (?P<PNAME>.+?)(?: \[(?P<OLDCARDS>.+?)\])?( \[(?P<NEWCARDS>.+?)\])", re.MULTILINE),
+    ),
+    "iPoker": ParserIdentity(
+        site_id=14,
+        codepage=("utf8", "cp1252"),
+        copyGameHeader=False,
+        summaryInFile=False,
+        identify=('<game gamecode="\\d+">', re.NOFLAG),
+        split_hands=(r"</game>", re.NOFLAG),
+        hero_cards=(
+            '<cards( (type="(Pocket|Second\\sStreet|Third\\sStreet|Fourth\\sStreet|Fifth\\sStreet|Sixth\\sStreet|River)"|player="(?P<PNAME>[^\\"]+)"))+>(?P<CARDS>.+?)</cards>',
+            re.MULTILINE,
+        ),
+    ),
+}
+
+SUMMARY_IDENTIFY: dict[str, PatternSpec | None] = {
+    "BovadaSummary": (r"(Ignition|Bovada|Bodog(\.eu|\sUK|\sCanada|88)?)\sHand", re.NOFLAG),
+    "FullTiltPokerSummary": (r"Full\sTilt\sPoker\.fr\sTournament|Full\sTilt\sPoker\sTournament\sSummary", re.NOFLAG),
+    "MergeSummary": (r"<title>Online\sPoker\sTournament\sDetails\s\-\sCarbonPoker</title>", re.NOFLAG),
+    "PacificPokerSummary": (
+        r"\*{5}\s(Cassava|888poker|888)(\.[a-z]{2})?(\-[a-z]{2})? Tournament Summary\s\*{5}",
+        re.NOFLAG,
+    ),
+    "PokerStarsSummary": (
+        r"((?P<SITE>PokerStars|Full\sTilt|Run\sIt\sOnce\sPoker)(\sKick-Off)?\sTournament\s\#\d+|<title>TOURNEYS:)",
+        re.NOFLAG,
+    ),
+    "PokerTrackerSummary": (r"PokerTracker", re.NOFLAG),
+    "TourneySummary": None,
+    "UnibetSummary": (r"Unibet\sTournament\s\#\d+", re.NOFLAG),
+    "WinamaxSummary": (r"Winamax\sPoker\s\-\sTournament\ssummary", re.NOFLAG),
+    "WinningSummary": ('<link\\sid="ctl00_CalendarTheme"', re.NOFLAG),
+    "iPokerSummary": (r"<game\sgamecode=", re.NOFLAG),
+}
+
+
+def render_table() -> str:
+    """Return the two tables above as source, read from the converter classes."""
+    from fpdb_3_legacy.parser_registry import (
+        PARSER_CLASS_REGISTRY,
+        SUMMARY_CLASS_REGISTRY,
+        describe_parser_class,
+        describe_summary_class,
+    )
+
+    lines = ["PARSER_IDENTITIES: dict[str, ParserIdentity] = {"]
+    for name, cls in PARSER_CLASS_REGISTRY.items():
+        identity = describe_parser_class(cls)
+        lines.append(f"    {name!r}: ParserIdentity(")
+        for field in ParserIdentity.__dataclass_fields__:
+            value = getattr(identity, field)
+            if field in ("site_id", "codepage", "copyGameHeader", "summaryInFile"):
+                lines.append(f"        {field}={value!r},")
+            elif value is not None:
+                lines.append(f"        {field}={_spec_literal(value)},")
+        lines.append("    ),")
+    lines.append("}")
+    lines.append("")
+    lines.append("SUMMARY_IDENTIFY: dict[str, PatternSpec | None] = {")
+    lines.extend(
+        f"    {name!r}: {_spec_literal(describe_summary_class(cls))}," for name, cls in SUMMARY_CLASS_REGISTRY.items()
+    )
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _spec_literal(spec: PatternSpec | None) -> str:
+    if spec is None:
+        return "None"
+    pattern, flags = spec
+    # Raw strings where they can say the same, so the table reads like the converters.
+    raw = pattern.isprintable() and '"' not in pattern and not pattern.endswith("\\")
+    literal = f'r"{pattern}"' if raw else repr(pattern)
+    return f"({literal}, {re.RegexFlag(flags)!r})"
+
+
+def main() -> None:
+    path = Path(__file__)
+    source = path.read_text(encoding="utf-8")
+    start = source.index("PARSER_IDENTITIES: dict")
+    end = source.index("\n\n\ndef render_table")
+    path.write_text(source[:start] + render_table() + source[end:], encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,28 @@
 #!/usr/bin/env python
+"""Where each hand-history converter and tournament summary importer lives.
+
+This module used to import every ``*ToFpdb`` and ``*Summary`` module up front,
+so any process that touched the importer or ``IdentifySite`` -- including the
+HUD child and one-off backfill scripts -- paid about a second to load thirty
+converters it mostly never used. Classes are now imported on first lookup, and
+identifying a file's site reads the small precomputed table in
+:mod:`fpdb_3_legacy.parser_identify_table` instead of the converter classes.
+"""
+
 from __future__ import annotations
 
 import importlib
 import re
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 from functools import cache
 from types import ModuleType
-from typing import cast
-
-from fpdb_3_legacy.AbsoluteToFpdb import Absolute
-from fpdb_3_legacy.BetfairToFpdb import Betfair
-from fpdb_3_legacy.BetOnlineToFpdb import BetOnline
-from fpdb_3_legacy.BossToFpdb import Boss
-from fpdb_3_legacy.BovadaSummary import BovadaSummary
-from fpdb_3_legacy.BovadaToFpdb import Bovada
-from fpdb_3_legacy.CakeToFpdb import Cake
-from fpdb_3_legacy.CoinPokerToFpdb import CoinPoker
-from fpdb_3_legacy.EnetToFpdb import Enet
-from fpdb_3_legacy.EntractionToFpdb import Entraction
-from fpdb_3_legacy.EverestToFpdb import Everest
-from fpdb_3_legacy.EverleafToFpdb import Everleaf
-from fpdb_3_legacy.FullTiltPokerSummary import FullTiltPokerSummary
-from fpdb_3_legacy.FulltiltToFpdb import Fulltilt
-from fpdb_3_legacy.GGPokerToFpdb import GGPoker
-from fpdb_3_legacy.HandHistoryConverter import HandHistoryConverter
-from fpdb_3_legacy.iPokerSummary import iPokerSummary
-from fpdb_3_legacy.iPokerToFpdb import iPoker
-from fpdb_3_legacy.KingsClubToFpdb import KingsClub
-from fpdb_3_legacy.MergeSummary import MergeSummary
-from fpdb_3_legacy.MergeToFpdb import Merge
-from fpdb_3_legacy.MicrogamingToFpdb import Microgaming
-from fpdb_3_legacy.OnGameToFpdb import OnGame
-from fpdb_3_legacy.PacificPokerSummary import PacificPokerSummary
-from fpdb_3_legacy.PacificPokerToFpdb import PacificPoker
-from fpdb_3_legacy.PartyPokerToFpdb import PartyPoker
-from fpdb_3_legacy.PkrToFpdb import Pkr
-from fpdb_3_legacy.PokerStarsSummary import PokerStarsSummary
-from fpdb_3_legacy.PokerStarsToFpdb import PokerStars
-from fpdb_3_legacy.PokerTrackerSummary import PokerTrackerSummary
-from fpdb_3_legacy.PokerTrackerToFpdb import PokerTracker
-from fpdb_3_legacy.SealsWithClubsToFpdb import SealsWithClubs
-from fpdb_3_legacy.TourneySummary import TourneySummary
-from fpdb_3_legacy.UnibetSummary import UnibetSummary
-from fpdb_3_legacy.UnibetToFpdb import Unibet
-from fpdb_3_legacy.WinamaxSummary import WinamaxSummary
-from fpdb_3_legacy.WinamaxToFpdb import Winamax
-from fpdb_3_legacy.WinningSummary import WinningSummary
-from fpdb_3_legacy.WinningToFpdb import Winning
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from fpdb_3_legacy.parser_identify_table import PARSER_IDENTITIES, SUMMARY_IDENTIFY, ParserIdentity
+
+if TYPE_CHECKING:
+    from fpdb_3_legacy.HandHistoryConverter import HandHistoryConverter
+    from fpdb_3_legacy.TourneySummary import TourneySummary
 
 LEGACY_MODULE_REGISTRY: dict[str, str] = {
     "AbsoluteToFpdb": "fpdb_3_legacy.AbsoluteToFpdb",
@@ -89,51 +65,91 @@ LEGACY_MODULE_REGISTRY: dict[str, str] = {
     "iPokerToFpdb": "fpdb_3_legacy.iPokerToFpdb",
 }
 
-PARSER_CLASS_REGISTRY: dict[str, type[HandHistoryConverter]] = {
-    "Absolute": Absolute,
-    "BetOnline": BetOnline,
-    "Betfair": Betfair,
-    "Boss": Boss,
-    "Bovada": Bovada,
-    "Cake": Cake,
-    "CoinPoker": cast(type[HandHistoryConverter], CoinPoker),
-    "Enet": Enet,
-    "Entraction": Entraction,
-    "Everest": Everest,
-    "Everleaf": Everleaf,
-    "Fulltilt": Fulltilt,
-    "GGPoker": GGPoker,
-    "KingsClub": KingsClub,
-    "Merge": Merge,
-    "Microgaming": Microgaming,
-    "OnGame": OnGame,
-    "PacificPoker": PacificPoker,
-    "PartyPoker": PartyPoker,
-    "Pkr": Pkr,
-    "PokerStars": PokerStars,
-    "PokerTracker": PokerTracker,
-    "SealsWithClubs": SealsWithClubs,
-    "Unibet": Unibet,
-    "Winamax": Winamax,
-    "Winning": Winning,
-    # Mixin methods satisfy the abstract converter contract at runtime; mypy
-    # does not infer that across iPoker's multiple-inheritance composition.
-    "iPoker": cast(type[HandHistoryConverter], iPoker),
-}
+# Converter filter names; each class lives in the "<filter name>ToFpdb" module.
+PARSER_CLASS_NAMES: tuple[str, ...] = (
+    "Absolute",
+    "BetOnline",
+    "Betfair",
+    "Boss",
+    "Bovada",
+    "Cake",
+    "CoinPoker",
+    "Enet",
+    "Entraction",
+    "Everest",
+    "Everleaf",
+    "Fulltilt",
+    "GGPoker",
+    "KingsClub",
+    "Merge",
+    "Microgaming",
+    "OnGame",
+    "PacificPoker",
+    "PartyPoker",
+    "Pkr",
+    "PokerStars",
+    "PokerTracker",
+    "SealsWithClubs",
+    "Unibet",
+    "Winamax",
+    "Winning",
+    "iPoker",
+)
 
-SUMMARY_CLASS_REGISTRY: dict[str, type[TourneySummary]] = {
-    "BovadaSummary": BovadaSummary,
-    "FullTiltPokerSummary": FullTiltPokerSummary,
-    "MergeSummary": MergeSummary,
-    "PacificPokerSummary": PacificPokerSummary,
-    "PokerStarsSummary": PokerStarsSummary,
-    "PokerTrackerSummary": PokerTrackerSummary,
-    "TourneySummary": TourneySummary,
-    "UnibetSummary": UnibetSummary,
-    "WinamaxSummary": WinamaxSummary,
-    "WinningSummary": WinningSummary,
-    "iPokerSummary": iPokerSummary,
-}
+# Summary importers; each class lives in the module of the same name.
+SUMMARY_CLASS_NAMES: tuple[str, ...] = (
+    "BovadaSummary",
+    "FullTiltPokerSummary",
+    "MergeSummary",
+    "PacificPokerSummary",
+    "PokerStarsSummary",
+    "PokerTrackerSummary",
+    "TourneySummary",
+    "UnibetSummary",
+    "WinamaxSummary",
+    "WinningSummary",
+    "iPokerSummary",
+)
+
+T = TypeVar("T")
+
+
+class LazyClassRegistry(Mapping[str, T]):
+    """Class name -> class, importing each class's module on first lookup."""
+
+    def __init__(self, modules: Mapping[str, str]) -> None:
+        self._modules = dict(modules)
+        self._classes: dict[str, T] = {}
+
+    def __getitem__(self, name: str) -> T:
+        try:
+            return self._classes[name]
+        except KeyError:
+            module_name = self._modules[name]
+        cls = getattr(importlib.import_module(module_name), name)
+        self._classes[name] = cls
+        return cls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._modules)
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def loaded(self) -> list[str]:
+        """Names of the classes imported so far."""
+        return list(self._classes)
+
+
+# iPoker and CoinPoker satisfy the abstract converter contract through mixins,
+# which mypy does not follow; the registry is typed by what callers get.
+PARSER_CLASS_REGISTRY: LazyClassRegistry[type[HandHistoryConverter]] = LazyClassRegistry(
+    {name: LEGACY_MODULE_REGISTRY[f"{name}ToFpdb"] for name in PARSER_CLASS_NAMES},
+)
+
+SUMMARY_CLASS_REGISTRY: LazyClassRegistry[type[TourneySummary]] = LazyClassRegistry(
+    {name: LEGACY_MODULE_REGISTRY[name] for name in SUMMARY_CLASS_NAMES},
+)
 
 _VALID_LEGACY_MODULE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
@@ -156,6 +172,50 @@ def get_summary_class(summary_name: str) -> type[TourneySummary]:
         raise _unknown_key("summary importer", summary_name, SUMMARY_CLASS_REGISTRY) from None
 
 
+def get_parser_identity(filter_name: str) -> ParserIdentity:
+    """What IdentifySite needs of a converter, without importing it."""
+    try:
+        return PARSER_IDENTITIES[filter_name]
+    except KeyError:
+        raise _unknown_key("parser filter_name", filter_name, PARSER_CLASS_REGISTRY) from None
+
+
+def get_summary_identify(summary_name: str) -> re.Pattern[str] | None:
+    """A summary importer's identification regex, without importing it."""
+    try:
+        spec = SUMMARY_IDENTIFY[summary_name]
+    except KeyError:
+        raise _unknown_key("summary importer", summary_name, SUMMARY_CLASS_REGISTRY) from None
+    return None if spec is None else re.compile(*spec)
+
+
+def describe_parser_class(cls: Any) -> ParserIdentity:
+    """Read a converter class into the form kept in the identification table."""
+    return ParserIdentity(
+        site_id=getattr(cls, "site_id", getattr(cls, "siteId", None)),
+        codepage=cls.codepage,
+        copyGameHeader=cls.copyGameHeader,
+        summaryInFile=cls.summaryInFile,
+        identify=_pattern_spec(getattr(cls, "re_identify", getattr(cls, "re_Identify", None))),
+        split_hands=_pattern_spec(getattr(cls, "re_split_hands", getattr(cls, "re_SplitHands", None))),
+        hero_cards=_pattern_spec(getattr(cls, "re_hero_cards", getattr(cls, "re_HeroCards", None))),
+        hero_cards1=_pattern_spec(getattr(cls, "re_HeroCards1", None)),
+        hero_cards2=_pattern_spec(getattr(cls, "re_HeroCards2", None)),
+    )
+
+
+def describe_summary_class(cls: Any) -> tuple[str, int] | None:
+    """Read a summary importer's identification regex into the table's form."""
+    return _pattern_spec(getattr(cls, "re_identify", getattr(cls, "re_Identify", None)))
+
+
+def _pattern_spec(pattern: re.Pattern[str] | None) -> tuple[str, int] | None:
+    if pattern is None:
+        return None
+    # Every str pattern carries re.UNICODE; leave it implied.
+    return pattern.pattern, pattern.flags & ~re.UNICODE
+
+
 @cache
 def import_fpdb_module(name: str) -> ModuleType:
     """Compatibility loader for scripts that still expect module objects."""
@@ -7,6 +7,8 @@ modernes, ainsi que le système d'exécution de requêtes asynchrones en arrièr
 from __future__ import annotations
 
 import contextlib
+from collections.abc import Callable
+from typing import Any
 
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import QMessageBox, QTabWidget
@@ -25,11 +27,20 @@ class DbWorker(QThread):
     # Arguments: (error_message)
     error = Signal(str)
 
-    def __init__(self, db_or_cursor, query_name: str, query_sql: str) -> None:
+    def __init__(
+        self,
+        db_or_cursor,
+        query_name: str,
+        query_sql: str,
+        transform: Callable[[list, list], list[Any]] | None = None,
+    ) -> None:
         super().__init__()
         self.db_or_cursor = db_or_cursor
         self.query_name = query_name
         self.query_sql = query_sql
+        # Optional post-processing of (rows, colnames), run in this thread;
+        # its result is emitted in place of the rows.
+        self.transform = transform
 
     def run(self) -> None:  # noqa: PLR0915
         import logging
@@ -83,6 +94,11 @@ class DbWorker(QThread):
                 log.warning(f"[PERF] DbWorker {self.query_name} Connection Acquire (shared): 0.0s")
                 results, colnames = _exec_on_conn(getattr(db, "connection", db))
 
+            if self.transform is not None:
+                t_transform = time.time()
+                results = self.transform(results, colnames)
+                log.warning(f"[PERF] DbWorker {self.query_name} transform: {time.time() - t_transform:.3f}s")
+
             t_emit = time.time()
             self.finished.emit(self.query_name, results, colnames)
             log.warning(f"[PERF] DbWorker {self.query_name} emit took: {time.time() - t_emit:.3f}s | Total: {time.time() - t_start:.3f}s")
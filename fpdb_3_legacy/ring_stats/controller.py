@@ -17,6 +17,7 @@ from fpdb_3_legacy import Card, gui_empty_state
 from fpdb_3_legacy.i18n import gettext as _
 from fpdb_3_legacy.loggingFpdb import get_logger
 from fpdb_3_legacy.ring_stats.base import DbWorker
+from fpdb_3_legacy.ring_stats.report_engine import Grouping, cached_report, report_cache_key, ring_report, store_report
 from fpdb_3_legacy.ring_stats.styles import get_theme_palette
 
 log = get_logger("ring_stats_controller")
@@ -39,6 +40,8 @@ fast_names = {
     "Winamax": "Go Fast"
 }
 _WINNINGS_ALIASES = frozenset({"net", "bbper100", "profitperhand", "evbb100", "bb100", "profit100"})
+# (filter_widget, playerids, sitenos, limits, seats, groups, dates, games, currencies, num_hands)
+_FilterParams = tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]
 _MAX_DETAIL_ROWS = 500
 
 # Textes d'aide pour les infobulles des colonnes
@@ -191,48 +194,94 @@ class RingStatsController(QObject):
             return
 
         # Paramètres pour affiner les requêtes
-        filter_params = (filter_widget, playerids, sitenos, limits, seats, groups, dates, games, currencies, num_hands)
+        filter_params: _FilterParams = (filter_widget, playerids, sitenos, limits, seats, groups, dates, games, currencies, num_hands)
 
         import logging
         import time
         log = logging.getLogger("controller")
 
         t0 = time.time()
-        # 2. Lancer la requête pour le tableau résumé (summary grid)
-        sql_summary = self._get_refined_sql("playerDetailedStats", False, *filter_params)
-        t1 = time.time()
-        log.warning(f"[PERF] controller sql_summary generation: {t1-t0:.3f}s")
-        self._run_query("summary", sql_summary, self._on_summary_query_finished)
-
-        # 3. Lancer la requête pour le détail des mains (hand detailed stats)
-        if "allplayers" not in groups:
-            sql_hands = self._get_refined_sql("playerDetailedStats", True, *filter_params)
-            t2 = time.time()
-            log.warning(f"[PERF] controller sql_hands generation: {t2-t1:.3f}s")
-            self._run_query("hands", sql_hands, self._on_hands_query_finished)
+        if "allplayers" in groups:
+            # Every player's rows: keep the per-grid queries, whose HAVING
+            # clause and 'all players' name the scan does not reproduce.
+            self._run_detailed_queries(filter_params)
         else:
-            t2 = time.time()
-
-        # 4. Lancer la requête spécifique pour le Poker Table (Heatmap de position)
-        sql_positions = self._get_refined_sql("playerDetailedStats", False, *filter_params, force_position=True)
+            # 2-4. Une seule lecture pour le résumé, les mains et les positions
+            self._run_report_scan(filter_params)
         t3 = time.time()
-        log.warning(f"[PERF] controller sql_positions generation: {t3-t2:.3f}s")
-        self._run_query("positions", sql_positions, self._on_positions_query_finished)
+        log.warning(f"[PERF] controller grid queries dispatch: {t3-t0:.3f}s")
 
         # 5. Lancer la requête chronologique de profit
         sql_profit = self._get_refined_sql_profit(playerids, sitenos, limits, dates, games, currencies, filter_widget)
         t4 = time.time()
         log.warning(f"[PERF] controller sql_profit generation: {t4-t3:.3f}s. Total queries dispatch: {t4-t0:.3f}s")
-        self._run_query("profit", sql_profit, self._on_profit_query_finished)
+        self._run_cached_query("profit", sql_profit, self._on_profit_query_finished)
+
+    def _run_detailed_queries(self, filter_params: _FilterParams) -> None:
+        """Lance playerDetailedStats pour le résumé puis pour les positions (mode tous les joueurs)."""
+        sql_summary = self._get_refined_sql("playerDetailedStats", False, *filter_params)
+        self._run_query("summary", sql_summary, self._on_summary_query_finished)
+        sql_positions = self._get_refined_sql("playerDetailedStats", False, *filter_params, force_position=True)
+        self._run_query("positions", sql_positions, self._on_positions_query_finished)
+
+    def _report_groupings(self, groups, seats) -> tuple[Grouping, ...]:
+        """The summary, hands and positions refinements of playerDetailedStats, as scan groupings."""
+        by_seats = bool(seats) and "seats" in groups
+        player_or_game = "gametypeid" if "limits" in groups else "pname"
+        position = "position" if "posn" in groups else "base"
+        return (
+            Grouping("summary", player_or_game, position, by_seats),
+            Grouping("hands", "startcards", position, by_seats),
+            Grouping("positions", player_or_game, "position", by_seats),
+        )
+
+    def _run_report_scan(self, filter_params: _FilterParams) -> None:
+        """Lit une seule fois les lignes du héros et en déduit les trois grilles dans le worker."""
+        filter_widget, _playerids, _sitenos, _limits, seats, groups = filter_params[:6]
+        sql_scan = self._get_refined_scan_sql(*filter_params)
+        groupings = self._report_groupings(groups, seats)
+        variance_ddof = 1 if self.db.backend == 3 else 0  # PostgreSQL's variance() is the sample variance
+
+        def roll_up(result: list, colnames: list) -> list:
+            return ring_report(result, colnames, groupings, variance_ddof)
+
+        self._run_cached_query("scan", sql_scan, self._on_report_finished, roll_up, groupings)
+
+    def _on_report_finished(self, name: str, reports: list, colnames: list) -> None:
+        """Distribue les grilles calculées depuis la lecture unique à leurs callbacks."""
+        callbacks = {
+            "summary": self._on_summary_query_finished,
+            "hands": self._on_hands_query_finished,
+            "positions": self._on_positions_query_finished,
+        }
+        for grid, result, grid_colnames in reports:
+            callbacks[grid](grid, result, grid_colnames)
+
+    def _run_cached_query(self, query_name: str, sql: str, callback, transform=None, *key_parts) -> None:
+        """Comme _run_query, mais réutilise le résultat tant que les filtres et la dernière main sont inchangés."""
+        key = report_cache_key(self.db, query_name, sql, *key_parts)
+        cached = cached_report(key)
+        if cached is not None:
+            debug_log(f"_run_cached_query: {query_name} served from the report cache")
+            callback(query_name, *cached)
+            return
 
-    def _run_query(self, query_name: str, sql: str, callback) -> None:
+        def compute(result: list, colnames: list) -> list:
+            if transform is not None:
+                result = transform(result, colnames)
+            store_report(key, (result, colnames))
+            return result
+
+        self._run_query(query_name, sql, callback, compute)
+
+    def _run_query(self, query_name: str, sql: str, callback, transform=None) -> None:
         """Lance une requête asynchrone à l'aide d'un DbWorker (ou synchrone en test)."""
         debug_log(f"_run_query: name={query_name}, async_mode={self.async_mode}")
         debug_log(f"SQL for {query_name}:\n{sql}")
         # Nettoyer les anciens workers
         self._workers = [w for w in self._workers if not w.isFinished()]
 
-        worker = DbWorker(self.db, query_name, sql)
+        worker = DbWorker(self.db, query_name, sql, transform)
         worker.finished.connect(callback)
 
         def on_error(err):
@@ -564,7 +613,52 @@ class RingStatsController(QObject):
         tmp = tmp.replace("<player_test>", nametest)
         tmp = tmp.replace("<playerName>", pname)
         tmp = tmp.replace("<havingclause>", having)
+        tmp = self._apply_filters(tmp, filter_widget, sitenos, limits, seats, groups, dates, games, currencies)
 
+        if holecards:
+            tmp = tmp.replace("<hgametypeId>", "hp.startcards")
+            tmp = tmp.replace(
+                "<orderbyhgametypeId>",
+                ",case when floor((hp.startcards-1)/13) >= mod((hp.startcards-1),13) then hp.startcards + 0.1 "
+                " else 13*mod((hp.startcards-1),13) + floor((hp.startcards-1)/13) + 1 "
+                " end desc ",
+            )
+        else:
+            tmp = tmp.replace("<orderbyhgametypeId>", "")
+            groupLevels = "limits" not in groups
+            if groupLevels:
+                tmp = tmp.replace("<hgametypeId>", "p.name")
+            else:
+                tmp = tmp.replace("<hgametypeId>", "h.gametypeId")
+
+        # Position (groupement)
+        plposition_column = next(x for x in self.columns if x[0] == "plposition")
+        if "posn" in groups or force_position:
+            tmp = tmp.replace("<position>", "hp.position")
+            plposition_column[colshow] = True
+        else:
+            tmp = tmp.replace("<position>", "gt.base")
+            plposition_column[colshow] = False
+
+        return tmp
+
+    def _get_refined_scan_sql(self, filter_widget, playerids, sitenos, limits, seats, groups, dates, games, currencies, num_hands) -> str:
+        """Formate ringStatsScan, et règle les colonnes comme le feraient le résumé puis les positions."""
+        self._last_groups = groups
+        pname_column = next(x for x in self.columns if x[0] == "pname")
+        plposition_column = next(x for x in self.columns if x[0] == "plposition")
+        for force_position in (False, True):
+            colshow = colshowposn if "posn" in groups or force_position else colshowsumm
+            pname_column[colshow] = False
+            plposition_column[colshow] = "posn" in groups or force_position
+
+        tmp = self.sql.query["ringStatsScan"]
+        nametest = str(tuple(playerids)).replace("L", "").replace(",)", ")") if playerids else "1 = 2"
+        tmp = tmp.replace("<player_test>", nametest)
+        return self._apply_filters(tmp, filter_widget, sitenos, limits, seats, groups, dates, games, currencies)
+
+    def _apply_filters(self, tmp: str, filter_widget, sitenos, limits, seats, groups, dates, games, currencies) -> str:
+        """Remplace les filtres communs à playerDetailedStats et ringStatsScan."""
         # Filtre sur les jeux
         gametest = ""
         if len(games) > 0:
@@ -605,22 +699,6 @@ class RingStatsController(QObject):
         bbtest = filter_widget.get_limits_where_clause(limits)
         tmp = tmp.replace("<gtbigBlind_test>", bbtest)
 
-        if holecards:
-            tmp = tmp.replace("<hgametypeId>", "hp.startcards")
-            tmp = tmp.replace(
-                "<orderbyhgametypeId>",
-                ",case when floor((hp.startcards-1)/13) >= mod((hp.startcards-1),13) then hp.startcards + 0.1 "
-                " else 13*mod((hp.startcards-1),13) + floor((hp.startcards-1)/13) + 1 "
-                " end desc ",
-            )
-        else:
-            tmp = tmp.replace("<orderbyhgametypeId>", "")
-            groupLevels = "limits" not in groups
-            if groupLevels:
-                tmp = tmp.replace("<hgametypeId>", "p.name")
-            else:
-                tmp = tmp.replace("<hgametypeId>", "h.gametypeId")
-
         # Flag tests
         flagtest = ""
         # dates
@@ -628,15 +706,6 @@ class RingStatsController(QObject):
         tmp = tmp.replace("<flagtest>", flagtest)
         tmp = tmp.replace("<cardstest>", "")
 
-        # Position (groupement)
-        plposition_column = next(x for x in self.columns if x[0] == "plposition")
-        if "posn" in groups or force_position:
-            tmp = tmp.replace("<position>", "hp.position")
-            plposition_column[colshow] = True
-        else:
-            tmp = tmp.replace("<position>", "gt.base")
-            plposition_column[colshow] = False
-
         if self.db.backend == 2:  # MySQL InnoDB
             tmp = tmp.replace("<signed>", "signed ")
         else:
@@ -0,0 +1,380 @@
+"""Roll the cash stats scan up into the tab's grids, and remember the result.
+
+The tab used to send ``playerDetailedStats`` to the database three times --
+for the summary grid, the starting-hand grid and the position table -- and
+each run aggregated the same HandsPlayers rows again. ``ringStatsScan`` now
+returns the counters those stats are made of, summed per player, game type,
+starting hand, position and table size, and :func:`ring_report` rolls that
+result up into each grid in the worker thread. Every stat in
+``playerDetailedStats`` is a ratio of sums, a mean or a variance, so it comes
+out of the finer sums unchanged.
+
+The rolled-up grids are cached by the scan's SQL, which carries every filter,
+and by the newest hand id, so re-opening the tab with the same filters reuses
+them until a hand is imported.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from fpdb_3_legacy.sql_queries_ring_stats_scan import RING_SCAN_COUNTERS, RING_SCAN_TOTALS
+
+# The columns of a rolled-up grid, named and ordered as playerDetailedStats
+# returns them.
+REPORT_COLUMNS = (
+    "hgametypeid",
+    "pname",
+    "base",
+    "category",
+    "limittype",
+    "name",
+    "minbigblind",
+    "maxbigblind",
+    "ante",
+    "currency",
+    "plposition",
+    "fast",
+    "n",
+    "vpip",
+    "pfr",
+    "car0",
+    "pf3",
+    "fl3",
+    "tn3",
+    "rv3",
+    "ff3",
+    "ft3",
+    "fr3",
+    "fl4",
+    "tn4",
+    "rv4",
+    "flopen",
+    "tnopen",
+    "rvopen",
+    "pf4",
+    "pff3",
+    "pff4",
+    "rfi",
+    "raisetosteal",
+    "foldbbtosteal",
+    "foldsbtosteal",
+    "steals",
+    "suc_steal",
+    "saw_f",
+    "sawsd",
+    "wmsf",
+    "wtsdwsf",
+    "wmsd",
+    "flafq",
+    "tuafq",
+    "rvafq",
+    "pofafq",
+    "aggfac",
+    "aggfrq",
+    "conbet",
+    "net",
+    "rake",
+    "bbper100",
+    "profitperhand",
+    "bb100xr",
+    "profhndxr",
+    "avgseats",
+    "variance",
+    "stddev",
+)
+
+# playerDetailedStats' "no data" marker for a ratio with no chances.
+NO_DATA = -999
+
+_AGGR = ("street1aggr", "street2aggr", "street3aggr", "street4aggr")
+_CALLS = ("street1calls", "street2calls", "street3calls", "street4calls")
+_FOLDS = (
+    "foldtootherraisedstreet1",
+    "foldtootherraisedstreet2",
+    "foldtootherraisedstreet3",
+    "foldtootherraisedstreet4",
+)
+
+# alias -> (numerator sums, denominator sums, scale, answer for a zero denominator).
+# aggfrq and conbet have no guard in SQL, so SQLite and MySQL answer NULL.
+_RATIOS: dict[str, tuple[tuple[str, ...], tuple[str, ...], float, int | None]] = {
+    "vpip": (("street0vpi",), ("street0vpichance",), 100.0, NO_DATA),
+    "pfr": (("street0aggr",), ("street0aggrchance",), 100.0, NO_DATA),
+    "car0": (("street0calledraisedone",), ("street0calledraisechance",), 100.0, NO_DATA),
+    "pf3": (("street0_3bdone",), ("street0_3bchance",), 100.0, NO_DATA),
+    "fl3": (("street1_3bdone",), ("street1_3bchance",), 100.0, NO_DATA),
+    "tn3": (("street2_3bdone",), ("street2_3bchance",), 100.0, NO_DATA),
+    "rv3": (("street3_3bdone",), ("street3_3bchance",), 100.0, NO_DATA),
+    "ff3": (("street1_foldto3bdone",), ("street1_foldto3bchance",), 100.0, NO_DATA),
+    "ft3": (("street2_foldto3bdone",), ("street2_foldto3bchance",), 100.0, NO_DATA),
+    "fr3": (("street3_foldto3bdone",), ("street3_foldto3bchance",), 100.0, NO_DATA),
+    "fl4": (("street1_4bdone",), ("street1_4bchance",), 100.0, NO_DATA),
+    "tn4": (("street2_4bdone",), ("street2_4bchance",), 100.0, NO_DATA),
+    "rv4": (("street3_4bdone",), ("street3_4bchance",), 100.0, NO_DATA),
+    "flopen": (("street1opendone",), ("street1openchance",), 100.0, NO_DATA),
+    "tnopen": (("street2opendone",), ("street2openchance",), 100.0, NO_DATA),
+    "rvopen": (("street3opendone",), ("street3openchance",), 100.0, NO_DATA),
+    "pf4": (("street0_4bdone",), ("street0_4bchance",), 100.0, NO_DATA),
+    "pff3": (("street0_foldto3bdone",), ("street0_foldto3bchance",), 100.0, NO_DATA),
+    "pff4": (("street0_foldto4bdone",), ("street0_foldto4bchance",), 100.0, NO_DATA),
+    "rfi": (("raisedfirstin",), ("raisefirstinchance",), 100.0, NO_DATA),
+    "raisetosteal": (("raisetostealdone",), ("raisetostealchance",), 100.0, NO_DATA),
+    "foldbbtosteal": (("foldedbbtosteal",), ("foldbbtostealchance",), 100.0, NO_DATA),
+    "foldsbtosteal": (("foldedsbtosteal",), ("foldsbtostealchance",), 100.0, NO_DATA),
+    "steals": (("stealdone",), ("stealchance",), 100.0, NO_DATA),
+    "suc_steal": (("success_steal",), ("stealdone",), 100.0, NO_DATA),
+    "saw_f": (("street1seen",), ("n",), 100.0, None),
+    "sawsd": (("sawshowdown",), ("n",), 100.0, None),
+    "wmsf": (("wonwhenseenstreet1",), ("street1seen",), 100.0, NO_DATA),
+    "wtsdwsf": (("sawshowdown",), ("street1seen",), 100.0, NO_DATA),
+    "wmsd": (("wonatsd",), ("sawshowdown",), 100.0, NO_DATA),
+    "flafq": (("street1aggr",), ("street1seen",), 100.0, NO_DATA),
+    "tuafq": (("street2aggr",), ("street2seen",), 100.0, NO_DATA),
+    "rvafq": (("street3aggr",), ("street3seen",), 100.0, NO_DATA),
+    "pofafq": (_AGGR[:3], ("street1seen", "street2seen", "street3seen"), 100.0, NO_DATA),
+    "aggfac": (_AGGR, _CALLS, 1.0, NO_DATA),
+    "aggfrq": (_AGGR, _FOLDS + _CALLS + _AGGR, 100.0, None),
+    "conbet": (
+        ("street1cbdone", "street2cbdone", "street3cbdone", "street4cbdone"),
+        ("street1cbchance", "street2cbchance", "street3cbchance", "street4cbchance"),
+        100.0,
+        None,
+    ),
+}
+
+_SUMMED = tuple(column.lower() for column in RING_SCAN_COUNTERS) + tuple(alias for _, alias in RING_SCAN_TOTALS)
+
+
+@dataclass(frozen=True)
+class Grouping:
+    """How one grid groups the scan, as a ``playerDetailedStats`` refinement would.
+
+    ``hgametypeid`` and ``position`` name the scan columns that stand in for
+    the query's ``<hgametypeId>`` and ``<position>``; ``seats`` splits the rows
+    by table size.
+    """
+
+    name: str
+    hgametypeid: str
+    position: str
+    seats: bool = False
+
+
+def _position_order(value: Any) -> str:
+    # ORDER BY case <position> when 'B' then 'B' when 'S' then 'S' when '0' then 'Y' else 'Z'||<position>
+    text = str(value)
+    if text in ("B", "S"):
+        return text
+    return "Y" if text == "0" else "Z" + text
+
+
+def _startcards_order(value: Any) -> float:
+    # playerDetailedStats' <orderbyhgametypeId> for starting hands, SQLite's
+    # arithmetic: pairs and suited hands before their offsuit mirror.
+    card = int(value or 0) - 1
+    row, column = int(card / 13), card % 13
+    return card + 1.1 if row >= column else 13 * column + row + 1
+
+
+def _descending(value: Any) -> Any:
+    return (value is not None, value)
+
+
+def _ratio(sums: dict[str, np.ndarray], numerator: Sequence[str], denominator: Sequence[str], scale: float, empty):
+    top = sum(sums[name] for name in numerator)
+    bottom = sum(sums[name] for name in denominator)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = scale * top / bottom
+    return [
+        empty if b == 0 else v for v, b in zip(np.asarray(values).tolist(), np.asarray(bottom).tolist(), strict=True)
+    ]
+
+
+def _group(rows: Sequence[Sequence[Any]], index: dict[str, int], grouping: Grouping):
+    """Number each row's group; return the numbers, each group's first row and its blinds."""
+    keys: dict[tuple[Any, ...], int] = {}
+    first: list[Sequence[Any]] = []
+    blinds: list[list[Any]] = []
+    groups: np.ndarray = np.empty(len(rows), dtype=np.intp)
+    hgametypeid, position, seats, blind = (
+        index[name] for name in (grouping.hgametypeid, grouping.position, "seats", "bigblind")
+    )
+    fixed = [index[name] for name in ("playerid", "base", "category", "limittype", "fast", "name", "ante", "currency")]
+    for i, row in enumerate(rows):
+        key = (row[hgametypeid], row[position], row[seats] if grouping.seats else None, *[row[j] for j in fixed])
+        group = keys.get(key)
+        if group is None:
+            group = keys[key] = len(first)
+            first.append(row)
+            blinds.append([row[blind], row[blind]])
+        else:
+            bounds = blinds[group]
+            bounds[0] = min(bounds[0], row[blind])
+            bounds[1] = max(bounds[1], row[blind])
+        groups[i] = group
+    return groups, first, blinds
+
+
+def _sums(rows: Sequence[Sequence[Any]], index: dict[str, int], groups: np.ndarray, count: int):
+    # The scan selects its sums after the key columns, starting at n.
+    start = index["n"]
+    block = [row[start:] for row in rows]
+    try:
+        data = np.array(block, dtype=np.float64)
+    except TypeError:  # a sum over no non-NULL values
+        data = np.array([[0.0 if value is None else float(value) for value in row] for row in block])
+    return {
+        name: np.bincount(groups, weights=data[:, index[name] - start], minlength=count) for name in ("n", *_SUMMED)
+    }
+
+
+def _money(sums: dict[str, np.ndarray], variance_ddof: int) -> dict[str, list[Any]]:
+    n, profit, rake = sums["n"], sums["totalprofit"], sums["rakecents"]
+    spread = np.maximum(sums["profitsquares"] - profit * profit / n, 0.0) / 10000.0
+    variance = [
+        s / (c - variance_ddof) if c > variance_ddof else None for s, c in zip(spread.tolist(), n.tolist(), strict=True)
+    ]
+    return {
+        "net": (profit / 100.0).tolist(),
+        "rake": (rake / 100.0).tolist(),
+        "bbper100": (100.0 * sums["bbwon"] / n).tolist(),
+        "profitperhand": (profit / n / 100.0).tolist(),
+        "bb100xr": (100.0 * sums["bbwonxr"] / n).tolist(),
+        "profhndxr": ((profit + rake) / 100.0 / n).tolist(),
+        "avgseats": (sums["seatsum"] / n).tolist(),
+        "variance": variance,
+        "stddev": [None if v is None else math.sqrt(v) for v in variance],
+    }
+
+
+def _order(columns: dict[str, list[Any]], seats: list[Any] | None, playerids: list[Any], startcards: bool) -> list[int]:
+    """Group numbers in playerDetailedStats' ORDER BY, by stable sorts from its last term to its first."""
+    order = list(range(len(playerids)))
+    order.sort(key=lambda g: columns["name"][g])
+    order.sort(key=lambda g: columns["fast"][g])
+    order.sort(key=lambda g: columns["maxbigblind"][g], reverse=True)
+    order.sort(key=lambda g: _descending(columns["limittype"][g]), reverse=True)
+    if startcards:
+        order.sort(key=lambda g: _startcards_order(columns["hgametypeid"][g]), reverse=True)
+    order.sort(key=lambda g: _position_order(columns["plposition"][g]))
+    if seats is not None:
+        order.sort(key=lambda g: seats[g])
+    order.sort(key=lambda g: (columns["base"][g], columns["category"][g]))
+    order.sort(key=lambda g: playerids[g])
+    return order
+
+
+def roll_up(
+    rows: Sequence[Sequence[Any]],
+    colnames: Sequence[str],
+    grouping: Grouping,
+    variance_ddof: int = 0,
+) -> tuple[list[tuple[Any, ...]], list[str]]:
+    """Group the scan's ``rows`` as ``grouping`` says and derive every report column.
+
+    ``variance_ddof`` is 0 where the backend's ``variance`` is the population
+    variance (SQLite's NumPy aggregate, MySQL) and 1 for PostgreSQL's sample
+    variance. Rows come back in ``playerDetailedStats``' order.
+    """
+    index = {name: i for i, name in enumerate(colnames)}
+    groups, first, blinds = _group(rows, index, grouping)
+    if not first:
+        return [], list(REPORT_COLUMNS)
+    sums = _sums(rows, index, groups, len(first))
+
+    columns: dict[str, list[Any]] = {
+        "hgametypeid": [row[index[grouping.hgametypeid]] for row in first],
+        "plposition": [row[index[grouping.position]] for row in first],
+        "minbigblind": [low for low, _ in blinds],
+        "maxbigblind": [high for _, high in blinds],
+        "n": sums["n"].astype(np.int64).tolist(),
+    }
+    for name in ("pname", "base", "category", "limittype", "name", "ante", "currency", "fast"):
+        columns[name] = [row[index[name]] for row in first]
+    for alias, (numerator, denominator, scale, empty) in _RATIOS.items():
+        columns[alias] = _ratio(sums, numerator, denominator, scale, empty)
+    columns.update(_money(sums, variance_ddof))
+
+    seats = [row[index["seats"]] for row in first] if grouping.seats else None
+    playerids = [row[index["playerid"]] for row in first]
+    order = _order(columns, seats, playerids, grouping.hgametypeid == "startcards")
+    table = [columns[name] for name in REPORT_COLUMNS]
+    return [tuple(column[g] for column in table) for g in order], list(REPORT_COLUMNS)
+
+
+def ring_report(
+    rows: Sequence[Sequence[Any]],
+    colnames: Sequence[str],
+    groupings: Sequence[Grouping],
+    variance_ddof: int = 0,
+) -> list[tuple[str, list[tuple[Any, ...]], list[str]]]:
+    """``(grouping name, rows, colnames)`` for each grid, from one scan result."""
+    return [(grouping.name, *roll_up(rows, colnames, grouping, variance_ddof)) for grouping in groupings]
+
+
+# --------------------------------------------------------------------------- #
+# Result cache.
+# --------------------------------------------------------------------------- #
+
+# Filter sets remembered per process. Each holds a few grids of at most a few
+# thousand rows.
+REPORT_CACHE_SIZE = 8
+
+_report_cache: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+# Results are stored from the query worker's thread and read from the GUI's.
+_report_cache_lock = threading.Lock()
+
+
+def report_cache_key(db: Any, *parts: Any) -> tuple[Any, ...] | None:
+    """Key a result by database, query and imports; ``None`` if those cannot be read.
+
+    The imports are the highest hand id and the hands the importer has logged
+    to Files, both cheap to read on every refresh. The newest id alone is not
+    enough: on PostgreSQL concurrent importers store hands from id blocks they
+    reserved earlier, below the current highest id, and only the logged total
+    moves. Hands stored without a Files entry below the highest id, and hands
+    deleted by the maintenance scripts, go unnoticed until the next import or
+    restart.
+    """
+    get_import_state: Callable[[], Any] | None = getattr(db, "get_import_state", None)
+    if get_import_state is None:
+        return None
+    try:
+        hands = get_import_state()
+    except Exception:  # noqa: BLE001 - no cache rather than no report.
+        return None
+    return (getattr(db, "backend", None), getattr(db, "host", None), getattr(db, "database", None), hands, *parts)
+
+
+def cached_report(key: tuple[Any, ...] | None) -> Any:
+    """The result stored under ``key``, or ``None``."""
+    if key is None:
+        return None
+    with _report_cache_lock:
+        if key not in _report_cache:
+            return None
+        _report_cache.move_to_end(key)
+        return _report_cache[key]
+
+
+def store_report(key: tuple[Any, ...] | None, result: Any) -> None:
+    if key is None:
+        return
+    with _report_cache_lock:
+        _report_cache[key] = result
+        _report_cache.move_to_end(key)
+        while len(_report_cache) > REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+
+
+def clear_report_cache() -> None:
+    with _report_cache_lock:
+        _report_cache.clear()
@@ -0,0 +1,347 @@
+"""Batched write queries for the keyed statistics caches.
+
+HudCache, CardsCache and PositionsCache each carry a unique index over their
+key columns. Where a row's key has no NULL in it, that index lets the database
+decide between insert and update itself: ``upsert_<cache>`` adds the row's
+statistics to the stored ones in a single statement. Ring-game rows key on a
+NULL ``tourneyTypeId``, which no unique index treats as equal to another NULL;
+for those, ``select_<cache>_keys`` fetches the ids of the stored rows for a
+whole batch of keys at once, ahead of the usual ``update_<cache>`` and
+``insert_<cache>``.
+"""
+
+from __future__ import annotations
+
+# The statistics each cache stores, in the order the writers pack them
+# (database_caches.SESSION_CACHE_KEYS, and CACHE_KEYS + HUDCACHE_EXTRA_KEYS for
+# HudCache).
+_SESSION_STATISTICS = (
+    "n",
+    "street0VPIChance",
+    "street0VPI",
+    "street0AggrChance",
+    "street0Aggr",
+    "street0CalledRaiseChance",
+    "street0CalledRaiseDone",
+    "street0FaceRaise",
+    "street0_2BChance",
+    "street0_2BDone",
+    "street0_3BChance",
+    "street0_3BDone",
+    "street0_4BChance",
+    "street0_4BDone",
+    "street0_C4BChance",
+    "street0_C4BDone",
+    "street0_FoldTo2BChance",
+    "street0_FoldTo2BDone",
+    "street0_FoldTo3BChance",
+    "street0_FoldTo3BDone",
+    "street0_FoldTo4BChance",
+    "street0_FoldTo4BDone",
+    "street0_SqueezeChance",
+    "street0_SqueezeDone",
+    "raiseToStealChance",
+    "raiseToStealDone",
+    "stealChance",
+    "stealDone",
+    "success_Steal",
+    "street1Seen",
+    "street2Seen",
+    "street3Seen",
+    "street4Seen",
+    "sawShowdown",
+    "street1Aggr",
+    "street2Aggr",
+    "street3Aggr",
+    "street4Aggr",
+    "otherRaisedStreet0",
+    "otherRaisedStreet1",
+    "otherRaisedStreet2",
+    "otherRaisedStreet3",
+    "otherRaisedStreet4",
+    "foldToOtherRaisedStreet0",
+    "foldToOtherRaisedStreet1",
+    "foldToOtherRaisedStreet2",
+    "foldToOtherRaisedStreet3",
+    "foldToOtherRaisedStreet4",
+    "wonWhenSeenStreet1",
+    "wonWhenSeenStreet2",
+    "wonWhenSeenStreet3",
+    "wonWhenSeenStreet4",
+    "wonAtSD",
+    "raiseFirstInChance",
+    "raisedFirstIn",
+    "foldBbToStealChance",
+    "foldedBbToSteal",
+    "foldSbToStealChance",
+    "foldedSbToSteal",
+    "street1CBChance",
+    "street1CBDone",
+    "street2CBChance",
+    "street2CBDone",
+    "street3CBChance",
+    "street3CBDone",
+    "street4CBChance",
+    "street4CBDone",
+    "foldToStreet1CBChance",
+    "foldToStreet1CBDone",
+    "foldToStreet2CBChance",
+    "foldToStreet2CBDone",
+    "foldToStreet3CBChance",
+    "foldToStreet3CBDone",
+    "foldToStreet4CBChance",
+    "foldToStreet4CBDone",
+    "common",
+    "committed",
+    "winnings",
+    "rake",
+    "rakeDealt",
+    "rakeContributed",
+    "rakeWeighted",
+    "totalProfit",
+    "allInEV",
+    "showdownWinnings",
+    "nonShowdownWinnings",
+    "street1CheckCallRaiseChance",
+    "street1CheckCallDone",
+    "street1CheckRaiseDone",
+    "street2CheckCallRaiseChance",
+    "street2CheckCallDone",
+    "street2CheckRaiseDone",
+    "street3CheckCallRaiseChance",
+    "street3CheckCallDone",
+    "street3CheckRaiseDone",
+    "street4CheckCallRaiseChance",
+    "street4CheckCallDone",
+    "street4CheckRaiseDone",
+    "street0Calls",
+    "street1Calls",
+    "street2Calls",
+    "street3Calls",
+    "street4Calls",
+    "street0Bets",
+    "street1Bets",
+    "street2Bets",
+    "street3Bets",
+    "street4Bets",
+    "street0Raises",
+    "street1Raises",
+    "street2Raises",
+    "street3Raises",
+    "street4Raises",
+    "street1Discards",
+    "street2Discards",
+    "street3Discards",
+)
+
+_HUDCACHE_STATISTICS = (
+    *_SESSION_STATISTICS,
+    "street0Limp",
+    "street0OpenLimpChance",
+    "street0OpenLimp",
+    "street1_3BChance",
+    "street1_3BDone",
+    "street2_3BChance",
+    "street2_3BDone",
+    "street3_3BChance",
+    "street3_3BDone",
+    "street1_4BChance",
+    "street1_4BDone",
+    "street1_FoldTo4BChance",
+    "street1_FoldTo4BDone",
+    "street2_4BChance",
+    "street2_4BDone",
+    "street2_FoldTo4BChance",
+    "street2_FoldTo4BDone",
+    "street3_4BChance",
+    "street3_4BDone",
+    "street3_FoldTo4BChance",
+    "street3_FoldTo4BDone",
+    "street1OpenChance",
+    "street1OpenDone",
+    "street2OpenChance",
+    "street2OpenDone",
+    "street3OpenChance",
+    "street3OpenDone",
+    "flg_f_fold",
+    "flg_t_fold",
+    "flg_r_fold",
+    "street1FirstRaise",
+    "street2FirstRaise",
+    "street3FirstRaise",
+    "street1FaceRaise",
+    "street2FaceRaise",
+    "street3FaceRaise",
+    "flg_f_donk_def_opp",
+    "flg_t_float_opp",
+    "flg_t_float",
+    "flg_t_float_def_opp",
+    "flg_r_float_opp",
+    "flg_r_float",
+    "flg_r_float_def_opp",
+    "flg_t_donk_def_opp",
+    "flg_r_donk_def_opp",
+    "street1_FoldTo3BChance",
+    "street1_FoldTo3BDone",
+    "street2_FoldTo3BChance",
+    "street2_FoldTo3BDone",
+    "street3_FoldTo3BChance",
+    "street3_FoldTo3BDone",
+    "street0_FoldToSqueezeChance",
+    "street0_FoldToSqueezeDone",
+    "street0_FaceLimpers",
+    "cnt_gp_open_opp",
+    "cnt_gp_2x",
+    "cnt_gp_os",
+    "cnt_gp_limp",
+    "flg_blind_ds",
+    "flg_blind_db",
+    "flg_blind_k",
+    "flg_faced_allin",
+    "flg_fold_to_allin",
+    "cnt_f_bet_facing",
+    "val_f_bet_facing_bp",
+    "cnt_t_bet_facing",
+    "val_t_bet_facing_bp",
+    "cnt_r_bet_facing",
+    "val_r_bet_facing_bp",
+    "cnt_p_2bet_facing",
+    "val_p_2bet_facing_bp",
+    "cnt_p_3bet_facing",
+    "val_p_3bet_facing_bp",
+    "cnt_p_4bet_facing",
+    "val_p_4bet_facing_bp",
+    "cnt_f_bet_made",
+    "val_f_bet_made_bp",
+    "cnt_t_bet_made",
+    "val_t_bet_made_bp",
+    "cnt_r_bet_made",
+    "val_r_bet_made_bp",
+    "cnt_f_spr",
+    "val_f_spr",
+    "cnt_t_spr",
+    "val_t_spr",
+    "cnt_r_spr",
+    "val_r_spr",
+    "cnt_p_raise_made",
+    "val_p_raise_made_bp",
+    "cnt_f_raise_made",
+    "val_f_raise_made_bp",
+    "cnt_t_raise_made",
+    "val_t_raise_made_bp",
+    "cnt_r_raise_made",
+    "val_r_raise_made_bp",
+    "cnt_f_2bet_facing",
+    "val_f_2bet_facing_bp",
+    "cnt_f_3bet_facing",
+    "val_f_3bet_facing_bp",
+    "cnt_f_4bet_facing",
+    "val_f_4bet_facing_bp",
+    "cnt_t_2bet_facing",
+    "val_t_2bet_facing_bp",
+    "cnt_t_3bet_facing",
+    "val_t_3bet_facing_bp",
+    "cnt_t_4bet_facing",
+    "val_t_4bet_facing_bp",
+    "cnt_r_2bet_facing",
+    "val_r_2bet_facing_bp",
+    "cnt_r_3bet_facing",
+    "val_r_3bet_facing_bp",
+    "cnt_r_4bet_facing",
+    "val_r_4bet_facing_bp",
+    "amt_blind",
+    "amt_bet_p",
+    "amt_bet_f",
+    "amt_bet_t",
+    "amt_bet_r",
+    "amt_bet_ttl",
+    "cnt_p_raise_facing",
+    "val_p_raise_facing_bp",
+    "cnt_f_raise_facing",
+    "val_f_raise_facing_bp",
+    "cnt_t_raise_facing",
+    "val_t_raise_facing_bp",
+    "cnt_r_raise_facing",
+    "val_r_raise_facing_bp",
+    "cnt_p_raise_made_2",
+    "val_p_raise_made_2_bp",
+    "cnt_f_raise_made_2",
+    "val_f_raise_made_2_bp",
+    "cnt_t_raise_made_2",
+    "val_t_raise_made_2_bp",
+    "cnt_r_raise_made_2",
+    "val_r_raise_made_2_bp",
+    "cnt_p_5bet_facing",
+    "val_p_5bet_facing_bp",
+    "street2DelayedCBChance",
+    "street2DelayedCBDone",
+    "street2ProbeChance",
+    "street2ProbeDone",
+)
+
+# Query-catalogue name -> (table, key columns, statistics).
+_KEYED_TABLES = {
+    "hudcache": (
+        "HudCache",
+        ("gametypeId", "playerId", "seats", "position", "tourneyTypeId", "styleKey"),
+        _HUDCACHE_STATISTICS,
+    ),
+    "cardscache": (
+        "CardsCache",
+        ("weekId", "monthId", "gametypeId", "tourneyTypeId", "playerId", "startCards"),
+        _SESSION_STATISTICS,
+    ),
+    "positionscache": (
+        "PositionsCache",
+        ("weekId", "monthId", "gametypeId", "tourneyTypeId", "playerId", "seats", "maxPosition", "position"),
+        _SESSION_STATISTICS,
+    ),
+}
+
+# One column per line, indented like the rest of the statement.
+_COLUMN_SEPARATOR = """,
+            """
+
+
+def _upsert(db_server: str, table: str, keys: tuple[str, ...], statistics: tuple[str, ...]) -> str:
+    columns = _COLUMN_SEPARATOR.join([*keys, *statistics])
+    values = ", ".join(["%s"] * (len(keys) + len(statistics)))
+    insert = f"""insert into {table} (
+            {columns})
+        values ({values})"""
+    if db_server == "mysql":
+        sums = _COLUMN_SEPARATOR.join(f"{s}={s}+VALUES({s})" for s in statistics)
+        return f"""{insert}
+        ON DUPLICATE KEY UPDATE
+            {sums}"""
+    sums = _COLUMN_SEPARATOR.join(f"{s}={table}.{s}+excluded.{s}" for s in statistics)
+    return f"""{insert}
+        ON CONFLICT ({", ".join(keys)}) DO UPDATE SET
+            {sums}"""
+
+
+def cache_upsert_queries(db_server: str) -> dict[str, str]:
+    """Return the upsert, batched key lookup and unique-index probe for each keyed cache."""
+    query: dict[str, str] = {}
+    for name, (table, keys, statistics) in _KEYED_TABLES.items():
+        query[f"upsert_{name}"] = _upsert(db_server, table, keys, statistics)
+        query[f"select_{name}_keys"] = f"""SELECT id, {", ".join(keys)}
+                FROM {table}
+                WHERE <where>"""
+
+    # Takes the index name in lower case: PostgreSQL folds unquoted names. An
+    # index of that name that is not unique gives ON CONFLICT nothing to
+    # arbitrate on, so it does not count.
+    if db_server == "mysql":
+        query["cacheUniqueIndexExists"] = """SELECT 1 FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND non_unique = 0 AND lower(index_name) = %s
+                LIMIT 1"""
+    elif db_server == "postgresql":
+        query["cacheUniqueIndexExists"] = """SELECT 1 FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = current_schema() AND lower(c.relname) = %s AND i.indisunique"""
+    elif db_server == "sqlite":
+        query["cacheUniqueIndexExists"] = """SELECT 1 FROM sqlite_master m, pragma_index_list(m.tbl_name) l
+                WHERE m.type = 'index' AND lower(m.name) = %s AND l.name = m.name AND l."unique" = 1"""
+    return query
@@ -8,6 +8,8 @@ def core_lookup_queries() -> dict[str, str]:
     query: dict[str, str] = {}
     query["get_last_hand"] = "select max(id) from Hands"
 
+    query["get_import_state"] = "select (select max(id) from Hands), (select sum(storedHands) from Files)"
+
     query["get_last_date"] = "SELECT MAX(startTime) FROM Hands"
 
     query["get_first_date"] = "SELECT MIN(startTime) FROM Hands"
@@ -53,6 +53,11 @@ def game_type_queries(db_server: str) -> dict[str, str]:
                                      WHERE siteHandNo=%s AND G.siteId=%s<heroSeat>
     """
 
+    query["handsAlreadyInDB"] = """SELECT H.siteHandNo, H.heroSeat FROM Hands H
+                                     INNER JOIN Gametypes G ON (H.gametypeId = G.id)
+                                     WHERE G.siteId=%s AND H.siteHandNo IN (<siteHandNos>)
+    """
+
     query["getTourneyTypeIdByTourneyNo"] = """SELECT tt.id,
                                                           tt.siteId,
                                                           tt.currency,
@@ -0,0 +1,120 @@
+"""Set-based reads that rebuild many stored hands at once.
+
+Each query answers for every hand id in ``<hand_ids>``, which the caller
+replaces with one placeholder per id, and carries the hand id in its first
+column so the rows can be dealt back out per hand. They mirror the single-hand
+replayer and artifact queries column for column, so a hand rebuilt from either
+comes out the same.
+"""
+
+from __future__ import annotations
+
+
+def hand_batch_queries() -> dict[str, str]:
+    """Return the multi-hand gametype, hand, board, player, action, artifact and seat queries."""
+    query: dict[str, str] = {}
+    query["get_gameinfo_from_hids"] = """
+            SELECT DISTINCT
+                    h.id,
+                    s.name,
+                    g.category,
+                    g.base,
+                    g.type,
+                    g.limitType,
+                    g.hilo,
+                    round(g.smallBlind / 100.0,2),
+                    round(g.bigBlind / 100.0,2),
+                    round(g.smallBet / 100.0,2),
+                    round(g.bigBet / 100.0,2),
+                    g.currency,
+                    h.gametypeId,
+                    g.split
+                FROM
+                    Hands as h,
+                    Sites as s,
+                    Gametypes as g,
+                    HandsPlayers as hp,
+                    Players as p
+                WHERE
+                    h.id IN (<hand_ids>)
+                and g.id = h.gametypeId
+                and hp.handId = h.id
+                and p.id = hp.playerId
+                and s.id = p.siteId
+        """
+
+    query["handBatch"] = """
+             SELECT h.*
+                FROM Hands h
+                WHERE h.id IN (<hand_ids>)"""
+
+    query["handBatchBoards"] = """
+             SELECT b.*
+                FROM Boards b
+                WHERE b.handId IN (<hand_ids>)
+                ORDER BY b.handId, b.id"""
+
+    query["handBatchPlayers"] = """
+        SELECT
+                    hp.handId,
+                    hp.seatno,
+                    round(hp.winnings / 100.0,2) as winnings,
+                    p.name,
+                    round(hp.startCash / 100.0,2) as chips,
+                    hp.card1,hp.card2,hp.card3,hp.card4,hp.card5,
+                    hp.card6,hp.card7,hp.card8,hp.card9,hp.card10,
+                    hp.card11,hp.card12,hp.card13,hp.card14,hp.card15,
+                    hp.card16,hp.card17,hp.card18,hp.card19,hp.card20,
+                    hp.position,
+                    round(hp.startBounty / 100.0,2) as bounty,
+                    hp.sitout,
+                    hp.isCashOut
+                FROM
+                    HandsPlayers as hp,
+                    Players as p
+                WHERE
+                    hp.handId IN (<hand_ids>)
+                    and p.id = hp.playerId
+                ORDER BY
+                    hp.handId,
+                    hp.seatno
+            """
+
+    query["handBatchActions"] = """
+        SELECT
+                  ha.handId,
+                  ha.actionNo,
+                  p.name,
+                  ha.street,
+                  ha.actionId,
+                  ha.allIn,
+                  round(ha.amount / 100.0,2) as bet,
+                  ha.numDiscarded,
+                  ha.cardsDiscarded
+            FROM
+                  HandsActions as ha,
+                  Players as p
+            WHERE
+                      ha.handId IN (<hand_ids>)
+                  AND ha.playerId = p.id
+            ORDER BY
+                  ha.id ASC
+            """
+
+    query["handBatchShowdown"] = """select hs.handId, p.name, hs.combo, hs.cards
+            from HandsShowdown hs, Players p
+            where hs.handId IN (<hand_ids>) and hs.playerId=p.id"""
+
+    query["handBatchCashout"] = """select hc.handId, p.name, hc.amount, hc.fee
+            from HandsCashout hc, Players p
+            where hc.handId IN (<hand_ids>) and hc.playerId=p.id"""
+
+    query["handBatchSplash"] = """select hp.handId, p.name, hp.splashWinnings
+            from HandsPlayers hp, Players p
+            where hp.handId IN (<hand_ids>) and hp.playerId=p.id and hp.splashWinnings<>0"""
+
+    # Who sat where, for the HUD's in-memory aggregates.
+    query["handBatchSeats"] = """SELECT handId, playerId, seatNo
+            FROM HandsPlayers
+            WHERE handId IN (<hand_ids>)"""
+    return query
@@ -1,12 +1,317 @@
-"""Blind-level aggregated current-hand HUD statistics query."""
+"""Blind-level aggregated current-hand HUD statistics query.
+
+The summed columns are declared here and the select list is written from the
+declarations, so anything that follows the aggregate without running it (the
+HUD's in-memory aggregates) reads the same list the database sums.
+"""
 
 from __future__ import annotations
 
+# (alias, HudCache column) summed over every HudCache row in range.
+HUD_SUMMED_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("n", "n"),
+    ("vpip_opp", "street0VPIChance"),
+    ("vpip", "street0VPI"),
+    ("pfr_opp", "street0AggrChance"),
+    ("pfr", "street0Aggr"),
+    ("CAR_opp_0", "street0CalledRaiseChance"),
+    ("CAR_0", "street0CalledRaiseDone"),
+    ("TB_opp_0", "street0_3BChance"),
+    ("TB_0", "street0_3BDone"),
+    ("fl3b_opp", "street1_3BChance"),
+    ("fl3b", "street1_3BDone"),
+    ("tn3b_opp", "street2_3BChance"),
+    ("tn3b", "street2_3BDone"),
+    ("rv3b_opp", "street3_3BChance"),
+    ("rv3b", "street3_3BDone"),
+    ("ff3b_opp", "street1_FoldTo3BChance"),
+    ("ff3b", "street1_FoldTo3BDone"),
+    ("ft3b_opp", "street2_FoldTo3BChance"),
+    ("ft3b", "street2_FoldTo3BDone"),
+    ("fr3b_opp", "street3_FoldTo3BChance"),
+    ("fr3b", "street3_FoldTo3BDone"),
+    ("fl4b_opp", "street1_4BChance"),
+    ("fl4b", "street1_4BDone"),
+    ("tn4b_opp", "street2_4BChance"),
+    ("tn4b", "street2_4BDone"),
+    ("rv4b_opp", "street3_4BChance"),
+    ("rv4b", "street3_4BDone"),
+    ("flopen_opp", "street1OpenChance"),
+    ("flopen", "street1OpenDone"),
+    ("tnopen_opp", "street2OpenChance"),
+    ("tnopen", "street2OpenDone"),
+    ("rvopen_opp", "street3OpenChance"),
+    ("rvopen", "street3OpenDone"),
+    ("f_fold", "flg_f_fold"),
+    ("t_fold", "flg_t_fold"),
+    ("r_fold", "flg_r_fold"),
+    ("f_first_raise", "street1FirstRaise"),
+    ("t_first_raise", "street2FirstRaise"),
+    ("r_first_raise", "street3FirstRaise"),
+    ("p_face_raise", "street0FaceRaise"),
+    ("f_face_raise", "street1FaceRaise"),
+    ("t_face_raise", "street2FaceRaise"),
+    ("r_face_raise", "street3FaceRaise"),
+    ("float_turn_chance", "flg_t_float_opp"),
+    ("float_turn_done", "flg_t_float"),
+    ("float_turn_def_opp", "flg_t_float_def_opp"),
+    ("float_river_chance", "flg_r_float_opp"),
+    ("float_river_done", "flg_r_float"),
+    ("float_river_def_opp", "flg_r_float_def_opp"),
+    ("sqzdef_opp", "street0_FoldToSqueezeChance"),
+    ("sqzdef_fold", "street0_FoldToSqueezeDone"),
+    ("face_limpers", "street0_FaceLimpers"),
+    ("gp_open_opp", "cnt_gp_open_opp"),
+    ("gp_2x", "cnt_gp_2x"),
+    ("gp_os", "cnt_gp_os"),
+    ("gp_limp", "cnt_gp_limp"),
+    ("blind_ds", "flg_blind_ds"),
+    ("blind_db", "flg_blind_db"),
+    ("straddle_done", "flg_blind_k"),
+    ("faced_allin", "flg_faced_allin"),
+    ("fold_allin", "flg_fold_to_allin"),
+    ("f_bet_facing_cnt", "cnt_f_bet_facing"),
+    ("f_bet_facing_bp", "val_f_bet_facing_bp"),
+    ("t_bet_facing_cnt", "cnt_t_bet_facing"),
+    ("t_bet_facing_bp", "val_t_bet_facing_bp"),
+    ("r_bet_facing_cnt", "cnt_r_bet_facing"),
+    ("r_bet_facing_bp", "val_r_bet_facing_bp"),
+    ("p_2bet_facing_cnt", "cnt_p_2bet_facing"),
+    ("p_2bet_facing_bp", "val_p_2bet_facing_bp"),
+    ("p_3bet_facing_cnt", "cnt_p_3bet_facing"),
+    ("p_3bet_facing_bp", "val_p_3bet_facing_bp"),
+    ("p_4bet_facing_cnt", "cnt_p_4bet_facing"),
+    ("p_4bet_facing_bp", "val_p_4bet_facing_bp"),
+    ("f_bet_made_cnt", "cnt_f_bet_made"),
+    ("f_bet_made_bp", "val_f_bet_made_bp"),
+    ("t_bet_made_cnt", "cnt_t_bet_made"),
+    ("t_bet_made_bp", "val_t_bet_made_bp"),
+    ("r_bet_made_cnt", "cnt_r_bet_made"),
+    ("r_bet_made_bp", "val_r_bet_made_bp"),
+    ("f_spr_cnt", "cnt_f_spr"),
+    ("f_spr_val", "val_f_spr"),
+    ("t_spr_cnt", "cnt_t_spr"),
+    ("t_spr_val", "val_t_spr"),
+    ("r_spr_cnt", "cnt_r_spr"),
+    ("r_spr_val", "val_r_spr"),
+    ("p_raise_made_cnt", "cnt_p_raise_made"),
+    ("p_raise_made_bp", "val_p_raise_made_bp"),
+    ("f_raise_made_cnt", "cnt_f_raise_made"),
+    ("f_raise_made_bp", "val_f_raise_made_bp"),
+    ("t_raise_made_cnt", "cnt_t_raise_made"),
+    ("t_raise_made_bp", "val_t_raise_made_bp"),
+    ("r_raise_made_cnt", "cnt_r_raise_made"),
+    ("r_raise_made_bp", "val_r_raise_made_bp"),
+    ("f_2bet_facing_cnt", "cnt_f_2bet_facing"),
+    ("f_2bet_facing_bp", "val_f_2bet_facing_bp"),
+    ("f_3bet_facing_cnt", "cnt_f_3bet_facing"),
+    ("f_3bet_facing_bp", "val_f_3bet_facing_bp"),
+    ("f_4bet_facing_cnt", "cnt_f_4bet_facing"),
+    ("f_4bet_facing_bp", "val_f_4bet_facing_bp"),
+    ("t_2bet_facing_cnt", "cnt_t_2bet_facing"),
+    ("t_2bet_facing_bp", "val_t_2bet_facing_bp"),
+    ("t_3bet_facing_cnt", "cnt_t_3bet_facing"),
+    ("t_3bet_facing_bp", "val_t_3bet_facing_bp"),
+    ("t_4bet_facing_cnt", "cnt_t_4bet_facing"),
+    ("t_4bet_facing_bp", "val_t_4bet_facing_bp"),
+    ("r_2bet_facing_cnt", "cnt_r_2bet_facing"),
+    ("r_2bet_facing_bp", "val_r_2bet_facing_bp"),
+    ("r_3bet_facing_cnt", "cnt_r_3bet_facing"),
+    ("r_3bet_facing_bp", "val_r_3bet_facing_bp"),
+    ("r_4bet_facing_cnt", "cnt_r_4bet_facing"),
+    ("r_4bet_facing_bp", "val_r_4bet_facing_bp"),
+    ("amt_blind", "amt_blind"),
+    ("amt_bet_p", "amt_bet_p"),
+    ("amt_bet_f", "amt_bet_f"),
+    ("amt_bet_t", "amt_bet_t"),
+    ("amt_bet_r", "amt_bet_r"),
+    ("amt_bet_ttl", "amt_bet_ttl"),
+    ("p_raise_facing_cnt", "cnt_p_raise_facing"),
+    ("p_raise_facing_bp", "val_p_raise_facing_bp"),
+    ("f_raise_facing_cnt", "cnt_f_raise_facing"),
+    ("f_raise_facing_bp", "val_f_raise_facing_bp"),
+    ("t_raise_facing_cnt", "cnt_t_raise_facing"),
+    ("t_raise_facing_bp", "val_t_raise_facing_bp"),
+    ("r_raise_facing_cnt", "cnt_r_raise_facing"),
+    ("r_raise_facing_bp", "val_r_raise_facing_bp"),
+    ("p_raise_made_2_cnt", "cnt_p_raise_made_2"),
+    ("p_raise_made_2_bp", "val_p_raise_made_2_bp"),
+    ("f_raise_made_2_cnt", "cnt_f_raise_made_2"),
+    ("f_raise_made_2_bp", "val_f_raise_made_2_bp"),
+    ("t_raise_made_2_cnt", "cnt_t_raise_made_2"),
+    ("t_raise_made_2_bp", "val_t_raise_made_2_bp"),
+    ("r_raise_made_2_cnt", "cnt_r_raise_made_2"),
+    ("r_raise_made_2_bp", "val_r_raise_made_2_bp"),
+    ("p_5bet_facing_cnt", "cnt_p_5bet_facing"),
+    ("p_5bet_facing_bp", "val_p_5bet_facing_bp"),
+    ("FB_opp_0", "street0_4BChance"),
+    ("FB_0", "street0_4BDone"),
+    ("CFB_opp_0", "street0_C4BChance"),
+    ("CFB_0", "street0_C4BDone"),
+    ("F3B_opp_0", "street0_FoldTo3BChance"),
+    ("F3B_0", "street0_FoldTo3BDone"),
+    ("F4B_opp_0", "street0_FoldTo4BChance"),
+    ("F4B_0", "street0_FoldTo4BDone"),
+    ("SQZ_opp_0", "street0_SqueezeChance"),
+    ("SQZ_0", "street0_SqueezeDone"),
+    ("RTS_opp", "raiseToStealChance"),
+    ("RTS", "raiseToStealDone"),
+    ("SUC_ST", "success_Steal"),
+    ("saw_f", "street1Seen"),
+    ("saw_1", "street1Seen"),
+    ("saw_2", "street2Seen"),
+    ("saw_3", "street3Seen"),
+    ("saw_4", "street4Seen"),
+    ("sd", "sawShowdown"),
+    ("aggr_1", "street1Aggr"),
+    ("aggr_2", "street2Aggr"),
+    ("aggr_3", "street3Aggr"),
+    ("aggr_4", "street4Aggr"),
+    ("was_raised_1", "otherRaisedStreet1"),
+    ("was_raised_2", "otherRaisedStreet2"),
+    ("was_raised_3", "otherRaisedStreet3"),
+    ("was_raised_4", "otherRaisedStreet4"),
+    ("f_freq_1", "foldToOtherRaisedStreet1"),
+    ("f_freq_2", "foldToOtherRaisedStreet2"),
+    ("f_freq_3", "foldToOtherRaisedStreet3"),
+    ("f_freq_4", "foldToOtherRaisedStreet4"),
+    ("w_w_s_1", "wonWhenSeenStreet1"),
+    ("wmsd", "wonAtSD"),
+    ("steal_opp", "stealChance"),
+    ("steal", "stealDone"),
+    ("SBstolen", "foldSbToStealChance"),
+    ("SBnotDef", "foldedSbToSteal"),
+    ("BBstolen", "foldBbToStealChance"),
+    ("BBnotDef", "foldedBbToSteal"),
+    ("CB_opp_1", "street1CBChance"),
+    ("CB_1", "street1CBDone"),
+    ("CB_opp_2", "street2CBChance"),
+    ("CB_2", "street2CBDone"),
+    ("CB_opp_3", "street3CBChance"),
+    ("CB_3", "street3CBDone"),
+    ("CB_opp_4", "street4CBChance"),
+    ("CB_4", "street4CBDone"),
+    ("f_cb_opp_1", "foldToStreet1CBChance"),
+    ("f_cb_1", "foldToStreet1CBDone"),
+    ("f_cb_opp_2", "foldToStreet2CBChance"),
+    ("f_cb_2", "foldToStreet2CBDone"),
+    ("f_cb_opp_3", "foldToStreet3CBChance"),
+    ("f_cb_3", "foldToStreet3CBDone"),
+    ("f_cb_opp_4", "foldToStreet4CBChance"),
+    ("f_cb_4", "foldToStreet4CBDone"),
+    ("net", "totalProfit"),
+    ("ccr_opp_1", "street1CheckCallRaiseChance"),
+    ("cc_1", "street1CheckCallDone"),
+    ("cr_1", "street1CheckRaiseDone"),
+    ("ccr_opp_2", "street2CheckCallRaiseChance"),
+    ("cc_2", "street2CheckCallDone"),
+    ("cr_2", "street2CheckRaiseDone"),
+    ("ccr_opp_3", "street3CheckCallRaiseChance"),
+    ("cc_3", "street3CheckCallDone"),
+    ("cr_3", "street3CheckRaiseDone"),
+    ("ccr_opp_4", "street4CheckCallRaiseChance"),
+    ("cc_4", "street4CheckCallDone"),
+    ("cr_4", "street4CheckRaiseDone"),
+    ("call_0", "street0Calls"),
+    ("call_1", "street1Calls"),
+    ("call_2", "street2Calls"),
+    ("call_3", "street3Calls"),
+    ("call_4", "street4Calls"),
+    ("bet_0", "street0Bets"),
+    ("bet_1", "street1Bets"),
+    ("bet_2", "street2Bets"),
+    ("bet_3", "street3Bets"),
+    ("bet_4", "street4Bets"),
+    ("raise_0", "street0Raises"),
+    ("raise_1", "street1Raises"),
+    ("raise_2", "street2Raises"),
+    ("raise_3", "street3Raises"),
+    ("raise_4", "street4Raises"),
+    ("limp", "street0Limp"),
+    ("open_limp_opp", "street0OpenLimpChance"),
+    ("open_limp", "street0OpenLimp"),
+    # Delayed turn c-bet: raw aliases so the declarative descriptor
+    # 'delayed_cbet_turn' renders via do_stat.
+    ("street2DelayedCBChance", "street2DelayedCBChance"),
+    ("street2DelayedCBDone", "street2DelayedCBDone"),
+    ("street2ProbeChance", "street2ProbeChance"),
+    ("street2ProbeDone", "street2ProbeDone"),
+)
+
+# Summed as gt.bigblind * hc.n: the big blinds the player's hands were played at.
+HUD_BIG_BLINDS_ALIAS = "bigblind"
+
+# (alias, HudCache column, position) summed over the rows of one position.
+# HudCache.position is stored as a letter bucket by storeHudCache(): D=button,
+# C=cutoff, M=middle, E=early (B/S=blinds). Preflop aggression by position keeps
+# both the action and its true opportunity count in each bucket.
+HUD_POSITION_COLUMNS: tuple[tuple[str, str, str], ...] = (
+    ("rfi_opp_btn", "raiseFirstInChance", "D"),
+    ("rfi_btn", "raisedFirstIn", "D"),
+    ("rfi_opp_lp", "raiseFirstInChance", "C"),
+    ("rfi_lp", "raisedFirstIn", "C"),
+    ("rfi_opp_mp", "raiseFirstInChance", "M"),
+    ("rfi_mp", "raisedFirstIn", "M"),
+    ("rfi_opp_ep", "raiseFirstInChance", "E"),
+    ("rfi_ep", "raisedFirstIn", "E"),
+    ("tb_opp_bb", "street0_3BChance", "B"),
+    ("tb_bb", "street0_3BDone", "B"),
+    ("tb_opp_sb", "street0_3BChance", "S"),
+    ("tb_sb", "street0_3BDone", "S"),
+    ("tb_opp_btn", "street0_3BChance", "D"),
+    ("tb_btn", "street0_3BDone", "D"),
+    ("tb_opp_co", "street0_3BChance", "C"),
+    ("tb_co", "street0_3BDone", "C"),
+    ("tb_opp_mp", "street0_3BChance", "M"),
+    ("tb_mp", "street0_3BDone", "M"),
+    ("tb_opp_ep", "street0_3BChance", "E"),
+    ("tb_ep", "street0_3BDone", "E"),
+    ("fb_opp_bb", "street0_4BChance", "B"),
+    ("fb_bb", "street0_4BDone", "B"),
+    ("fb_opp_sb", "street0_4BChance", "S"),
+    ("fb_sb", "street0_4BDone", "S"),
+    ("fb_opp_btn", "street0_4BChance", "D"),
+    ("fb_btn", "street0_4BDone", "D"),
+    ("fb_opp_co", "street0_4BChance", "C"),
+    ("fb_co", "street0_4BDone", "C"),
+    ("fb_opp_mp", "street0_4BChance", "M"),
+    ("fb_mp", "street0_4BDone", "M"),
+    ("fb_opp_ep", "street0_4BChance", "E"),
+    ("fb_ep", "street0_4BDone", "E"),
+    ("sqz_opp_bb", "street0_SqueezeChance", "B"),
+    ("sqz_bb", "street0_SqueezeDone", "B"),
+    ("sqz_opp_sb", "street0_SqueezeChance", "S"),
+    ("sqz_sb", "street0_SqueezeDone", "S"),
+    ("sqz_opp_btn", "street0_SqueezeChance", "D"),
+    ("sqz_btn", "street0_SqueezeDone", "D"),
+    ("sqz_opp_co", "street0_SqueezeChance", "C"),
+    ("sqz_co", "street0_SqueezeDone", "C"),
+    ("sqz_opp_mp", "street0_SqueezeChance", "M"),
+    ("sqz_mp", "street0_SqueezeDone", "M"),
+    ("sqz_opp_ep", "street0_SqueezeChance", "E"),
+    ("sqz_ep", "street0_SqueezeDone", "E"),
+)
+
+
+_SELECT_SEPARATOR = """,
+                   """
+
+
+def _summed_select_list() -> str:
+    lines = [f"sum(hc.{column}) AS {alias}" for alias, column in HUD_SUMMED_COLUMNS]
+    lines.append(f"sum(gt.bigblind * hc.n) AS {HUD_BIG_BLINDS_ALIAS}")
+    lines.extend(
+        f"sum(CASE WHEN hc.position = '{position}' THEN hc.{column} ELSE 0 END) AS {alias}"
+        for alias, column, position in HUD_POSITION_COLUMNS
+    )
+    return _SELECT_SEPARATOR.join(lines)
+
 
 def hud_aggregated_stats_queries() -> dict[str, str]:
     """Return the current-hand HUD query aggregated across blind levels."""
     query: dict[str, str] = {}
-    query["get_stats_from_hand_aggregated"] = """
+    query["get_stats_from_hand_aggregated"] = (
+        """
             /* explain query plan */
             SELECT hc.playerId                         AS player_id,
                    max(case when hc.gametypeId = h.gametypeId
@@ -14,282 +319,9 @@ def hud_aggregated_stats_queries() -> dict[str, str]:
                             else -1
                        end)                            AS seat,
                    p.name                              AS screen_name,
-                   sum(hc.n)                           AS n,
-                   sum(hc.street0VPIChance)            AS vpip_opp,
-                   sum(hc.street0VPI)                  AS vpip,
-                   sum(hc.street0AggrChance)           AS pfr_opp,
-                   sum(hc.street0Aggr)                 AS pfr,
-                   sum(hc.street0CalledRaiseChance)    AS CAR_opp_0,
-                   sum(hc.street0CalledRaiseDone)      AS CAR_0,
-                   sum(hc.street0_3BChance)            AS TB_opp_0,
-                   sum(hc.street0_3BDone)              AS TB_0,
-                   sum(hc.street1_3BChance)            AS fl3b_opp,
-                   sum(hc.street1_3BDone)              AS fl3b,
-                   sum(hc.street2_3BChance)            AS tn3b_opp,
-                   sum(hc.street2_3BDone)              AS tn3b,
-                   sum(hc.street3_3BChance)            AS rv3b_opp,
-                   sum(hc.street3_3BDone)              AS rv3b,
-                sum(hc.street1_FoldTo3BChance)      AS ff3b_opp,
-                sum(hc.street1_FoldTo3BDone)        AS ff3b,
-                sum(hc.street2_FoldTo3BChance)      AS ft3b_opp,
-                sum(hc.street2_FoldTo3BDone)        AS ft3b,
-                sum(hc.street3_FoldTo3BChance)      AS fr3b_opp,
-                sum(hc.street3_FoldTo3BDone)        AS fr3b,
-                   sum(hc.street1_4BChance)            AS fl4b_opp,
-                   sum(hc.street1_4BDone)              AS fl4b,
-                   sum(hc.street2_4BChance)            AS tn4b_opp,
-                   sum(hc.street2_4BDone)              AS tn4b,
-                   sum(hc.street3_4BChance)            AS rv4b_opp,
-                   sum(hc.street3_4BDone)              AS rv4b,
-                   sum(hc.street1OpenChance)           AS flopen_opp,
-                   sum(hc.street1OpenDone)             AS flopen,
-                   sum(hc.street2OpenChance)           AS tnopen_opp,
-                   sum(hc.street2OpenDone)             AS tnopen,
-                   sum(hc.street3OpenChance)           AS rvopen_opp,
-                   sum(hc.street3OpenDone)             AS rvopen,
-                   sum(hc.flg_f_fold)                  AS f_fold,
-                   sum(hc.flg_t_fold)                  AS t_fold,
-                   sum(hc.flg_r_fold)                  AS r_fold,
-                   sum(hc.street1FirstRaise)           AS f_first_raise,
-                   sum(hc.street2FirstRaise)           AS t_first_raise,
-                   sum(hc.street3FirstRaise)           AS r_first_raise,
-                   sum(hc.street0FaceRaise)            AS p_face_raise,
-                   sum(hc.street1FaceRaise)            AS f_face_raise,
-                   sum(hc.street2FaceRaise)            AS t_face_raise,
-                   sum(hc.street3FaceRaise)            AS r_face_raise,
-                   sum(hc.flg_t_float_opp)             AS float_turn_chance,
-                   sum(hc.flg_t_float)                 AS float_turn_done,
-                   sum(hc.flg_t_float_def_opp)         AS float_turn_def_opp,
-                   sum(hc.flg_r_float_opp)             AS float_river_chance,
-                   sum(hc.flg_r_float)                 AS float_river_done,
-                   sum(hc.flg_r_float_def_opp)         AS float_river_def_opp,
-                   sum(hc.street0_FoldToSqueezeChance) AS sqzdef_opp,
-                   sum(hc.street0_FoldToSqueezeDone)   AS sqzdef_fold,
-                   sum(hc.street0_FaceLimpers)         AS face_limpers,
-                   sum(hc.cnt_gp_open_opp)            AS gp_open_opp,
-                   sum(hc.cnt_gp_2x)                  AS gp_2x,
-                   sum(hc.cnt_gp_os)                  AS gp_os,
-                   sum(hc.cnt_gp_limp)                AS gp_limp,
-                   sum(hc.flg_blind_ds)                AS blind_ds,
-                   sum(hc.flg_blind_db)                AS blind_db,
-                   sum(hc.flg_blind_k)                 AS straddle_done,
-                   sum(hc.flg_faced_allin)             AS faced_allin,
-                   sum(hc.flg_fold_to_allin)           AS fold_allin,
-                   sum(hc.cnt_f_bet_facing)            AS f_bet_facing_cnt,
-                   sum(hc.val_f_bet_facing_bp)         AS f_bet_facing_bp,
-                   sum(hc.cnt_t_bet_facing)            AS t_bet_facing_cnt,
-                   sum(hc.val_t_bet_facing_bp)         AS t_bet_facing_bp,
-                   sum(hc.cnt_r_bet_facing)            AS r_bet_facing_cnt,
-                   sum(hc.val_r_bet_facing_bp)         AS r_bet_facing_bp,
-                   sum(hc.cnt_p_2bet_facing)           AS p_2bet_facing_cnt,
-                   sum(hc.val_p_2bet_facing_bp)        AS p_2bet_facing_bp,
-                   sum(hc.cnt_p_3bet_facing)           AS p_3bet_facing_cnt,
-                   sum(hc.val_p_3bet_facing_bp)        AS p_3bet_facing_bp,
-                   sum(hc.cnt_p_4bet_facing)           AS p_4bet_facing_cnt,
-                   sum(hc.val_p_4bet_facing_bp)        AS p_4bet_facing_bp,
-                   sum(hc.cnt_f_bet_made)              AS f_bet_made_cnt,
-                   sum(hc.val_f_bet_made_bp)           AS f_bet_made_bp,
-                   sum(hc.cnt_t_bet_made)              AS t_bet_made_cnt,
-                   sum(hc.val_t_bet_made_bp)           AS t_bet_made_bp,
-                   sum(hc.cnt_r_bet_made)              AS r_bet_made_cnt,
-                   sum(hc.val_r_bet_made_bp)           AS r_bet_made_bp,
-                   sum(hc.cnt_f_spr)                   AS f_spr_cnt,
-                   sum(hc.val_f_spr)                   AS f_spr_val,
-                   sum(hc.cnt_t_spr)                   AS t_spr_cnt,
-                   sum(hc.val_t_spr)                   AS t_spr_val,
-                   sum(hc.cnt_r_spr)                   AS r_spr_cnt,
-                   sum(hc.val_r_spr)                   AS r_spr_val,
-                   sum(hc.cnt_p_raise_made)            AS p_raise_made_cnt,
-                   sum(hc.val_p_raise_made_bp)         AS p_raise_made_bp,
-                   sum(hc.cnt_f_raise_made)            AS f_raise_made_cnt,
-                   sum(hc.val_f_raise_made_bp)         AS f_raise_made_bp,
-                   sum(hc.cnt_t_raise_made)            AS t_raise_made_cnt,
-                   sum(hc.val_t_raise_made_bp)         AS t_raise_made_bp,
-                   sum(hc.cnt_r_raise_made)            AS r_raise_made_cnt,
-                   sum(hc.val_r_raise_made_bp)         AS r_raise_made_bp,
-                   sum(hc.cnt_f_2bet_facing)           AS f_2bet_facing_cnt,
-                   sum(hc.val_f_2bet_facing_bp)        AS f_2bet_facing_bp,
-                   sum(hc.cnt_f_3bet_facing)           AS f_3bet_facing_cnt,
-                   sum(hc.val_f_3bet_facing_bp)        AS f_3bet_facing_bp,
-                   sum(hc.cnt_f_4bet_facing)           AS f_4bet_facing_cnt,
-                   sum(hc.val_f_4bet_facing_bp)        AS f_4bet_facing_bp,
-                   sum(hc.cnt_t_2bet_facing)           AS t_2bet_facing_cnt,
-                   sum(hc.val_t_2bet_facing_bp)        AS t_2bet_facing_bp,
-                   sum(hc.cnt_t_3bet_facing)           AS t_3bet_facing_cnt,
-                   sum(hc.val_t_3bet_facing_bp)        AS t_3bet_facing_bp,
-                   sum(hc.cnt_t_4bet_facing)           AS t_4bet_facing_cnt,
-                   sum(hc.val_t_4bet_facing_bp)        AS t_4bet_facing_bp,
-                   sum(hc.cnt_r_2bet_facing)           AS r_2bet_facing_cnt,
-                   sum(hc.val_r_2bet_facing_bp)        AS r_2bet_facing_bp,
-                   sum(hc.cnt_r_3bet_facing)           AS r_3bet_facing_cnt,
-                   sum(hc.val_r_3bet_facing_bp)        AS r_3bet_facing_bp,
-                   sum(hc.cnt_r_4bet_facing)           AS r_4bet_facing_cnt,
-                   sum(hc.val_r_4bet_facing_bp)        AS r_4bet_facing_bp,
-                   sum(hc.amt_blind)                 AS amt_blind,
-                   sum(hc.amt_bet_p)                 AS amt_bet_p,
-                   sum(hc.amt_bet_f)                 AS amt_bet_f,
-                   sum(hc.amt_bet_t)                 AS amt_bet_t,
-                   sum(hc.amt_bet_r)                 AS amt_bet_r,
-                   sum(hc.amt_bet_ttl)               AS amt_bet_ttl,
-                   sum(hc.cnt_p_raise_facing)        AS p_raise_facing_cnt,
-                   sum(hc.val_p_raise_facing_bp)     AS p_raise_facing_bp,
-                   sum(hc.cnt_f_raise_facing)        AS f_raise_facing_cnt,
-                   sum(hc.val_f_raise_facing_bp)     AS f_raise_facing_bp,
-                   sum(hc.cnt_t_raise_facing)        AS t_raise_facing_cnt,
-                   sum(hc.val_t_raise_facing_bp)     AS t_raise_facing_bp,
-                   sum(hc.cnt_r_raise_facing)        AS r_raise_facing_cnt,
-                   sum(hc.val_r_raise_facing_bp)     AS r_raise_facing_bp,
-                   sum(hc.cnt_p_raise_made_2)        AS p_raise_made_2_cnt,
-                   sum(hc.val_p_raise_made_2_bp)     AS p_raise_made_2_bp,
-                   sum(hc.cnt_f_raise_made_2)        AS f_raise_made_2_cnt,
-                   sum(hc.val_f_raise_made_2_bp)     AS f_raise_made_2_bp,
-                   sum(hc.cnt_t_raise_made_2)        AS t_raise_made_2_cnt,
-                   sum(hc.val_t_raise_made_2_bp)     AS t_raise_made_2_bp,
-                   sum(hc.cnt_r_raise_made_2)        AS r_raise_made_2_cnt,
-                   sum(hc.val_r_raise_made_2_bp)     AS r_raise_made_2_bp,
-                   sum(hc.cnt_p_5bet_facing)         AS p_5bet_facing_cnt,
-                   sum(hc.val_p_5bet_facing_bp)      AS p_5bet_facing_bp,
-                   sum(hc.street0_4BChance)            AS FB_opp_0,
-                   sum(hc.street0_4BDone)              AS FB_0,
-                   sum(hc.street0_C4BChance)           AS CFB_opp_0,
-                   sum(hc.street0_C4BDone)             AS CFB_0,
-                   sum(hc.street0_FoldTo3BChance)      AS F3B_opp_0,
-                   sum(hc.street0_FoldTo3BDone)        AS F3B_0,
-                   sum(hc.street0_FoldTo4BChance)      AS F4B_opp_0,
-                   sum(hc.street0_FoldTo4BDone)        AS F4B_0,
-                   sum(hc.street0_SqueezeChance)       AS SQZ_opp_0,
-                   sum(hc.street0_SqueezeDone)         AS SQZ_0,
-                   sum(hc.raiseToStealChance)          AS RTS_opp,
-                   sum(hc.raiseToStealDone)            AS RTS,
-                   sum(hc.success_Steal)               AS SUC_ST,
-                   sum(hc.street1Seen)                 AS saw_f,
-                   sum(hc.street1Seen)                 AS saw_1,
-                   sum(hc.street2Seen)                 AS saw_2,
-                   sum(hc.street3Seen)                 AS saw_3,
-                   sum(hc.street4Seen)                 AS saw_4,
-                   sum(hc.sawShowdown)                 AS sd,
-                   sum(hc.street1Aggr)                 AS aggr_1,
-                   sum(hc.street2Aggr)                 AS aggr_2,
-                   sum(hc.street3Aggr)                 AS aggr_3,
-                   sum(hc.street4Aggr)                 AS aggr_4,
-                   sum(hc.otherRaisedStreet1)          AS was_raised_1,
-                   sum(hc.otherRaisedStreet2)          AS was_raised_2,
-                   sum(hc.otherRaisedStreet3)          AS was_raised_3,
-                   sum(hc.otherRaisedStreet4)          AS was_raised_4,
-                   sum(hc.foldToOtherRaisedStreet1)    AS f_freq_1,
-                   sum(hc.foldToOtherRaisedStreet2)    AS f_freq_2,
-                   sum(hc.foldToOtherRaisedStreet3)    AS f_freq_3,
-                   sum(hc.foldToOtherRaisedStreet4)    AS f_freq_4,
-                   sum(hc.wonWhenSeenStreet1)          AS w_w_s_1,
-                   sum(hc.wonAtSD)                     AS wmsd,
-                   sum(hc.stealChance)                 AS steal_opp,
-                   sum(hc.stealDone)                   AS steal,
-                   sum(hc.foldSbToStealChance)         AS SBstolen,
-                   sum(hc.foldedSbToSteal)             AS SBnotDef,
-                   sum(hc.foldBbToStealChance)         AS BBstolen,
-                   sum(hc.foldedBbToSteal)             AS BBnotDef,
-                   sum(hc.street1CBChance)             AS CB_opp_1,
-                   sum(hc.street1CBDone)               AS CB_1,
-                   sum(hc.street2CBChance)             AS CB_opp_2,
-                   sum(hc.street2CBDone)               AS CB_2,
-                   sum(hc.street3CBChance)             AS CB_opp_3,
-                   sum(hc.street3CBDone)               AS CB_3,
-                   sum(hc.street4CBChance)             AS CB_opp_4,
-                   sum(hc.street4CBDone)               AS CB_4,
-                   sum(hc.foldToStreet1CBChance)       AS f_cb_opp_1,
-                   sum(hc.foldToStreet1CBDone)         AS f_cb_1,
-                   sum(hc.foldToStreet2CBChance)       AS f_cb_opp_2,
-                   sum(hc.foldToStreet2CBDone)         AS f_cb_2,
-                   sum(hc.foldToStreet3CBChance)       AS f_cb_opp_3,
-                   sum(hc.foldToStreet3CBDone)         AS f_cb_3,
-                   sum(hc.foldToStreet4CBChance)       AS f_cb_opp_4,
-                   sum(hc.foldToStreet4CBDone)         AS f_cb_4,
-                   sum(hc.totalProfit)                 AS net,
-                   sum(gt.bigblind * hc.n)             AS bigblind,
-                   sum(hc.street1CheckCallRaiseChance) AS ccr_opp_1,
-                   sum(hc.street1CheckCallDone)        AS cc_1,
-                   sum(hc.street1CheckRaiseDone)       AS cr_1,
-                   sum(hc.street2CheckCallRaiseChance) AS ccr_opp_2,
-                   sum(hc.street2CheckCallDone)        AS cc_2,
-                   sum(hc.street2CheckRaiseDone)       AS cr_2,
-                   sum(hc.street3CheckCallRaiseChance) AS ccr_opp_3,
-                   sum(hc.street3CheckCallDone)        AS cc_3,
-                   sum(hc.street3CheckRaiseDone)       AS cr_3,
-                   sum(hc.street4CheckCallRaiseChance) AS ccr_opp_4,
-                   sum(hc.street4CheckCallDone)        AS cc_4,
-                   sum(hc.street4CheckRaiseDone)       AS cr_4,
-                   sum(hc.street0Calls)                AS call_0,
-                   sum(hc.street1Calls)                AS call_1,
-                   sum(hc.street2Calls)                AS call_2,
-                   sum(hc.street3Calls)                AS call_3,
-                   sum(hc.street4Calls)                AS call_4,
-                   sum(hc.street0Bets)                 AS bet_0,
-                   sum(hc.street1Bets)                 AS bet_1,
-                   sum(hc.street2Bets)                 AS bet_2,
-                   sum(hc.street3Bets)                 AS bet_3,
-                   sum(hc.street4Bets)                 AS bet_4,
-    sum(hc.street0Raises)               AS raise_0,
-                    sum(hc.street1Raises)               AS raise_1,
-    sum(hc.street2Raises)               AS raise_2,
-                    sum(hc.street3Raises)               AS raise_3,
-                    sum(hc.street4Raises)               AS raise_4,
-    sum(hc.street0Limp)                 AS limp,
-                     sum(hc.street0OpenLimpChance)         AS open_limp_opp,
-                     sum(hc.street0OpenLimp)               AS open_limp,
-                    /* HudCache.position is stored as a letter bucket by storeHudCache():
-                       D=button, C=cutoff, M=middle, E=early (B/S=blinds). */
-                    sum(CASE WHEN hc.position = 'D' THEN hc.raiseFirstInChance ELSE 0 END) AS rfi_opp_btn,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.raisedFirstIn      ELSE 0 END) AS rfi_btn,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.raiseFirstInChance ELSE 0 END) AS rfi_opp_lp,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.raisedFirstIn      ELSE 0 END) AS rfi_lp,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.raiseFirstInChance ELSE 0 END) AS rfi_opp_mp,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.raisedFirstIn      ELSE 0 END) AS rfi_mp,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.raiseFirstInChance ELSE 0 END) AS rfi_opp_ep,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.raisedFirstIn      ELSE 0 END) AS rfi_ep,
-                    /* Preflop aggression by position.  Keep both the action and
-                       its true opportunity count in each bucket. */
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_bb,
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_3BDone   ELSE 0 END) AS tb_bb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_sb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_3BDone   ELSE 0 END) AS tb_sb,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_btn,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_3BDone   ELSE 0 END) AS tb_btn,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_co,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_3BDone   ELSE 0 END) AS tb_co,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_mp,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_3BDone   ELSE 0 END) AS tb_mp,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_3BChance ELSE 0 END) AS tb_opp_ep,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_3BDone   ELSE 0 END) AS tb_ep,
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_bb,
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_4BDone   ELSE 0 END) AS fb_bb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_sb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_4BDone   ELSE 0 END) AS fb_sb,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_btn,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_4BDone   ELSE 0 END) AS fb_btn,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_co,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_4BDone   ELSE 0 END) AS fb_co,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_mp,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_4BDone   ELSE 0 END) AS fb_mp,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_4BChance ELSE 0 END) AS fb_opp_ep,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_4BDone   ELSE 0 END) AS fb_ep,
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_bb,
-                    sum(CASE WHEN hc.position = 'B' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_bb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_sb,
-                    sum(CASE WHEN hc.position = 'S' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_sb,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_btn,
-                    sum(CASE WHEN hc.position = 'D' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_btn,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_co,
-                    sum(CASE WHEN hc.position = 'C' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_co,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_mp,
-                    sum(CASE WHEN hc.position = 'M' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_mp,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_SqueezeChance ELSE 0 END) AS sqz_opp_ep,
-                    sum(CASE WHEN hc.position = 'E' THEN hc.street0_SqueezeDone   ELSE 0 END) AS sqz_ep,
-                    /* Delayed turn c-bet — raw aliases so the declarative
-                       descriptor 'delayed_cbet_turn' renders via do_stat. */
-                    sum(hc.street2DelayedCBChance)      AS street2DelayedCBChance,
-                    sum(hc.street2DelayedCBDone)        AS street2DelayedCBDone,
-                    sum(hc.street2ProbeChance)          AS street2ProbeChance,
-                    sum(hc.street2ProbeDone)            AS street2ProbeDone
+                   """
+        + _summed_select_list()
+        + """
                     /* Declarative descriptor stats (stat_registry.py) inject
                        bucket-encoded ChipEV-by-position columns here. */
                     <chipev_columns>
@@ -331,6 +363,7 @@ def hud_aggregated_stats_queries() -> dict[str, str]:
             GROUP BY hc.PlayerId, p.name
             ORDER BY hc.PlayerId, p.name
         """
+    )
     #  NOTES on above cursor:
     #  - Do NOT include %s inside query in a comment - the db api thinks
     #  they are actual arguments.
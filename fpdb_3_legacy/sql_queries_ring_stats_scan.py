@@ -0,0 +1,170 @@
+"""The one scan behind the cash stats tab's summary, starting-hand and position grids.
+
+``playerDetailedStats`` computes its ratios in SQL, so the tab ran it three
+times over the same HandsPlayers rows, each grouped differently. This query
+instead sums the counters those ratios are made of, at the finest grain any of
+the grids needs -- player, game type, starting hand, position and table size --
+and ``ring_stats.report_engine`` rolls the rows up into each grid. It takes the
+same filter placeholders as ``playerDetailedStats``.
+"""
+
+from __future__ import annotations
+
+# HandsPlayers counters summed per group, in the order they are selected. Each
+# comes back under its lower-cased name.
+RING_SCAN_COUNTERS = (
+    "street0VPIChance",
+    "street0VPI",
+    "street0AggrChance",
+    "street0Aggr",
+    "street0CalledRaiseChance",
+    "street0CalledRaiseDone",
+    "street0_3Bchance",
+    "street0_3Bdone",
+    "street0_4Bchance",
+    "street0_4Bdone",
+    "street0_FoldTo3Bchance",
+    "street0_FoldTo3Bdone",
+    "street0_FoldTo4Bchance",
+    "street0_FoldTo4Bdone",
+    "street1_3BChance",
+    "street1_3BDone",
+    "street2_3BChance",
+    "street2_3BDone",
+    "street3_3BChance",
+    "street3_3BDone",
+    "street1_FoldTo3BChance",
+    "street1_FoldTo3BDone",
+    "street2_FoldTo3BChance",
+    "street2_FoldTo3BDone",
+    "street3_FoldTo3BChance",
+    "street3_FoldTo3BDone",
+    "street1_4BChance",
+    "street1_4BDone",
+    "street2_4BChance",
+    "street2_4BDone",
+    "street3_4BChance",
+    "street3_4BDone",
+    "street1OpenChance",
+    "street1OpenDone",
+    "street2OpenChance",
+    "street2OpenDone",
+    "street3OpenChance",
+    "street3OpenDone",
+    "raiseFirstInChance",
+    "raisedFirstIn",
+    "raiseToStealChance",
+    "raiseToStealDone",
+    "foldBbToStealChance",
+    "foldedBbToSteal",
+    "foldSbToStealChance",
+    "foldedSbToSteal",
+    "stealChance",
+    "stealDone",
+    "success_Steal",
+    "street1Seen",
+    "street2Seen",
+    "street3Seen",
+    "sawShowdown",
+    "wonWhenSeenStreet1",
+    "wonAtSD",
+    "street1Aggr",
+    "street2Aggr",
+    "street3Aggr",
+    "street4Aggr",
+    "street1Calls",
+    "street2Calls",
+    "street3Calls",
+    "street4Calls",
+    "foldToOtherRaisedStreet1",
+    "foldToOtherRaisedStreet2",
+    "foldToOtherRaisedStreet3",
+    "foldToOtherRaisedStreet4",
+    "street1CBChance",
+    "street2CBChance",
+    "street3CBChance",
+    "street4CBChance",
+    "street1CBDone",
+    "street2CBDone",
+    "street3CBDone",
+    "street4CBDone",
+)
+
+# The money sums after the counters. The square is summed as a float: summed
+# as an integer it overflows SQLite's sum() over a few million big pots.
+RING_SCAN_TOTALS = (
+    ("hp.totalProfit", "totalprofit"),
+    ("hp.rake", "rakecents"),
+    ("hp.totalProfit/(gt.bigBlind+0.0)", "bbwon"),
+    ("(hp.totalProfit+hp.rake)/(gt.bigBlind+0.0)", "bbwonxr"),
+    ("hp.totalProfit*(hp.totalProfit+0.0)", "profitsquares"),
+    ("h.seats", "seatsum"),
+)
+
+_DATE_COLUMN = {
+    "mysql": "date_format(h.startTime, '%Y-%m-%d %T')",
+    "postgresql": "to_char(h.startTime, 'YYYY-MM-DD HH24:MI:SS')",
+    "sqlite": "datetime(h.startTime)",
+}
+
+
+def ring_stats_scan_queries(db_server: str) -> dict[str, str]:
+    """Return the backend-specific scan of the hero's cash HandsPlayers rows."""
+    if db_server not in _DATE_COLUMN:
+        return {}
+    signed = "SIGNED" if db_server == "mysql" else "<signed>integer"
+    sums = "".join(
+        f"""
+                        ,sum(cast(hp.{column} as {signed})) AS {column.lower()}"""
+        for column in RING_SCAN_COUNTERS
+    )
+    totals = "".join(
+        f"""
+                        ,sum({expression}) AS {alias}"""
+        for expression, alias in RING_SCAN_TOTALS
+    )
+    query: dict[str, str] = {}
+    query["ringStatsScan"] = f"""
+                 select  hp.playerId                                                            AS playerid
+                        ,p.name                                                                 AS pname
+                        ,h.gametypeId                                                           AS gametypeid
+                        ,hp.startcards                                                          AS startcards
+                        ,hp.position                                                            AS position
+                        ,h.seats                                                                AS seats
+                        ,gt.base                                                                AS base
+                        ,gt.category                                                            AS category
+                        ,upper(gt.limitType)                                                    AS limittype
+                        ,s.name                                                                 AS name
+                        ,gt.bigBlind                                                            AS bigblind
+                        ,gt.ante                                                                AS ante
+                        ,gt.currency                                                            AS currency
+                        ,gt.fast                                                                AS fast
+                        ,count(1)                                                               AS n{sums}{totals}
+                  from HandsPlayers hp
+                       inner join Hands h       on  (h.id = hp.handId)
+                       inner join Gametypes gt  on  (gt.Id = h.gametypeId)
+                       inner join Sites s       on  (s.Id = gt.siteId)
+                       inner join Players p     on  (p.Id = hp.playerId)
+                  where hp.playerId in <player_test>
+                  <game_test>
+                  <site_test>
+                  <currency_test>
+                  and   h.seats <seats_test>
+                  <gtbigBlind_test>
+                  and   {_DATE_COLUMN[db_server]} <datestest>
+                  group by hp.playerId
+                          ,p.name
+                          ,h.gametypeId
+                          ,hp.startcards
+                          ,hp.position
+                          ,h.seats
+                          ,gt.base
+                          ,gt.category
+                          ,upper(gt.limitType)
+                          ,s.name
+                          ,gt.bigBlind
+                          ,gt.ante
+                          ,gt.currency
+                          ,gt.fast
+                  """
+    return query
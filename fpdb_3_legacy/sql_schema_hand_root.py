@@ -136,3 +136,27 @@ def root_hand_schema_queries(db_server: str) -> dict[str, str]:
         return {}
     return {"createHandsTable": ddl}
 
+
+def hand_id_block_queries(db_server: str) -> dict[str, str]:
+    """Return the PostgreSQL sequence hand ids are reserved from, a block at a time.
+
+    ``INCREMENT BY`` is the block size: one ``nextval`` reserves a whole block
+    for the connection calling it, with no lock and no read of the table.
+    It is not ``OWNED BY Hands.id``: that column's own serial sequence must
+    stay the only one ``pg_get_serial_sequence`` can return, or the sequence
+    repair could ``setval`` the blocks back under ids already handed out.
+    drop_tables drops it instead.
+    """
+    if db_server != "postgresql":
+        return {}
+    return {
+        "handIdBlocksExists": "SELECT to_regclass('handidblocks')",
+        "createHandIdBlocks": """CREATE SEQUENCE IF NOT EXISTS HandIdBlocks
+                                    INCREMENT BY <block> START WITH <start>""",
+        "dropHandIdBlocks": "DROP SEQUENCE IF EXISTS HandIdBlocks",
+        "nextHandIdBlock": "SELECT nextval('handidblocks')",
+        # Forward only: a setval could move the sequence back under a block
+        # another connection already holds.
+        "skipHandIdBlocks": "SELECT max(nextval('handidblocks')) FROM generate_series(1, %s)",
+    }
+
@@ -141,6 +141,22 @@ class GridAdapter:
                 variables[input_name] = lowered.get(_column_alias(descriptor, input_name).casefold(), 0)
         return descriptor.compute(variables)
 
+    def compute_rows(self, descriptor: StatDescriptor, rows: Sequence[Mapping[str, Any]]) -> list[float | None]:
+        """:meth:`compute` for every row of a result set, evaluated column by column.
+
+        Gathers each input into one column across ``rows`` and evaluates the
+        descriptor over the columns at once; a row :meth:`compute` would answer
+        ``None`` for comes back as ``None``.
+        """
+        lowered = [{str(key).casefold(): value for key, value in row.items()} for row in rows]
+        columns: dict[str, list[Any]] = {}
+        for input_name in descriptor.inputs:
+            key = input_name if input_name in descriptor.context else _column_alias(descriptor, input_name)
+            key = key.casefold()
+            columns[input_name] = [row.get(key, 0) for row in lowered]
+        values = descriptor.compute_columns(columns, len(rows))
+        return [None if value != value else value for value in values.tolist()]
+
     def augment_row(
         self,
         descriptors: Sequence[StatDescriptor],
@@ -222,6 +238,13 @@ HUDCACHE_POSITION_BUCKET: dict[Any, str] = {
 }
 
 
+def _position_bucket(position: Any) -> str:
+    bucket = HUDCACHE_POSITION_BUCKET.get(position)
+    if bucket is None:
+        raise ValueError(f"no HudCache bucket for position {position!r}")
+    return bucket
+
+
 class HudAdapter:
     """Renders descriptor stats in the live HUD.
 
@@ -251,10 +274,7 @@ class HudAdapter:
         if "seats" in dim:
             parts.append(f"{self.alias}.seats = {int(dim['seats'])}")
         if "position" in dim:
-            bucket = HUDCACHE_POSITION_BUCKET.get(dim["position"])
-            if bucket is None:
-                raise ValueError(f"no HudCache bucket for position {dim['position']!r}")
-            parts.append(f"{self.alias}.position = {_sql_str_literal(bucket)}")
+            parts.append(f"{self.alias}.position = {_sql_str_literal(_position_bucket(dim['position']))}")
         return " AND ".join(parts)
 
     def select_fragments(self, descriptor: StatDescriptor) -> list[str]:
@@ -280,6 +300,21 @@ class HudAdapter:
             frags.extend(self.select_fragments(descriptor))
         return (", " + ", ".join(frags)) if frags else ""
 
+    def aggregated_columns(
+        self, descriptors: Sequence[StatDescriptor]
+    ) -> list[tuple[str, str, int | None, str | None]]:
+        """``(alias, HudCache column, seats, position bucket)`` for each column :meth:`select_clause` sums."""
+        columns: list[tuple[str, str, int | None, str | None]] = []
+        for descriptor in descriptors:
+            dim = descriptor.dimension or {}
+            seats = int(dim["seats"]) if "seats" in dim else None
+            position = _position_bucket(dim["position"]) if "position" in dim else None
+            columns.extend(
+                (_column_alias(descriptor, input_name), input_name, seats, position)
+                for input_name in descriptor.fact_inputs()
+            )
+        return columns
+
     def compute(self, descriptor: StatDescriptor, player_stats: Mapping[str, Any]) -> float | None:
         """Evaluate the descriptor from a ``stat_dict[player]`` mapping.
 
@@ -16,7 +16,10 @@ descriptors from ``stats.d/`` files. Surface-specific *adapters* (HUD, report
 grid, graph) consume the same descriptor and compile it to their native shape.
 
 The descriptor's ``value`` is a small arithmetic expression over named input
-columns, evaluated by a sandboxed AST walker (no ``eval``). Loading a descriptor
+columns. It is parsed and checked against a whitelist once, at load time, then
+compiled into a function of its inputs; the HUD evaluates it per stat, player
+and hand, so walking the tree on every call cost more than the arithmetic. A
+report can also evaluate it over whole NumPy columns at once. Loading a descriptor
 whose expression references a column that does not exist is refused at load
 time, which gives the PT4 importer a clean Tier-2/Tier-3 boundary: if every
 input maps onto an existing FPDB column the stat is plug-and-play; otherwise the
@@ -28,11 +31,12 @@ from __future__ import annotations
 import ast
 import json
 import operator
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import lru_cache, reduce
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 try:  # Python 3.11+
     import tomllib as _toml
@@ -44,6 +48,9 @@ except ModuleNotFoundError:  # pragma: no cover - exercised only on <3.11
 
 from fpdb_3_legacy.loggingFpdb import get_logger
 
+if TYPE_CHECKING:
+    import numpy as np
+
 log = get_logger("stat_registry")
 
 # --------------------------------------------------------------------------- #
@@ -91,6 +98,151 @@ _ALLOWED_FUNCS: dict[str, Callable[..., Any]] = {
 }
 
 
+def _scalar(value: Any) -> Any:
+    """An input as the expression sees it: missing/``None`` is 0, ``Decimal`` is float.
+
+    PostgreSQL/MySQL numeric columns can arrive as Decimal, while descriptor
+    literals are parsed as float. Normalize at the expression boundary so
+    operations such as Decimal / 100.0 do not fail before adapters can convert
+    the computed result.
+    """
+    if value is None:
+        return 0
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _compile_function(body: ast.expr, names: tuple[str, ...]) -> Callable[..., Any]:
+    """Compile a validated expression into ``lambda <names>: <body>``.
+
+    ``body`` has already passed :meth:`SafeExpression._validate`, so the only
+    names it loads are its inputs, which become the parameters, and the
+    whitelisted functions, which are the code's only globals. It runs without
+    builtins.
+    """
+    arguments = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in names],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    tree = ast.Expression(body=ast.Lambda(args=arguments, body=body))
+    code = compile(ast.fix_missing_locations(tree), "<stat expression>", "eval")
+    return eval(code, {"__builtins__": {}, **_ALLOWED_FUNCS})
+
+
+# --------------------------------------------------------------------------- #
+# Column-at-a-time evaluation.
+# --------------------------------------------------------------------------- #
+
+# A column expression takes the input arrays and a per-row "divided by zero"
+# mask it sets, and returns an array or a scalar that broadcasts against them.
+_ColumnFunction = Callable[[Mapping[str, "np.ndarray"], "np.ndarray"], Any]
+
+
+@lru_cache(maxsize=1)
+def _column_ops() -> tuple[dict[type, Callable[..., Any]], dict[type, Callable[..., Any]], dict[str, Any]]:
+    """The NumPy counterparts of the whitelisted operators and functions.
+
+    Imported on first use so the HUD, which only evaluates row by row, does not
+    pay for NumPy when it loads the registry.
+    """
+    import numpy as np
+
+    def coalesce(*args: Any) -> Any:
+        if not args:
+            return 0
+        result = args[-1]
+        for arg in reversed(args[:-1]):
+            result = np.where(np.asarray(arg) != 0, arg, result)
+        return result
+
+    binary: dict[type, Callable[..., Any]] = {
+        ast.Add: np.add,
+        ast.Sub: np.subtract,
+        ast.Mult: np.multiply,
+        ast.Div: np.true_divide,
+        ast.FloorDiv: np.floor_divide,
+        ast.Mod: np.mod,
+        ast.Pow: np.power,
+    }
+    unary: dict[type, Callable[..., Any]] = {ast.UAdd: np.positive, ast.USub: np.negative}
+    funcs = {
+        "min": lambda *args: reduce(np.minimum, args),
+        "max": lambda *args: reduce(np.maximum, args),
+        "abs": np.abs,
+        "coalesce": coalesce,
+    }
+    return binary, unary, funcs
+
+
+def _compile_columns(node: ast.AST) -> _ColumnFunction | None:  # noqa: C901
+    """Compile a validated expression to run over whole columns.
+
+    Returns ``None`` for what has no exact column form (a bare function name,
+    ``round``); those expressions are evaluated row by row instead. Where the
+    row form raises ``ZeroDivisionError`` -- a zero divisor, or zero to a
+    negative power -- the row is marked in the mask, because the row form
+    answers ``None`` for the whole expression, whatever surrounds the division.
+    """
+    binary, unary, funcs = _column_ops()
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda columns, zero: value
+    if isinstance(node, ast.Name):
+        if node.id in _ALLOWED_FUNCS:
+            return None
+        name = node.id
+        return lambda columns, zero: columns[name]
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_columns(node.operand)
+        if operand is None:
+            return None
+        op = unary[type(node.op)]
+        return lambda columns, zero: op(operand(columns, zero))
+    if isinstance(node, ast.BinOp):
+        left, right = _compile_columns(node.left), _compile_columns(node.right)
+        if left is None or right is None:
+            return None
+        op = binary[type(node.op)]
+        if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)):
+
+            def divide(columns: Mapping[str, np.ndarray], zero: np.ndarray) -> Any:
+                a, b = left(columns, zero), right(columns, zero)
+                zero |= b == 0
+                return op(a, b)
+
+            return divide
+        if isinstance(node.op, ast.Pow):
+
+            def power(columns: Mapping[str, np.ndarray], zero: np.ndarray) -> Any:
+                a, b = left(columns, zero), right(columns, zero)
+                zero |= (a == 0) & (b < 0)
+                return op(a, b)
+
+            return power
+        return lambda columns, zero: op(left(columns, zero), right(columns, zero))
+    if isinstance(node, ast.Call):
+        func = funcs.get(node.func.id)  # type: ignore[attr-defined]
+        args = [_compile_columns(arg) for arg in node.args]
+        if func is None or any(arg is None for arg in args):
+            return None
+        return lambda columns, zero: func(*[arg(columns, zero) for arg in args])  # type: ignore[misc]
+    return None  # pragma: no cover - _validate admits nothing else
+
+
+def _column_array(values: Any, length: int) -> np.ndarray:
+    """One input column as float64, with ``None`` as 0 and ``Decimal`` as float."""
+    import numpy as np
+
+    if values is None:
+        return np.zeros(length)
+    array = np.asarray(values)
+    if array.dtype.kind not in "biuf":
+        array = np.array([float(_scalar(value)) for value in values], dtype=np.float64)
+    return array.astype(np.float64, copy=False)
+
+
 class SafeExpression:
     """A compiled, sandboxed arithmetic expression over named variables.
 
@@ -99,6 +251,11 @@ class SafeExpression:
     Anything else (attribute access, calls to unknown names, comprehensions,
     lambdas, etc.) raises :class:`StatDescriptorError` at compile time, so an
     untrusted descriptor file can never execute arbitrary code.
+
+    The checked tree is compiled once into a function of the names it
+    references (:meth:`evaluate`) and, on first use, into a column form
+    (:meth:`evaluate_columns`). :meth:`interpret` walks the tree and is the
+    reference both are held to.
     """
 
     def __init__(self, source: str, allowed_names: frozenset[str]) -> None:
@@ -109,6 +266,10 @@ class SafeExpression:
         except SyntaxError as exc:  # pragma: no cover - defensive
             raise StatDescriptorError(f"invalid expression {source!r}: {exc}") from exc
         self.referenced_names = self._validate(self._tree.body)
+        self._names = tuple(sorted(self.referenced_names))
+        self._function = _compile_function(self._tree.body, self._names)
+        self._columns: _ColumnFunction | None = None
+        self._columns_compiled = False
 
     def _validate(self, node: ast.AST) -> frozenset[str]:
         """Walk the tree, reject anything outside the sandbox, collect names."""
@@ -155,11 +316,44 @@ class SafeExpression:
         "no data" placeholder when a denominator is zero, matching how the
         legacy stat functions degrade.
         """
+        try:
+            return self._function(*[_scalar(variables.get(name, 0)) for name in self._names])
+        except ZeroDivisionError:
+            return None
+
+    def interpret(self, variables: Mapping[str, Any]) -> float | None:
+        """:meth:`evaluate` by walking the tree instead of running the compiled code."""
         try:
             return self._eval(self._tree.body, variables)
         except ZeroDivisionError:
             return None
 
+    def evaluate_columns(self, columns: Mapping[str, Sequence[Any]], length: int | None = None) -> np.ndarray:
+        """Evaluate over whole columns, one float64 per row; NaN where a row divides by zero.
+
+        ``columns`` maps input names to equal-length sequences (lists of query
+        values or arrays). A missing input is a column of zeros, which needs
+        ``length`` when no referenced input is given. Rows come out as floats
+        even where :meth:`evaluate` would answer an int.
+        """
+        import numpy as np
+
+        if length is None:
+            length = next((len(columns[name]) for name in self._names if columns.get(name) is not None), 0)
+        arrays = {name: _column_array(columns.get(name), length) for name in self._names}
+        if not self._columns_compiled:
+            self._columns = _compile_columns(self._tree.body)
+            self._columns_compiled = True
+        if self._columns is None:
+            rows = (self.evaluate({name: arrays[name][i] for name in self._names}) for i in range(length))
+            return np.fromiter((np.nan if value is None else value for value in rows), np.float64, length)
+        zero: np.ndarray = np.zeros(length, dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            values = np.asarray(self._columns(arrays, zero), dtype=np.float64)
+        result = np.array(np.broadcast_to(values, (length,)))
+        result[zero] = np.nan
+        return result
+
     def _eval(self, node: ast.AST, variables: Mapping[str, Any]) -> Any:
         if isinstance(node, ast.BinOp):
             return _BIN_OPS[type(node.op)](
@@ -173,14 +367,7 @@ class SafeExpression:
         if isinstance(node, ast.Name):
             if node.id in _ALLOWED_FUNCS:
                 return _ALLOWED_FUNCS[node.id]
-            value = variables.get(node.id, 0)
-            if value is None:
-                return 0
-            # PostgreSQL/MySQL numeric columns can arrive as Decimal, while
-            # descriptor literals are parsed as float. Normalize at the
-            # expression boundary so operations such as Decimal / 100.0 do
-            # not fail before adapters can convert the computed result.
-            return float(value) if isinstance(value, Decimal) else value
+            return _scalar(variables.get(node.id, 0))
         if isinstance(node, ast.Call):
             func = _ALLOWED_FUNCS[node.func.id]  # type: ignore[attr-defined]
             return func(*[self._eval(a, variables) for a in node.args])
@@ -245,6 +432,10 @@ class StatDescriptor:
         """Evaluate the raw value from a mapping of input column -> number."""
         return self.expression.evaluate(columns)
 
+    def compute_columns(self, columns: Mapping[str, Sequence[Any]], length: int | None = None) -> np.ndarray:
+        """Evaluate the raw value for every row of input column -> values at once."""
+        return self.expression.evaluate_columns(columns, length)
+
     def format(self, raw: float | None) -> str:
         """Render the raw value with ``fmt``; ``None`` becomes a placeholder."""
         if raw is None:
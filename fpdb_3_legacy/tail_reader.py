@@ -0,0 +1,128 @@
+"""Read only what a hand-history file gained since the last auto-import poll.
+
+The poker client appends to its history file while the table is open, and
+auto-import polls every few seconds. ``HandHistoryConverter.readFile`` used to
+read and decode the whole file on every poll and then slice off what it had
+already seen, so a session grown to a few MB was decoded again for every new
+hand, at every table.
+
+A ``TailReader`` keeps, per file, the byte offset already read and the decoder
+that read it -- an incremental decoder, so a multi-byte character split across
+two polls is completed on the next one instead of failing the decode. It also
+keeps the decoded text the importer has not yet consumed: the converter can
+step its index back (an unfinished last hand is retried on the next poll), and
+that text must still be there when it does.
+
+Converters with a session header (``copyGameHeader``, and iPoker's session
+block) look beyond the hand they parse, into ``whole_file``. On a resumed read
+``whole_file`` is the header snapshot taken on the first read -- the file up to
+the end of its first hand -- followed by the unread text, instead of the full
+file.
+
+Anything the reader cannot vouch for falls back to a full read: the first read
+of a file, a file that shrank or was replaced, bytes that no longer decode with
+the codec chosen the first time, and the formats ``readFile`` transforms while
+decoding (UTF-16 exports, SQLite hand-history databases).
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+
+from fpdb_3_legacy.loggingFpdb import get_logger
+
+log = get_logger("tail_reader")
+
+# Upper bound on the header snapshot, in characters. A session header is a few
+# hundred bytes; the cap only matters when the split regex never matches.
+HEADER_SNAPSHOT_MAX = 65536
+
+
+class TailReader:
+    """Byte offset, decoder state and unconsumed text of one hand-history file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything read so far; the next read is a full one."""
+        self.kodec: str | None = None
+        self.header = ""
+        self._identity: tuple[int, int] | None = None
+        self._byte_offset = 0
+        self._decoder: codecs.IncrementalDecoder | None = None
+        # Decoded text from character _base onwards, up to everything read.
+        self._base = 0
+        self._text = ""
+
+    @property
+    def primed(self) -> bool:
+        return self._decoder is not None
+
+    @property
+    def end(self) -> int:
+        """Number of characters decoded so far."""
+        return self._base + len(self._text)
+
+    def prime(self, raw_length: int, whole_file: str, kodec: str, split_re=None) -> None:
+        """Take over after a full read that decoded ``raw_length`` bytes into ``whole_file``."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.reset()
+            return
+        header_end = HEADER_SNAPSHOT_MAX
+        if split_re is not None:
+            m = split_re.search(whole_file, 0, HEADER_SNAPSHOT_MAX)
+            if m:
+                header_end = m.end()
+        self.kodec = kodec
+        self.header = whole_file[:header_end]
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._byte_offset = raw_length
+        self._decoder = codecs.getincrementaldecoder(kodec)(errors="strict")
+        self._base = 0
+        self._text = whole_file
+
+    def read_from(self, index: int) -> str | None:
+        """Return the text from character ``index`` on, reading only appended bytes.
+
+        Returns None when a full read is needed instead; the reader is reset.
+        """
+        if self._decoder is None:
+            return None
+        if index < self._base:
+            log.debug("%s: index %d precedes the retained text, reading in full", self.path, index)
+            self.reset()
+            return None
+        try:
+            stat = os.stat(self.path)
+            if (stat.st_dev, stat.st_ino) != self._identity or stat.st_size < self._byte_offset:
+                log.info("%s was replaced or truncated, reading it in full", self.path)
+                self.reset()
+                return None
+            if stat.st_size > self._byte_offset:
+                with open(self.path, "rb") as fh:
+                    fh.seek(self._byte_offset)
+                    appended = fh.read()
+                self._text += self._decoder.decode(appended, final=False)
+                self._byte_offset += len(appended)
+        except (OSError, UnicodeDecodeError) as e:
+            log.info("Tail read of %s failed (%s), reading it in full", self.path, e)
+            self.reset()
+            return None
+        return self._text[index - self._base :]
+
+    def whole_file(self, index: int, obs: str) -> str:
+        """The ``whole_file`` a converter sees when only ``obs`` was read from ``index``."""
+        return self.header[:index] + obs
+
+    def release(self, index: int) -> None:
+        """Drop retained text before ``index``; the importer will not read it again."""
+        if self._decoder is None or index <= self._base:
+            return
+        index = min(index, self.end)
+        self._text = self._text[index - self._base :]
+        self._base = index
@@ -720,6 +720,18 @@ def test_check_tables_skipped_during_drag(hud_main) -> None:
         Aux_Base.set_drag_active(False)
 
 
+def test_table_window_changes_recheck_only_the_changed_tables(hud_main) -> None:
+    """A window event from the platform re-checks that table without waiting for the poll."""
+    moved, idle = MagicMock(), MagicMock()
+    moved.table.number, idle.table.number = 0x1400003, 0x1400007
+    hud_main.hud_dict = {"moved": moved, "idle": idle, "preview": SimpleNamespace()}
+
+    with patch.object(hud_main, "_handle_table_status") as mock_status:
+        hud_main._on_table_windows_changed({0x1400003})
+
+    mock_status.assert_called_once_with(moved)
+
+
 def test_check_tables_ignores_preview_hud_without_live_table(hud_main) -> None:
     """Preview/lightweight HUDs must not crash the periodic table poll."""
     hud_main.hud_dict = {"preview": SimpleNamespace()}
@@ -1696,6 +1708,27 @@ def test_process_message_enotsock_handling() -> None:
             mock_log.exception.assert_not_called()
 
 
+# Ensures that a message's HudCache rows reach the aggregate store before its hand id is emitted.
+def test_process_message_records_rows_before_emitting() -> None:
+    import zmq
+
+    from fpdb_3_legacy.hud_aggregates import encode_hud_message
+
+    with patch("zmq.Context"), patch("zmq.Poller") as mock_poller_cls:
+        aggregates = MagicMock()
+        receiver = HUD_main.ZMQReceiver(aggregates=aggregates)
+        receiver.socket.closed = False
+        mock_poller_cls.return_value.poll.return_value = [(receiver.socket, zmq.POLLIN)]
+        receiver.socket.recv_string.return_value = encode_hud_message(7, sender="a", seq=1, hudcache=[])
+        emitted = []
+        aggregates.record.side_effect = lambda message: emitted.append(("record", message.rows))
+        receiver.message_received.connect(lambda hand_id: emitted.append(("emit", hand_id)))
+
+        receiver.process_message()
+
+        assert emitted == [("record", ()), ("emit", "7")]
+
+
 def test_advance_live_positions_rotates_button(hud_main) -> None:
     """Positional panels need the CURRENT hand's position; _advance_live_positions
     moves the button one seat from the last imported hand (works even when a
@@ -1013,6 +1013,7 @@ def test_backfill_aof_analyses_commit_persists_analyses(tmp_path: Path) -> None:
         commit=True,
         batch_size=10,
         limit=10,
+        equity_cache=False,
     )
     assert stats2["hands_submitted"] == 0
 
@@ -27,7 +27,12 @@ from fpdb_3_legacy.coinpoker_hand_builder import (
     _tournament_info,
     build_hands,
 )
-from fpdb_3_legacy.coinpoker_protocol import decode_frame, split_frames
+from fpdb_3_legacy.coinpoker_protocol import (
+    decode_frame,
+    encode_frame,
+    protocol_event_from_object,
+    split_frames,
+)
 from fpdb_3_legacy.Database import Database
 from fpdb_3_legacy.http_capture_hand_builder import (
     CaptureNotImportableError,
@@ -72,6 +77,31 @@ def test_decode_frame_tlv_map_with_string() -> None:
     assert decode_frame(0x80, payload) == {"c": "hi"}
 
 
+def test_frames_split_as_views_decode_like_the_bytes() -> None:
+    message = {"a": 13, "p": {"c": "game.x", "p": {"gameHandId": "9", "data": "x" * 60_000}}}
+    stream = encode_frame(message) + encode_frame(message, compress=True)
+    frames = split_frames(stream)
+
+    assert [type(payload) for _, payload in frames] == [memoryview, memoryview]
+    assert [decode_frame(flags, payload) for flags, payload in frames] == [message, message]
+
+
+def test_decode_frame_checks_the_whole_frame_up_front() -> None:
+    frame = encode_frame({"a": 13, "p": {"c": "game.x", "data": "abcdef"}})
+    with pytest.raises(ValueError, match="past the end"):
+        decode_frame(frame[0], frame[3:-2])
+
+
+def test_protocol_events_carry_plain_data() -> None:
+    frame = encode_frame({"p": {"c": "tour.x", "p": {"gameHandId": "7", "data": {"rank": 3, "seat": {"id": 2}}}}})
+    name, hand_id, data = protocol_event_from_object(decode_frame(frame[0], frame[3:]))
+
+    assert (name, hand_id) == ("tour.x", "7")
+    assert type(data) is dict
+    assert type(data["seat"]) is dict
+    assert json.dumps(data) == '{"rank": 3, "seat": {"id": 2}}'
+
+
 def test_split_frames_reads_length_prefixed_frames() -> None:
     payload = b"\x12\x00\x00"  # empty map
     stream = b"\x80\x00\x03" + payload + b"\x80\x00\x03" + payload
@@ -22,8 +22,10 @@ from fpdb_3_legacy.coinpoker_live_capture import (
     RawEventArchive,
     StreamReassembler,
     _acquire_instance_lock,
+    _build_arg_parser,
     _Conn,
     _ensure_capture_file,
+    _events_from_lines,
     _is_game_port,
     _known_aof_tables,
     _make_equity_coordinator,
@@ -31,6 +33,7 @@ from fpdb_3_legacy.coinpoker_live_capture import (
     _Tee,
     run,
 )
+from fpdb_3_legacy.coinpoker_protocol import encode_frame
 from fpdb_3_legacy.Exceptions import FpdbHandDuplicate
 from fpdb_3_legacy.http_capture_hand_builder import HttpCaptureHandConfig
 
@@ -143,6 +146,17 @@ def test_conn_in_order_yields_frames() -> None:
     assert c.pop_frames() == [(0x80, b"\x12\x00\x00"), (0x80, b"\xaa\xbb")]
 
 
+def test_popped_frames_outlive_the_buffer() -> None:
+    c = _Conn()
+    c.add(100, FRAME_A + FRAME_B[:2])
+    first = c.pop_frames()
+    c.add(106 + 2, FRAME_B[2:] + FRAME_A)
+
+    assert c.pop_frames() == [(0x80, b"\xaa\xbb"), (0x80, b"\x12\x00\x00")]
+    assert first == [(0x80, b"\x12\x00\x00")]
+    assert bytes(c.buf) == b""
+
+
 def test_conn_reorders_out_of_order_segments() -> None:
     c = _Conn()
     c.add(100, FRAME_A)  # baseline; next_seq -> 106
@@ -192,6 +206,16 @@ def test_reassembler_routes_game_port_payload_into_conn() -> None:
     assert "9000->55291" in r.conns
 
 
+def test_text_replay_flushes_the_last_packet() -> None:
+    frame = encode_frame({"p": {"c": "game.hand_start", "p": {"gameHandId": "7", "data": "{}"}}, "a": 13})
+    lines = [
+        f"01:00:00.0 IP6 2606::1.9000 > 2a01::2.55291: Flags [P.], seq 1000:{1000 + len(frame)}, length {len(frame)}",
+        "\t0x0000:  " + frame.hex(),
+    ]
+
+    assert list(_events_from_lines(lines)) == [("game.hand_start", "7", {})]
+
+
 def test_tournament_ports_are_captured() -> None:
     assert _is_game_port(3000)
     assert _is_game_port(3001)
@@ -400,9 +424,10 @@ def test_live_hand_is_notified_before_its_equity_job_is_queued(monkeypatch) -> N
     coordinator.submit_hand.assert_called_once_with(hand, ("decision",), (7,))
 
 
-def test_live_worker_enables_range_and_action_models_without_a_second_service(monkeypatch) -> None:
+def test_live_worker_enables_range_and_action_models_without_a_second_service(monkeypatch, tmp_path) -> None:
     captured = {}
     service = object()
+    engines = []
 
     def coordinator(*args, **kwargs):
         captured["args"] = args
@@ -411,7 +436,7 @@ def test_live_worker_enables_range_and_action_models_without_a_second_service(mo
 
     monkeypatch.setattr(
         "fpdb_3_legacy.coinpoker_live_capture.AsyncEquityService",
-        lambda: service,
+        lambda engine: engines.append(engine) or service,
     )
     monkeypatch.setattr(
         "fpdb_3_legacy.coinpoker_live_capture.KnownCardsAnalysisCoordinator",
@@ -419,14 +444,32 @@ def test_live_worker_enables_range_and_action_models_without_a_second_service(mo
     )
     notify = Mock()
 
-    _make_equity_coordinator(Mock(), notify)
+    _make_equity_coordinator(Mock(dir_database=str(tmp_path)), notify)
 
     assert captured["args"][0] is service
+    # Equities computed by earlier captures and backfills are looked up, not recomputed.
+    assert engines[0]._store.path == str(tmp_path / "equity_cache.sqlite3")
     assert captured["kwargs"]["notify_hand"] is notify.send_hand_id
     assert captured["kwargs"]["population_model"].identifier == "population_observed"
     assert captured["kwargs"]["action_model"].identifier == "population_action_frequency"
 
 
+def test_the_equity_cache_can_be_turned_off(monkeypatch, tmp_path) -> None:
+    engines = []
+    monkeypatch.setattr(
+        "fpdb_3_legacy.coinpoker_live_capture.AsyncEquityService",
+        lambda engine: engines.append(engine) or Mock(),
+    )
+    monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture.KnownCardsAnalysisCoordinator", Mock())
+
+    _make_equity_coordinator(Mock(dir_database=str(tmp_path)), None, equity_cache=False)
+
+    assert engines[0]._store is None
+    assert not (tmp_path / "equity_cache.sqlite3").exists()
+    assert _build_arg_parser().parse_args(["--live", "--no-equity-cache"]).no_equity_cache
+    assert not _build_arg_parser().parse_args(["--live"]).no_equity_cache
+
+
 def test_an_equity_queue_failure_never_marks_a_committed_hand_failed(monkeypatch) -> None:
     db = Mock()
     hand = Mock(players=[(1, "hero", 2)], dbid_hands=42, aof_decisions=(), aof_decision_ids=())
@@ -1016,7 +1059,9 @@ def test_live_run_hydrates_the_new_pump_with_known_aof_tables(monkeypatch) -> No
     monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture._ensure_capture_file", lambda _db: 7)
     monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture._known_aof_tables", lambda _db: {"124115": 2})
     monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture._make_hud_notifier", lambda: None)
-    monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture._make_equity_coordinator", lambda *_args: coordinator)
+    monkeypatch.setattr(
+        "fpdb_3_legacy.coinpoker_live_capture._make_equity_coordinator", lambda *_args, **_kwargs: coordinator
+    )
     monkeypatch.setattr("fpdb_3_legacy.coinpoker_live_capture.HandPump", RecordingPump)
 
     run([], dry_run=False, table_category="PLO4")
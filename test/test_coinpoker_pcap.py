@@ -6,9 +6,14 @@ they run on any platform regardless of libpcap/Npcap being installed.
 
 from __future__ import annotations
 
+import json
 import struct
+from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
+from fpdb_3_legacy.coinpoker_live_capture import _events_from_segments
 from fpdb_3_legacy.coinpoker_pcap import (
     _PCAP_IF_LOOPBACK,
     _PCAP_IF_RUNNING,
@@ -19,7 +24,11 @@ from fpdb_3_legacy.coinpoker_pcap import (
     _windows_route_device_name,
     default_device,
     parse_segment,
+    read_capture_file,
 )
+from fpdb_3_legacy.coinpoker_protocol import encode_frame
+
+FIXTURE = Path(__file__).parent / "data" / "coinpoker_hand_events.json"
 
 _DLT_EN10MB = 1
 _DLT_LINUX_SLL = 113
@@ -66,6 +75,12 @@ def test_vlan_tag_is_skipped() -> None:
     assert parse_segment(pkt, _DLT_EN10MB) == (9000, 2, 8, b"y")
 
 
+def test_ethernet_padding_is_not_payload() -> None:
+    # A bare ACK is padded to Ethernet's 60-byte minimum; the IP length ends it.
+    pkt = _eth(0x0800, _ipv4(6, _tcp(9000, 1, 5, b""))) + b"\x00" * 6
+    assert parse_segment(pkt, _DLT_EN10MB) == (9000, 1, 5, b"")
+
+
 def test_non_tcp_returns_none() -> None:
     pkt = _eth(0x86DD, _ipv6(17, b"\x00" * 8))  # next header 17 = UDP
     assert parse_segment(pkt, _DLT_EN10MB) is None
@@ -154,3 +169,85 @@ def test_is_virtual_device_by_unix_name_prefix() -> None:
     assert _is_virtual_device("docker0", "")
     assert _is_virtual_device("utun3", "")
     assert not _is_virtual_device("en0", "Ethernet")
+
+
+# --- capture files read without libpcap ---------------------------------------
+
+
+def _pcap(packets: list[bytes], dlt: int = _DLT_EN10MB, byte_order: str = "<") -> bytes:
+    header = struct.pack(byte_order + "IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, dlt)
+    return header + b"".join(struct.pack(byte_order + "IIII", 0, 0, len(p), len(p)) + p for p in packets)
+
+
+def _block(block_type: int, body: bytes) -> bytes:
+    body += b"\x00" * (-len(body) % 4)
+    return struct.pack("<II", block_type, 12 + len(body)) + body + struct.pack("<I", 12 + len(body))
+
+
+def _pcapng_section(packets: list[bytes], dlt: int = _DLT_EN10MB) -> bytes:
+    blocks = [_block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)), _block(1, struct.pack("<HHI", dlt, 0, 0))]
+    for n, packet in enumerate(packets):
+        if n % 2:
+            blocks.append(_block(3, struct.pack("<I", len(packet)) + packet))
+        else:
+            blocks.append(_block(6, struct.pack("<IIIII", 0, 0, 0, len(packet), len(packet)) + packet))
+    return b"".join(blocks)
+
+
+def _segments(count: int) -> list[bytes]:
+    return [_eth(0x86DD, _ipv6(6, _tcp(9000, 55291, 1000 + n, bytes([n]) * (n + 1)))) for n in range(count)]
+
+
+def _read(path: Path) -> list[tuple]:
+    return [(sport, dport, seq, bytes(payload)) for sport, dport, seq, payload in read_capture_file(str(path))]
+
+
+EXPECTED = [(9000, 55291, 1000 + n, bytes([n]) * (n + 1)) for n in range(5)]
+
+
+@pytest.mark.parametrize("byte_order", ["<", ">"])
+def test_pcap_files_are_read_in_either_byte_order(tmp_path, byte_order: str) -> None:
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(_pcap(_segments(5), byte_order=byte_order))
+    assert _read(path) == EXPECTED
+
+
+def test_pcapng_sections_restart_their_interfaces(tmp_path) -> None:
+    # The second section's only interface is Linux cooked capture.
+    cooked = [b"\x00" * 16 + _ipv6(6, _tcp(9000, 55291, 7, b"z"))]
+    path = tmp_path / "capture.pcapng"
+    path.write_bytes(_pcapng_section(_segments(5)) + _pcapng_section(cooked, dlt=_DLT_LINUX_SLL))
+    assert _read(path) == [*EXPECTED, (9000, 55291, 7, b"z")]
+
+
+def test_a_truncated_last_record_ends_the_file(tmp_path) -> None:
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(_pcap(_segments(5))[:-3])
+    assert _read(path) == EXPECTED[:4]
+
+
+def test_other_files_are_refused(tmp_path) -> None:
+    path = tmp_path / "capture.txt"
+    path.write_text("01:00:00.0 IP6 2606::1.9000 > 2a01::2.55291")
+    with pytest.raises(ValueError, match="neither a pcap nor a pcapng"):
+        list(read_capture_file(str(path)))
+
+
+def test_a_capture_file_replays_to_the_events_it_carried(tmp_path) -> None:
+    events = [tuple(event) for event in json.loads(FIXTURE.read_text())]
+    stream = b"".join(
+        encode_frame(
+            {"p": {"p": {"gameHandId": hand_id, "data": json.dumps(data)}, "c": name}, "a": 13},
+            compress=n % 3 == 0,
+        )
+        for n, (name, hand_id, data) in enumerate(events)
+    )
+    # Segments of 1400 bytes, the last two swapped and one retransmitted.
+    chunks = [stream[start : start + 1400] for start in range(0, len(stream), 1400)]
+    seqs = [5000 + 1400 * n for n in range(len(chunks))]
+    order = [*range(len(chunks) - 2), len(chunks) - 1, len(chunks) - 2, 0]
+    packets = [_eth(0x0800, _ipv4(6, _tcp(9000, 55291, seqs[n], chunks[n]))) for n in order]
+    path = tmp_path / "capture.pcap"
+    path.write_bytes(_pcap(packets))
+
+    assert list(_events_from_segments(read_capture_file(str(path)))) == events
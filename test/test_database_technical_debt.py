@@ -4,7 +4,12 @@ import inspect
 from datetime import datetime
 from types import SimpleNamespace
 
+import psycopg
+import pytest
+
 import fpdb_3_legacy.Database as Database
+from fpdb_3_legacy.hud_session import SessionAccumulator
+from fpdb_3_legacy.SQL import Sql
 
 
 def _player_stats(position):
@@ -54,46 +59,141 @@ def test_get_stats_from_hand_no_longer_exposes_builtin_type_parameter():
     assert "game_type" in signature.parameters
 
 
-def test_next_hand_id_serializes_postgresql_allocations():
+def _pg_allocator(sequence_values, max_id):
     class Cursor:
         def __init__(self):
             self.calls = []
+            self.result = None
 
-        def execute(self, query):
+        def execute(self, query, params=None):
             self.calls.append(query)
+            if "max(id)" in query and "nextval" not in query:
+                self.result = max_id
+            else:
+                self.result = next(sequence_values)
 
         def fetchone(self):
-            return (41,)
+            return (self.result,)
 
     cursor = Cursor()
     db = Database.Database.__new__(Database.Database)
     db.backend = db.PGSQL
     db.hand_inc = 1
+    db.sql = SimpleNamespace(
+        query={
+            "nextHandIdBlock": "SELECT nextval('handidblocks')",
+            "skipHandIdBlocks": "SELECT max(nextval('handidblocks')) FROM generate_series(1, %s)",
+        },
+    )
+    db._hand_id_next = db._hand_id_end = 0
+    db.get_cursor = lambda _connect=False: cursor
+    return db, cursor
+
+
+def test_next_hand_id_hands_out_a_postgresql_block_without_a_lock():
+    db, cursor = _pg_allocator(iter([1001, 2001]), 1000)
+
+    first = db.nextHandId()
+    assert first == 1001
+    assert db.nextHandId() == 1001  # not taken yet
+    ids = [first]
+    for _ in range(Database.HAND_ID_BLOCK):
+        ids.append(db.nextHandId(ids[-1]))
+
+    assert ids[: Database.HAND_ID_BLOCK] == list(range(1001, 1001 + Database.HAND_ID_BLOCK))
+    assert ids[-1] == 2001
+    assert not any("pg_advisory" in call for call in cursor.calls)
+    assert sum("nextval" in call for call in cursor.calls) == 2
+
+
+def test_next_hand_id_skips_blocks_the_table_is_already_past():
+    # Hands copied in by a migration: the sequence is behind max(id).
+    db, cursor = _pg_allocator(iter([1, 5001]), 4500)
+
+    assert db.nextHandId() == 5001
+    assert "generate_series" in cursor.calls[-1]
+
+
+def test_hand_id_blocks_are_owned_by_no_column() -> None:
+    queries = Sql(db_server="postgresql").query
+
+    assert "OWNED BY" not in queries["createHandIdBlocks"]
+    assert queries["dropHandIdBlocks"] == "DROP SEQUENCE IF EXISTS HandIdBlocks"
+
+
+def _pg_schema_db(cursor):
+    db = Database.Database.__new__(Database.Database)
+    db.backend = db.PGSQL
+    db.sql = Sql(db_server="postgresql")
     db.get_cursor = lambda _connect=False: cursor
+    db.rolled_back = False
+    db.rollback = lambda: setattr(db, "rolled_back", True)
+    return db
+
+
+def test_hand_id_blocks_wait_for_the_hands_table_on_first_setup():
+    def execute(query):
+        if "max(id)" in query:
+            raise psycopg.errors.UndefinedTable("relation hands does not exist")
+
+    db = _pg_schema_db(SimpleNamespace(execute=execute, fetchone=lambda: (None,)))
+
+    db.ensure_hand_id_blocks()
+
+    assert db.rolled_back
+
+
+def test_hand_id_blocks_setup_does_not_swallow_non_database_errors():
+    def execute(query):
+        raise RuntimeError("bug")
+
+    db = _pg_schema_db(SimpleNamespace(execute=execute, fetchone=lambda: (None,)))
+
+    with pytest.raises(RuntimeError):
+        db.ensure_hand_id_blocks()
+
+
+def test_next_hand_id_continues_from_max_id_on_sqlite():
+    class Cursor:
+        def execute(self, query):
+            assert query == "SELECT max(id) FROM Hands"
+
+        def fetchone(self):
+            return (41,)
+
+    db = Database.Database.__new__(Database.Database)
+    db.backend = db.SQLITE
+    db.hand_inc = 1
+    db.get_cursor = lambda _connect=False: Cursor()
 
     assert db.nextHandId() == 42
-    assert "pg_advisory_xact_lock" in cursor.calls[0]
-    assert cursor.calls[1] == "SELECT max(id) FROM Hands"
+    assert db.nextHandId(42) == 43
 
 
 def test_session_stats_are_not_truncated_after_ten_thousand_rows():
     class Cursor:
-        description = [("player_id",), ("vpip",)]
+        description = None
 
         def __init__(self):
-            self.rows = iter([(1, 1)] * 10_001)
+            self.rows = []
 
-        def execute(self, _query, _subs):
-            return None
+        def execute(self, query, _subs):
+            if query.startswith("SELECT h.id, hp.playerId"):  # the hand's players
+                self.rows = [(123, 1, 1, "villain", 6, "table")]
+            else:
+                self.description = [("player_id",), ("hand_id",), ("seats",), ("n",), ("vpip",)]
+                self.rows = [(1, 100 + i, 6, 1, 1) for i in range(10_001)]
 
-        def fetchone(self):
-            return next(self.rows, None)
+        def fetchall(self):
+            rows, self.rows = self.rows, []
+            return rows
 
     cursor = Cursor()
     db = Database.Database.__new__(Database.Database)
-    db.sql = SimpleNamespace(query={"get_stats_from_hand_session": "SELECT session stats"})
+    db.sql = SimpleNamespace(query={"get_stats_from_hand_session": "SELECT session stats", "placeholder": "?"})
     db.db_server = "sqlite"
-    db.hand_1day_ago = "2026-07-15"
+    db.hand_1day_ago = 1
+    db._session_stats = SessionAccumulator()
     db.get_cursor = lambda: cursor
     stat_dict = {}
 
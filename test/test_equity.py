@@ -15,6 +15,7 @@ from fpdb_3_legacy.equity import (
     expected_pot_share,
     load_poker_eval,
 )
+from fpdb_3_legacy.equity_store import EquityResultStore, open_store
 from fpdb_3_legacy.HandDataReporter import HandDataReporter
 
 
@@ -197,6 +198,43 @@ def test_equity_engine_cache_is_bounded() -> None:
     assert len(backend.calls) == 3
 
 
+def test_a_result_in_the_equity_store_is_not_computed_by_another_engine(tmp_path) -> None:
+    path = str(tmp_path / "equity_cache.sqlite3")
+    arguments = ("omaha", ["As", "Ks", "Qh", "Jh"], ["Ts", "9s", "2d"])
+    first_backend, second_backend = RecordingPokerEval(), RecordingPokerEval()
+
+    first = EquityEngine(first_backend, store=open_store(path)).evaluate_uniform_unknown(*arguments, iterations=100)
+    # A second process: its own engine, its own connection to the same file.
+    engine = EquityEngine(second_backend, store=open_store(path))
+    second = engine.evaluate_uniform_unknown(*arguments, iterations=100)
+    engine.evaluate_uniform_unknown(*arguments, iterations=100)
+
+    assert second == first
+    assert second_backend.calls == []
+    assert engine.cache_lookups == {"store": 1, "memory": 1, "computed": 0}
+
+
+def test_the_equity_store_evicts_the_least_recently_used_results(tmp_path) -> None:
+    store = EquityResultStore(str(tmp_path / "equity_cache.sqlite3"), max_entries=2)
+    engine = EquityEngine(RecordingPokerEval(), cache_size=0, store=store)
+    arguments = ("omaha", ["As", "Ks", "Qh", "Jh"], ["Ts", "9s", "2d"])
+    for iterations in (100, 200, 300):
+        engine.evaluate_uniform_unknown(*arguments, iterations=iterations)
+
+    store._evict()
+
+    assert len(store) == 2
+    engine.evaluate_uniform_unknown(*arguments, iterations=100)
+    assert engine.cache_lookups["computed"] == 4
+    assert store.lookups == {"hits": 0, "misses": 4}
+
+
+def test_an_unopenable_equity_store_leaves_equity_in_memory(tmp_path) -> None:
+    (tmp_path / "file").write_text("not a directory", encoding="utf-8")
+
+    assert open_store(str(tmp_path / "file" / "equity_cache.sqlite3")) is None
+
+
 def test_equity_engine_reports_a_missing_backend_only_once(monkeypatch) -> None:
     loads = []
     warnings = []
@@ -231,6 +269,72 @@ def test_equity_engine_apportions_a_weighted_range_before_native_calls() -> None
     assert sorted(call["iterations"] for call in backend.calls) == [10, 30]
 
 
+PARALLEL_RANGE = [
+    WeightedPocket(("Ah", "Ad", "7c", "6c"), Decimal(1)),
+    WeightedPocket(("Tc", "Td", "8c", "8d"), Decimal(3)),
+    WeightedPocket(("2h", "2s", "3h", "3s"), Decimal(2)),
+    WeightedPocket(("4c", "4d", "5c", "5d"), Decimal(5)),
+]
+
+
+def _weighted_omaha(engine: EquityEngine):
+    return engine.evaluate_weighted_range(
+        "omaha",
+        ["As", "Ks", "Qh", "Jh"],
+        [PARALLEL_RANGE],
+        ["9c", "9d", "6h"],
+        iterations=4_400,
+        seed=7,
+    )
+
+
+def test_worker_processes_give_the_sequential_result() -> None:
+    sequential = _weighted_omaha(EquityEngine(RecordingPokerEval()))
+    backend = RecordingPokerEval()
+    engine = EquityEngine(backend, max_workers=2)
+    try:
+        parallel = _weighted_omaha(engine)
+    finally:
+        engine.close()
+
+    assert parallel == sequential
+    # Every native call ran in a worker process, on its own copy of the backend.
+    assert backend.calls == []
+
+
+def test_equity_falls_back_to_this_process_when_workers_cannot_start(monkeypatch) -> None:
+    def broken_pool(**_kwargs):
+        raise OSError("no processes")
+
+    monkeypatch.setattr(equity_module, "ProcessPoolExecutor", broken_pool)
+    backend = RecordingPokerEval()
+    engine = EquityEngine(backend, max_workers=4)
+
+    assert _weighted_omaha(engine) == _weighted_omaha(EquityEngine(RecordingPokerEval()))
+    assert len(backend.calls) == len(PARALLEL_RANGE)
+
+
+def test_worker_processes_are_spawned_not_forked(monkeypatch) -> None:
+    # Forking a process with other threads copies the locks they hold.
+    pools = []
+    monkeypatch.setattr(
+        equity_module, "ProcessPoolExecutor", lambda **kwargs: pools.append(kwargs) or SimpleNamespace()
+    )
+
+    EquityEngine(RecordingPokerEval(), max_workers=2)._worker_pool()
+
+    assert pools[0]["mp_context"].get_start_method() == "spawn"
+
+
+def test_matchups_are_split_in_order_into_balanced_runs() -> None:
+    matchups = [(i, ((f"p{i}",),), count) for i, count in enumerate([400, 100, 100, 200, 100, 100])]
+
+    chunks = equity_module._split_matchups(matchups, 2)
+
+    assert [[seed for seed, _pockets, _count in chunk] for chunk in chunks] == [[0, 1], [2, 3, 4, 5]]
+    assert [m for chunk in equity_module._split_matchups(matchups, 8) for m in chunk] == matchups
+
+
 def test_equity_engine_removes_blocked_range_pockets_and_rejects_impossible_ranges() -> None:
     backend = RecordingPokerEval()
     engine = EquityEngine(backend)
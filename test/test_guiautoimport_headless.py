@@ -45,7 +45,10 @@ def _make_gui(settings, config):
     from fpdb_3_legacy import GuiAutoImport
 
     with patch.object(GuiAutoImport.Importer, "Importer", return_value=MagicMock()):
-        return GuiAutoImport.GuiAutoImport(settings, config, cli=True)
+        gui = GuiAutoImport.GuiAutoImport(settings, config, cli=True)
+    # No file watcher, as on a platform without inotify: the loop polls.
+    gui.importer.watcher = None
+    return gui
 
 
 def test_cli_constructor_does_not_raise():
@@ -100,6 +103,24 @@ def test_run_headless_imports_then_shuts_down_cleanly():
     lock.release.assert_called_once()
 
 
+def test_run_headless_waits_on_the_file_watcher_instead_of_sleeping():
+    """With a watcher the loop wakes on the next file change, at the interval at the latest."""
+    lock = MagicMock()
+    lock.acquire.return_value = True
+    gui = _make_gui(_make_settings(lock), _make_config(interval=7))
+    gui.updatePaths = MagicMock()
+    gui.importer.watcher = MagicMock()
+    gui.importer.waitForChanges.side_effect = KeyboardInterrupt
+
+    with patch.object(sys.modules["fpdb_3_legacy.GuiAutoImport"].time, "sleep") as sleep:
+        rc = gui.run_headless(launch_hud=False)
+
+    assert rc == 0
+    gui.importer.runUpdated.assert_called_once()
+    gui.importer.waitForChanges.assert_called_once_with(7)
+    sleep.assert_not_called()
+
+
 def test_run_headless_survives_a_failing_cycle():
     """One failing import cycle must not kill the loop or leak the lock."""
     lock = MagicMock()
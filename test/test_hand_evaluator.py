@@ -0,0 +1,201 @@
+"""The table evaluator against a plain ranker and, when it is installed, pypoker-eval."""
+
+from __future__ import annotations
+
+import itertools
+import random
+import subprocess
+import sys
+from collections import Counter
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from fpdb_3_legacy import hand_evaluator
+from fpdb_3_legacy.equity import calculate_equity, load_equity_backend, load_poker_eval
+from fpdb_3_legacy.hand_evaluator import (
+    DECK,
+    FULL_HOUSE,
+    STRAIGHT,
+    STRAIGHT_FLUSH,
+    TablePokerEval,
+    card_index,
+    evaluate,
+    evaluate_cards,
+    hand_category,
+)
+
+_RANK_VALUE = {rank: value for value, rank in enumerate("23456789TJQKA", start=2)}
+
+
+def rank_five(cards) -> tuple:
+    """The replayer's former ranker: sort the ranks by count, then by value."""
+    values = sorted((_RANK_VALUE[card[0]] for card in cards), reverse=True)
+    counts = Counter(values)
+    by_count = sorted(values, key=lambda value: (counts[value], value), reverse=True)
+    flush = len({card[1] for card in cards}) == 1
+    distinct = sorted(set(values), reverse=True)
+    straight = 5 if {14, 5, 4, 3, 2} <= set(values) else 0
+    if len(distinct) == 5 and distinct[0] - distinct[4] == 4:
+        straight = distinct[0]
+    shape = sorted(counts.values(), reverse=True)
+    category = {(4, 1): 7, (3, 2): 6, (3, 1, 1): 3, (2, 2, 1): 2, (2, 1, 1, 1): 1}.get(tuple(shape), 0)
+    if flush and straight:
+        return (8, [straight])
+    if category in (6, 7):
+        return (category, by_count)
+    if flush:
+        return (5, by_count)
+    if straight:
+        return (4, [straight])
+    return (category, by_count)
+
+
+def reference(cards) -> tuple:
+    return max(rank_five(five) for five in itertools.combinations(cards, 5))
+
+
+def deals(seed: int, count: int, size: int) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [rng.sample(DECK, size) for _ in range(count)]
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_values_order_hands_as_the_plain_ranker_does(size: int) -> None:
+    hands = deals(size, 1500, size)
+    ranked = [(reference(cards), evaluate_cards(cards)) for cards in hands]
+
+    for (first, first_value), (second, second_value) in itertools.pairwise(ranked):
+        assert hand_category(first_value) == first[0]
+        assert (first > second) - (first < second) == (first_value > second_value) - (first_value < second_value)
+
+
+def test_the_rare_hands_rank_in_order() -> None:
+    royal = evaluate_cards(["As", "Ks", "Qs", "Js", "Ts", "2c", "2d"])
+    wheel_flush = evaluate_cards(["5h", "4h", "3h", "2h", "Ah", "Ad", "Ac"])
+    quads = evaluate_cards(["9c", "9d", "9h", "9s", "Kd"])
+    boat_over_flush = evaluate_cards(["Kh", "Kd", "Kc", "2h", "2c", "7h", "9h"])
+    wheel = evaluate_cards(["Ad", "2c", "3h", "4s", "5d"])
+
+    assert royal > wheel_flush > quads > boat_over_flush
+    assert hand_category(wheel_flush) == STRAIGHT_FLUSH
+    assert hand_category(boat_over_flush) == FULL_HOUSE
+    assert hand_category(wheel) == STRAIGHT
+    assert wheel < evaluate_cards(["2d", "3c", "4h", "5s", "6d"])
+
+
+def test_the_batched_values_match_one_hand_at_a_time() -> None:
+    hands = deals(11, 2000, 7)
+    indices = np.array([[card_index(card) for card in cards] for cards in hands])
+
+    assert evaluate(indices).tolist() == [evaluate_cards(cards) for cards in hands]
+    assert evaluate(indices[:, :5]).tolist() == [evaluate_cards(cards[:5]) for cards in hands]
+
+
+def test_card_names_are_checked() -> None:
+    assert card_index("as") == card_index("As")
+    with pytest.raises(ValueError, match="Invalid card"):
+        card_index("1s")
+
+
+def test_the_tables_are_kept_on_disk_and_rebuilt_when_stale(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "tables" / hand_evaluator.EVALUATOR_TABLES_FILE)
+    built = hand_evaluator.build_tables()
+    hand_evaluator._write_tables(path, built)
+
+    monkeypatch.setattr(hand_evaluator, "_tables", None)
+    monkeypatch.setattr(hand_evaluator, "build_tables", lambda: pytest.fail("read from disk"))
+    assert np.array_equal(hand_evaluator.load_tables(path).unsuited_values, built.unsuited_values)
+
+    monkeypatch.setattr(hand_evaluator, "TABLES_VERSION", hand_evaluator.TABLES_VERSION + 1)
+    assert hand_evaluator._read_tables(path) is None
+
+
+def test_exhaustive_equity_counts_every_river() -> None:
+    result = calculate_equity(
+        "holdem", [["As", "Ah"], ["Kd", "Kc"]], ["2s", "7d", "9c", "Ks"], backend=TablePokerEval()
+    )
+
+    assert result.samples == 44
+    # Set of kings on the turn: only the two aces left in the deck save the aces.
+    assert [player.wins for player in result.players] == [2, 42]
+    assert result.players[0].equity == Decimal(round(1000 * 2 / 44)) / 1000
+
+
+def test_omaha_plays_exactly_two_hole_cards() -> None:
+    # Four spades on board: the lone spade in the first pocket makes no flush.
+    result = calculate_equity(
+        "omaha",
+        [["As", "Kd", "Qc", "2h"], ["Ac", "Kh", "Jd", "Js"]],
+        ["2s", "5s", "8s", "Ts", "3d"],
+        backend=TablePokerEval(),
+    )
+
+    assert [player.wins for player in result.players] == [0, 1]
+
+
+def test_omaha_values_are_the_best_of_two_hole_and_three_board_cards() -> None:
+    hands = deals(5, 300, 9)
+    holes = np.array([[card_index(card) for card in cards[:4]] for cards in hands])
+    boards = np.array([[card_index(card) for card in cards[4:]] for cards in hands])
+
+    assert TablePokerEval._best("omaha", holes, boards).tolist() == [
+        max(
+            evaluate_cards([*pair, *three])
+            for pair in itertools.combinations(cards[:4], 2)
+            for three in itertools.combinations(cards[4:], 3)
+        )
+        for cards in hands
+    ]
+
+
+def test_monte_carlo_deals_unknown_pockets_and_is_seeded() -> None:
+    def equity(seed: int) -> Decimal:
+        result = TablePokerEval(seed).poker_eval(
+            game="holdem", pockets=[["Ah", "Ad"], ["__", "__"]], board=[], dead=[], iterations=20_000
+        )
+        return result["eval"][0]["ev"]
+
+    assert equity(3) == equity(3)
+    # Aces win about 85% against a random hand.
+    assert 835 <= equity(3) <= 865
+
+
+def test_unsupported_games_are_refused() -> None:
+    with pytest.raises(ValueError, match="does not rank"):
+        TablePokerEval().poker_eval(game="holdem8", pockets=[["As", "Ah"], ["Kd", "Kc"]], board=[], dead=[])
+
+
+def test_the_fallback_backend_is_always_available() -> None:
+    assert hasattr(load_equity_backend(), "poker_eval")
+
+
+def test_numpy_loads_only_for_the_fallback(monkeypatch) -> None:
+    imported = subprocess.run(
+        [sys.executable, "-c", "import sys, fpdb_3_legacy.equity; print('numpy' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    monkeypatch.setattr("fpdb_3_legacy.equity.load_poker_eval", lambda: None)
+
+    assert imported.stdout.strip() == "False"
+    assert isinstance(load_equity_backend(), TablePokerEval)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_equities_match_pypoker_eval_on_random_deals(seed: int) -> None:
+    native = load_poker_eval()
+    if native is None:
+        pytest.skip("pypoker-eval is not installed")
+    rng = random.Random(seed)
+    for game, pocket_size in (("holdem", 2), ("omaha", 4)):
+        for board_size in (3, 4, 5):
+            cards = rng.sample(DECK, 2 * pocket_size + board_size)
+            pockets = [cards[:pocket_size], cards[pocket_size : 2 * pocket_size]]
+            board = cards[2 * pocket_size :]
+            ours = calculate_equity(game, pockets, board, backend=TablePokerEval())
+            theirs = calculate_equity(game, pockets, board, backend=native)
+
+            assert ours == theirs, (game, pockets, board)
@@ -0,0 +1,141 @@
+"""The raw capture archive: buffered blocks, compression, the offset index and streaming reads."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+
+import pytest
+
+from fpdb_3_legacy import http_capture_archive
+from fpdb_3_legacy.http_capture_archive import JsonlRawCaptureArchive, index_path, iter_raw_capture_records
+from fpdb_3_legacy.http_capture_models import RawCaptureMessage
+
+
+def _message(n: int, *, hand: int | None = None) -> RawCaptureMessage:
+    return RawCaptureMessage(
+        site="SealsWithClubs",
+        transport="websocket",
+        message_type="GameState",
+        hand_id=hand if hand is not None else 100 + n // 10,
+        captured_at=f"2026-06-28T10:{n // 60:02d}:{n % 60:02d}Z",
+        payload={"n": n, "pad": "x" * 200},
+    )
+
+
+def _archive(tmp_path, count: int, **options) -> JsonlRawCaptureArchive:
+    archive = JsonlRawCaptureArchive(tmp_path, flush_interval=60, **options)
+    for n in range(count):
+        archive.append(_message(n))
+    archive.close()
+    return archive
+
+
+def test_messages_are_written_in_blocks_of_the_configured_size(tmp_path) -> None:
+    first = _message(0)
+    first.sequence = 1
+    line = len(json.dumps(first.to_dict())) + 1
+    archive = JsonlRawCaptureArchive(tmp_path, flush_interval=60, flush_bytes=4 * line)
+
+    for n in range(3):
+        archive.append(_message(n))
+    assert not archive.path.exists()
+    archive.append(_message(3))
+    assert len(archive.path.read_text(encoding="utf-8").splitlines()) == 4
+    archive.append(_message(4))
+    archive.close()
+
+    assert [record["sequence"] for record in iter_raw_capture_records(archive.path)] == [1, 2, 3, 4, 5]
+    assert [entry["sequence"] for entry in map(json.loads, index_path(archive.path).open())] == [1, 5]
+
+
+def test_a_quiet_capture_is_flushed_after_the_interval(tmp_path) -> None:
+    archive = JsonlRawCaptureArchive(tmp_path, flush_interval=0.05)
+    archive.append(_message(0))
+
+    deadline = time.monotonic() + 5
+    while not archive.path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [record["payload"]["n"] for record in iter_raw_capture_records(archive.path)] == [0]
+    archive.close()
+
+
+def test_gzip_blocks_read_as_one_stream(tmp_path) -> None:
+    archive = _archive(tmp_path, 50, compression="gzip", flush_bytes=2000)
+
+    assert archive.path.name == "raw_messages.jsonl.gz"
+    with gzip.open(archive.path, "rt", encoding="utf-8") as handle:
+        assert len(handle.readlines()) == 50
+    entries = [json.loads(line) for line in index_path(archive.path).open()]
+    assert len(entries) > 5
+    with archive.path.open("rb") as raw:
+        for entry in entries:
+            raw.seek(entry["offset"])
+            assert raw.read(2) == b"\x1f\x8b"
+    assert [record["payload"]["n"] for record in iter_raw_capture_records(archive.path)] == list(range(50))
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_replay_starts_at_a_timestamp_or_a_hand(tmp_path, compression) -> None:
+    archive = _archive(tmp_path, 120, compression=compression, flush_bytes=2000)
+
+    since = [record["payload"]["n"] for record in iter_raw_capture_records(archive.path, since="2026-06-28T10:01:15Z")]
+    from_hand = [record["payload"]["n"] for record in iter_raw_capture_records(archive.path, hand_id="107")]
+
+    assert since == list(range(75, 120))
+    assert from_hand == list(range(70, 120))
+    # Without the index the same records come back from a full scan.
+    index_path(archive.path).unlink()
+    assert [record["payload"]["n"] for record in iter_raw_capture_records(archive.path, hand_id=107)] == from_hand
+
+
+def test_the_index_skips_the_blocks_before_the_start(tmp_path, monkeypatch) -> None:
+    archive = _archive(tmp_path, 120, compression="gzip", flush_bytes=2000)
+    open_records = http_capture_archive._open_records
+    read = []
+
+    def counting(raw, magic):
+        for line in open_records(raw, magic):
+            read.append(line)
+            yield line
+
+    monkeypatch.setattr(http_capture_archive, "_open_records", counting)
+    records = list(iter_raw_capture_records(archive.path, hand_id="111"))
+
+    assert records[0]["hand_id"] == 111
+    assert len(read) < 20
+
+
+def test_a_later_session_appends_blocks_and_index_lines(tmp_path) -> None:
+    _archive(tmp_path, 10, compression="gzip")
+    archive = _archive(tmp_path, 10, compression="gzip")
+
+    assert len(index_path(archive.path).read_text(encoding="utf-8").splitlines()) == 2
+    assert len(list(iter_raw_capture_records(archive.path))) == 20
+
+
+def test_a_truncated_gzip_tail_yields_the_complete_blocks(tmp_path) -> None:
+    archive = _archive(tmp_path, 30, compression="gzip", flush_bytes=2000)
+    data = archive.path.read_bytes()
+    archive.path.write_bytes(data[:-10])
+
+    payloads = [record["payload"]["n"] for record in iter_raw_capture_records(archive.path)]
+
+    assert payloads == list(range(len(payloads)))
+    assert 0 < len(payloads) < 30
+
+
+def test_zstd_blocks_read_back(tmp_path) -> None:
+    pytest.importorskip("zstandard")
+    archive = _archive(tmp_path, 40, compression="zstd", flush_bytes=2000)
+
+    assert archive.path.name == "raw_messages.jsonl.zst"
+    assert [record["payload"]["n"] for record in iter_raw_capture_records(archive.path, hand_id=102)] == list(
+        range(20, 40)
+    )
+
+
+def test_unknown_compression_is_refused(tmp_path) -> None:
+    with pytest.raises(ValueError, match="unknown capture archive compression"):
+        JsonlRawCaptureArchive(tmp_path, compression="lz4")
@@ -1361,6 +1361,7 @@ def test_raw_and_hand_archives_write_json(tmp_path):
         )
     )
     assert raw_ref == "raw_messages.jsonl:1"
+    raw_archive.close()
 
     raw_line = (tmp_path / "raw_messages.jsonl").read_text(encoding="utf-8").strip()
     raw_data = json.loads(raw_line)
@@ -1724,6 +1725,7 @@ def test_replay_swc_raw_archive_writes_normalized_hand(tmp_path):
                 payload=_socketio_frame(state),
             )
         )
+    raw_archive.close()
 
     written = replay_swc_raw_archive(tmp_path / "raw_messages.jsonl", tmp_path / "normalized")
 
@@ -1751,6 +1753,7 @@ def test_generic_replay_uses_record_site_adapter(tmp_path):
             payload=_socketio_frame(final_state),
         )
     )
+    raw_archive.close()
 
     written = replay_raw_archive(tmp_path / "raw_messages.jsonl", tmp_path / "normalized", include_active=True)
 
@@ -1783,6 +1786,7 @@ def test_analyze_raw_archive_summarizes_sites_games_and_hands(tmp_path):
             direction="sent",
         )
     )
+    raw_archive.close()
 
     summary = analyze_raw_archive(tmp_path / "raw_messages.jsonl")
 
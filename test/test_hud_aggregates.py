@@ -0,0 +1,246 @@
+"""In-memory HUD aggregates, moved forward by the HudCache rows the importer sends."""
+
+from __future__ import annotations
+
+import json
+import re
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from fpdb_3_legacy.coinpoker_hand_builder import build_hands
+from fpdb_3_legacy.Database import Database
+from fpdb_3_legacy.http_capture_hand_builder import HttpCaptureHandConfig, build_fpdb_hand, import_fpdb_hand
+from fpdb_3_legacy.hud_aggregates import (
+    HUDCACHE_COLUMNS,
+    AggregateColumn,
+    HudAggregateStore,
+    HudCacheDelta,
+    HudMessage,
+    aggregate_plan,
+    decode_hud_message,
+    encode_hud_message,
+)
+from fpdb_3_legacy.SQL import Sql
+
+FIXTURE = Path(__file__).parent / "data" / "coinpoker_aof_hand_events.json"
+
+HUD_PARAMS = {
+    "stat_range": "A",
+    "agg_bb_mult": 1000,
+    "seats_style": "A",
+    "seats_cust_nums_low": 1,
+    "seats_cust_nums_high": 10,
+    "h_stat_range": "A",
+    "h_agg_bb_mult": 1000,
+    "h_seats_style": "A",
+    "h_seats_cust_nums_low": 1,
+    "h_seats_cust_nums_high": 10,
+}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _config() -> MagicMock:
+    config = MagicMock()
+    config.get_db_parameters.return_value = {
+        "db-backend": 4,
+        "db-server": "sqlite",
+        "db-databaseName": ":memory:",
+        "db-user": "",
+        "db-password": "",
+        "db-host": "",
+        "db-port": "",
+        "db-path": "",
+    }
+    config.get_import_parameters.return_value = {
+        "saveActions": True,
+        "callFpdbHud": True,
+        "cacheSessions": False,
+        "publicDB": False,
+        "fastStoreHudCache": False,
+        "sessionTimeout": 30,
+        "importFilters": [],
+        "hhBulkPath": "",
+    }
+    config.get_general_params.return_value = {}
+    config.get_site_id.return_value = 30
+    return config
+
+
+def _hand(site_hand_offset: int = 0):
+    raw = json.loads(FIXTURE.read_text())
+    (hand_data,) = build_hands([tuple(raw["join"]), *[tuple(event) for event in raw["hand"]]], "PLO4")
+    hand = build_fpdb_hand(hand_data, config=HttpCaptureHandConfig(site_ids={"CoinPoker": 30, "default": 30}))
+    hand.handid = str(int(hand.handid) + site_hand_offset)
+    hand.callHud = True
+    return hand
+
+
+def _import(db: Database, hand_id: int) -> list:
+    """Import one copy of the fixture hand and return the HudCache rows it added."""
+    added = []
+    store = db.storeHudCache
+
+    def _store(*args, **kwargs):
+        rows = store(*args, **kwargs)
+        added.extend(rows)
+        return rows
+
+    db.storeHudCache = _store
+    db.resetBulkCache()
+    import_fpdb_hand(_hand(hand_id), db, file_id=1, starting_hand_id=hand_id)
+    del db.storeHudCache
+    return added
+
+
+def _database() -> Database:
+    db = Database(_config(), Sql(db_server="sqlite"))
+    db.init_hud_stat_vars(30, 30)
+    return db
+
+
+def _stats(db: Database, hand_id: int) -> dict:
+    return db.get_stats_from_hand(hand_id, "ring", HUD_PARAMS, hero_id=-1, num_seats=3)
+
+
+def _aggregate_reads(db: Database, run) -> int:
+    statements: list[str] = []
+    db.connection.set_trace_callback(statements.append)
+    try:
+        run()
+    finally:
+        db.connection.set_trace_callback(None)
+    return sum("JOIN HudCache hc" in statement for statement in statements)
+
+
+def test_the_plan_follows_every_column_of_the_hud_query() -> None:
+    db = _database()
+    sql_text = db._inject_hud_chipev_columns(db.sql.query["get_stats_from_hand_aggregated"])
+
+    plan = aggregate_plan(db._hud_chipev_columns)
+
+    assert plan is not None
+    selected = {alias.lower() for alias in re.findall(r"\bAS (\w+)", sql_text)}
+    assert set(plan) == selected - {"player_id", "seat", "screen_name"}
+    assert plan["n"] == AggregateColumn(HUDCACHE_COLUMNS.index("n"))
+    assert plan["bigblind"] == AggregateColumn(HUDCACHE_COLUMNS.index("n"), big_blinds=True)
+    assert plan["rfi_btn"].position == "D"
+    assert any(column.seats is not None for column in plan.values()), "the ChipEV columns are followed too"
+
+
+def test_a_column_the_store_cannot_follow_turns_it_off() -> None:
+    assert aggregate_plan([("ev_btn__chips", "notSentByTheImporter", 6, "D")]) is None
+
+
+def test_messages_round_trip_and_bare_ids_still_read() -> None:
+    key = (3, 7, 6, "B", None, "d260101")
+    text = encode_hud_message(41, sender="a", seq=2, hudcache=[(key, [1, Decimal("0.25")])])
+
+    message = decode_hud_message(text)
+
+    assert message == HudMessage("41", (HudCacheDelta(3, 7, 6, "B", "d260101", (1, Decimal("0.25"))),), "a", 2)
+    assert decode_hud_message("41") == HudMessage("41")
+    assert decode_hud_message('{"hand":') is None
+
+
+def test_anything_that_may_hide_a_missed_hand_drops_the_store() -> None:
+    store = HudAggregateStore()
+    keys = ((1, "0000000", 1000, 0, 10),) * 2
+    store._plan = {"n": AggregateColumn(0)}
+    store.seed({7: 1}, -1, keys, {7: {"n": 3, "seat": 1}}, started_at=0.0, watermark=0)
+
+    store.record(HudMessage("1", (), "a", 1))
+    assert len(store) == 1
+    store.record(HudMessage("3", (), "a", 3))
+    assert len(store) == 0
+
+    store.seed({7: 1}, -1, keys, {7: {"n": 3, "seat": 1}}, started_at=0.0, watermark=0)
+    store.record(HudMessage("4"))
+    assert len(store) == 0
+    assert store.lookups["gaps"] == 2
+
+
+def test_moving_the_store_forward_matches_reading_the_database() -> None:
+    clock = _Clock()
+    db = _database()
+    store = HudAggregateStore(clock=clock)
+    first = _import(db, 1)
+    store.record(decode_hud_message(encode_hud_message(1, sender="importer", seq=1, hudcache=first)))
+    db.hud_aggregates = store
+
+    assert _aggregate_reads(db, lambda: _stats(db, 1)) == 1
+    clock.now += 5
+    second = _import(db, 2)
+    store.record(decode_hud_message(encode_hud_message(2, sender="importer", seq=2, hudcache=second)))
+
+    cached: dict = {}
+    assert _aggregate_reads(db, lambda: cached.update(_stats(db, 2))) == 0
+    db.hud_aggregates = None
+    read = _stats(db, 2)
+
+    assert cached == read
+    assert {values["n"] for values in read.values()} == {2}
+    assert store.lookups["hits"] == 1
+
+
+def test_a_hand_the_seed_may_include_forces_a_read() -> None:
+    clock = _Clock()
+    db = _database()
+    store = HudAggregateStore(clock=clock)
+    db.hud_aggregates = store
+    _import(db, 1)
+    second = _import(db, 2)
+    _stats(db, 1)
+    clock.now += 5
+
+    store.record(decode_hud_message(encode_hud_message(2, sender="importer", seq=1, hudcache=second)))
+
+    assert _aggregate_reads(db, lambda: _stats(db, 2)) == 1
+    assert {values["n"] for values in _stats(db, 2).values()} == {2}
+
+
+def test_a_hand_newer_than_the_seed_is_added_at_once() -> None:
+    clock = _Clock()
+    db = _database()
+    store = HudAggregateStore(clock=clock)
+    db.hud_aggregates = store
+    _import(db, 1)
+    _stats(db, 1)
+    clock.now += 0.01
+    second = _import(db, 2)
+
+    store.record(decode_hud_message(encode_hud_message(2, sender="importer", seq=1, hudcache=second)))
+
+    assert _aggregate_reads(db, lambda: _stats(db, 2)) == 0
+    assert {values["n"] for values in _stats(db, 2).values()} == {2}
+
+
+def test_seats_are_read_in_batches(monkeypatch) -> None:
+    monkeypatch.setattr("fpdb_3_legacy.database_hud_stats.HAND_ROWS_BATCH", 1)
+    db = _database()
+    _import(db, 1)
+    _import(db, 2)
+
+    seats = db._hand_seats([1, 2])
+
+    assert seats[1] and seats[1] == seats[2]
+
+
+def test_entries_expire() -> None:
+    clock = _Clock()
+    db = _database()
+    store = HudAggregateStore(ttl=60, clock=clock)
+    db.hud_aggregates = store
+    _import(db, 1)
+    _stats(db, 1)
+
+    assert _aggregate_reads(db, lambda: _stats(db, 1)) == 0
+    clock.now += 61
+    assert _aggregate_reads(db, lambda: _stats(db, 1)) == 1
@@ -0,0 +1,176 @@
+"""Running session sums against the full-window session query they replace."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from fpdb_3_legacy.coinpoker_hand_builder import build_hands
+from fpdb_3_legacy.Database import Database
+from fpdb_3_legacy.http_capture_hand_builder import HttpCaptureHandConfig, build_fpdb_hand, import_fpdb_hand
+from fpdb_3_legacy.hud_session import IDENTITY_COLUMNS, SessionAccumulator
+from fpdb_3_legacy.SQL import Sql
+
+FIXTURE = Path(__file__).parent / "data" / "coinpoker_aof_hand_events.json"
+HERO = 3  # "hero" in the fixture hand
+WIDE = (2, 10)
+
+
+def _config() -> MagicMock:
+    config = MagicMock()
+    config.get_db_parameters.return_value = {
+        "db-backend": 4,
+        "db-server": "sqlite",
+        "db-databaseName": ":memory:",
+        "db-user": "",
+        "db-password": "",
+        "db-host": "",
+        "db-port": "",
+        "db-path": "",
+    }
+    config.get_import_parameters.return_value = {
+        "saveActions": True,
+        "callFpdbHud": False,
+        "cacheSessions": False,
+        "publicDB": False,
+        "fastStoreHudCache": False,
+        "sessionTimeout": 30,
+        "importFilters": [],
+        "hhBulkPath": "",
+    }
+    config.get_general_params.return_value = {}
+    config.get_site_id.return_value = 30
+    return config
+
+
+def _import(db: Database, hand_id: int) -> None:
+    raw = json.loads(FIXTURE.read_text())
+    (hand_data,) = build_hands([tuple(raw["join"]), *[tuple(event) for event in raw["hand"]]], "PLO4")
+    hand = build_fpdb_hand(hand_data, config=HttpCaptureHandConfig(site_ids={"CoinPoker": 30, "default": 30}))
+    hand.handid = str(int(hand.handid) + hand_id)
+    db.resetBulkCache()
+    import_fpdb_hand(hand, db, file_id=1, starting_hand_id=hand_id)
+
+
+def _database(hands: int, *, clock=None) -> Database:
+    db = Database(_config(), Sql(db_server="sqlite"))
+    if clock is not None:
+        db._session_stats = SessionAccumulator(clock=clock)
+    for hand_id in range(1, hands + 1):
+        _import(db, hand_id)
+    db.hand_1day_ago = 1
+    return db
+
+
+def _full_window(db: Database, hand, hero_id, stat_range, seats, h_stat_range, h_seats) -> dict:
+    """What get_stats_from_hand_session returned before it kept running sums."""
+    query = db.sql.query["get_stats_from_hand_session"].replace("<signed>", "")
+    c = db.get_cursor()
+    c.execute(query, (db.hand_1day_ago, hand, hero_id, *seats, hero_id, *h_seats))
+    colnames = [desc[0].lower() for desc in c.description]
+    stat_dict: dict = {}
+    for row in c.fetchall():
+        is_hero = int(row[0]) == int(hero_id)
+        if (is_hero and h_stat_range == "S") or (not is_hero and stat_range == "S"):
+            player = stat_dict.setdefault(row[0], {})
+            for name, val in zip(colnames, row, strict=True):
+                if name not in player:
+                    player[name] = val
+                elif name not in IDENTITY_COLUMNS:
+                    player[name] += val
+    return stat_dict
+
+
+def _session(db: Database, hand, hero_id=HERO, stat_range="S", seats=WIDE, h_stat_range="S", h_seats=WIDE) -> dict:
+    stat_dict: dict = {}
+    db.get_stats_from_hand_session(hand, stat_dict, hero_id, stat_range, *seats, h_stat_range, *h_seats)
+    assert stat_dict == _full_window(db, hand, hero_id, stat_range, seats, h_stat_range, h_seats)
+    return stat_dict
+
+
+def _reads(db: Database, monkeypatch) -> list:
+    reads: list = []
+    read = db._read_session_rows
+
+    def _record(table_name, lowest_id, id_bound):
+        reads.append((lowest_id, id_bound))
+        return read(table_name, lowest_id, id_bound)
+
+    monkeypatch.setattr(db, "_read_session_rows", _record)
+    return reads
+
+
+def test_running_sums_match_the_full_window() -> None:
+    db = _database(3)
+
+    stats = _session(db, 3)
+
+    assert sorted(stats) == [1, 2, 3]
+    assert {values["n"] for values in stats.values()} == {3}
+    assert {values["hand_id"] for values in stats.values()} == {3}
+
+
+def test_only_new_hands_are_read(monkeypatch) -> None:
+    db = _database(2)
+    reads = _reads(db, monkeypatch)
+    _session(db, 2)
+    _import(db, 3)
+    _import(db, 4)
+
+    stats = _session(db, 4)
+
+    assert reads == [(1, None), (3, None)]
+    assert stats[HERO]["n"] == 4
+
+
+def test_hands_leaving_the_window_are_subtracted(monkeypatch) -> None:
+    db = _database(4)
+    reads = _reads(db, monkeypatch)
+    _session(db, 4)
+    db.hand_1day_ago = 3
+
+    stats = _session(db, 4)
+
+    assert reads == [(1, None), (1, 3), (5, None)]
+    assert stats[HERO]["n"] == 2
+
+
+@pytest.mark.parametrize(
+    ("stat_range", "seats", "h_stat_range", "h_seats"),
+    [
+        ("S", (6, 6), "S", WIDE),
+        ("S", WIDE, "A", WIDE),
+        ("A", WIDE, "S", (2, 3)),
+        ("S", (7, 9), "S", (7, 9)),
+    ],
+)
+def test_seat_ranges_and_hero_scope_match_the_full_window(stat_range, seats, h_stat_range, h_seats) -> None:
+    db = _database(4)
+    db.get_cursor().execute("UPDATE Hands SET seats = 6 WHERE id IN (2, 3)")
+    _session(db, 1)
+
+    _session(db, 4, stat_range=stat_range, seats=seats, h_stat_range=h_stat_range, h_seats=h_seats)
+
+
+def test_tables_are_kept_apart() -> None:
+    db = _database(3)
+    db.get_cursor().execute("UPDATE Hands SET tableName = 'other' WHERE id = 2")
+
+    assert _session(db, 3)[HERO]["n"] == 2
+    assert _session(db, 2)[HERO]["n"] == 1
+    assert len(db._session_stats) == 2
+
+
+def test_tables_are_read_afresh_after_a_while(monkeypatch) -> None:
+    now = [0.0]
+    db = _database(2, clock=lambda: now[0])
+    reads = _reads(db, monkeypatch)
+    _session(db, 2)
+    now[0] += 601
+
+    _session(db, 2)
+
+    assert reads == [(1, None), (1, None)]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from itertools import permutations
+
+import pytest
+
+from fpdb_3_legacy import icm
+from fpdb_3_legacy.GuiReplayer import ICM
+
+
+def finishing_orders(stacks: list[float], payouts: list[float]) -> list[float]:
+    equities = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks))):
+        probability = 1.0
+        left = sum(stacks)
+        for player in order:
+            probability *= stacks[player] / left
+            left -= stacks[player]
+        for place, player in enumerate(order[: len(payouts)]):
+            equities[player] += probability * payouts[place]
+    return equities
+
+
+@pytest.mark.parametrize(
+    ("stacks", "payouts"),
+    [
+        ([5000, 3000, 2000, 1500, 800], [50, 30, 20]),
+        ([100, 100], [65, 35]),
+        ([12, 40, 7, 19, 33, 25], [40, 25, 15, 10, 6, 4]),
+    ],
+)
+def test_exact_icm_matches_the_sum_over_finishing_orders(stacks, payouts) -> None:
+    assert icm.exact_icm(stacks, payouts) == pytest.approx(finishing_orders(stacks, payouts))
+
+
+def test_players_with_no_chips_take_no_paid_place() -> None:
+    assert icm.exact_icm([0, 30, 10], [70, 30, 0]) == pytest.approx([0.0, 60.0, 40.0])
+    assert icm.monte_carlo_icm([0, 10, 10], [1, 1]) == [0.0, 1.0, 1.0]
+
+
+def test_a_nine_handed_final_table_pays_out_the_whole_pool() -> None:
+    payouts = [30, 20, 15, 10, 8, 6, 5, 4, 2]
+
+    equities = icm.exact_icm([1000 * (seat + 1) for seat in range(9)], payouts)
+
+    assert sum(equities) == pytest.approx(sum(payouts))
+    assert equities == sorted(equities)
+
+
+def test_sampled_icm_is_reproducible_and_close_to_exact() -> None:
+    stacks = [5000, 3000, 2000, 1500, 800]
+    payouts = [50, 30, 20]
+
+    sampled = icm.monte_carlo_icm(stacks, payouts, samples=50_000, seed=3)
+
+    assert sampled == icm.monte_carlo_icm(stacks, payouts, samples=50_000, seed=3)
+    assert sampled == pytest.approx(icm.exact_icm(stacks, payouts), abs=0.5)
+
+
+def test_large_fields_are_sampled(monkeypatch) -> None:
+    monkeypatch.setattr(icm, "EXACT_ICM_STATE_LIMIT", 10)
+
+    equities = icm.icm_equities([10, 20, 30, 40, 50], [3, 2, 1], samples=1_000, seed=1)
+
+    assert equities == icm.monte_carlo_icm([10, 20, 30, 40, 50], [3, 2, 1], samples=1_000, seed=1)
+
+
+def test_invalid_stacks_are_rejected() -> None:
+    with pytest.raises(ValueError, match="negative"):
+        icm.icm_equities([10, -1], [1])
+
+
+def test_replayer_icm_rounds_without_touching_the_stacks() -> None:
+    stacks = [Decimal(3000), Decimal(1000)]
+
+    result = ICM(stacks, [Decimal(60), Decimal(40)])
+
+    assert result.equities == [Decimal("55.0000"), Decimal("45.0000")]
+    assert stacks == [Decimal(3000), Decimal(1000)]
@@ -78,7 +78,7 @@ def importer(monkeypatch) -> Importer:
     imp.database = database
     imp._recorder = recorder
 
-    def _record_send(hid) -> None:
+    def _record_send(hid, **_kwargs) -> None:
         recorder.events.append(f"send:{hid}")
 
     sender = MagicMock(name="ZMQSender")
@@ -0,0 +1,112 @@
+"""Session-level lookups are made once per file text, not once per hand.
+
+Every hand of an iPoker session looks up the session's game type, table and
+table size in ``whole_file``, and ``copyGameHeader`` converters normalise the
+whole file for ``parseHeader``. Both used to be redone for every hand, which
+made long sessions quadratic to parse; they are now cached until ``readFile``
+(or ``setObs``) replaces the text.
+"""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from fpdb_3_legacy.Configuration import Config
+from fpdb_3_legacy.iPoker.base import iPoker
+from fpdb_3_legacy.MergeToFpdb import Merge
+
+HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<session sessioncode="5869851690">
+ <general>
+  <gametype>Omaha PL 0,01€/0,02€</gametype>
+  <tablename>Sea Lake, 560237915</tablename>
+  <currency>EUR</currency>
+  <nickname>Hero</nickname>
+ </general>
+"""
+
+GAME = """ <game gamecode="{code}">
+  <general>
+   <startdate>2026-07-21 14:45:39</startdate>
+   <players>
+    <player bet="0,04€" chips="2,63€" dealer="0" name="Villain" seat="1" win="0€"/>
+    <player bet="0,06€" chips="3,42€" dealer="1" name="Hero" seat="6" win="0,10€"/>
+   </players>
+  </general>
+ </game>
+"""
+
+
+@pytest.fixture(scope="module")
+def config() -> Config:
+    return Config()
+
+
+def session(games: int, tablesize: str = "") -> str:
+    header = HEADER.replace(" </general>", f"  {tablesize}\n </general>") if tablesize else HEADER
+    return header + "".join(GAME.format(code=9025178751 + n) for n in range(games)) + "</session>"
+
+
+def counting_searches(monkeypatch: pytest.MonkeyPatch, whole_file: str) -> list[str]:
+    """Record every ``re.search`` the iPoker parser runs over ``whole_file``."""
+    searched: list[str] = []
+    search = re.search
+
+    def spy(pattern, string, flags=0):
+        if string is whole_file:
+            searched.append(getattr(pattern, "pattern", pattern))
+        return search(pattern, string, flags)
+
+    monkeypatch.setattr(re, "search", spy)
+    return searched
+
+
+def test_a_tag_missing_from_the_session_is_searched_for_once(config: Config, monkeypatch) -> None:
+    parser = iPoker(config, autostart=False)
+    parser.setObs(session(20))
+    searched = counting_searches(monkeypatch, parser.whole_file)
+
+    for n in range(20):
+        assert parser.determineGameType(GAME.format(code=9025178751 + n)) is not None
+
+    assert searched
+    assert len(searched) == len(set(searched))
+
+
+def test_a_new_read_drops_the_cached_answers(config: Config) -> None:
+    parser = iPoker(config, autostart=False)
+    parser.setObs(session(2))
+    parser.determineGameType(GAME.format(code=9025178751))
+    assert "seats" not in parser.info
+
+    parser.setObs(session(3, "<tablesize>6</tablesize>"))
+    parser.determineGameType(GAME.format(code=9025178751))
+
+    assert parser.info["seats"] == "6"
+
+
+def test_cached_lookups_answer_as_the_searches_did(config: Config) -> None:
+    parser = iPoker(config, autostart=False)
+    parser.setObs(session(3, "<tablesize>6</tablesize>"))
+
+    for pattern in (r"<gametype>([^<]*)</gametype>", r"<place>([^<]*)</place>", parser.re_max_seats):
+        expected = re.search(pattern, parser.whole_file)
+        for _ in range(2):
+            found = parser._session_search(pattern)
+            assert (found and found.group(0)) == (expected and expected.group(0))
+    assert parser._session_contains("<tablename>")
+    assert not parser._session_contains("<tournamentname>")
+
+
+def test_the_header_file_is_normalised_once_per_read(config: Config) -> None:
+    parser = Merge(config, autostart=False)
+    parser.setObs("<game>\r\n\xa0</game>")
+
+    first = parser.header_file()
+
+    assert first == "<game>\n </game>"
+    assert parser.header_file() is first
+    parser.setObs("<game>\r\n</game>")
+    assert parser.header_file() == "<game>\n</game>"
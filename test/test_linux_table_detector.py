@@ -12,8 +12,16 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from fpdb.infrastructure.platform.linux import LinuxTableDetector
-from fpdb.infrastructure.platform.protocol import Platform
+from fpdb.infrastructure.platform.linux import (
+    CLOSED,
+    HIDDEN,
+    MOVED,
+    RESIZED,
+    RETITLED,
+    LinuxTableDetector,
+    WindowChange,
+)
+from fpdb.infrastructure.platform.protocol import Platform, TableGeometry
 
 
 class FakeValue:
@@ -256,3 +264,247 @@ def test_find_tables_ignores_window_with_bad_property() -> None:
     detector._wnameatom = 4
     detector._utf8atom = 5
     assert detector.find_tables("") == []
+
+
+# -- event-driven tracking --------------------------------------------------
+
+
+class _Event:
+    def __init__(self, **fields: object) -> None:
+        self.__dict__.update(fields)
+
+
+class FakeXproto:
+    class ConfigureNotifyEvent(_Event): ...
+
+    class PropertyNotifyEvent(_Event): ...
+
+    class CreateNotifyEvent(_Event): ...
+
+    class DestroyNotifyEvent(_Event): ...
+
+    class MapNotifyEvent(_Event): ...
+
+    class UnmapNotifyEvent(_Event): ...
+
+    class ReparentNotifyEvent(_Event): ...
+
+
+class FakeProtocolError(Exception):
+    """Stands in for ``xcffib.ProtocolException``."""
+
+
+ROOT = 1
+CLIENT_LIST = 2
+NAME = 4
+
+
+class FakeServer:
+    """An X server holding a few windows; logs every request and every reply read."""
+
+    def __init__(self, windows: dict[int, dict[str, object]]) -> None:
+        self.windows = windows
+        self.clients = list(windows)
+        self.events: list[object] = []
+        self.log: list[str] = []
+        self.core = Mock()
+        self.core.ChangeWindowAttributes.side_effect = lambda **kw: self.log.append("subscribe")
+        self.core.GetProperty.side_effect = self._get_property
+        self.core.GetGeometry.side_effect = lambda drawable: self._cookie(
+            "geometry",
+            lambda: FakeReply(width=self.windows[drawable]["size"][0], height=self.windows[drawable]["size"][1]),
+        )
+        self.core.TranslateCoordinates.side_effect = lambda src_window, **kw: self._cookie(
+            "position",
+            lambda: FakeReply(dst_x=self.windows[src_window]["pos"][0], dst_y=self.windows[src_window]["pos"][1]),
+        )
+        self.core.GetWindowAttributes.side_effect = lambda window: self._cookie(
+            "attributes", lambda: FakeReply(map_state=2 if self.windows.get(window, {}).get("mapped", True) else 0)
+        )
+        self.core.QueryTree.side_effect = lambda window: self._cookie(
+            "tree", lambda: FakeReply(parent=self.windows[window].get("frame", ROOT))
+        )
+
+    def _cookie(self, name: str, reply) -> Mock:
+        self.log.append(f"request {name}")
+
+        def read():
+            self.log.append(f"reply {name}")
+            return reply()
+
+        return Mock(reply=read)
+
+    def _get_property(self, *, window: int, property: int, **_kw: object) -> Mock:
+        if window == ROOT:
+            return self._cookie("client list", lambda: FakeReply(value=FakeValue(atoms=list(self.clients))))
+        return self._cookie("title", lambda: FakeReply(value=FakeValue(utf8=self.windows[window]["title"])))
+
+    def _poll_for_event(self) -> object:
+        if not self.events:
+            return None
+        event = self.events.pop(0)
+        if isinstance(event, Exception):
+            raise event
+        return event
+
+    def connection(self) -> Mock:
+        return Mock(
+            core=self.core,
+            poll_for_event=self._poll_for_event,
+            get_file_descriptor=lambda: 7,
+        )
+
+
+def _tracked(server: FakeServer) -> LinuxTableDetector:
+    detector = object.__new__(LinuxTableDetector)
+    detector._platform = Platform.LINUX
+    detector._xconn = server.connection()
+    detector._root = ROOT
+    detector._nclatom = CLIENT_LIST
+    detector._winatom = 3
+    detector._wnameatom = NAME
+    detector._utf8atom = 5
+    detector._tracker = detector._start_tracker(FakeXproto, FakeProtocolError)
+    server.log.clear()
+    return detector
+
+
+def _tables() -> FakeServer:
+    return FakeServer(
+        {
+            101: {"title": "PokerStars - Table 1", "pos": (10, 20), "size": (800, 600), "frame": 901},
+            102: {"title": "PokerStars - Table 2", "pos": (900, 20), "size": (800, 600), "frame": 902},
+            103: {"title": "Firefox", "pos": (0, 0), "size": (1920, 1080)},
+        }
+    )
+
+
+def test_tracker_loads_every_window_in_one_pipelined_batch() -> None:
+    server = _tables()
+    detector = object.__new__(LinuxTableDetector)
+    detector._xconn = server.connection()
+    detector._root, detector._nclatom, detector._winatom, detector._wnameatom, detector._utf8atom = ROOT, 2, 3, 4, 5
+
+    tracker = detector._start_tracker(FakeXproto, FakeProtocolError)
+
+    loads = server.log[server.log.index("reply client list") + 1 :]
+    first_reply = next(n for n, entry in enumerate(loads) if entry.startswith("reply"))
+    assert all(entry.startswith("reply") for entry in loads[first_reply:])
+    assert tracker.windows() == [101, 102, 103]
+    assert tracker.geometry(102) == TableGeometry(x=900, y=20, width=800, height=600)
+
+
+def test_tracked_queries_make_no_requests() -> None:
+    server = _tables()
+    detector = _tracked(server)
+
+    tables = detector.find_tables("pokerstars")
+
+    assert [(t.window_id, t.geometry.x) for t in tables] == [(101, 10), (102, 900)]
+    assert detector.get_window_title(103) == "Firefox"
+    assert detector.is_window_visible(101) is True
+    assert server.log == []
+
+
+def test_a_moved_frame_refreshes_its_client_and_notifies() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    seen: list[list[WindowChange]] = []
+    detector.tracker.add_listener(seen.append)
+
+    server.windows[101]["pos"] = (50, 60)
+    server.events.append(FakeXproto.ConfigureNotifyEvent(window=901, x=45, y=40, width=810, height=630))
+
+    assert detector.get_window_geometry(101) == TableGeometry(x=50, y=60, width=800, height=600)
+    assert seen == [[WindowChange(101, MOVED)]]
+
+
+def test_a_resized_client_reports_the_new_size() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    server.windows[102]["size"] = (640, 480)
+    server.events.append(FakeXproto.ConfigureNotifyEvent(window=102, x=0, y=0, width=640, height=480))
+
+    assert detector.tracker.process_events() == [WindowChange(102, RESIZED)]
+    assert detector.get_window_geometry(102) == TableGeometry(x=900, y=20, width=640, height=480)
+
+
+def test_closed_and_opened_windows_follow_the_client_list() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    del server.windows[102]
+    server.windows[104] = {"title": "PokerStars - Table 3", "pos": (5, 5), "size": (800, 600)}
+    server.clients = [101, 103, 104]
+    server.events += [
+        FakeXproto.DestroyNotifyEvent(event=102, window=102),
+        FakeXproto.PropertyNotifyEvent(window=ROOT, atom=CLIENT_LIST),
+    ]
+
+    assert detector.tracker.process_events() == [WindowChange(102, CLOSED)]
+    assert [t.window_id for t in detector.find_tables("Table")] == [101, 104]
+
+
+def test_title_and_map_changes_update_the_cache() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    server.windows[101]["title"] = "PokerStars - Table 9"
+    server.events += [
+        FakeXproto.PropertyNotifyEvent(window=101, atom=NAME),
+        FakeXproto.UnmapNotifyEvent(event=102, window=102),
+    ]
+
+    changes = detector.tracker.process_events()
+
+    assert set(changes) == {WindowChange(101, RETITLED), WindowChange(102, HIDDEN)}
+    assert detector.get_window_title(101) == "PokerStars - Table 9"
+    assert detector.is_window_visible(102) is False
+
+
+def test_a_listener_may_query_the_detector() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    seen = []
+    detector.tracker.add_listener(lambda changes: seen.append(detector.get_window_geometry(changes[0].window)))
+    server.events.append(FakeXproto.UnmapNotifyEvent(event=103, window=103))
+
+    detector.tracker.process_events()
+
+    assert seen == [TableGeometry(x=0, y=0, width=1920, height=1080)]
+
+
+def test_untracked_windows_are_asked_of_x() -> None:
+    server = _tables()
+    detector = _tracked(server)
+
+    server.windows[555] = {"title": "Dialog", "mapped": False}
+
+    assert detector.is_window_visible(555) is False
+    assert server.log == ["request attributes", "reply attributes"]
+
+
+def test_x_errors_for_single_requests_are_skipped() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    server.events += [
+        FakeProtocolError("BadWindow"),
+        FakeXproto.UnmapNotifyEvent(event=102, window=102),
+    ]
+
+    assert detector.tracker.process_events() == [WindowChange(102, HIDDEN)]
+    assert detector.tracker.closed is False
+
+
+def test_a_lost_connection_closes_the_tracker_and_falls_back_to_x() -> None:
+    server = _tables()
+    detector = _tracked(server)
+    tracker = detector.tracker
+    lost = ConnectionError("connection closed")
+    server.events += [lost, lost, FakeXproto.UnmapNotifyEvent(event=102, window=102)]
+
+    assert tracker.process_events() == []
+    assert tracker.closed is True
+    assert len(server.events) == 2
+
+    assert detector.get_window_title(101) == "PokerStars - Table 1"
+    assert detector.tracker is None
+    assert server.log == ["request title", "reply title"]
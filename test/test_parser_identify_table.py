@@ -0,0 +1,90 @@
+"""The precomputed identification table against the converter classes.
+
+``IdentifySite`` picks a file's site from ``parser_identify_table`` rather than
+from the converter classes, so that the converters need not be imported to do
+it. A converter whose regexes change without the table being regenerated would
+be identified with stale patterns; these tests catch that, and that the
+identification path really stays free of converter imports.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from fpdb_3_legacy.parser_identify_table import PARSER_IDENTITIES, SUMMARY_IDENTIFY
+from fpdb_3_legacy.parser_registry import (
+    PARSER_CLASS_NAMES,
+    SUMMARY_CLASS_NAMES,
+    LazyClassRegistry,
+    describe_parser_class,
+    describe_summary_class,
+    get_parser_class,
+    get_parser_identity,
+    get_summary_class,
+    get_summary_identify,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("name", PARSER_CLASS_NAMES)
+def test_table_matches_the_converter_class(name: str) -> None:
+    assert describe_parser_class(get_parser_class(name)) == PARSER_IDENTITIES[name], (
+        "run python -m fpdb_3_legacy.parser_identify_table"
+    )
+
+
+@pytest.mark.parametrize("name", SUMMARY_CLASS_NAMES)
+def test_table_matches_the_summary_class(name: str) -> None:
+    assert describe_summary_class(get_summary_class(name)) == SUMMARY_IDENTIFY[name], (
+        "run python -m fpdb_3_legacy.parser_identify_table"
+    )
+
+
+def test_table_covers_exactly_the_registered_classes() -> None:
+    assert set(PARSER_IDENTITIES) == set(PARSER_CLASS_NAMES)
+    assert set(SUMMARY_IDENTIFY) == set(SUMMARY_CLASS_NAMES)
+
+
+def test_identities_compile_to_the_class_regexes() -> None:
+    pokerstars = get_parser_class("PokerStars")
+    identity = get_parser_identity("PokerStars")
+
+    assert identity.re_identify.pattern == pokerstars.re_identify.pattern
+    assert identity.re_identify.flags == pokerstars.re_identify.flags
+    assert identity.re_identify is identity.re_identify
+    assert get_summary_identify("TourneySummary") is None
+    with pytest.raises(KeyError, match="Unknown parser filter_name"):
+        get_parser_identity("MissingRoom")
+
+
+def test_lazy_registry_imports_only_what_is_looked_up() -> None:
+    registry = LazyClassRegistry({"OrderedDict": "collections", "Path": "pathlib"})
+
+    assert list(registry) == ["OrderedDict", "Path"]
+    assert registry.loaded() == []
+    assert registry["Path"] is Path
+    assert registry.loaded() == ["Path"]
+
+
+def test_identifying_a_file_imports_no_converter() -> None:
+    hand = ROOT / "tests/fixtures/hands/pokerstars/holdem/5card_omaha.txt"
+    script = f"""
+import sys
+from fpdb_3_legacy import Configuration
+from fpdb_3_legacy.IdentifySite import IdentifySite
+
+ids = IdentifySite(Configuration.Config())
+ids.scan({str(hand)!r})
+found = ids.get_fobj({str(hand)!r})
+assert found and found.site.filter_name == "PokerStars", found
+print(sorted(name for name in sys.modules if name.endswith(("ToFpdb", "Summary"))))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120, check=True
+    )
+
+    # PokerStars' skin detection imports its own converter, and nothing else.
+    assert result.stdout.strip().splitlines()[-1] == "['fpdb_3_legacy.PokerStarsToFpdb']"
@@ -0,0 +1,135 @@
+"""Player-name regexes are compiled once per player set, not once per hand.
+
+Converters spell the seated players' names out in a few regexes and compiled
+them again whenever a hand seated someone new -- nearly every hand on a
+fast-fold table. ``cached_player_regexes`` shares the compiled patterns across
+hands and converters, and PokerStars reads most hands with name-agnostic
+regexes, checking the names they find against the seated players.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from fpdb_3_legacy import HandHistoryConverter
+from fpdb_3_legacy.Configuration import Config
+from fpdb_3_legacy.HandHistoryConverter import cached_player_regexes, clear_player_regex_cache
+from fpdb_3_legacy.PokerStarsToFpdb import PokerStars
+
+LEGACY = Path(__file__).resolve().parent.parent / "fpdb_3_legacy"
+
+HAND_TEXT = """PokerStars Hand #1:  Hold'em No Limit ($0.05/$0.10 USD) - 2009/11/26 10:06:58 ET
+Seat 1: Hero ($10 in chips)
+Seat 2: Villain ($10 in chips)
+*** HOLE CARDS ***
+Dealt to Hero [Ah Kh]
+*** SUMMARY ***
+Seat 2: Villain (big blind) showed [Qs Qd] and won ($0.30) with a pair of Queens
+"""
+
+
+class Converter:
+    compiledPlayers: set[str] = set()
+    compiles = 0
+
+    def __init__(self, currency: str = "USD") -> None:
+        self.currency = currency
+
+    @cached_player_regexes("re_player", variant=lambda self, hand: self.currency)
+    def compilePlayerRegexs(self, hand) -> None:
+        players = {player[1] for player in hand.players}
+        if not players <= self.compiledPlayers:
+            self.compiledPlayers = players
+            type(self).compiles += 1
+            self.re_player = re.compile("|".join(map(re.escape, sorted(players))) + re.escape(self.currency))
+
+
+def seated(*names: str, text: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(players=[(seat, name, "10") for seat, name in enumerate(names, 1)], handText=text)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_player_regex_cache()
+    Converter.compiles = 0
+    yield
+    clear_player_regex_cache()
+
+
+def test_a_new_converter_reuses_the_patterns_of_a_player_set() -> None:
+    first, second = Converter(), Converter()
+    first.compilePlayerRegexs(seated("Hero", "Villain"))
+    second.compilePlayerRegexs(seated("Villain", "Hero"))
+
+    assert second.re_player is first.re_player
+    assert second.compiledPlayers == {"Hero", "Villain"}
+    assert Converter.compiles == 1
+
+
+def test_the_variant_keeps_patterns_built_from_other_settings_apart() -> None:
+    usd, eur = Converter("USD"), Converter("EUR")
+    usd.compilePlayerRegexs(seated("Hero", "Villain"))
+    eur.compilePlayerRegexs(seated("Hero", "Villain"))
+
+    assert eur.re_player is not usd.re_player
+    assert eur.re_player.search("VillainEUR")
+
+
+def test_the_cache_keeps_the_most_recent_player_sets(monkeypatch) -> None:
+    monkeypatch.setattr(HandHistoryConverter, "PLAYER_REGEX_CACHE_SIZE", 2)
+    converter = Converter()
+    for names in (("A", "B"), ("C", "D"), ("A", "B"), ("E", "F")):
+        converter.compilePlayerRegexs(seated(*names))
+
+    converter.compilePlayerRegexs(seated("A", "B"))
+    converter.compilePlayerRegexs(seated("C", "D"))
+
+    assert Converter.compiles == 4
+    assert len(HandHistoryConverter._player_regex_cache) == 2
+
+
+def test_pokerstars_reads_seated_names_without_compiling_them() -> None:
+    parser = PokerStars(Config(), autostart=False)
+    parser.compilePlayerRegexs(seated("Hero", "Villain", text=HAND_TEXT))
+
+    assert "Hero" not in parser.re_hero_cards.pattern
+    assert parser.re_hero_cards.search(HAND_TEXT).group("PNAME") == "Hero"
+    assert parser.re_shown_cards.search(HAND_TEXT).group("PNAME") == "Villain"
+
+
+def test_pokerstars_spells_the_names_out_when_an_unseated_one_turns_up() -> None:
+    text = HAND_TEXT + 'Villain said, "Dealt to me [2c 7d]"\n'
+    parser = PokerStars(Config(), autostart=False)
+    parser.compilePlayerRegexs(seated("Hero", "Villain", text=text))
+
+    assert [found.group("PNAME") for found in parser.re_hero_cards.finditer(text)] == ["Hero"]
+
+
+def _assigned_attributes(function: ast.FunctionDef) -> set[str]:
+    return {
+        target.attr
+        for node in ast.walk(function)
+        if isinstance(node, ast.Assign)
+        for target in ast.walk(ast.Tuple(elts=node.targets))
+        if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self"
+    }
+
+
+def _decorated_methods():
+    for path in sorted(LEGACY.glob("*ToFpdb.py")):
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if not isinstance(node, ast.FunctionDef):
+                continue
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Call) and getattr(decorator.func, "id", "") == "cached_player_regexes":
+                    yield path.name, node, {arg.value for arg in decorator.args}
+
+
+@pytest.mark.parametrize(("module", "method", "declared"), list(_decorated_methods()), ids=lambda v: str(v)[:30])
+def test_a_cached_compile_sets_only_what_it_declares(module: str, method: ast.FunctionDef, declared: set) -> None:
+    assert _assigned_attributes(method) <= declared | {"compiledPlayers"}, module
@@ -0,0 +1,104 @@
+"""The vectorised sessionizer against the per-session loop it replaced."""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from fpdb_3_legacy.sessionizer import SESSION_GAP, SESSION_PADDING, session_rows, sessionize
+
+
+def loop_sessions(hands: list) -> list[tuple]:
+    """(hands, start, end, minutes, open, close, low, high, won) per session, summed hand by hand."""
+    sessions = []
+    session: list = []
+    balance = 0
+    for n, (time, profit) in enumerate(hands):
+        if session and time - hands[n - 1][0] > SESSION_GAP:
+            sessions.append(session)
+            session = []
+        session.append((time, profit, balance))
+        balance += profit
+    sessions.append(session)
+
+    rows = []
+    balance = 0
+    for session in sessions:
+        opened = balance
+        marks = [opened // 100]
+        for _time, profit, _ in session:
+            balance += profit
+            marks.append(balance // 100)
+        minutes = (session[-1][0] - session[0][0]) // 60 + SESSION_PADDING
+        won = sum(profit for _, profit, _ in session) // 100
+        rows.append(
+            (
+                len(session),
+                session[0][0],
+                session[-1][0],
+                minutes,
+                opened // 100,
+                balance // 100,
+                min(marks),
+                max(marks),
+                won,
+            )
+        )
+    return rows
+
+
+def random_history(seed: int, count: int) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    time = 1_600_000_000
+    hands = []
+    for _ in range(count):
+        time += rng.choice((rng.randint(0, 90), rng.randint(0, 90), rng.randint(1700, 90_000)))
+        hands.append((time, rng.randint(-5000, 5000)))
+    return hands
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sessions_match_the_hand_by_hand_sums(seed: int) -> None:
+    hands = random_history(seed, 400)
+    sessions = sessionize([(str(time), profit) for time, profit in hands])
+
+    columns = (
+        sessions.hands,
+        sessions.start,
+        sessions.end,
+        sessions.minutes,
+        sessions.opened,
+        sessions.closed,
+        sessions.low,
+        sessions.high,
+        sessions.won,
+    )
+    assert list(zip(*(column.tolist() for column in columns), strict=True)) == loop_sessions(hands)
+
+
+def test_a_gap_of_exactly_the_threshold_stays_in_the_session() -> None:
+    sessions = sessionize([(0, 100), (SESSION_GAP, 100), (2 * SESSION_GAP + 1, -300)])
+
+    assert sessions.hands.tolist() == [2, 1]
+    assert sessions.low.tolist() == [0, -1]
+    assert sessions.high.tolist() == [2, 2]
+
+
+def test_the_rows_end_with_a_total_of_all_sessions() -> None:
+    results, quotes, times = session_rows(sessionize([(0, 1000), (60, -250), (10_000, 500)]))
+
+    assert len(results) == 4
+    assert results[2] == [""] * 11
+    assert results[3][0] == "all"
+    assert [quote[:3] for quote in quotes] == [(1, 0, 7), (2, 7, 12)]
+    assert times == [(-SESSION_PADDING * 60, 60 + SESSION_PADDING * 60), (10_000 - 300, 10_000 + 300)]
+
+
+def test_no_hands_make_no_sessions() -> None:
+    sessions = sessionize([])
+
+    assert len(sessions) == 0
+    assert session_rows(sessions) == ([], [], [])
+    assert np.asarray(sessions.hands).size == 0
@@ -0,0 +1,35 @@
+"""Regression tests for the multi-hand rebuild queries."""
+
+from fpdb_3_legacy.SQL import Sql
+from fpdb_3_legacy.sql_queries_hand_artifacts import hand_artifact_queries
+from fpdb_3_legacy.sql_queries_hand_batch import hand_batch_queries
+from fpdb_3_legacy.sql_queries_replayer import replayer_queries
+
+
+def test_hand_batch_queries_are_installed_with_sqlite_placeholders() -> None:
+    expected = hand_batch_queries()
+    assert len(expected) == 9
+    for backend in ("mysql", "postgresql"):
+        assert expected.items() <= Sql(db_server=backend).query.items()
+    sqlite_expected = {key: value.replace("%s", "?") for key, value in expected.items()}
+    assert sqlite_expected.items() <= Sql(db_server="sqlite").query.items()
+
+
+def test_every_batch_query_is_keyed_by_hand_id() -> None:
+    for name, query in hand_batch_queries().items():
+        assert "IN (<hand_ids>)" in query, name
+        assert "%s" not in query, name
+
+
+def test_batch_queries_keep_the_single_hand_columns() -> None:
+    batch = hand_batch_queries()
+    single = {**replayer_queries(), **hand_artifact_queries()}
+
+    players = single["playerHand"]
+    assert players[players.index("hp.seatno") : players.index("FROM")] in batch["handBatchPlayers"]
+    actions = single["handActions"]
+    assert actions[actions.index("ha.actionNo") : actions.index("FROM")] in batch["handBatchActions"]
+    assert "ha.id ASC" in batch["handBatchActions"]
+    assert "p.name, hs.combo, hs.cards" in batch["handBatchShowdown"]
+    assert "p.name, hc.amount, hc.fee" in batch["handBatchCashout"]
+    assert "p.name, hp.splashWinnings" in batch["handBatchSplash"]
@@ -0,0 +1,29 @@
+"""Regression tests for the cash stats tab's single scan."""
+
+from fpdb_3_legacy.SQL import Sql
+from fpdb_3_legacy.sql_queries_ring_stats_scan import RING_SCAN_COUNTERS, ring_stats_scan_queries
+
+
+def test_scan_is_installed_for_every_backend() -> None:
+    for backend in ("mysql", "postgresql", "sqlite"):
+        expected = ring_stats_scan_queries(backend)
+        assert list(expected) == ["ringStatsScan"]
+        assert expected.items() <= Sql(db_server=backend).query.items()
+    assert ring_stats_scan_queries("oracle") == {}
+
+
+def test_scan_takes_the_detailed_stats_filters() -> None:
+    detailed = Sql(db_server="sqlite").query["playerDetailedStats"]
+    scan = ring_stats_scan_queries("sqlite")["ringStatsScan"]
+    for placeholder in ("<player_test>", "<game_test>", "<site_test>", "<currency_test>", "<seats_test>"):
+        assert placeholder in detailed
+        assert placeholder in scan
+    assert "<gtbigBlind_test>" in scan
+    assert "<datestest>" in scan
+
+
+def test_scan_sums_every_counter_once() -> None:
+    scan = ring_stats_scan_queries("postgresql")["ringStatsScan"]
+    for column in RING_SCAN_COUNTERS:
+        assert scan.count(f" AS {column.lower()}\n") == 1, column
+    assert "as SIGNED" in ring_stats_scan_queries("mysql")["ringStatsScan"]
@@ -93,6 +93,17 @@ class TestComputeAndFormat:
         row = {"chipev_tourney__allInEV": 200000, "cnt_tourneys": 0}
         assert adapter.augment_row([d], row) == {"chipev_tourney": "-"}
 
+    def test_compute_rows_matches_compute(self, registry):
+        adapter = GridAdapter()
+        d = registry.get("chipev_tourney")
+        rows = [
+            {"chipev_tourney__allInEV": 200000, "cnt_tourneys": 40},
+            {"CHIPEV_TOURNEY__ALLINEV": 500, "CNT_TOURNEYS": 4},
+            {"chipev_tourney__allInEV": 200000, "cnt_tourneys": 0},
+            {},
+        ]
+        assert adapter.compute_rows(d, rows) == [adapter.compute(d, row) for row in rows]
+
     def test_column_spec_shape(self, registry):
         adapter = GridAdapter()
         spec = adapter.column_spec(registry.get("chipev_3h_sb"))
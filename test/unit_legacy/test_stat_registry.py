@@ -64,6 +64,63 @@ class TestSafeExpression:
             sr.SafeExpression("a + True", frozenset({"a"}))
 
 
+# Expressions that exercise every whitelisted operator and function, including
+# the division-by-zero cases where the result is "no data".
+EXPRESSIONS = [
+    "100 * a / b",
+    "a / 100.0 / c",
+    "a // b + a % b",
+    "-a + +b - c",
+    "a ** 2 + b ** -1",
+    "max(a, b, c) - min(a, b) + abs(-c)",
+    "coalesce(a, b, 7)",
+    "coalesce(a / b, c)",
+    "round(a / 3)",
+    "a * 0 + b / c",
+]
+ROWS = [
+    {"a": 3, "b": 4, "c": 5},
+    {"a": 0, "b": 0, "c": 2},
+    {"a": -7, "b": 2, "c": 0},
+    {"a": Decimal("2500"), "b": None, "c": 1.5},
+    {"a": 9, "c": 0},
+    {"a": 0.0, "b": 0, "c": 0},
+]
+
+
+class TestCompiledExpression:
+    @pytest.mark.parametrize("source", EXPRESSIONS)
+    def test_compiled_matches_tree_walk(self, source):
+        expr = sr.SafeExpression(source, frozenset({"a", "b", "c"}))
+        for row in ROWS:
+            assert expr.evaluate(row) == expr.interpret(row), row
+
+    @pytest.mark.parametrize("source", EXPRESSIONS)
+    def test_columns_match_row_by_row(self, source):
+        expr = sr.SafeExpression(source, frozenset({"a", "b", "c"}))
+        columns = {name: [row.get(name) for row in ROWS] for name in ("a", "b", "c")}
+        values = expr.evaluate_columns(columns)
+        assert len(values) == len(ROWS)
+        for value, row in zip(values.tolist(), ROWS, strict=True):
+            expected = expr.interpret(row)
+            if expected is None:
+                assert value != value, row
+            else:
+                assert value == pytest.approx(float(expected)), row
+
+    def test_missing_column_is_zero(self):
+        expr = sr.SafeExpression("a + b", frozenset({"a", "b"}))
+        assert expr.evaluate_columns({"a": [1, 2]}).tolist() == [1.0, 2.0]
+
+    def test_constant_expression_takes_length(self):
+        expr = sr.SafeExpression("2 * 3", frozenset())
+        assert expr.evaluate_columns({}, length=3).tolist() == [6.0, 6.0, 6.0]
+
+    def test_compiled_code_has_no_builtins(self):
+        expr = sr.SafeExpression("a", frozenset({"a"}))
+        assert expr._function.__globals__["__builtins__"] == {}
+
+
 class TestBuildDescriptor:
     def _valid(self, **over):
         data = {
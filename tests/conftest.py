@@ -79,6 +79,23 @@ def fresh_db(legacy_config):
     yield db
     db.disconnect()
 
+@pytest.fixture
+def postgresql_server():
+    """Connection settings of the live PostgreSQL server the FPDB_POSTGRES_* variables name.
+
+    Skips unless FPDB_TEST_DATABASES lists postgresql, as the CI service job does.
+    """
+    requested = {backend.strip() for backend in os.environ.get("FPDB_TEST_DATABASES", "").split(",")}
+    if "postgresql" not in requested:
+        pytest.skip("live PostgreSQL service not requested")
+    return {
+        "host": os.environ.get("FPDB_POSTGRES_HOST", "127.0.0.1"),
+        "port": int(os.environ.get("FPDB_POSTGRES_PORT", "5432")),
+        "dbname": os.environ.get("FPDB_POSTGRES_DB", "fpdb"),
+        "user": os.environ.get("FPDB_POSTGRES_USER", "fpdb"),
+        "password": os.environ.get("FPDB_POSTGRES_PASSWORD", "fpdb"),
+    }
+
 @pytest.fixture
 def importer(legacy_config, fresh_db):
     """Importer instance set up with the fresh in-memory database."""
@@ -0,0 +1,223 @@
+"""PostgreSQL must load the per-hand tables with COPY FROM STDIN.
+
+A server-side ``COPY ... FROM 'file'`` needs superuser rights and a directory
+the server shares with fpdb; streaming the rows over the connection needs
+neither. These tests pin which statements stream, that the COPY lists the
+insert's columns in the insert's order, that values COPY's text format would
+reject are coerced as an INSERT coerces them, and that every other statement
+keeps going through ``executemany``. The live test imports the regression
+hands with and without the ``copyStream`` import option on a real server and
+compares what was stored.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import fpdb_3_legacy.Database as Database
+from fpdb_3_legacy import database_bulk_import
+from fpdb_3_legacy.SQL import Sql
+
+PER_HAND_INSERTS = {
+    "store_hands_players": "HandsPlayers",
+    "store_hands_actions": "HandsActions",
+    "store_hands_stove": "HandsStove",
+    "store_hands_pots": "HandsPots",
+    "store_boards": "Boards",
+}
+
+
+class Column:
+    def __init__(self, type_code: int) -> None:
+        self.type_code = type_code
+
+
+INT4, FLOAT8, TEXT = 23, 701, 25
+
+
+class RecordingCursor:
+    """Records executemany batches and the rows written through copy().
+
+    Every column a SELECT names reads back as an integer, save those listed in
+    ``types``.
+    """
+
+    def __init__(self, types: dict[str, int] | None = None) -> None:
+        self.types = types or {}
+        self.batches: list[tuple[str, list[Any]]] = []
+        self.copied: dict[str, list[Any]] = {}
+        self.selects: list[str] = []
+        self.description: list[Column] = []
+
+    def execute(self, q: str) -> None:
+        self.selects.append(q)
+        columns = q[len("SELECT ") : q.index(" FROM ")].split(", ")
+        self.description = [Column(self.types.get(column, INT4)) for column in columns]
+
+    def executemany(self, q: str, values: list[Any]) -> None:
+        self.batches.append((q, list(values)))
+
+    @contextmanager
+    def copy(self, statement: str):
+        rows = self.copied.setdefault(statement, [])
+
+        class Copy:
+            def write_row(self, row: Any) -> None:
+                rows.append(row)
+
+        yield Copy()
+
+
+def pg_host() -> Any:
+    db = Database.Database.__new__(Database.Database)
+    db.backend = db.PGSQL
+    db.import_options = {"hhBulkPath": ""}
+    db._copy_integer_columns = {}
+    return db
+
+
+@pytest.mark.parametrize(("query_name", "table"), sorted(PER_HAND_INSERTS.items()))
+def test_each_per_hand_insert_has_a_copy_with_the_same_columns(query_name, table) -> None:
+    insert = Sql(db_server="postgresql").query[query_name]
+
+    statement = database_bulk_import.copy_statement(insert)
+
+    assert statement.startswith(f"COPY {table} (")
+    assert statement.endswith(") FROM STDIN")
+    columns = statement[statement.index("(") + 1 : statement.index(")")].split(", ")
+    assert len(columns) == insert.count("%s")
+    assert columns[0] == "handId"
+
+
+def test_cache_inserts_do_not_stream() -> None:
+    # Cache rows are merged into existing ones; COPY could only append.
+    assert database_bulk_import.copy_statement(Sql(db_server="postgresql").query["insert_hudcache"]) is None
+
+
+def test_hands_keep_their_executemany() -> None:
+    # A configured hhBulkPath must not move Hands onto the server-file COPY.
+    assert database_bulk_import.copy_statement(Sql(db_server="postgresql").query["store_hand"]) is None
+
+
+def test_postgresql_streams_the_rows_through_copy() -> None:
+    cursor = RecordingCursor()
+    rows = [[1, i, 0, i, i, 1, 0, 0, 0, 0, None, False] for i in range(3)]
+
+    pg_host().executemany(cursor, Sql(db_server="postgresql").query["store_hands_actions"], rows)
+
+    assert cursor.batches == []
+    ((statement, copied),) = cursor.copied.items()
+    assert statement.startswith("COPY HandsActions (handId, playerId, street")
+    assert copied == rows
+
+
+def test_copy_coerces_what_the_text_format_rejects_in_integer_columns() -> None:
+    # DerivedStats hands over bools and floats where the columns are integers.
+    query = Sql(db_server="postgresql").query["store_boards"]
+    columns = query[query.index("(") + 1 : query.index(")")].split(",")
+    cursor = RecordingCursor(types={columns[1].strip(): TEXT, columns[2].strip(): FLOAT8})
+    db = pg_host()
+
+    db.executemany(cursor, query, [[True, 2.5, 2.5, 1.5, Decimal("2.5"), None, 7]])
+    db.executemany(cursor, query, [[False, "x", 0.5, 2.5, Decimal("-2.5"), 4.0, 8]])
+
+    (copied,) = cursor.copied.values()
+    assert copied == [[1, 2.5, 2.5, 2, 3, None, 7], [0, "x", 0.5, 2, -3, 4, 8]]
+    assert [type(v) for v in copied[0]] == [int, float, float, int, int, type(None), int]
+    assert len(cursor.selects) == 1, "column types are read once per statement"
+
+
+def test_other_backends_keep_executemany_batches(monkeypatch) -> None:
+    monkeypatch.setattr(database_bulk_import, "EXECUTEMANY_BATCH_SIZE", 2)
+    cursor = RecordingCursor()
+    db = pg_host()
+    db.backend = db.SQLITE
+    query = Sql(db_server="sqlite").query["store_boards"]
+
+    db.executemany(cursor, query, [[1], [2], [3]])
+
+    assert cursor.copied == {}
+    assert cursor.batches == [(query, [[1], [2]]), (query, [[3]])]
+
+
+def test_the_import_option_can_turn_copy_off() -> None:
+    cursor = RecordingCursor()
+    db = pg_host()
+    db.import_options["copyStream"] = False
+
+    db.executemany(cursor, Sql(db_server="postgresql").query["store_boards"], [[1, 0, 1, 2, 3, 4, 5]])
+
+    assert cursor.copied == {}
+    assert len(cursor.batches) == 1
+
+
+# --------------------------------------------------------------------------
+# Against a live server: COPY must store what the INSERTs store
+# --------------------------------------------------------------------------
+
+REGRESSION_HANDS = Path(__file__).resolve().parents[1] / "regression-test-files"
+# importTime is the wall clock at import, the only column the two runs cannot share.
+VOLATILE_COLUMNS = {"importtime"}
+COMPARED_TABLES = sorted({"Hands", *database_bulk_import.COPY_STREAM_TABLES})
+
+
+def regression_files(per_site: int = 3) -> list[Path]:
+    """A few hand histories from every site, cash games and tournaments."""
+    files = []
+    for kind in ("cash", "tour"):
+        for site in sorted(path for path in (REGRESSION_HANDS / kind).iterdir() if path.is_dir()):
+            files += sorted(path for path in site.rglob("*") if path.is_file() and path.suffix == ".txt")[:per_site]
+    return files
+
+
+def imported_rows(config: Any, *, copy_stream: bool) -> dict[str, list[tuple]]:
+    """Import the regression hands into an empty schema and read back the per-hand tables."""
+    from fpdb_3_legacy.Importer import Importer
+
+    import_parameters = config.get_import_parameters()
+    config.get_import_parameters = lambda: {**import_parameters, "copyStream": copy_stream}
+    db = Database.Database(config)
+    try:
+        db.recreate_tables()
+        importer = Importer(caller=None, settings={"testData": False, "threads": 1}, config=config, sql=None)
+        importer.database = db
+        for path in regression_files():
+            importer.addImportFile(str(path))
+        importer.runImport()
+        rows = {}
+        cursor = db.get_cursor()
+        for table in COMPARED_TABLES:
+            cursor.execute(f"SELECT * FROM {table}")
+            keep = [n for n, column in enumerate(cursor.description) if column[0].lower() not in VOLATILE_COLUMNS]
+            rows[table] = sorted((tuple(row[n] for n in keep) for row in cursor.fetchall()), key=repr)
+        db.commit()
+        return rows
+    finally:
+        db.disconnect()
+
+
+@pytest.mark.integration
+def test_copy_stores_the_same_rows_as_executemany(legacy_config, postgresql_server) -> None:
+    legacy_config.get_db_parameters().update(
+        {
+            "db-server": "postgresql",
+            "db-backend": Database.Database.PGSQL,
+            "db-host": postgresql_server["host"],
+            "db-port": postgresql_server["port"],
+            "db-databaseName": postgresql_server["dbname"],
+            "db-user": postgresql_server["user"],
+            "db-password": postgresql_server["password"],
+        }
+    )
+
+    inserted = imported_rows(legacy_config, copy_stream=False)
+    copied = imported_rows(legacy_config, copy_stream=True)
+
+    assert inserted["Hands"], "no regression hand was imported"
+    for table in COMPARED_TABLES:
+        assert copied[table] == inserted[table], table
@@ -561,6 +561,72 @@ def test_flushing_the_hud_cache_twice_updates_the_existing_row(fresh_db) -> None
     assert row == (2, 350)
 
 
+def test_flushing_a_tournament_hud_cache_twice_adds_to_the_row_in_place(fresh_db) -> None:
+    # A tournament key has no NULL in it, so the unique index decides between
+    # insert and update: one upsert per batch, no lookup.
+    start = datetime(2026, 7, 20, 14, 30)
+    stats = {"Hero": player_stats(position=0, tourney_type_id=7, totalProfit=300)}
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+    fresh_db.resetBulkCache()
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+
+    assert fresh_db._unique_cache_indexes == {"hudcache": True}
+    assert rows(fresh_db, "SELECT tourneyTypeId, n, totalProfit FROM HudCache") == [(7, 2, 600)]
+
+
+def test_a_flush_looks_up_the_stored_ring_rows_of_every_player_at_once(fresh_db) -> None:
+    start = datetime(2026, 7, 20, 14, 30)
+    pids = {f"P{i}": 100 + i for i in range(6)}
+    pdata = {name: player_stats(position=i, totalProfit=10) for i, name in enumerate(pids)}
+    fresh_db.storeHudCache(5, RING, pids, start, pdata, True)
+    fresh_db.resetBulkCache()
+
+    statements: list[str] = []
+    fresh_db.connection.set_trace_callback(statements.append)
+    fresh_db.storeHudCache(5, RING, pids, start, pdata, True)
+    fresh_db.connection.set_trace_callback(None)
+
+    assert len([q for q in statements if q.lstrip().upper().startswith("SELECT ID")]) == 1
+    assert rows(fresh_db, "SELECT COUNT(*), SUM(n), SUM(totalProfit) FROM HudCache") == [(6, 12, 120)]
+
+
+def test_without_the_unique_index_tournament_rows_are_looked_up_instead(fresh_db) -> None:
+    # A database whose index was lost must keep summing rather than raise.
+    fresh_db.get_cursor().execute("DROP INDEX HudCache_Compound_idx")
+    start = datetime(2026, 7, 20, 14, 30)
+    stats = {"Hero": player_stats(position=0, tourney_type_id=7, totalProfit=300)}
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+    fresh_db.resetBulkCache()
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+
+    assert fresh_db._unique_cache_indexes == {"hudcache": False}
+    assert rows(fresh_db, "SELECT tourneyTypeId, n, totalProfit FROM HudCache") == [(7, 2, 600)]
+
+
+def test_an_index_of_the_same_name_that_is_not_unique_does_not_enable_the_upsert(fresh_db) -> None:
+    cursor = fresh_db.get_cursor()
+    cursor.execute("DROP INDEX HudCache_Compound_idx")
+    cursor.execute("CREATE INDEX HudCache_Compound_idx ON HudCache (gametypeId, playerId)")
+    start = datetime(2026, 7, 20, 14, 30)
+    stats = {"Hero": player_stats(position=0, tourney_type_id=7, totalProfit=300)}
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+    fresh_db.resetBulkCache()
+    fresh_db.storeHudCache(5, TOUR, {"Hero": 11}, start, stats, True)
+
+    assert fresh_db._unique_cache_indexes == {"hudcache": False}
+    assert rows(fresh_db, "SELECT tourneyTypeId, n, totalProfit FROM HudCache") == [(7, 2, 600)]
+
+
+@pytest.mark.parametrize("name", sorted(database_caches.KEYED_CACHES))
+def test_the_upsert_names_the_key_columns_the_writers_pack(name) -> None:
+    # sql_queries_cache_upsert spells its columns out like every query module;
+    # the writers pack their keys from KEYED_CACHES.
+    _table, _index, keys, _statistics = database_caches.KEYED_CACHES[name]
+    query = SQL.Sql(db_server="sqlite").query[f"upsert_{name}"]
+
+    assert f"ON CONFLICT ({', '.join(keys)})" in query
+
+
 # --------------------------------------------------------------------------
 # CACHE_KEYS and the narrow caches
 #
@@ -581,6 +647,9 @@ CACHE_INSERTS = {
     "insert_TC": 5 + len(SESSION_CACHE_KEYS),
     "insert_cardscache": 6 + len(SESSION_CACHE_KEYS),
     "insert_positionscache": 8 + len(SESSION_CACHE_KEYS),
+    "upsert_hudcache": 6 + len(CACHE_KEYS) + len(HUDCACHE_EXTRA_KEYS),
+    "upsert_cardscache": 6 + len(SESSION_CACHE_KEYS),
+    "upsert_positionscache": 8 + len(SESSION_CACHE_KEYS),
 }
 
 
@@ -617,6 +686,9 @@ CACHE_WRITE_QUERIES = {
     "insert_hudcache": "HudCache",
     "update_hudcache": "HudCache",
     "select_SC": "SessionsCache",
+    "upsert_cardscache": "CardsCache",
+    "upsert_positionscache": "PositionsCache",
+    "upsert_hudcache": "HudCache",
 }
 
 
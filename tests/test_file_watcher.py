@@ -0,0 +1,81 @@
+"""Auto-import must hear about changed files from the OS instead of walking for them.
+
+With inotify available, a cycle looks only at the files the watcher reported --
+no directory walk, no stat of every tracked file -- and anything the watcher
+cannot vouch for (a directory just added, a queue overflow) sends the importer
+back to the full walk.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from fpdb_3_legacy import file_watcher
+
+ROOT = Path(__file__).resolve().parents[1]
+HAND = ROOT / "tests/fixtures/hands/pokerstars/holdem/cash_nl_6max.txt"
+
+pytestmark = pytest.mark.skipif(file_watcher.create_watcher() is None, reason="inotify is not available")
+
+
+@pytest.fixture
+def watcher():
+    w = file_watcher.create_watcher()
+    yield w
+    w.close()
+
+
+def test_a_new_directory_is_walked_once_then_only_changes_are_reported(watcher, tmp_path) -> None:
+    (tmp_path / "old.txt").write_text("old", encoding="utf-8")
+    assert watcher.watch(str(tmp_path))
+    assert watcher.take() is None
+
+    (tmp_path / "new.txt").write_text("new", encoding="utf-8")
+    assert watcher.poll(2.0)
+
+    assert watcher.take() == {str(tmp_path / "new.txt")}
+    assert watcher.take() == set()
+
+
+def test_files_in_a_new_subdirectory_are_reported(watcher, tmp_path) -> None:
+    watcher.watch(str(tmp_path))
+    watcher.take()
+
+    (tmp_path / "2026").mkdir()
+    watcher.poll(2.0)
+    (tmp_path / "2026" / "table.txt").write_text("hand", encoding="utf-8")
+    watcher.poll(2.0)
+
+    assert str(tmp_path / "2026" / "table.txt") in watcher.take()
+
+
+def test_an_unwatched_directory_reports_nothing(watcher, tmp_path) -> None:
+    watcher.watch(str(tmp_path))
+    watcher.take()
+
+    watcher.unwatch(str(tmp_path))
+    (tmp_path / "late.txt").write_text("late", encoding="utf-8")
+
+    assert not watcher.poll(0.2)
+    assert watcher.take() == set()
+
+
+def test_a_watched_cycle_imports_the_new_file_without_walking(importer, tmp_path) -> None:
+    importer.setMode("auto")
+    importer.setCallHud(False)
+    importer.caller = MagicMock()
+    importer.addImportDirectory(str(tmp_path), monitor=True, site=("PokerStars", "hh"))
+    assert importer.watcher is not None
+    importer.runUpdated()  # the first cycle walks the new directory
+
+    (tmp_path / "HH20240101 Table.txt").write_text(HAND.read_text(encoding="utf-8"), encoding="utf-8")
+    assert importer.waitForChanges(2.0)
+    importer.addImportDirectory = MagicMock(side_effect=AssertionError("walked the directory"))
+    importer.runUpdated()
+
+    importer.caller.addText.assert_called_once()
+    assert "OK (1 stored)" in importer.caller.addText.call_args.args[0]
+    importer.stopWatching()
@@ -0,0 +1,121 @@
+"""Rebuilding several stored hands at once against rebuilding them one by one.
+
+``hands_factory`` reads a whole list of hands with one query per table, where
+``hand_factory`` reads a hand at a time. The viewer, the tournament viewer and
+the replayer now go through the former, so a hand must come back from it
+exactly as it does alone.
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fpdb_3_legacy.Hand import hand_factory, hands_factory
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Hold'em, run it twice, draw and stud each rebuild their streets differently;
+# the cashed-out hand brings back its HandsCashout rows.
+HANDS = [
+    "tests/fixtures/hands/pokerstars/holdem/5card_omaha.txt",
+    "regression-test-files/cash/Stars/Flop/PLO-6max-USD-200-400-201505.rit.leaves.table.txt",
+    "tests/fixtures/hands/pokerstars/holdem/cashed_out.txt",
+    "tests/fixtures/hands/pokerstars/draw/5card_draw.txt",
+    "tests/fixtures/hands/pokerstars/stud/7stud.txt",
+]
+
+FIELDS = (
+    "handid",
+    "tablename",
+    "startTime",
+    "players",
+    "board",
+    "actions",
+    "actionStreets",
+    "allStreets",
+    "collectees",
+    "totalpot",
+    "rake",
+    "hero",
+    "runItTimes",
+    "showdownStrings",
+    "winningHand",
+    "cashOutAmounts",
+    "cashOutFees",
+    "splashWinnings",
+    "handid_selected",
+)
+
+
+def import_hands(importer: Any, db: Any, tmp_path: Path) -> list[int]:
+    for relative in HANDS:
+        source = ROOT / relative
+        copy = tmp_path / source.name
+        shutil.copy(source, copy)
+        importer.addImportFile(str(copy), "PokerStars")
+    importer.runImport()
+    cursor = db.get_cursor()
+    cursor.execute("SELECT id FROM Hands ORDER BY id")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def statements(db: Any, run) -> list[str]:
+    seen: list[str] = []
+    db.connection.set_trace_callback(seen.append)
+    try:
+        run()
+    finally:
+        db.connection.set_trace_callback(None)
+    return seen
+
+
+def test_every_hand_comes_back_as_it_does_alone(importer, fresh_db, legacy_config, tmp_path) -> None:
+    hand_ids = import_hands(importer, fresh_db, tmp_path)
+    assert len(hand_ids) >= len(HANDS)
+
+    batched = hands_factory(hand_ids, legacy_config, fresh_db)
+
+    assert list(batched) == hand_ids
+    for hand_id in hand_ids:
+        alone = hand_factory(hand_id, legacy_config, fresh_db)
+        together = batched[hand_id]
+        assert type(together) is type(alone)
+        for name in FIELDS:
+            assert getattr(together, name, None) == getattr(alone, name, None), (hand_id, name)
+
+
+def test_a_list_of_hands_costs_a_fixed_number_of_reads(importer, fresh_db, legacy_config, tmp_path) -> None:
+    hand_ids = import_hands(importer, fresh_db, tmp_path)
+    fresh_db._gameinfo_cache.clear()
+
+    one = statements(fresh_db, lambda: hands_factory(hand_ids[:1], legacy_config, fresh_db))
+    fresh_db._gameinfo_cache.clear()
+    every = statements(fresh_db, lambda: hands_factory(hand_ids, legacy_config, fresh_db))
+
+    assert len(every) == len(one)
+
+
+def test_missing_hands_come_back_as_none(importer, fresh_db, legacy_config, tmp_path) -> None:
+    hand_ids = import_hands(importer, fresh_db, tmp_path)
+
+    batched = hands_factory([hand_ids[0], 999_999], legacy_config, fresh_db)
+
+    assert batched[hand_ids[0]] is not None
+    assert batched[999_999] is None
+
+
+def test_a_hand_that_cannot_be_rebuilt_does_not_cost_the_others(importer, fresh_db, legacy_config, tmp_path) -> None:
+    hand_ids = import_hands(importer, fresh_db, tmp_path)
+    broken = hand_ids[1]
+    fresh_db.get_cursor().execute("UPDATE HandsActions SET street = 40 WHERE handId = ?", (broken,))
+
+    batched = hands_factory(hand_ids, legacy_config, fresh_db)
+
+    with pytest.raises(IndexError):
+        hand_factory(broken, legacy_config, fresh_db)
+    assert batched[broken] is None
+    assert all(batched[hand_id] is not None for hand_id in hand_ids if hand_id != broken)
@@ -11,13 +11,15 @@ parser its files must be identified as.
 
 from __future__ import annotations
 
+import re
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
 from fpdb_3_legacy.Configuration import Config
-from fpdb_3_legacy.IdentifySite import IdentifySite
+from fpdb_3_legacy.IdentifySite import IDENTIFY_READ_CHUNK, IdentifySite
 
 ROOT = Path(__file__).resolve().parents[1]
 CASH = ROOT / "regression-test-files" / "cash"
@@ -217,3 +219,88 @@ def test_clearing_the_list_forgets_what_was_scanned(identifier, tmp_path) -> Non
     identifier.clear_filelist()
 
     assert identifier.get_filelist() == {}
+
+
+# --------------------------------------------------------------------------
+# Identifying from the start of a file
+# --------------------------------------------------------------------------
+
+
+def identity(found: Any) -> tuple | None:
+    if not found:
+        return None
+    return (found.site.name, found.ftype, found.archive, found.archiveHead, found.archiveDivider, found.hero)
+
+
+def test_the_start_of_a_file_identifies_it_as_the_whole_file_did(identifier) -> None:
+    files = sorted(path for path in CASH.rglob("*") if is_candidate(path) and path.stat().st_size > 0)
+
+    for path in files:
+        text, codec = identifier.read_file(str(path))
+        whole = identifier.idSite(str(path), text, codec) if text else None
+        identifier.clear_filelist()
+        identifier.identified.clear()
+        identifier.processFile(str(path))
+
+        assert identity(identifier.get_fobj(str(path))) == identity(whole), path
+
+
+def test_an_archive_divider_past_the_read_prefix_is_still_found(identifier, tmp_path) -> None:
+    hand = hand_histories("Stars")[0].read_text(encoding="utf-8-sig")
+    archive = tmp_path / "archive.txt"
+    archive.write_text(hand + "\n" * 3 + " " * (4 * IDENTIFY_READ_CHUNK) + "\nHand #2\r\n" + hand, encoding="utf-8")
+
+    head, codec, complete = identifier.read_prefix(str(archive))
+    identifier.clear_filelist()
+    identifier.processFile(str(archive))
+
+    assert not complete
+    assert len(head.encode(codec)) < archive.stat().st_size
+    assert identifier.get_fobj(str(archive)).archiveDivider
+
+
+def test_an_unchanged_file_is_not_read_again(identifier, tmp_path, monkeypatch) -> None:
+    import shutil
+
+    copy = Path(shutil.copy(hand_histories("Winamax")[0], tmp_path))
+    identifier.clear_filelist()
+    identifier.processFile(str(copy))
+    reads: list[str] = []
+    read_prefix = identifier.read_prefix
+    monkeypatch.setattr(identifier, "read_prefix", lambda path: reads.append(path) or read_prefix(path))
+
+    identifier.clear_filelist()
+    identifier.processFile(str(copy))
+    assert reads == []
+    assert identifier.get_fobj(str(copy)).site.filter_name == "Winamax"
+
+    with copy.open("a", encoding="utf-8") as grown:
+        grown.write("\n\n")
+    identifier.clear_filelist()
+    identifier.processFile(str(copy))
+    assert reads == [str(copy)]
+
+
+def test_the_first_listed_site_wins_when_two_match() -> None:
+    first = SimpleNamespace(name="First", filter_name="First", re_Identify=re.compile(r"Game #\d+"))
+    second = SimpleNamespace(name="Second", filter_name="Second", re_Identify=re.compile(r"^Poker"))
+    identifier = IdentifySite.__new__(IdentifySite)
+    identifier.sitelist = {1: first, 2: second}
+
+    # The second site matches further left, but the first is listed first.
+    assert identifier._first_identified_site("Poker Game #12") == (first, [])
+    identifier.sitelist = {2: second, 1: first}
+    assert identifier._first_identified_site("Poker Game #12") == (second, [])
+    assert identifier._first_identified_site("Game #12") == (first, [second])
+    assert identifier._first_identified_site("nothing") == (None, [second, first])
+
+
+def test_a_combined_match_outside_the_site_groups_asks_every_site(monkeypatch) -> None:
+    from fpdb_3_legacy import IdentifySite as identify_module
+
+    site = SimpleNamespace(name="Site", filter_name="Site", re_Identify=re.compile(r"Game #\d+"))
+    identifier = IdentifySite.__new__(IdentifySite)
+    identifier.sitelist = {1: site}
+    monkeypatch.setattr(identify_module, "_combined_identify", lambda _specs: re.compile(r"(Game) #\d+"))
+
+    assert identifier._first_identified_site("Game #12") == (site, [])
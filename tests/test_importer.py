@@ -63,6 +63,31 @@ def test_the_same_file_imported_twice_is_counted_as_a_duplicate(importer, fresh_
     assert counts(fresh_db, "Hands") == 1
 
 
+def test_a_file_is_checked_for_duplicates_with_one_query(importer, fresh_db, tmp_path) -> None:
+    # One lookup per hand made re-importing a large archive a query per hand.
+    holdem = ROOT / "tests/fixtures/hands/pokerstars/holdem"
+    source = tmp_path / "session.txt"
+    source.write_text(
+        "".join(
+            (holdem / name).read_text(encoding="utf-8").strip() + "\n\n\n"
+            for name in ("cash_nl_6max.txt", "multi_pot.txt", "straddle.txt", "walk.txt")
+        ),
+        encoding="utf-8",
+    )
+    importer.addImportFile(str(source), "PokerStars")
+    stored, *_ = importer.runImport()
+    assert stored == 4
+    assert fresh_db.duplicate_lookups == {"memory": 4, "database": 1}
+
+    importer.clearFileList()
+    importer.addImportFile(str(source), "PokerStars")
+    stored, duplicates, *_ = importer.runImport()
+
+    assert (stored, duplicates) == (0, 4)
+    assert fresh_db.duplicate_lookups == {"memory": 8, "database": 2}
+    assert counts(fresh_db, "Hands") == 4
+
+
 def test_a_file_that_is_not_a_hand_history_is_never_queued(importer, tmp_path) -> None:
     stranger = tmp_path / "shopping-list.txt"
     stranger.write_text("milk, eggs, a new mouse\n", encoding="utf-8")
@@ -125,6 +150,54 @@ def test_a_directory_is_imported_whole(importer, fresh_db, tmp_path) -> None:
     assert counts(fresh_db, "Hands") >= 1
 
 
+def _stored_hands(db: Any) -> list[tuple[int, str]]:
+    cursor = db.get_cursor()
+    cursor.execute("SELECT id, siteHandNo FROM Hands ORDER BY id")
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def test_parsing_on_worker_processes_stores_what_a_serial_import_does(importer, fresh_db, tmp_path) -> None:
+    # The pool only parses; ids, tallies and rows must not depend on it.
+    folder = tmp_path / "histories"
+    for name in ("cash_nl_6max.txt", "multi_pot.txt", "straddle.txt", "walk.txt"):
+        staged(folder, HAND.parent / name)
+    importer.addBulkImportImportFileOrDir(str(folder), site="PokerStars")
+    serial = importer.runImport()[:5]
+    serial_hands = _stored_hands(fresh_db)
+
+    fresh_db.recreate_tables()
+    importer.clearFileList()
+    importer.setParseWorkers(2)
+    importer.addBulkImportImportFileOrDir(str(folder), site="PokerStars")
+    parallel = importer.runImport()[:5]
+
+    assert serial[0] == 4
+    assert parallel == serial
+    assert _stored_hands(fresh_db) == serial_hands
+
+
+def test_cached_converters_stay_converters_with_parse_workers(importer, fresh_db, tmp_path) -> None:
+    from fpdb_3_legacy.HandHistoryConverter import HandHistoryConverter
+
+    folder = tmp_path / "histories"
+    for name in ("cash_nl_6max.txt", "walk.txt"):
+        staged(folder, HAND.parent / name)
+    importer.setParseWorkers(2)
+    importer.setFakeCacheHHC(True)
+    importer.addBulkImportImportFileOrDir(str(folder), site="PokerStars")
+
+    importer.runImport()
+
+    cached = [importer.getCachedHHC(path) for path in importer.filelist]
+    assert all(isinstance(hhc, HandHistoryConverter) for hhc in cached)
+
+
+def test_zero_parse_workers_means_one_per_spare_core(importer) -> None:
+    importer.setParseWorkers(0)
+
+    assert importer.settings["parseWorkers"] >= 1
+
+
 def test_removing_a_directory_takes_its_files_off_the_list(importer, tmp_path) -> None:
     folder = tmp_path / "histories"
     staged(folder, HAND)
@@ -224,6 +297,7 @@ def test_a_cached_converter_is_kept_once_caching_is_on(importer, tmp_path) -> No
         ("setHandCount", "handCount", 25),
         ("setQuiet", "quiet", True),
         ("setThreads", "threads", 2),
+        ("setParseWorkers", "parseWorkers", 3),
         ("setDropIndexes", "dropIndexes", "auto"),
         ("setDropHudCache", "dropHudCache", "auto"),
         ("setStarsArchive", "starsArchive", True),
@@ -7,6 +7,7 @@ from xml.dom import minidom
 
 import pytest
 
+from fpdb_3_legacy import AutoNotes
 from fpdb_3_legacy.AutoNotePlo import (
     is_aaxx,
     is_rainbow,
@@ -22,22 +23,27 @@ from fpdb_3_legacy.AutoNotes import (
     available_rule_ids,
     available_rule_set_ids,
     available_rule_sets,
+    compile_rule_plan,
     configured_rule_summary,
     filter_generated_notes,
     format_generated_notes,
     format_note_evidence,
     format_rule_summary,
+    format_rule_timings,
     generate_for_hand,
     max_auto_notes_per_hand,
     max_auto_notes_per_player_per_hand,
     rule_enabled,
     rule_manifest,
     rule_note_template,
+    rule_plan,
     rule_set_enabled,
     set_autonotes_enabled,
     set_rule_enabled,
     set_rule_note_template,
     set_rule_set_enabled,
+    start_rule_timing,
+    stop_rule_timing,
     summarize_generated_notes,
     summarize_generated_notes_by_rule_set,
 )
@@ -58,6 +64,8 @@ from fpdb_3_legacy.backfill_autonotes import (
 from fpdb_3_legacy.backfill_autonotes import (
     main as backfill_main,
 )
+from fpdb_3_legacy.ConfigObservers import AutoNotesConfigObserver
+from fpdb_3_legacy.ConfigurationManager import ChangeType, ConfigurationManager
 from fpdb_3_legacy.Database import Database
 from fpdb_3_legacy.SQL import Sql
 
@@ -1910,3 +1918,110 @@ def test_backfill_prepare_hand_sets_ids_and_generates_notes():
     assert {note.rule_id for note in notes} >= {"hwang_plo_081"}
     assert all(note.hand_id == 555 for note in notes)
     assert any(note.player_id == 11 for note in notes)
+
+
+RULE_PLAN_CONFIGS = [
+    "<FreePokerToolsConfig/>",
+    '<FreePokerToolsConfig><autonotes enabled="False"/></FreePokerToolsConfig>',
+    '<FreePokerToolsConfig><autonotes maxPerHand="3" maxPerPlayerPerHand="1">'
+    '<ruleset name="hwang_plo_preflop" enabled="True">'
+    '<rule id="hwang_plo_081" enabled="False"/>'
+    '<rule id="hwang_plo_082" noteTemplate="{player}: templated"/>'
+    "</ruleset>"
+    '<ruleset name="hwang_plo_preflop" enabled="False">'
+    '<rule id="hwang_plo_081" enabled="True"/>'
+    '<rule id="hwang_plo_083" enabled="False"/>'
+    "</ruleset>"
+    '<ruleset name="range_capture" enabled="True"/>'
+    '<rule id="hwang_plo_084" enabled="False"/>'
+    "</autonotes></FreePokerToolsConfig>",
+]
+
+
+@pytest.mark.parametrize("xml", RULE_PLAN_CONFIGS)
+def test_rule_plan_matches_the_config_lookups(xml):
+    config = config_from_xml(xml)
+
+    plan = compile_rule_plan(config)
+
+    expected = {}
+    for rule_set in available_rule_sets():
+        if not rule_set_enabled(config, rule_set.rule_set_id, default=rule_set.enabled_by_default):
+            continue
+        rules = [rule.rule_id for rule in rule_set.rules if rule_enabled(config, rule.rule_id, rule_set.rule_set_id)]
+        if rules:
+            expected[rule_set.rule_set_id] = rules
+    assert {rule_set.rule_set_id: [rule.rule_id for rule in rule_set.rules] for rule_set in plan.rule_sets} == expected
+    for rule_set in plan.rule_sets:
+        for rule in rule_set.rules:
+            template = rule_note_template(config, rule.rule_id, rule_set.rule_set_id, rule.note_template)
+            assert plan.templates.get((rule_set.rule_set_id, rule.rule_id), rule.note_template) == template
+    assert plan.enabled == autonotes_enabled(config)
+    assert plan.max_per_hand == max_auto_notes_per_hand(config)
+    assert plan.max_per_player == max_auto_notes_per_player_per_hand(config)
+
+
+def test_rule_plan_is_reused_until_a_setter_changes_the_rules(monkeypatch):
+    legacy_hand = hand(
+        ["BTN", "SB"],
+        {"BTN": ["As", "Kh", "Qd", "7c"], "SB": ["Ks", "Kh", "Qd", "7c"]},
+        [("BTN", "raises", 3), ("SB", "raises", 10)],
+        {"BTN": 0, "SB": "S"},
+    )
+    config = config_from_xml("<FreePokerToolsConfig/>")
+    reads = []
+    read_switches = AutoNotes._read_switches
+    monkeypatch.setattr(AutoNotes, "_read_switches", lambda cfg: reads.append(cfg) or read_switches(cfg))
+
+    first = generate_for_hand(legacy_hand, config=config)
+    second = generate_for_hand(legacy_hand, config=config)
+    assert first == second
+    assert len(reads) == 1
+    assert "hwang_plo_081" in {note.rule_id for note in first}
+
+    set_rule_enabled(config, "hwang_plo_081", False, rule_set_name="hwang_plo_preflop")
+
+    assert "hwang_plo_081" not in {note.rule_id for note in generate_for_hand(legacy_hand, config=config)}
+    assert len(reads) == 2
+
+
+def test_autonotes_observer_drops_plans_when_the_config_section_changes(monkeypatch):
+    old_config = config_from_xml("<FreePokerToolsConfig><autonotes/></FreePokerToolsConfig>")
+    new_config = config_from_xml('<FreePokerToolsConfig><autonotes enabled="False"/></FreePokerToolsConfig>')
+
+    changes = ConfigurationManager()._identify_changes(old_config, new_config)
+
+    autonote_changes = [change for change in changes if change.type == ChangeType.AUTONOTE_SETTINGS]
+    assert [change.path for change in autonote_changes] == ["autonotes"]
+    assert ConfigurationManager()._identify_changes(old_config, old_config) == []
+
+    rule_plan(old_config)
+    reads = []
+    monkeypatch.setattr(AutoNotes, "_read_switches", lambda cfg: reads.append(cfg) or AutoNotes._AutoNoteSwitches())
+    rule_plan(old_config)
+    assert reads == []
+    assert AutoNotesConfigObserver().on_config_change(autonote_changes[0])
+    rule_plan(old_config)
+    assert reads == [old_config]
+
+
+def test_rule_timings_report_each_evaluated_rule():
+    legacy_hand = hand(
+        ["BTN", "SB"],
+        {"BTN": ["As", "Kh", "Qd", "7c"], "SB": ["Ks", "Kh", "Qd", "7c"]},
+        [("BTN", "raises", 3), ("SB", "raises", 10)],
+        {"BTN": 0, "SB": "S"},
+    )
+
+    timings = start_rule_timing()
+    try:
+        generate_for_hand(legacy_hand, rule_ids={"hwang_plo_081", "hwang_plo_082"})
+    finally:
+        assert stop_rule_timing() is timings
+
+    report = {(row["ruleSet"], row["rule"]): row for row in timings.report()}
+    assert set(report) == {("hwang_plo_preflop", "hwang_plo_081"), ("hwang_plo_preflop", "hwang_plo_082")}
+    assert all(row["calls"] == 2 for row in report.values())
+    assert "hwang_plo_081" in format_rule_timings(timings)
+    generate_for_hand(legacy_hand, rule_ids={"hwang_plo_081"})
+    assert report[("hwang_plo_preflop", "hwang_plo_081")]["calls"] == 2
@@ -0,0 +1,179 @@
+"""The cash stats grids rolled up from one scan against playerDetailedStats.
+
+The tab now reads ``ringStatsScan`` once and lets ``report_engine`` group it
+for the summary, starting-hand and position grids, where it used to run
+``playerDetailedStats`` once per grid. Each grid must come back with the rows,
+values and order the query gives.
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from fpdb_3_legacy.ring_stats import report_engine
+from fpdb_3_legacy.ring_stats.controller import RingStatsController
+from fpdb_3_legacy.ring_stats.report_engine import NO_DATA, ring_report
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Two currencies, hold'em and hi/lo Omaha, full ring, 6-max and heads-up.
+HANDS = [
+    "regression-test-files/cash/Stars/Flop/NLHE-FR-USD-0.01-0.02-201005.microgrind.txt",
+    "regression-test-files/cash/Stars/Flop/NLHE-6max-USD-0.05-0.10-200911.txt",
+    "regression-test-files/cash/Stars/Flop/NLHE-6max-EUR-0.05-0.10-200911.txt",
+    "regression-test-files/cash/Stars/Flop/PLO8-6max-USD-0.01-0.02-200911.txt",
+    "regression-test-files/cash/Stars/Flop/NLHE-2max-USD-0.25-0.50-201005.Hitnrun.txt",
+]
+
+GROUPS = [{}, {"posn": True}, {"limits": True}, {"seats": True}, {"limits": True, "posn": True, "seats": True}]
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    report_engine.clear_report_cache()
+    yield
+    report_engine.clear_report_cache()
+
+
+def import_hands(importer: Any, db: Any, tmp_path: Path) -> list[int]:
+    for relative in HANDS:
+        source = ROOT / relative
+        copy = tmp_path / source.name
+        shutil.copy(source, copy)
+        importer.addImportFile(str(copy), "PokerStars")
+    importer.runImport()
+    cursor = db.get_cursor()
+    # The two players with the most hands stand in for a hero on two sites.
+    cursor.execute("SELECT playerId FROM HandsPlayers GROUP BY playerId ORDER BY count(1) DESC, playerId LIMIT 2")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def filter_params(db: Any, playerids: list[int], groups: dict[str, bool]) -> tuple[Any, ...]:
+    cursor = db.get_cursor()
+    cursor.execute("SELECT DISTINCT category FROM Gametypes")
+    games = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT currency FROM Gametypes")
+    currencies = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT siteId FROM Gametypes")
+    sitenos = [row[0] for row in cursor.fetchall()]
+    widget = SimpleNamespace(get_limits_where_clause=lambda limits: "")
+    seats = {"from": 2, "to": 10}
+    dates = ("1970-01-01 00:00:00", "2100-01-01 00:00:00")
+    return (widget, playerids, sitenos, [], seats, groups, dates, games, currencies, 0)
+
+
+def fetch(db: Any, sql: str) -> tuple[list[tuple[Any, ...]], list[str]]:
+    cursor = db.get_cursor()
+    cursor.execute(sql)
+    return [tuple(row) for row in cursor.fetchall()], [d[0].lower() for d in cursor.description]
+
+
+def same(ours: Any, theirs: Any) -> bool:
+    if isinstance(theirs, float) or isinstance(ours, float):
+        if ours is None or theirs is None:
+            return ours is None and theirs is None
+        return ours == pytest.approx(theirs, rel=1e-9, abs=1e-9)
+    return ours == theirs
+
+
+@pytest.mark.parametrize("groups", GROUPS, ids=lambda g: "+".join(g) or "plain")
+def test_every_grid_matches_player_detailed_stats(importer, fresh_db, legacy_config, tmp_path, groups) -> None:
+    playerids = import_hands(importer, fresh_db, tmp_path)
+    controller = RingStatsController(fresh_db, legacy_config, fresh_db.sql)
+    params = filter_params(fresh_db, playerids, groups)
+
+    scan, scan_colnames = fetch(fresh_db, controller._get_refined_scan_sql(*params))
+    groupings = controller._report_groupings(groups, params[4])
+    reports = {name: (rows, colnames) for name, rows, colnames in ring_report(scan, scan_colnames, groupings)}
+    expected = {
+        "summary": fetch(fresh_db, controller._get_refined_sql("playerDetailedStats", False, *params)),
+        "hands": fetch(fresh_db, controller._get_refined_sql("playerDetailedStats", True, *params)),
+        "positions": fetch(
+            fresh_db, controller._get_refined_sql("playerDetailedStats", False, *params, force_position=True)
+        ),
+    }
+
+    for name, (rows, colnames) in expected.items():
+        ours, our_colnames = reports[name]
+        assert our_colnames == colnames, name
+        assert len(ours) == len(rows) > 0, name
+        for our_row, row in zip(ours, rows, strict=True):
+            for column, mine, theirs in zip(colnames, our_row, row, strict=True):
+                assert same(mine, theirs), (name, column, mine, theirs)
+
+
+def test_a_ratio_without_chances_reads_as_no_data() -> None:
+    colnames = ["playerid", "pname", "gametypeid", "startcards", "position", "seats", "base", "category"]
+    colnames += ["limittype", "name", "bigblind", "ante", "currency", "fast", "n", *report_engine._SUMMED]
+    row = [1, "hero", 3, 14, "B", 6, "hold", "holdem", "NL", "PokerStars", 10, 0, "USD", 0, 2]
+    row += [0] * len(report_engine._SUMMED)
+
+    ((_, rows, report_colnames),) = ring_report([row], colnames, [report_engine.Grouping("summary", "pname", "base")])
+
+    line = dict(zip(report_colnames, rows[0], strict=True))
+    assert line["vpip"] == NO_DATA
+    assert line["aggfrq"] is None
+    assert line["saw_f"] == 0.0
+    assert line["variance"] == 0.0
+
+
+def test_the_same_filters_reuse_the_scan_until_a_hand_is_imported(importer, fresh_db, legacy_config, tmp_path) -> None:
+    playerids = import_hands(importer, fresh_db, tmp_path)
+    controller = RingStatsController(fresh_db, legacy_config, fresh_db.sql)
+    widget, _, sitenos, limits, seats, groups, dates, games, currencies, num_hands = filter_params(
+        fresh_db, playerids, {}
+    )
+    widget.getSites = lambda: ["PokerStars"]
+    widget.getHeroes = lambda: {"PokerStars": "hero"}
+    widget.getSiteIds = lambda: {"PokerStars": sitenos[0]}
+    widget.getLimits = lambda: ["2nl"]
+    widget.getSeats = lambda: seats
+    widget.getGroups = lambda: groups
+    widget.getDates = lambda: dates
+    widget.getGames = lambda: games
+    widget.getCurrencies = lambda: currencies
+    widget.getNumHands = lambda: num_hands
+    fresh_db.get_player_id = lambda config, site, name: playerids[0]
+    ran: list[str] = []
+    run_query = controller._run_query
+    controller._run_query = lambda name, *args: (ran.append(name), run_query(name, *args))
+    scans: list[tuple[Any, ...]] = []
+    run_report_scan = controller._run_report_scan
+    controller._run_report_scan = lambda params: (scans.append(params), run_report_scan(params))
+    controller.refresh_all(widget)
+    replayed: list[tuple[str, int]] = []
+    controller._on_report_finished = lambda name, reports, colnames: replayed.extend(
+        (grid, len(rows)) for grid, rows, _ in reports
+    )
+
+    run_report_scan(scans[0])
+
+    assert ran == ["scan", "profit"]
+    assert [grid for grid, _ in replayed] == ["summary", "hands", "positions"]
+    assert all(count > 0 for _, count in replayed)
+
+
+def test_an_import_changes_the_cache_key() -> None:
+    db = SimpleNamespace(backend=4, host="localhost", database="fpdb", get_import_state=lambda: (41, 41))
+    before = report_engine.report_cache_key(db, "scan", "select 1")
+    report_engine.store_report(before, ([], []))
+    db.get_import_state = lambda: (42, 42)
+
+    assert report_engine.cached_report(before) == ([], [])
+    assert report_engine.cached_report(report_engine.report_cache_key(db, "scan", "select 1")) is None
+    assert report_engine.report_cache_key(SimpleNamespace(), "scan") is None
+
+
+def test_hands_stored_below_the_newest_id_change_the_cache_key() -> None:
+    # Another PostgreSQL importer filling a hand-id block it reserved earlier.
+    db = SimpleNamespace(backend=3, host="db", database="fpdb", get_import_state=lambda: (5000, 900))
+    before = report_engine.report_cache_key(db, "scan", "select 1")
+    report_engine.store_report(before, ([], []))
+    db.get_import_state = lambda: (5000, 901)
+
+    assert report_engine.cached_report(report_engine.report_cache_key(db, "scan", "select 1")) is None
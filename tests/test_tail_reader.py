@@ -0,0 +1,111 @@
+"""Auto-import must read only what was appended, and see the same text as a full read.
+
+Every poll builds a new converter at the importer's character offset. With a
+tail reader attached, the converter gets the appended text without the file
+being read or decoded again -- but the hands it parses, and the offset it hands
+back, must be exactly those of a full read.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from fpdb_3_legacy.Configuration import Config
+from fpdb_3_legacy.PokerStarsToFpdb import PokerStars
+from fpdb_3_legacy.tail_reader import TailReader
+
+ROOT = Path(__file__).resolve().parents[1]
+HOLDEM = ROOT / "tests/fixtures/hands/pokerstars/holdem"
+
+
+@pytest.fixture(scope="module")
+def config() -> Config:
+    return Config(file="HUD_config.xml")
+
+
+def poll(config: Config, path: Path, index: int, reader: TailReader | None) -> PokerStars:
+    hhc = PokerStars(config, in_path=str(path), index=index, autostart=False, sitename="PokerStars")
+    hhc.setAutoPop(True)
+    if reader is not None:
+        hhc.setTailReader(reader)
+    hhc.start()
+    if reader is not None:
+        reader.release(hhc.getLastCharacterRead())
+    return hhc
+
+
+def hand_ids(hhc: PokerStars) -> list[str]:
+    return [hand.handid for hand in hhc.getProcessedHands()]
+
+
+def test_a_poll_parses_the_appended_hand_exactly_like_a_full_read(config, tmp_path) -> None:
+    first = (HOLDEM / "cash_nl_6max.txt").read_text(encoding="utf-8").strip() + "\n\n\n"
+    second = (HOLDEM / "walk.txt").read_text(encoding="utf-8").strip() + "\n\n\n"
+    path = tmp_path / "session.txt"
+    path.write_text(first, encoding="utf-8")
+
+    reader = TailReader(str(path))
+    tailed = poll(config, path, 0, reader)
+    plain = poll(config, path, 0, None)
+    assert hand_ids(tailed) == hand_ids(plain)
+    assert tailed.getLastCharacterRead() == plain.getLastCharacterRead()
+
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(second)
+    index = tailed.getLastCharacterRead()
+    tailed = poll(config, path, index, reader)
+    plain = poll(config, path, index, None)
+
+    assert len(hand_ids(tailed)) == 1
+    assert hand_ids(tailed) == hand_ids(plain)
+    assert tailed.getLastCharacterRead() == plain.getLastCharacterRead()
+    assert reader.end == len(first) + len(second)
+
+
+def test_a_character_split_across_two_polls_is_decoded_whole(tmp_path) -> None:
+    path = tmp_path / "session.txt"
+    encoded = "Seat 1: Jérôme\n".encode()
+    cut = encoded.index("é".encode()) + 1
+    path.write_bytes(encoded[: cut - 1])
+    reader = TailReader(str(path))
+    reader.prime(cut - 1, encoded[: cut - 1].decode(), "utf-8")
+
+    # The client has written the first byte of "é" when the poll comes.
+    with path.open("ab") as fh:
+        fh.write(encoded[cut - 1 : cut])
+    assert reader.read_from(0) == "Seat 1: J"
+
+    with path.open("ab") as fh:
+        fh.write(encoded[cut:])
+    assert reader.read_from(0) == "Seat 1: Jérôme\n"
+
+
+def test_a_truncated_file_falls_back_to_a_full_read(tmp_path) -> None:
+    path = tmp_path / "session.txt"
+    path.write_text("x" * 100, encoding="utf-8")
+    reader = TailReader(str(path))
+    reader.prime(100, "x" * 100, "utf-8")
+
+    path.write_text("y" * 10, encoding="utf-8")
+
+    assert reader.read_from(50) is None
+    assert not reader.primed
+
+
+def test_a_resumed_read_sees_the_header_snapshot_then_the_new_text(tmp_path) -> None:
+    path = tmp_path / "session.xml"
+    text = "<session><general>NL 0.5/1</general><game>1</game>\n<game>2</game>\n"
+    path.write_text(text, encoding="utf-8")
+    reader = TailReader(str(path))
+    reader.prime(len(text), text, "utf-8", re.compile(r"</game>"))
+    reader.release(len(text))
+
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write("<game>3</game>\n")
+    obs = reader.read_from(len(text))
+
+    assert obs == "<game>3</game>\n"
+    assert reader.whole_file(len(text), obs) == "<session><general>NL 0.5/1</general><game>1</game><game>3</game>\n"
@@ -0,0 +1,112 @@
+"""Measure how fast a CoinPoker capture replays, in MB of capture per second.
+
+A saved capture used to go through ``tcpdump -x`` text (or libpcap with a
+per-byte copy) and a decoder that copied every nested TLV field. This replays
+the same traffic three ways and reports the throughput of each:
+
+* ``tcpdump text`` -- ``tcpdump -S -x`` lines fed to ``StreamReassembler``;
+* ``pcap file`` -- ``coinpoker_pcap.read_capture_file`` feeding the
+  reassembly directly;
+* ``decode only`` -- ``iter_game_events`` over the reassembled stream.
+
+Without ``--capture`` the traffic is the CoinPoker fixture hand repeated
+``--hands`` times, a third of the frames zlib-compressed, cut into 1400-byte
+segments.
+
+    python tools/bench_coinpoker_capture.py [--capture day.pcap] [--hands 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.coinpoker_live_capture import _events_from_lines, _events_from_segments  # noqa: E402
+from fpdb_3_legacy.coinpoker_pcap import read_capture_file  # noqa: E402
+from fpdb_3_legacy.coinpoker_protocol import encode_frame, iter_game_events  # noqa: E402
+
+FIXTURE = REPO / "test" / "data" / "coinpoker_hand_events.json"
+SEGMENT = 1400
+
+
+def synthetic_stream(hands: int) -> bytes:
+    events = json.loads(FIXTURE.read_text())
+    frames = [
+        encode_frame(
+            {"p": {"p": {"gameHandId": hand_id, "data": json.dumps(data)}, "c": name}, "a": 13},
+            compress=n % 3 == 0,
+        )
+        for n, (name, hand_id, data) in enumerate(events)
+    ]
+    return b"".join(frames) * hands
+
+
+def ipv4_packet(seq: int, payload: bytes) -> bytes:
+    tcp = struct.pack(">HHIIBBHHH", 9000, 55291, seq, 1, 5 << 4, 0x18, 501, 0, 0) + payload
+    return struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), 0, 0, 64, 6, 0, b"\x0a\0\0\x01", b"\x0a\0\0\x02") + tcp
+
+
+def write_pcap(path: Path, packets: Iterable[bytes]) -> None:
+    with path.open("wb") as stream:
+        stream.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 101))  # DLT_RAW
+        for packet in packets:
+            stream.write(struct.pack("<IIII", 0, 0, len(packet), len(packet)) + packet)
+
+
+def tcpdump_text(packets: Iterable[tuple[int, bytes]]) -> list[str]:
+    lines = []
+    for seq, packet in packets:
+        length = len(packet) - 40
+        lines.append(
+            f"01:00:00.000000 IP 10.0.0.1.9000 > 10.0.0.2.55291: Flags [P.], seq {seq}:{seq + length}, "
+            f"ack 1, win 501, length {length}"
+        )
+        for row in range(0, len(packet), 16):
+            words = packet[row : row + 16].hex(" ", -2)
+            lines.append(f"\t0x{row:04x}:  {words}")
+    return lines
+
+
+def throughput(name: str, size: int, run: Callable[[], int]) -> None:
+    start = time.perf_counter()
+    events = run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {events:>9} events {elapsed:8.2f} s {size / elapsed / 1e6:8.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture", type=Path, help="a recorded pcap/pcapng capture")
+    parser.add_argument("--hands", type=int, default=500, help="fixture hands in the synthetic capture")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.capture:
+            path = args.capture
+            segments = [(seq, bytes(payload)) for _, _, seq, payload in read_capture_file(str(path))]
+        else:
+            stream = synthetic_stream(args.hands)
+            segments = [(5000 + start, stream[start : start + SEGMENT]) for start in range(0, len(stream), SEGMENT)]
+            path = Path(scratch) / "capture.pcap"
+            write_pcap(path, (ipv4_packet(seq, payload) for seq, payload in segments))
+        size = path.stat().st_size
+        print(f"{path.name}: {size / 1e6:.1f} MB, {len(segments)} segments")
+
+        text = tcpdump_text((seq, ipv4_packet(seq, payload)) for seq, payload in segments)
+        throughput("tcpdump text", size, lambda: sum(1 for _ in _events_from_lines(text)))
+        throughput("pcap file", size, lambda: sum(1 for _ in _events_from_segments(read_capture_file(str(path)))))
+        stream = b"".join(payload for _, payload in segments)
+        throughput("decode only", size, lambda: sum(1 for _ in iter_game_events(stream)))
+
+
+if __name__ == "__main__":
+    main()
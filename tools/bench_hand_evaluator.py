@@ -0,0 +1,87 @@
+"""Time the table hand evaluator: building its tables, ranking hands, and Monte-Carlo equity.
+
+The replayer ranked a hand by sorting Python lists for each of its five-card
+subsets, and without pypoker-eval there was no equity at all. This times
+``hand_evaluator`` one hand at a time (what the replayer calls), batched over
+NumPy arrays of random seven-card hands, and as the ``TablePokerEval`` equity
+backend on a flop all-in, against the replayer's former ranker.
+
+    python tools/bench_hand_evaluator.py [--hands 1000000] [--iterations 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy import hand_evaluator  # noqa: E402
+from fpdb_3_legacy.equity import calculate_equity  # noqa: E402
+
+_RANK_VALUE = {rank: value for value, rank in enumerate("23456789TJQKA", start=2)}
+
+
+def sorted_lists_rank(cards) -> tuple:
+    """The replayer's former five-card ranker (straights and flushes included)."""
+    values = sorted((_RANK_VALUE[card[0]] for card in cards), reverse=True)
+    counts = Counter(values)
+    by_count = sorted(values, key=lambda value: (counts[value], value), reverse=True)
+    flush = len({card[1] for card in cards}) == 1
+    distinct = sorted(set(values), reverse=True)
+    straight = len(distinct) == 5 and distinct[0] - distinct[4] == 4
+    shape = sorted(counts.values(), reverse=True)
+    return (flush, straight, shape, by_count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=1_000_000, help="seven-card hands for the batched run")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Monte-Carlo deals")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    hand_evaluator.load_tables()
+    print(f"build tables             {time.perf_counter() - start:8.2f} s")
+
+    rng = random.Random(1)
+    sevens = [rng.sample(hand_evaluator.DECK, 7) for _ in range(20_000)]
+    start = time.perf_counter()
+    for cards in sevens:
+        max(sorted_lists_rank(five) for five in itertools.combinations(cards, 5))
+    elapsed = time.perf_counter() - start
+    print(f"sorted lists, 21 subsets {len(sevens) / elapsed:12,.0f} hands/s")
+    start = time.perf_counter()
+    for cards in sevens:
+        hand_evaluator.evaluate_cards(cards)
+    elapsed = time.perf_counter() - start
+    print(f"tables, one at a time    {len(sevens) / elapsed:12,.0f} hands/s")
+
+    batch = np.random.default_rng(1).random((args.hands, 52)).argsort(axis=1)[:, :7]
+    start = time.perf_counter()
+    hand_evaluator.evaluate(batch)
+    elapsed = time.perf_counter() - start
+    print(f"tables, batched          {args.hands / elapsed:12,.0f} hands/s")
+
+    for game, pockets in (
+        ("holdem", [["As", "Ks"], ["Qd", "Qc"]]),
+        ("omaha", [["As", "Ks", "Jd", "Td"], ["Qd", "Qc", "8h", "7h"]]),
+    ):
+        start = time.perf_counter()
+        calculate_equity(
+            game, pockets, ["2s", "9d", "Th"], iterations=args.iterations, backend=hand_evaluator.TablePokerEval(1)
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{game} flop equity      {args.iterations / elapsed:12,.0f} boards/s")
+
+
+if __name__ == "__main__":
+    main()
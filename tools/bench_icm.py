@@ -0,0 +1,88 @@
+"""Time ICM equities for final tables and large fields.
+
+The replayer's original ICM recursion summed over every finishing order in
+``Decimal``, which is factorial in the number of players. ``fpdb_3_legacy.icm``
+walks sets of finished players instead and samples finishing orders past a size
+limit. This times the exact model on 6- to 12-handed tables paying every place,
+checks it against a brute-force sum over finishing orders where that is still
+affordable, and times the sampled model on a large multi-table field.
+
+    python tools/bench_icm.py [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from itertools import permutations
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.icm import exact_icm, exact_state_count, icm_equities  # noqa: E402
+
+# Brute force over finishing orders is only run up to this many players.
+BRUTE_FORCE_PLAYERS = 7
+
+
+def stacks_for(players: int) -> list[float]:
+    return [1_000.0 + 750.0 * (i * 7 % players) for i in range(players)]
+
+
+def payouts_for(places: int) -> list[float]:
+    return [float(2 ** (places - i)) for i in range(places)]
+
+
+def brute_force(stacks: list[float], payouts: list[float]) -> list[float]:
+    """The textbook sum over every finishing order."""
+    equities = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks))):
+        probability = 1.0
+        left = sum(stacks)
+        for player in order:
+            probability *= stacks[player] / left
+            left -= stacks[player]
+        for place, player in enumerate(order[: len(payouts)]):
+            equities[player] += probability * payouts[place]
+    return equities
+
+
+def best_of(repeat: int, run) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per case; the fastest is reported")
+    args = parser.parse_args()
+    repeat = max(1, args.repeat)
+
+    print("exact model, every place paid")
+    for players in (6, 9, 12):
+        stacks = stacks_for(players)
+        payouts = payouts_for(players)
+        elapsed = best_of(repeat, lambda: exact_icm(stacks, payouts))
+        line = f"  {players:2d} players  {exact_state_count(players, players):6d} sets  {elapsed * 1000:8.2f} ms"
+        if players <= BRUTE_FORCE_PLAYERS:
+            reference = brute_force(stacks, payouts)
+            error = max(abs(a - b) for a, b in zip(exact_icm(stacks, payouts), reference, strict=True))
+            line += f"  max difference from brute force {error:.1e}"
+        print(line)
+
+    players, places = 180, 27
+    stacks = stacks_for(players)
+    payouts = payouts_for(places)
+    elapsed = best_of(max(1, repeat // 10), lambda: icm_equities(stacks, payouts))
+    print(f"sampled model, {players} players, {places} places paid: {elapsed * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
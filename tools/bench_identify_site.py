@@ -0,0 +1,87 @@
+"""Time site identification over a directory of hand histories.
+
+``IdentifySite`` used to read and decode every file whole -- retrying the full
+read per code page -- and then try each site's regex in turn on its first 5000
+characters. It now decodes a bounded prefix once, runs one combined regex over
+it, and remembers each file by size and mtime. This copies some of the
+regression corpus into a scratch directory, grown to a realistic session size,
+and times the whole-file path against the prefix path and against a rescan of
+the unchanged directory.
+
+    python tools/bench_identify_site.py [--files 2000] [--hands 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.Configuration import Config  # noqa: E402
+from fpdb_3_legacy.IdentifySite import IdentifySite  # noqa: E402
+
+SOURCES = [
+    "regression-test-files/cash/Stars/Flop/NLHE-FR-USD-0.01-0.02-201005.microgrind.txt",
+    "regression-test-files/cash/Winamax/Flop/NLHE-2max-EUR-2-4-201704.go.fast.txt",
+    "regression-test-files/cash/FTP/Flop/6-Card-PLO-6max-USD-0.50-1.00-201307.txt",
+    "regression-test-files/cash/PartyPoker/Flop/LHE-6max-USD-15-30-201104.live.second.sb.txt",
+]
+
+
+def build_corpus(directory: Path, files: int, hands: int) -> list[str]:
+    sources = [REPO / source for source in SOURCES]
+    paths = []
+    for index in range(files):
+        source = sources[index % len(sources)]
+        raw = source.read_bytes()
+        target = directory / f"{index:05d}-{source.name}"
+        target.write_bytes(raw * max(1, hands // max(1, raw.count(b"\n\n\n") + 1)))
+        paths.append(str(target))
+    return paths
+
+
+def timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="files in the scratch directory")
+    parser.add_argument("--hands", type=int, default=200, help="approximate hands per file")
+    args = parser.parse_args()
+
+    identifier = IdentifySite(Config(file=str(REPO / "HUD_config.xml")))
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = build_corpus(Path(scratch), args.files, args.hands)
+        megabytes = sum(Path(path).stat().st_size for path in paths) / 1e6
+
+        def whole_files() -> None:
+            for path in paths:
+                text, codec = identifier.read_file(path)
+                identifier.idSite(path, text, codec)
+
+        def prefixes() -> None:
+            identifier.clear_filelist()
+            identifier.identified.clear()
+            for path in paths:
+                identifier.processFile(path)
+
+        def rescan() -> None:
+            identifier.clear_filelist()
+            for path in paths:
+                identifier.processFile(path)
+
+        print(f"{len(paths)} files, {megabytes:.0f} MB")
+        for name, run in (("whole file", whole_files), ("prefix", prefixes), ("unchanged rescan", rescan)):
+            print(f"{name:<17} {timed(run):8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
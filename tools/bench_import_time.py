@@ -0,0 +1,68 @@
+"""Time how long fresh processes take to import the importer's entry points.
+
+Every process that identifies or imports hand histories -- the GUI, the HUD
+child, the auto-import thread, one-off backfill scripts -- starts by importing
+``parser_registry``, ``IdentifySite`` or ``Importer``. This starts a new
+interpreter per sample, imports one of them, and reports the best wall time
+along with how many converter and summary modules came in with it. The
+"every converter" row is what each of them used to cost when the registry
+imported every converter up front.
+
+    python tools/bench_import_time.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    "parser_registry": "import fpdb_3_legacy.parser_registry",
+    "IdentifySite": "import fpdb_3_legacy.IdentifySite",
+    "Importer": "import fpdb_3_legacy.Importer",
+    "every converter": (
+        "from fpdb_3_legacy.parser_registry import PARSER_CLASS_REGISTRY, SUMMARY_CLASS_REGISTRY\n"
+        "[*PARSER_CLASS_REGISTRY.values(), *SUMMARY_CLASS_REGISTRY.values()]"
+    ),
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - started
+converters = [name for name in sys.modules if name.endswith(("ToFpdb", "Summary"))]
+print(json.dumps({{"seconds": elapsed, "converters": len(converters)}}))
+"""
+
+
+def sample(statement: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target")
+    args = parser.parse_args()
+
+    print(f"{'import':<18} {'best':>9} {'converters':>11}")
+    for name, statement in TARGETS.items():
+        runs = [sample(statement) for _ in range(args.repeat)]
+        best = min(run["seconds"] for run in runs)
+        print(f"{name:<18} {best * 1000:>7.0f}ms {runs[0]['converters']:>11}")
+
+
+if __name__ == "__main__":
+    main()
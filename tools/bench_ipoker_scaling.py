@@ -0,0 +1,74 @@
+"""Time how iPoker parsing scales with the number of hands in a session file.
+
+An iPoker file is one session: the game type, table and table size are written
+once at the top and every hand is looked up against them. Those lookups used
+to search the whole file again for every hand, so a tag the session lacks
+(``<tablesize>`` in older exports) cost a full scan per hand and a long
+session parsed in quadratic time. This builds sessions of growing size from
+the ``no.max.seats`` regression file, parses every hand of each, and prints the
+time per hand, which should stay flat as the file grows.
+
+    python tools/bench_ipoker_scaling.py [--hands 500 1000 2000 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.Configuration import Config  # noqa: E402
+from fpdb_3_legacy.iPoker.base import iPoker  # noqa: E402
+
+SOURCE = REPO / "regression-test-files" / "cash" / "iPoker" / "Flop" / "PLO-EUR-2.50-5.00-201901.no.max.seats.txt"
+GAME = re.compile(r' <game gamecode="(\d+)">.*?</game>\n', re.DOTALL)
+
+
+def session(hands: int) -> bytes:
+    """The source session with its games repeated, renumbered, to ``hands`` games."""
+    text = SOURCE.read_bytes().decode("cp1252")
+    games = [match.group(0) for match in GAME.finditer(text)]
+    head, tail = text[: text.index(" <game ")], text[text.rindex("</game>\n") + len("</game>\n") :]
+    body = [
+        GAME.sub(lambda m, n=n: m.group(0).replace(m.group(1), str(4419495747 + n), 1), games[n % len(games)])
+        for n in range(hands)
+    ]
+    return (head + "".join(body) + tail).encode("cp1252")
+
+
+def parse(config: Config, path: Path) -> tuple[int, float]:
+    parser = iPoker(config, in_path=str(path), autostart=False)
+    start = time.perf_counter()
+    parsed = 0
+    for hand_text in parser.allHandsAsList():
+        if parser.processHand(hand_text) is not None:
+            parsed += 1
+    return parsed, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, nargs="+", default=[500, 1000, 2000, 5000])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    config = Config()
+    print(f"{'hands':>6} {'size':>9} {'parsed':>7} {'seconds':>8} {'ms/hand':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for count in args.hands:
+            path = Path(folder) / f"session-{count}.xml"
+            path.write_bytes(session(count))
+            parsed, seconds = parse(config, path)
+            size = path.stat().st_size / 1e6
+            print(f"{count:>6} {size:>7.1f}MB {parsed:>7} {seconds:>8.2f} {seconds * 1000 / count:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
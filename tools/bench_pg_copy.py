@@ -0,0 +1,112 @@
+"""Compare COPY FROM STDIN with executemany for the bulk import's HandsActions rows.
+
+The import writes its per-hand tables either as ``executemany`` batches of
+20,000 rows or, on PostgreSQL, as one streamed ``COPY ... FROM STDIN``. This
+times both on synthetic HandsActions rows -- the widest-volume table, a dozen
+rows per hand -- against a live server, using the same statements and helpers
+the importer does.
+
+    FPDB_POSTGRES_DB=fpdb python tools/bench_pg_copy.py [--rows 200000]
+
+Connection settings come from the FPDB_POSTGRES_* variables the integration
+tests read. The rows go into a temporary table shaped like the database's
+HandsActions (``LIKE``, so no foreign keys), so the database must hold an fpdb
+schema and nothing is left behind. Run it over the link you care about: the gap
+between the two grows with the round-trip time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.database_bulk_import import (  # noqa: E402
+    EXECUTEMANY_BATCH_SIZE,
+    copy_rows,
+    copy_statement,
+)
+from fpdb_3_legacy.SQL import Sql  # noqa: E402
+
+DEFAULT_ROWS = 200_000
+ACTIONS_PER_HAND = 12
+
+
+def connect():
+    import psycopg
+
+    return psycopg.connect(
+        host=os.environ.get("FPDB_POSTGRES_HOST", "127.0.0.1"),
+        port=int(os.environ.get("FPDB_POSTGRES_PORT", "5432")),
+        dbname=os.environ.get("FPDB_POSTGRES_DB", "fpdb"),
+        user=os.environ.get("FPDB_POSTGRES_USER", "fpdb"),
+        password=os.environ.get("FPDB_POSTGRES_PASSWORD", "fpdb"),
+    )
+
+
+def action_rows(count: int) -> list[tuple]:
+    """HandsActions rows as storeHandsActions buffers them."""
+    return [
+        (
+            1 + i // ACTIONS_PER_HAND,  # handId
+            1 + i % 6,  # playerId
+            i % 5,  # street
+            i % ACTIONS_PER_HAND,  # actionNo
+            i % 4,  # streetActionNo
+            1 + i % 9,  # actionId
+            i % 400,  # amount
+            0,  # raiseTo
+            0,  # amountCalled
+            0,  # numDiscarded
+            None,  # cardsDiscarded
+            False,  # allIn
+        )
+        for i in range(count)
+    ]
+
+
+def timed(connection, load) -> float:
+    with connection.cursor() as c:
+        c.execute("TRUNCATE HandsActions")
+        started = time.perf_counter()
+        load(c)
+        connection.commit()
+        return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="HandsActions rows to load")
+    args = parser.parse_args()
+
+    insert = Sql(db_server="postgresql").query["store_hands_actions"]
+    statement = copy_statement(insert)
+    rows = action_rows(max(1, args.rows))
+
+    with connect() as connection:
+        with connection.cursor() as c:
+            # Shadows the real table for this session only: pg_temp is searched first.
+            c.execute("CREATE TEMP TABLE HandsActions (LIKE public.HandsActions INCLUDING DEFAULTS)")
+        connection.commit()
+
+        def batches(c) -> None:
+            for start in range(0, len(rows), EXECUTEMANY_BATCH_SIZE):
+                c.executemany(insert, rows[start : start + EXECUTEMANY_BATCH_SIZE])
+
+        many = timed(connection, batches)
+        copied = timed(connection, lambda c: copy_rows(c, statement, rows))
+
+    print(f"{len(rows)} HandsActions rows")
+    print(f"  executemany ({EXECUTEMANY_BATCH_SIZE}/batch): {many:7.2f}s  {len(rows) / many:10.0f} rows/s")
+    print(f"  COPY FROM STDIN:              {copied:7.2f}s  {len(rows) / copied:10.0f} rows/s")
+    print(f"  speed-up: {many / copied:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Time PokerStars parsing of a fast-fold session, compiling player regexes three ways.
+
+A converter compiles regexes spelling out the seated players' names, and
+compiles them again whenever a hand seats someone new. At a fast-fold table
+(Zoom, Rush, Fast Forward) that is nearly every hand. This builds a
+fast-fold-like session from a 6-max regression file by reseating every hand
+with opponents drawn from a pool, then parses it twice with fresh converters
+-- a first import and a re-read -- compiling per hand as before, through the
+process-wide per-player-set LRU only, and with PokerStars' name-agnostic
+regexes (the default).
+
+    python tools/bench_player_regexes.py [--hands 3000] [--pool 40] [--seed 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy import HandHistoryConverter  # noqa: E402
+from fpdb_3_legacy.Configuration import Config  # noqa: E402
+from fpdb_3_legacy.PokerStarsToFpdb import PokerStars  # noqa: E402
+
+ANY_NAME = PokerStars.compilePlayerRegexs
+SEATED_NAMES = PokerStars._compile_seated_player_regexs
+
+SOURCE = REPO / "regression-test-files" / "cash" / "Stars" / "Flop" / "NLHE-6max-USD-0.05-0.10-200911.txt"
+SEAT = re.compile(r"^Seat \d+: (.+?) \(", re.MULTILINE)
+HAND_NO = re.compile(r"PokerStars Game #(\d+)")
+
+
+def fast_fold_session(hands: int, pool: int, seed: int) -> str:
+    """``hands`` hands of the source file, each reseated with opponents from a pool of ``pool`` names."""
+    rng = random.Random(seed)
+    names = [f"regular{n:04d}" for n in range(pool)]
+    source = [hand for hand in SOURCE.read_text(encoding="utf-8").split("\n\n\n") if hand.strip()]
+    session = []
+    for n in range(hands):
+        text = source[n % len(source)]
+        seated = list(dict.fromkeys(name for name in SEAT.findall(text) if name != "Hero"))
+        for name, new in zip(seated, rng.sample(names, len(seated)), strict=True):
+            text = re.sub(rf"(?<![\w.]){re.escape(name)}(?![\w.])", new, text)
+        session.append(HAND_NO.sub(f"PokerStars Game #{40000000000 + n}", text, count=1))
+    return "\n\n\n".join(session) + "\n\n\n"
+
+
+def parse(config: Config, path: Path) -> tuple[int, float]:
+    converter = PokerStars(config, in_path=str(path), autostart=False)
+    start = time.perf_counter()
+    parsed = sum(converter.processHand(text) is not None for text in converter.allHandsAsList())
+    return parsed, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=3000)
+    parser.add_argument("--pool", type=int, default=40, help="opponents the table draws from")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    config = Config()
+    size = HandHistoryConverter.PLAYER_REGEX_CACHE_SIZE
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "fast-fold.txt"
+        path.write_text(fast_fold_session(args.hands, args.pool, args.seed), encoding="utf-8")
+        print(f"{args.hands} hands, opponents drawn from {args.pool} players")
+        for label, compile_player_regexs, cache_size in (
+            ("per hand", SEATED_NAMES, 0),
+            ("LRU", SEATED_NAMES, size),
+            ("any name", ANY_NAME, size),
+        ):
+            PokerStars.compilePlayerRegexs = compile_player_regexs
+            HandHistoryConverter.PLAYER_REGEX_CACHE_SIZE = cache_size
+            HandHistoryConverter.clear_player_regex_cache()
+            for run in ("import", "re-read"):
+                parsed, seconds = parse(config, path)
+                print(f"{label:<9} {run:<8} {parsed:>6} hands {seconds:7.2f}s {seconds * 1000 / parsed:6.2f} ms/hand")
+
+
+if __name__ == "__main__":
+    main()
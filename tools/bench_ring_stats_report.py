@@ -0,0 +1,161 @@
+"""Time the cash stats tab's grids: three queries, one scan, and the cache.
+
+The tab used to run ``playerDetailedStats`` three times -- summary, starting
+hands, positions -- over the same HandsPlayers rows. It now reads
+``ringStatsScan`` once and rolls the result up with ``report_engine``, and the
+same filters are served from the result cache until a hand is imported. This
+imports five PokerStars cash regression files into a scratch SQLite database,
+copies every hand ``--copies`` times to reach a realistic size, and times the
+three ways of filling the grids for the player with the most hands.
+
+    python tools/bench_ring_stats_report.py [--copies 200] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.Configuration import Config  # noqa: E402
+from fpdb_3_legacy.Database import Database  # noqa: E402
+from fpdb_3_legacy.Importer import Importer  # noqa: E402
+from fpdb_3_legacy.ring_stats import report_engine  # noqa: E402
+from fpdb_3_legacy.ring_stats.controller import RingStatsController  # noqa: E402
+
+FLOP = REPO / "regression-test-files" / "cash" / "Stars" / "Flop"
+HANDS = [
+    FLOP / "NLHE-FR-USD-0.01-0.02-201005.microgrind.txt",
+    FLOP / "NLHE-6max-USD-0.05-0.10-200911.txt",
+    FLOP / "NLHE-6max-EUR-0.05-0.10-200911.txt",
+    FLOP / "PLO8-6max-USD-0.01-0.02-200911.txt",
+    FLOP / "NLHE-2max-USD-0.25-0.50-201005.Hitnrun.txt",
+]
+
+
+def scratch_database(folder: Path) -> Database:
+    config = Config(file="HUD_config.xml")
+    params = config.get_db_parameters()
+    params.update(
+        {
+            "db-host": "localhost",
+            "db-server": "sqlite",
+            "db-port": 5432,
+            "db-user": "bench",
+            "db-password": "bench",
+            "db-backend": 4,
+            "db-name": str(folder / "bench.sqlite3"),
+            "db-databaseName": str(folder / "bench.sqlite3"),
+            "db-path": "",
+        }
+    )
+    config.get_db_parameters = lambda: params
+    Database(config).recreate_tables()
+    # The importer opens, and on collection closes, its own connection.
+    importer = Importer(caller=None, settings={"testData": False, "threads": 1}, config=config, sql=None)
+    for path in HANDS:
+        importer.addImportFile(str(path), "PokerStars")
+    importer.runImport()
+    del importer
+    return Database(config)
+
+
+def copy_hands(db: Database, copies: int) -> None:
+    # Each copy shifts the hand ids past the last ones and renames the hand
+    # numbers, so the unique index on Hands still holds.
+    cursor = db.get_cursor()
+    cursor.execute("SELECT max(id) FROM Hands")
+    offset = cursor.fetchone()[0]
+    for table, key in (("Hands", "id"), ("HandsPlayers", "handId")):
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [row[1] for row in cursor.fetchall() if not (table == "HandsPlayers" and row[1] == "id")]
+        for k in range(1, copies + 1):
+            chosen = []
+            for column in columns:
+                if column == key:
+                    chosen.append(f"{column} + {k * offset}")
+                elif table == "Hands" and column == "siteHandNo":
+                    chosen.append(f"{column} || '-{k}'")
+                else:
+                    chosen.append(column)
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(chosen)} FROM {table} "
+                f"WHERE {key} <= {offset}"
+            )
+    db.commit()
+
+
+def filter_params(db: Database) -> tuple:
+    cursor = db.get_cursor()
+    cursor.execute("SELECT playerId, count(1) FROM HandsPlayers GROUP BY playerId ORDER BY 2 DESC LIMIT 1")
+    playerid, hands = cursor.fetchone()
+    cursor.execute("SELECT DISTINCT category FROM Gametypes")
+    games = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT currency FROM Gametypes")
+    currencies = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT siteId FROM Gametypes")
+    sitenos = [row[0] for row in cursor.fetchall()]
+    widget = SimpleNamespace(get_limits_where_clause=lambda limits: "")
+    dates = ("1970-01-01 00:00:00", "2100-01-01 00:00:00")
+    print(f"player {playerid}: {hands} hands")
+    return (widget, [playerid], sitenos, [], {"from": 2, "to": 10}, {"posn": True}, dates, games, currencies, 0)
+
+
+def best_of(repeat: int, run) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=200, help="copies of every imported hand")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = scratch_database(Path(folder))
+        copy_hands(db, args.copies)
+        controller = RingStatsController(db, db.config, db.sql)
+        params = filter_params(db)
+        cursor = db.get_cursor()
+
+        def three_queries() -> None:
+            for holecards, force_position in ((False, False), (True, False), (False, True)):
+                cursor.execute(controller._get_refined_sql("playerDetailedStats", holecards, *params, force_position))
+                cursor.fetchall()
+
+        groupings = controller._report_groupings(params[5], params[4])
+        sql = controller._get_refined_scan_sql(*params)
+
+        def one_scan() -> list:
+            cursor.execute(sql)
+            colnames = [column[0].lower() for column in cursor.description]
+            return report_engine.ring_report(cursor.fetchall(), colnames, groupings)
+
+        key = report_engine.report_cache_key(db, "scan", sql, *groupings)
+        report_engine.store_report(key, one_scan())
+
+        for name, run in (
+            ("three queries", three_queries),
+            ("one scan", one_scan),
+            (
+                "cached",
+                lambda: report_engine.cached_report(report_engine.report_cache_key(db, "scan", sql, *groupings)),
+            ),
+        ):
+            print(f"{name:<14} {best_of(args.repeat, run) * 1000:9.1f}ms")
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Time how the Session tab's sessionizer scales with the size of a hero history.
+
+``GuiSessionViewer`` used to sum the profits before each session again inside
+its per-session loop, so a long history with many sessions took minutes to
+cut. ``sessionizer`` reads every figure off one cumulative sum. This builds
+histories of growing size -- bursts of hands a few seconds apart, broken by
+gaps of hours -- and times cutting them into sessions (``sessionize``, run in
+the query worker) and formatting the table rows (``session_rows``, run in the
+GUI thread).
+
+    python tools/bench_sessionizer.py [--hands 100000 500000 2000000] [--session 400]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from fpdb_3_legacy.sessionizer import SESSION_GAP, session_rows, sessionize  # noqa: E402
+
+
+def history(hands: int, session: int, seed: int = 1) -> list[tuple[str, int]]:
+    """``(time, profit)`` rows as SQLite returns them: the time as text, the profit in cents."""
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(5, 60, hands)
+    steps[::session] += SESSION_GAP * 4
+    times = 1_500_000_000 + steps.cumsum()
+    profits = rng.integers(-2000, 2000, hands)
+    return list(zip(times.astype(str).tolist(), profits.tolist(), strict=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, nargs="+", default=[100_000, 500_000, 2_000_000])
+    parser.add_argument("--session", type=int, default=400, help="hands per session")
+    args = parser.parse_args()
+
+    print(f"{'hands':>9} {'sessions':>9} {'sessionize':>11} {'rows':>8}")
+    for count in args.hands:
+        rows = history(count, args.session)
+        start = time.perf_counter()
+        sessions = sessionize(rows)
+        cut = time.perf_counter() - start
+        start = time.perf_counter()
+        session_rows(sessions)
+        formatted = time.perf_counter() - start
+        print(f"{count:>9} {len(sessions):>9} {cut:>10.2f}s {formatted:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()